@@ -0,0 +1,77 @@
+"""
+Benchmark: deduplicate_code time as generated code grows
+
+Doubles the input size each round; with a linear algorithm the time per line
+stays flat and each round takes about twice as long as the previous one.
+
+Usage:
+    python benchmarks/bench_dedup.py --max-lines 64000
+    python benchmarks/bench_dedup.py --output dedup.json
+"""
+
+import argparse
+import json
+import statistics
+import time
+
+from pragyan.dedup import deduplicate_code
+
+
+def unique_code(lines: int) -> str:
+    """Code with no repeated blocks, so the whole input is scanned"""
+    body = [f"    value_{i} = compute(value_{i - 1}, {i})  # step {i}" for i in range(1, lines)]
+    return "\n".join(["def solve(value_0):"] + body + ["    return value_0"])
+
+
+def sliding_window_code(lines: int) -> str:
+    """A solution followed by its tail repeated from later and later starts"""
+    solution = unique_code(max(lines // 4, 12)).split("\n")
+    output = list(solution)
+    start = 2
+    while len(output) < lines:
+        output.extend(solution[start:])
+        start += 2
+    return "\n".join(output[:lines])
+
+
+def time_case(code: str, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        deduplicate_code(code)
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--min-lines", type=int, default=1000)
+    parser.add_argument("--max-lines", type=int, default=32000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", default=None, help="Write results as JSON to this file")
+    args = parser.parse_args()
+
+    results = {}
+    for name, make in (("unique", unique_code), ("sliding_window", sliding_window_code)):
+        rows = []
+        lines = args.min_lines
+        previous = None
+        print(f"\n{name}")
+        print(f"{'lines':>8} {'median (ms)':>12} {'us/line':>9} {'x prev':>7}")
+        while lines <= args.max_lines:
+            seconds = time_case(make(lines), args.repeat)
+            growth = seconds / previous if previous else None
+            rows.append({"lines": lines, "median_s": round(seconds, 6), "us_per_line": round(seconds / lines * 1e6, 3)})
+            print(f"{lines:>8} {seconds * 1000:>12.2f} {seconds / lines * 1e6:>9.2f} "
+                  f"{growth if growth else float('nan'):>7.2f}")
+            previous = seconds
+            lines *= 2
+        results[name] = rows
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"benchmark": "dedup", "results": results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
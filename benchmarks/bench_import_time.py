@@ -0,0 +1,93 @@
+"""
+Benchmark: start-up time of `import pragyan` and of quick CLI commands
+
+Each command runs in a fresh interpreter so nothing is already imported.
+
+Usage:
+    python benchmarks/bench_import_time.py --runs 10
+    python benchmarks/bench_import_time.py --max-ms 100   # apply the budget to every command
+
+Exits 1 when a command exceeds its budget (by default 100 ms over interpreter
+start-up for `pragyan version` and `pragyan languages`) or a heavy module is loaded.
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+
+
+COMMANDS = {
+    "import pragyan": [sys.executable, "-c", "import pragyan"],
+    "pragyan --help": [sys.executable, "-m", "pragyan.cli", "--help"],
+    "pragyan version": [sys.executable, "-m", "pragyan.cli", "version"],
+    "pragyan languages": [sys.executable, "-m", "pragyan.cli", "languages"],
+}
+
+# Modules that should only be loaded when their feature is used
+HEAVY_MODULES = [
+    "google.generativeai", "groq", "manim", "moviepy", "selenium",
+    "langchain_community", "bs4", "httpx", "rich",
+]
+
+# Default budgets in ms over interpreter start-up (--max-ms sets one for every command)
+BUDGETS = {
+    "pragyan version": 100.0,
+    "pragyan languages": 100.0,
+}
+
+BASELINE = [sys.executable, "-c", "pass"]
+
+
+def time_command(command, runs: int) -> float:
+    """Median wall-clock milliseconds of a command"""
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True)
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def loaded_heavy_modules(statement: str) -> list:
+    """Heavy modules present in sys.modules after running a statement"""
+    probe = f"{statement}\nimport sys, json\nprint(json.dumps([m for m in {HEAVY_MODULES!r} if m in sys.modules]))"
+    output = subprocess.run([sys.executable, "-c", probe], capture_output=True, text=True, check=True)
+    return json.loads(output.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--max-ms", type=float, default=None,
+                        help="Fail if any median (minus interpreter start-up) exceeds this "
+                             "(default: 100 for version and languages)")
+    args = parser.parse_args()
+
+    # Warm the bytecode cache so the first sample is not a compile
+    subprocess.run(COMMANDS["import pragyan"], check=True)
+
+    baseline = time_command(BASELINE, args.runs)
+    print(f"{'interpreter start-up':<22}{baseline:8.1f} ms")
+
+    failed = False
+    for name, command in COMMANDS.items():
+        median = time_command(command, args.runs)
+        overhead = median - baseline
+        budget = args.max_ms if args.max_ms is not None else BUDGETS.get(name)
+        over = budget is not None and overhead > budget
+        failed = failed or over
+        print(f"{name:<22}{median:8.1f} ms  (+{overhead:.1f} ms){'  OVER BUDGET' if over else ''}")
+
+    for statement in ("import pragyan", "import pragyan.cli"):
+        heavy = loaded_heavy_modules(statement)
+        print(f"{statement:<22}loads: {', '.join(heavy) if heavy else 'no heavy modules'}")
+        failed = failed or bool(heavy)
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
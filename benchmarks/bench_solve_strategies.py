@@ -0,0 +1,113 @@
+"""
+Benchmark: wall-clock time of the sequential, speculative and fused solve strategies
+
+Usage:
+    # Against a live provider (reads PRAGYAN_API_KEY)
+    python benchmarks/bench_solve_strategies.py --provider groq --runs 3
+
+    # Offline, with a simulated per-request latency in seconds
+    python benchmarks/bench_solve_strategies.py --simulate 1.5
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+from pragyan import llm_client
+from pragyan.main import Pragyan
+from pragyan.models import SolveStrategy
+
+
+PROBLEM = """Two Sum
+
+Given an array of integers nums and an integer target, return indices of the two numbers such that they add up to target.
+You may assume that each input would have exactly one solution, and you may not use the same element twice.
+
+Example 1:
+Input: nums = [2,7,11,15], target = 9
+Output: [0,1]
+
+Constraints:
+- 2 <= nums.length <= 10^4
+- -10^9 <= nums[i] <= 10^9
+"""
+
+
+class SimulatedClient(llm_client.BaseLLMClient):
+    """Provider stand-in that sleeps for a fixed latency per request"""
+
+    latency = 1.0
+
+    def generate(self, prompt, system_prompt=None):
+        time.sleep(self.latency)
+        return "{}"
+
+    def generate_json(self, prompt, system_prompt=None):
+        time.sleep(self.latency)
+        solution = {"code": "def two_sum(nums, target):\n    pass", "time_complexity": "O(n)"}
+        analysis = {"topics": ["array", "hash table"], "main_concept": "Hash map lookup"}
+        if '"analysis"' in prompt and '"solution"' in prompt:
+            return {"analysis": analysis, "solution": solution}
+        if "Generate a complete solution" in prompt:
+            return solution
+        return analysis
+
+
+def run_benchmark(pragyan: Pragyan, runs: int):
+    question = pragyan.parse_question(PROBLEM)
+    results = {}
+
+    for strategy in SolveStrategy:
+        timings = []
+        for _ in range(runs):
+            start = time.perf_counter()
+            pragyan.solve_complete(question, "python", strategy)
+            timings.append(time.perf_counter() - start)
+
+        results[strategy.value] = {
+            "runs": runs,
+            "mean_s": round(statistics.mean(timings), 3),
+            "min_s": round(min(timings), 3),
+            "max_s": round(max(timings), 3),
+        }
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--provider", default="groq", choices=["gemini", "groq"])
+    parser.add_argument("--model", default=None)
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--simulate", type=float, default=None, metavar="SECONDS",
+                        help="Use a simulated provider with this per-request latency")
+    parser.add_argument("--output", default=None, help="Write results as JSON to this file")
+    args = parser.parse_args()
+
+    api_key = os.environ.get("PRAGYAN_API_KEY", "")
+    if args.simulate is not None:
+        SimulatedClient.latency = args.simulate
+        llm_client.GeminiClient = SimulatedClient
+        llm_client.GroqClient = SimulatedClient
+    elif not api_key:
+        sys.exit("Set PRAGYAN_API_KEY or pass --simulate SECONDS")
+
+    pragyan = Pragyan(provider=args.provider, api_key=api_key, model=args.model)
+    results = run_benchmark(pragyan, args.runs)
+
+    baseline = results[SolveStrategy.SEQUENTIAL.value]["mean_s"]
+    print(f"{'strategy':<12} {'mean (s)':>10} {'min (s)':>10} {'max (s)':>10} {'speedup':>9}")
+    for name, row in results.items():
+        speedup = baseline / row["mean_s"] if row["mean_s"] else 0.0
+        print(f"{name:<12} {row['mean_s']:>10.3f} {row['min_s']:>10.3f} {row['max_s']:>10.3f} {speedup:>8.2f}x")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"benchmark": "solve_strategies", "results": results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,298 @@
+"""
+Benchmark suite: offline timings of the Pragyan pipeline on fixture problems
+
+Uses the fake LLM provider, so no API key or network is needed. Results are
+written as JSON so runs from different releases can be compared.
+
+Usage:
+    python benchmarks/run_benchmarks.py --output results.json
+    python benchmarks/run_benchmarks.py --latency 0.2 --jitter 0.05 --only pipeline
+    python benchmarks/run_benchmarks.py --compare baseline.json   # exit 1 on a regression
+"""
+
+import argparse
+import json
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pragyan
+from pragyan.batch import load_batch_items
+from pragyan.json_stream import JSONStreamParser
+from pragyan.llm_client import FakeClient, _FAKE_SOLUTION, _clean_and_parse_json
+from pragyan.main import Pragyan
+from pragyan.models import ProgrammingLanguage, VideoConfig
+
+
+FIXTURES = Path(__file__).parent / "fixtures" / "problems.jsonl"
+
+
+def timed(fn, repeat: int) -> dict:
+    """Run fn repeat times and summarize the wall-clock seconds"""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return {
+        "runs": repeat,
+        "median_s": round(statistics.median(samples), 6),
+        "min_s": round(min(samples), 6),
+        "max_s": round(max(samples), 6),
+    }
+
+
+def fake_pragyan(latency: float, jitter: float, video_config=None) -> Pragyan:
+    instance = Pragyan(provider="fake", api_key="", video_config=video_config)
+    instance.llm.client = FakeClient(instance.llm.config, latency=latency, jitter=jitter)
+    return instance
+
+
+def bench_pipeline(problems, args) -> dict:
+    """End-to-end Pragyan.process (analysis + solution, no video) per problem"""
+    instance = fake_pragyan(args.latency, args.jitter)
+
+    def run():
+        for problem in problems:
+            instance.process(problem.source, generate_video=False, strategy=args.strategy)
+
+    result = timed(run, args.repeat)
+    result["problems"] = len(problems)
+    result["problems_per_s"] = round(len(problems) / result["median_s"], 2) if result["median_s"] else None
+    return result
+
+
+def bench_json_parsing(problems, args) -> dict:
+    """_clean_and_parse_json on clean, fenced and control-character responses, plus the same fed in stream chunks"""
+    clean = json.dumps(_FAKE_SOLUTION, indent=2)
+    responses = [
+        clean,
+        f"```json\n{clean}\n```",
+        clean.replace("\\n", "\n"),  # raw newlines inside strings, as LLMs often send
+    ]
+
+    chunked = [[response[i:i + 16] for i in range(0, len(response), 16)] for response in responses]
+
+    def run():
+        for _ in range(100):
+            for response in responses:
+                _clean_and_parse_json(response)
+            for chunks in chunked:
+                parser = JSONStreamParser()
+                for chunk in chunks:
+                    parser.feed(chunk)
+                parser.close()
+
+    result = timed(run, args.repeat)
+    result["parses"] = 100 * len(responses) * 2
+    return result
+
+
+def bench_code_dedup(problems, args) -> dict:
+    """_deduplicate_code on a solution repeated several times over"""
+    instance = fake_pragyan(0.0, 0.0)
+    code = "\n\n".join([_FAKE_SOLUTION["code"]] * 8)
+    large = "\n".join(f"    value_{i} = compute({i})" for i in range(2000))
+
+    def run():
+        for _ in range(20):
+            instance.llm._deduplicate_code(code)
+        instance.llm._deduplicate_code(large)
+
+    return timed(run, args.repeat)
+
+
+def bench_sandbox(problems, args) -> dict:
+    """Fake solution verified against 20 test cases, once per fixture problem, on warm workers"""
+    from pragyan.models import ExecutionConfig, Solution
+    from pragyan.sandbox import SandboxPool
+
+    solution = Solution(language=ProgrammingLanguage.PYTHON, **{
+        key: _FAKE_SOLUTION[key] for key in
+        ("code", "explanation", "time_complexity", "space_complexity", "concept", "approach")
+    })
+    cases = [
+        {"input": f"nums = {list(range(i + 2))}, target = {2 * i + 1}", "expected_output": [i, i + 1]}
+        for i in range(20)
+    ]
+    jobs = [(solution, cases)] * len(problems)
+
+    with SandboxPool(ExecutionConfig()) as sandbox:
+        sandbox.run_many([(solution, cases[:1])] * sandbox.size)  # let every worker finish importing first
+
+        def run():
+            reports = sandbox.run_many(jobs)
+            assert all(report.passed for report in reports)
+
+        result = timed(run, args.repeat)
+        result["workers"] = sandbox.size
+    result["solutions"] = len(jobs)
+    result["solutions_per_s"] = round(len(jobs) / result["median_s"], 2) if result["median_s"] else None
+    return result
+
+
+def bench_stress(problems, args) -> dict:
+    """Fake solution run on every worst-case input order at n = 10^5, arguments memory-mapped from files"""
+    from pragyan.models import ExecutionConfig, Question, Solution
+    from pragyan.sandbox import SandboxPool
+    from pragyan.stress import StressGenerator
+
+    solution = Solution(language=ProgrammingLanguage.PYTHON, **{
+        key: _FAKE_SOLUTION[key] for key in
+        ("code", "explanation", "time_complexity", "space_complexity", "concept", "approach")
+    })
+    question = Question(title="Two Sum", description="", constraints=[
+        "2 <= nums.length <= 10^5", "-10^9 <= nums[i] <= 10^9", "-10^9 <= target <= 10^9",
+    ])
+
+    with SandboxPool(ExecutionConfig(workers=1)) as sandbox, \
+            StressGenerator.for_question(question, ["nums", "target"]) as generator:
+        inputs = generator.generate()
+        sandbox.stress(solution, inputs[:1])  # let the worker finish importing first
+
+        def run():
+            report = sandbox.stress(solution, inputs)
+            assert report.passed, [case.status for case in report.cases]
+
+        result = timed(run, args.repeat)
+    result["inputs"] = len(inputs)
+    result["elements_per_s"] = round(len(inputs) * generator.max_size / result["median_s"]) if result["median_s"] else None
+    return result
+
+
+def _codegen_generator(video_config: VideoConfig):
+    """VideoGenerator whose scene code generation works without Manim installed"""
+    from pragyan.video_generator import VideoGenerator
+
+    class CodegenOnly(VideoGenerator):
+        def _verify_manim_installation(self):
+            pass
+
+    return CodegenOnly(video_config)
+
+
+def bench_scene_codegen(problems, args) -> dict:
+    """Generic DSAExplanation scene source for every fixture problem"""
+    instance = fake_pragyan(0.0, 0.0)
+    generator = _codegen_generator(VideoConfig(use_render_cache=False))
+    inputs = []
+    for problem in problems:
+        question = instance.parse_question(problem.source)
+        solution, analysis = instance.solve_complete(question, ProgrammingLanguage.PYTHON)
+        inputs.append((question, solution, analysis))
+
+    def run():
+        for question, solution, analysis in inputs:
+            generator._generate_animated_scene(question, solution, analysis)
+
+    result = timed(run, args.repeat)
+    result["scenes"] = len(inputs)
+    return result
+
+
+def bench_render(problems, args) -> dict:
+    """Low-quality Manim render of the generic scene for the first fixture problem"""
+    import importlib.util
+    import shutil
+
+    if importlib.util.find_spec("manim") is None or shutil.which("manim") is None:
+        return {"skipped": "manim is not installed"}
+
+    with tempfile.TemporaryDirectory(prefix="pragyan_bench_") as output_dir:
+        video_config = VideoConfig(
+            output_dir=Path(output_dir), video_quality="low_quality", resolution="480p", fps=15,
+            use_render_cache=False,
+        )
+        instance = fake_pragyan(0.0, 0.0, video_config)
+        question = instance.parse_question(problems[0].source)
+        solution, analysis = instance.solve_complete(question, ProgrammingLanguage.PYTHON)
+
+        from pragyan.video_generator import VideoGenerator
+        sizes = []
+
+        def run():
+            path = VideoGenerator(video_config).generate_video(question, solution, analysis)
+            sizes.append(Path(path).stat().st_size)
+
+        result = timed(run, min(args.repeat, 3))
+        result["output_bytes"] = sizes[-1]
+        return result
+
+
+BENCHMARKS = {
+    "pipeline": bench_pipeline,
+    "json_parsing": bench_json_parsing,
+    "code_dedup": bench_code_dedup,
+    "sandbox": bench_sandbox,
+    "stress": bench_stress,
+    "scene_codegen": bench_scene_codegen,
+    "render_low_quality": bench_render,
+}
+
+
+def compare(results: dict, baseline_path: str, tolerance: float) -> bool:
+    """Print median changes against a baseline file; True if any got slower than tolerance"""
+    with open(baseline_path, "r", encoding="utf-8") as f:
+        baseline = json.load(f)["results"]
+
+    regressed = False
+    print(f"\n{'benchmark':<20} {'baseline':>10} {'current':>10} {'change':>9}")
+    for name, row in results.items():
+        before = baseline.get(name, {}).get("median_s")
+        after = row.get("median_s")
+        if not before or after is None:
+            continue
+        change = (after - before) / before
+        flag = "  REGRESSION" if change > tolerance else ""
+        regressed = regressed or bool(flag)
+        print(f"{name:<20} {before:>10.4f} {after:>10.4f} {change:>+8.1%}{flag}")
+    return regressed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--latency", type=float, default=0.0, help="Fake provider seconds per request")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Fake provider +/- seconds per request")
+    parser.add_argument("--strategy", default="sequential", choices=["sequential", "speculative", "fused"])
+    parser.add_argument("--problems", default=str(FIXTURES), help="Fixture problems (batch file format)")
+    parser.add_argument("--only", action="append", choices=list(BENCHMARKS), help="Run only these benchmarks")
+    parser.add_argument("--output", default=None, help="Write results as JSON to this file")
+    parser.add_argument("--compare", default=None, metavar="BASELINE", help="Results file to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed slowdown before --compare fails")
+    args = parser.parse_args()
+
+    problems = load_batch_items(args.problems)
+    results = {}
+    for name in args.only or BENCHMARKS:
+        results[name] = BENCHMARKS[name](problems, args)
+        row = results[name]
+        summary = row.get("skipped") or f"median {row['median_s']:.4f}s (min {row['min_s']:.4f}s)"
+        print(f"{name:<20} {summary}")
+
+    report = {
+        "benchmark": "suite",
+        "version": pragyan.__version__,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "settings": {
+            "repeat": args.repeat, "latency": args.latency, "jitter": args.jitter,
+            "strategy": args.strategy, "problems": len(problems),
+        },
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+    if args.compare and compare(results, args.compare, args.tolerance):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -11,24 +11,108 @@ This package provides:
 __version__ = "1.0.4"
 __author__ = "Kamal"
 
-from pragyan.main import Pragyan, solve_from_url, solve_from_text
-from pragyan.models import (
-    Question, 
-    Solution, 
-    VideoConfig, 
-    ProgrammingLanguage,
-    LLMProvider,
-    LLMConfig,
-)
-from pragyan.scraper import QuestionScraper
-from pragyan.solver import DSASolver
-from pragyan.llm_client import LLMClient
-from pragyan.video_generator import VideoGenerator, SimpleVideoGenerator
-from pragyan.logger import PragyanLogger, get_logger
+from typing import TYPE_CHECKING
+
+# Public names are imported on first access, so `import pragyan` stays cheap
+# and heavy dependencies only load when the stage that needs them runs
+_LAZY_IMPORTS = {
+    "Pragyan": "pragyan.main",
+    "AsyncPragyan": "pragyan.main",
+    "solve_from_url": "pragyan.main",
+    "solve_from_text": "pragyan.main",
+    "Question": "pragyan.models",
+    "Solution": "pragyan.models",
+    "VideoConfig": "pragyan.models",
+    "ProgrammingLanguage": "pragyan.models",
+    "LLMProvider": "pragyan.models",
+    "LLMConfig": "pragyan.models",
+    "BatchConfig": "pragyan.models",
+    "SolveStrategy": "pragyan.models",
+    "FailoverConfig": "pragyan.models",
+    "RateLimitConfig": "pragyan.models",
+    "ExecutionConfig": "pragyan.models",
+    "ProfileConfig": "pragyan.models",
+    "QuestionScraper": "pragyan.scraper",
+    "WebDriverPool": "pragyan.webdriver_pool",
+    "DSASolver": "pragyan.solver",
+    "LLMClient": "pragyan.llm_client",
+    "AsyncLLMClient": "pragyan.llm_client",
+    "FakeClient": "pragyan.llm_client",
+    "FailoverClient": "pragyan.failover",
+    "RateLimiter": "pragyan.ratelimit",
+    "SingleFlight": "pragyan.singleflight",
+    "SandboxPool": "pragyan.sandbox",
+    "ExecutionReport": "pragyan.sandbox",
+    "ComplexityProfiler": "pragyan.profiler",
+    "ComplexityReport": "pragyan.profiler",
+    "ApproachTable": "pragyan.profiler",
+    "StressGenerator": "pragyan.stress",
+    "StressInput": "pragyan.stress",
+    "ResponseCache": "pragyan.cache",
+    "RenderCache": "pragyan.cache",
+    "ScrapeCache": "pragyan.cache",
+    "Tracer": "pragyan.tracing",
+    "BatchItem": "pragyan.batch",
+    "BatchResult": "pragyan.batch",
+    "load_batch_items": "pragyan.batch",
+    "VideoGenerator": "pragyan.video_generator",
+    "SimpleVideoGenerator": "pragyan.video_generator",
+    "PragyanLogger": "pragyan.logger",
+    "get_logger": "pragyan.logger",
+}
+
+if TYPE_CHECKING:
+    from pragyan.main import Pragyan, AsyncPragyan, solve_from_url, solve_from_text
+    from pragyan.models import (
+        Question,
+        Solution,
+        VideoConfig,
+        ProgrammingLanguage,
+        LLMProvider,
+        LLMConfig,
+        BatchConfig,
+        SolveStrategy,
+        FailoverConfig,
+        RateLimitConfig,
+        ExecutionConfig,
+        ProfileConfig,
+    )
+    from pragyan.scraper import QuestionScraper
+    from pragyan.webdriver_pool import WebDriverPool
+    from pragyan.solver import DSASolver
+    from pragyan.llm_client import LLMClient, AsyncLLMClient, FakeClient
+    from pragyan.failover import FailoverClient
+    from pragyan.ratelimit import RateLimiter
+    from pragyan.singleflight import SingleFlight
+    from pragyan.sandbox import SandboxPool, ExecutionReport
+    from pragyan.profiler import ComplexityProfiler, ComplexityReport, ApproachTable
+    from pragyan.stress import StressGenerator, StressInput
+    from pragyan.cache import ResponseCache, RenderCache, ScrapeCache
+    from pragyan.tracing import Tracer
+    from pragyan.batch import BatchItem, BatchResult, load_batch_items
+    from pragyan.video_generator import VideoGenerator, SimpleVideoGenerator
+    from pragyan.logger import PragyanLogger, get_logger
+
+
+def __getattr__(name: str):
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module 'pragyan' has no attribute '{name}'")
+
+    import importlib
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_IMPORTS))
+
 
 __all__ = [
     # Main class
     "Pragyan",
+    "AsyncPragyan",
     
     # Convenience functions
     "solve_from_url",
@@ -41,11 +125,39 @@ __all__ = [
     "ProgrammingLanguage",
     "LLMProvider",
     "LLMConfig",
+    "BatchConfig",
+    "SolveStrategy",
+    "FailoverConfig",
+    "RateLimitConfig",
+    "ExecutionConfig",
+    "ProfileConfig",
     
     # Components
     "QuestionScraper",
+    "WebDriverPool",
     "DSASolver",
     "LLMClient",
+    "AsyncLLMClient",
+    "FakeClient",
+    "FailoverClient",
+    "RateLimiter",
+    "SingleFlight",
+    "SandboxPool",
+    "ExecutionReport",
+    "ComplexityProfiler",
+    "ComplexityReport",
+    "ApproachTable",
+    "StressGenerator",
+    "StressInput",
+    "ResponseCache",
+    "RenderCache",
+    "ScrapeCache",
+    "Tracer",
+    
+    # Batch processing
+    "BatchItem",
+    "BatchResult",
+    "load_batch_items",
     "VideoGenerator",
     "SimpleVideoGenerator",
     
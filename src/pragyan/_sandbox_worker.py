@@ -0,0 +1,607 @@
+"""
+Sandbox worker for Pragyan - runs generated solutions against test cases
+Started by SandboxPool as a standalone script (python -I); reads one JSON request per
+line on stdin and answers with one JSON line on stdout. Must not import pragyan.
+"""
+
+import ast
+import inspect
+import io
+import json
+import math
+import mmap
+import os
+import selectors
+import signal
+import subprocess
+import sys
+import time
+import tracemalloc
+from array import array
+
+try:
+    import resource
+except ImportError:  # Windows: no rlimits, only the parent's wall-clock timeout
+    resource = None
+
+# Preloaded once here so every forked run starts with them already imported
+import bisect, collections, functools, heapq, itertools, operator, random, re, string, typing  # noqa: E401,F401
+
+CAN_FORK = hasattr(os, "fork")
+
+# What LeetCode's Python environment has in scope before the solution runs
+_PRELUDE = compile(
+    "from typing import *\n"
+    "from collections import *\n"
+    "from functools import *\n"
+    "from itertools import *\n"
+    "from heapq import *\n"
+    "from bisect import *\n"
+    "import math, string, re, random, collections, heapq, bisect, itertools, functools, operator\n",
+    "<prelude>", "exec"
+)
+
+_JSON_NAMES = {"true": True, "false": False, "null": None}
+_MAX_REPR = 500
+
+
+class _CaseTimeout(Exception):
+    """Raised inside a test case by the CPU or wall-clock timer"""
+
+
+def _on_timer(signum, frame):
+    raise _CaseTimeout()
+
+
+def _set_timers(cpu_seconds, wall_seconds):
+    """Arm (or with 0, disarm) the per-case timers; POSIX only"""
+    if hasattr(signal, "setitimer"):
+        signal.setitimer(signal.ITIMER_PROF, cpu_seconds)
+        signal.setitimer(signal.ITIMER_REAL, wall_seconds)
+
+
+def _install_timer_handlers():
+    if hasattr(signal, "setitimer"):
+        signal.signal(signal.SIGPROF, _on_timer)
+        signal.signal(signal.SIGALRM, _on_timer)
+
+
+# Test case values
+
+class _JsonNames(ast.NodeTransformer):
+    """Let literal_eval read JSON's true/false/null as well as Python literals"""
+
+    def visit_Name(self, node):
+        if node.id in _JSON_NAMES:
+            return ast.copy_location(ast.Constant(_JSON_NAMES[node.id]), node)
+        return node
+
+
+def _literal(node):
+    return ast.literal_eval(_JsonNames().visit(node))
+
+
+def parse_value(value):
+    """A test case value as Python data; text that is not a literal stays text"""
+    if not isinstance(value, str):
+        return value
+    text = value.strip()
+    try:
+        return _literal(ast.parse(text, mode="eval").body)
+    except (SyntaxError, ValueError, TypeError):
+        return text
+
+
+def parse_arguments(value):
+    """
+    (args, kwargs) from a test case input such as "nums = [2,7,11,15], target = 9"
+
+    Lists become positional arguments and dicts keyword arguments; strings may
+    be assignments separated by commas or newlines, or a single literal.
+    """
+    if isinstance(value, dict):
+        return [], dict(value)
+    if not isinstance(value, str):
+        return [value], {}
+
+    text = ", ".join(line.strip().rstrip(",") for line in value.strip().splitlines() if line.strip())
+    try:
+        call = ast.parse(f"_({text})", mode="eval").body
+        return [_literal(arg) for arg in call.args], {kw.arg: _literal(kw.value) for kw in call.keywords}
+    except (SyntaxError, ValueError, TypeError):
+        return [parse_value(value)], {}
+
+
+# Typecodes of arrays stored raw in argument files (see pragyan.stress.write_arguments)
+_ARRAY_KINDS = {"int64": "q", "float64": "d"}
+
+
+def load_arguments(path, segments):
+    """
+    Positional arguments stored in a file, one segment per argument
+
+    Segments are {"kind": "int64" or "float64", "offset", "count"} for flat
+    numeric arrays, read straight from a memory map, or {"kind": "json",
+    "offset", "length"} for anything else. Every call returns fresh objects.
+    """
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return [[] if segment["kind"] in _ARRAY_KINDS else None for segment in segments]
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            view = memoryview(mapped)
+            try:
+                arguments = []
+                for segment in segments:
+                    start = segment["offset"]
+                    if segment["kind"] in _ARRAY_KINDS:
+                        values = array(_ARRAY_KINDS[segment["kind"]])
+                        values.frombytes(view[start:start + segment["count"] * values.itemsize])
+                        arguments.append(values.tolist())
+                    else:
+                        arguments.append(json.loads(mapped[start:start + segment["length"]]))
+                return arguments
+            finally:
+                view.release()
+
+
+def _case_arguments(case):
+    """(args, kwargs) of a test case, read from its argument file if it has one"""
+    if "file" in case:
+        return load_arguments(case["file"], case["segments"]), {}
+    return parse_arguments(case.get("input"))
+
+
+def _bind(fn, args, kwargs):
+    """Arguments for fn: keywords when their names match its parameters, else in order"""
+    if not kwargs:
+        return args, {}
+    try:
+        parameters = inspect.signature(fn).parameters
+    except (TypeError, ValueError):
+        parameters = {}
+    if all(name in parameters for name in kwargs):
+        return args, kwargs
+    return args + list(kwargs.values()), {}
+
+
+def _normalize(value):
+    if isinstance(value, (tuple, list)):
+        return [_normalize(item) for item in value]
+    if isinstance(value, dict):
+        return {str(key): _normalize(item) for key, item in value.items()}
+    if isinstance(value, (set, frozenset)):
+        return sorted((_normalize(item) for item in value), key=repr)
+    return value
+
+
+def _equal(actual, expected):
+    if isinstance(actual, bool) or isinstance(expected, bool):
+        return actual is expected or (type(actual) is type(expected) and actual == expected)
+    if isinstance(actual, (int, float)) and isinstance(expected, (int, float)):
+        return math.isclose(actual, expected, rel_tol=1e-6, abs_tol=1e-6)
+    if isinstance(actual, list) and isinstance(expected, list):
+        return len(actual) == len(expected) and all(_equal(a, e) for a, e in zip(actual, expected))
+    if isinstance(actual, dict) and isinstance(expected, dict):
+        return actual.keys() == expected.keys() and all(_equal(actual[k], expected[k]) for k in actual)
+    return actual == expected
+
+
+def matches(actual, expected):
+    """Whether a solution's output equals the expected output of a test case"""
+    expected = _normalize(parse_value(expected))
+    actual = _normalize(parse_value(actual) if isinstance(actual, str) and not isinstance(expected, str) else actual)
+    if _equal(actual, expected):
+        return True
+    # Fall back to comparing the printed forms without whitespace ("[0, 1]" vs "[0,1]")
+    printed = actual if isinstance(actual, str) else json.dumps(actual, default=repr)
+    wanted = expected if isinstance(expected, str) else json.dumps(expected, default=repr)
+    return "".join(printed.split()) == "".join(wanted.split())
+
+
+def _short(value):
+    text = value if isinstance(value, str) else repr(value)
+    return text if len(text) <= _MAX_REPR else text[:_MAX_REPR] + "..."
+
+
+# Python solutions
+
+def _called_names(node):
+    """Names of functions and self/cls methods called anywhere inside node"""
+    names = set()
+    for child in ast.walk(node):
+        if isinstance(child, ast.Call):
+            if isinstance(child.func, ast.Name):
+                names.add(child.func.id)
+            elif isinstance(child.func, ast.Attribute) and isinstance(child.func.value, ast.Name):
+                names.add(child.func.attr)
+    return names
+
+
+def _root(functions):
+    """The first function none of the others call (helpers are called, the entry point is not)"""
+    called = set()
+    for node in functions:
+        called |= _called_names(node) - {node.name}
+    roots = [node for node in functions if node.name not in called]
+    return (roots or functions)[0]
+
+
+def _public_functions(body):
+    return [
+        node for node in body
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef))
+        and not node.name.startswith("_") and node.name != "main"
+    ]
+
+
+def _entry_node(tree, name=None):
+    """(whether it is a Solution method, its definition) for the function to call"""
+    classes = [node for node in tree.body if isinstance(node, ast.ClassDef) and node.name == "Solution"]
+    methods = _public_functions(classes[0].body) if classes else []
+    functions = _public_functions(tree.body)
+    if name:
+        for in_class, candidates in ((True, methods), (False, functions)):
+            for node in candidates:
+                if node.name == name:
+                    return in_class, node
+        raise ValueError(f"Entry point {name!r} not found")
+    if methods:
+        return True, _root(methods)
+    if functions:
+        return False, _root(functions)
+    raise ValueError("No Solution class or top-level function to call")
+
+
+def entry_parameters(code, name=None):
+    """Parameter names of the function find_entry_point would call, read without running the code"""
+    in_class, node = _entry_node(ast.parse(code), name)
+    names = [arg.arg for arg in node.args.posonlyargs + node.args.args]
+    return names[1:] if in_class and names else names
+
+
+def find_entry_point(namespace, code, name=None):
+    """
+    The function to call: a public method of class Solution (LeetCode style), or
+    a top-level function - in both cases the first one that the others do not call
+    """
+    in_class, node = _entry_node(ast.parse(code), name)
+    if in_class:
+        return getattr(namespace["Solution"](), node.name)
+    return namespace[node.name]
+
+
+def _run_case(fn, index, case, cpu_limit, wall_limit):
+    result = {"index": index, "status": "error", "runtime_s": 0.0, "cpu_s": 0.0, "output": None, "error": None}
+    try:
+        args, kwargs = _bind(fn, *_case_arguments(case))
+    except Exception as e:
+        result["error"] = f"Could not read input: {e}"
+        return result
+
+    cpu_started, started = time.process_time(), time.perf_counter()
+    try:
+        _set_timers(cpu_limit, wall_limit)
+        try:
+            output = fn(*args, **kwargs)
+        finally:
+            _set_timers(0, 0)
+    except _CaseTimeout:
+        result["status"] = "timeout"
+    except MemoryError:
+        result["status"] = "memory"
+    except RecursionError as e:
+        result["error"] = f"RecursionError: {e}"
+    except BaseException as e:
+        result["error"] = f"{type(e).__name__}: {e}"
+    else:
+        # In-place problems ("modify nums, return nothing") are judged on their first argument
+        if output is None and args:
+            output = args[0]
+        result["output"] = _short(output)
+        # Stress inputs have no expected output; finishing within the limits is the test
+        result["status"] = "passed" if "expected" not in case or matches(output, case["expected"]) else "failed"
+    result["runtime_s"] = round(time.perf_counter() - started, 6)
+    result["cpu_s"] = round(time.process_time() - cpu_started, 6)
+    return result
+
+
+def _load_solution(request):
+    """Execute the solution code and return the function to call"""
+    namespace = {"__name__": "__solution__"}
+    exec(_PRELUDE, namespace)
+    exec(compile(request["code"], "<solution>", "exec"), namespace)
+    return find_entry_point(namespace, request["code"], request.get("entry_point"))
+
+
+def _fresh(fn):
+    """fn on a new Solution instance, with memo caches cleared - every call starts clean, as on LeetCode"""
+    owner = getattr(fn, "__self__", None)
+    if owner is not None and not isinstance(owner, type):
+        fn = getattr(type(owner)(), fn.__name__)
+    if hasattr(fn, "cache_clear"):
+        fn.cache_clear()
+    return fn
+
+
+def _python_cases(request):
+    """Yield one result per test case of a Python request"""
+    cases = request["cases"]
+    try:
+        fn = _load_solution(request)
+    except BaseException as e:
+        for index in range(len(cases)):
+            yield {"index": index, "status": "error", "runtime_s": 0.0, "cpu_s": 0.0,
+                   "output": None, "error": f"{type(e).__name__}: {e}"}
+        return
+
+    for index, case in enumerate(cases):
+        yield _run_case(_fresh(fn), index, case, request["cpu_time_limit"], request["wall_time_limit"])
+
+
+def _limit(request, cpu_seconds, address_space=True):
+    """Apply CPU and memory rlimits to the current (child) process"""
+    if resource is None:
+        return
+    cpu = max(1, math.ceil(cpu_seconds))
+    resource.setrlimit(resource.RLIMIT_CPU, (cpu, cpu + 1))
+    if address_space and request.get("memory_limit_mb"):
+        memory = request["memory_limit_mb"] * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (memory, memory))
+    resource.setrlimit(resource.RLIMIT_CORE, (0, 0))
+
+
+def _forked(request, produce, cpu_seconds, wall_seconds):
+    """
+    Run produce(request) in a forked child with the request's limits, so nothing a
+    solution does outlives the request
+
+    Returns:
+        (results the child sent, why it stopped early: None, "timeout" or "error", error message)
+    """
+    read_fd, write_fd = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        try:
+            os.close(read_fd)
+            os.setsid()
+            devnull = os.open(os.devnull, os.O_RDWR)
+            for fd in (0, 1, 2):
+                os.dup2(devnull, fd)
+            sys.stdout = sys.stderr = io.StringIO()  # prints from the solution are dropped
+            _install_timer_handlers()
+            _limit(request, cpu_seconds)
+            with os.fdopen(write_fd, "w") as out:
+                for result in produce(request):
+                    out.write(json.dumps(result) + "\n")
+                    out.flush()
+        finally:
+            os._exit(0)
+
+    os.close(write_fd)
+    deadline = time.monotonic() + wall_seconds
+    buffer = b""
+    killed = False
+    with os.fdopen(read_fd, "rb") as reader:
+        selector = selectors.DefaultSelector()
+        selector.register(reader, selectors.EVENT_READ)
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                try:
+                    os.killpg(pid, signal.SIGKILL)
+                except ProcessLookupError:
+                    pass
+                killed = True
+                break
+            if not selector.select(remaining):
+                continue
+            data = os.read(reader.fileno(), 65536)
+            if not data:
+                break
+            buffer += data
+        selector.close()
+    _, status = os.waitpid(pid, 0)
+
+    results = [json.loads(line) for line in buffer.decode("utf-8", "replace").splitlines() if line.strip()]
+    if not killed and os.WIFEXITED(status) and os.WEXITSTATUS(status) == 0:
+        return results, None, None
+    if killed or (os.WIFSIGNALED(status) and os.WTERMSIG(status) in (signal.SIGXCPU, signal.SIGKILL)):
+        return results, "timeout", None
+    return results, "error", f"Solution process exited with code {os.waitstatus_to_exitcode(status)}"
+
+
+def _inline(request, produce):
+    """Without fork everything runs here; the worker exits afterwards so it is never reused"""
+    stdout, sys.stdout = sys.stdout, io.StringIO()
+    try:
+        _install_timer_handlers()
+        return list(produce(request))
+    finally:
+        sys.stdout = stdout
+
+
+def _run_python(request):
+    cases = request["cases"]
+    if not CAN_FORK:
+        return {"cases": _inline(request, _python_cases), "recycle": True}
+
+    results, reason, error = _forked(
+        request, _python_cases,
+        cpu_seconds=request["cpu_time_limit"] * len(cases) + 1,
+        wall_seconds=request["wall_time_limit"] * max(1, len(cases)) + 5,
+    )
+    for index in range(len(results), len(cases)):
+        results.append({"index": index, "status": reason or "error", "runtime_s": 0.0, "cpu_s": 0.0,
+                        "output": None, "error": error})
+    return {"cases": results}
+
+
+# Growth profiling: the same call on inputs of increasing size
+
+def _call_limited(fn, args, cpu_limit, wall_limit):
+    """Call fn under the per-call timers; (status, error)"""
+    try:
+        _set_timers(cpu_limit, wall_limit)
+        try:
+            fn(*args)
+        finally:
+            _set_timers(0, 0)
+    except _CaseTimeout:
+        return "timeout", None
+    except MemoryError:
+        return "memory", None
+    except BaseException as e:
+        return "error", f"{type(e).__name__}: {e}"
+    return "ok", None
+
+
+def _point_arguments(point):
+    if "file" in point:
+        return load_arguments(point["file"], point["segments"])
+    return json.loads(point["args"])
+
+
+def _profile_points(request):
+    """Yield wall time (best of repeats) and peak traced memory for each input size"""
+    try:
+        fn = _load_solution(request)
+    except BaseException as e:
+        yield {"n": None, "status": "error", "error": f"{type(e).__name__}: {e}"}
+        return
+
+    cpu_limit, wall_limit = request["cpu_time_limit"], request["wall_time_limit"]
+    for point in request["inputs"]:
+        timings = []
+        for _ in range(request["repeats"]):
+            args = _point_arguments(point)  # fresh copy, the call may modify it
+            call = _fresh(fn)
+            started = time.perf_counter()
+            status, error = _call_limited(call, args, cpu_limit, wall_limit)
+            if status != "ok":
+                yield {"n": point["n"], "status": status, "error": error}
+                return
+            timings.append(time.perf_counter() - started)
+            if timings[-1] > request["size_time_budget"]:
+                break  # slow enough that noise does not matter, and this is the last size
+
+        best = min(timings)
+        if best > request["size_time_budget"]:
+            yield {"n": point["n"], "status": "ok", "time_s": round(best, 9), "peak_bytes": None}
+            return
+
+        # Memory is measured on a separate run, since tracing slows the call down
+        args = _point_arguments(point)
+        call = _fresh(fn)
+        tracemalloc.start()
+        status, _ = _call_limited(call, args, cpu_limit * 4, wall_limit * 4)
+        peak = tracemalloc.get_traced_memory()[1] if status == "ok" else None
+        tracemalloc.stop()
+        yield {"n": point["n"], "status": "ok", "time_s": round(best, 9), "peak_bytes": peak}
+
+
+def _run_profile(request):
+    if not CAN_FORK:
+        return {"points": _inline(request, _profile_points), "recycle": True}
+
+    sizes = max(1, len(request["inputs"]))
+    results, reason, error = _forked(
+        request, _profile_points,
+        cpu_seconds=request["cpu_time_limit"] * 6 * request["repeats"] * sizes + 1,
+        wall_seconds=request["wall_time_limit"] * 6 * request["repeats"] * sizes + 5,
+    )
+    if reason is not None:
+        done = {point["n"] for point in results}
+        pending = [point["n"] for point in request["inputs"] if point["n"] not in done]
+        results.append({"n": pending[0] if pending else None, "status": reason, "error": error})
+    return {"points": results}
+
+
+# Compiled and other languages: the program reads the input on stdin and prints the output
+
+def _run_program(request):
+    results = []
+    for index, case in enumerate(request["cases"]):
+        results.append(_run_program_case(index, case, request))
+    return {"cases": results}
+
+
+def _run_program_case(index, case, request):
+    result = {"index": index, "status": "error", "runtime_s": 0.0, "cpu_s": 0.0, "output": None, "error": None}
+    stdin = case.get("input")
+    if not isinstance(stdin, str):
+        stdin = json.dumps(stdin)
+    cpu_limit = request["cpu_time_limit"]
+    preexec = None
+    if resource is not None:
+        preexec = lambda: (os.setsid(), _limit(request, cpu_limit, request.get("limit_address_space", True)))
+
+    usage_before = resource.getrusage(resource.RUSAGE_CHILDREN) if resource else None
+    started = time.perf_counter()
+    try:
+        proc = subprocess.Popen(
+            request["argv"], cwd=request.get("cwd"), stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE, stderr=subprocess.PIPE, preexec_fn=preexec,
+        )
+    except OSError as e:
+        result["error"] = f"Could not start program: {e}"
+        return result
+    try:
+        stdout, stderr = proc.communicate(stdin.encode("utf-8"), timeout=request["wall_time_limit"])
+        timed_out = False
+    except subprocess.TimeoutExpired:
+        if resource is not None:
+            os.killpg(proc.pid, signal.SIGKILL)
+        else:
+            proc.kill()
+        stdout, stderr = proc.communicate()
+        timed_out = True
+    result["runtime_s"] = round(time.perf_counter() - started, 6)
+    if usage_before is not None:
+        usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+        result["cpu_s"] = round(
+            usage.ru_utime + usage.ru_stime - usage_before.ru_utime - usage_before.ru_stime, 6
+        )
+
+    killed_by = -proc.returncode if proc.returncode and proc.returncode < 0 else None
+    if timed_out or result["cpu_s"] > cpu_limit or killed_by in (getattr(signal, "SIGXCPU", None), 9):
+        result["status"] = "timeout"
+    elif proc.returncode != 0:
+        result["error"] = _short(stderr.decode("utf-8", "replace").strip()) or f"Exit status {proc.returncode}"
+    else:
+        output = stdout.decode("utf-8", "replace").strip()
+        result["output"] = _short(output)
+        result["status"] = "passed" if matches(output, case.get("expected")) else "failed"
+    return result
+
+
+def handle(request):
+    """Answer one request"""
+    if request.get("mode") == "python":
+        return _run_python(request)
+    if request.get("mode") == "profile":
+        return _run_profile(request)
+    if request.get("mode") == "program":
+        return _run_program(request)
+    if request.get("mode") == "ping":
+        return {"pong": True}
+    raise ValueError(f"Unknown request mode {request.get('mode')!r}")
+
+
+def main():
+    protocol = sys.stdout
+    sys.setrecursionlimit(10000)
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        try:
+            response = handle(json.loads(line))
+        except Exception as e:
+            response = {"error": f"{type(e).__name__}: {e}"}
+        protocol.write(json.dumps(response) + "\n")
+        protocol.flush()
+        if response.get("recycle"):
+            break
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,255 @@
+"""
+Batch processing module for Pragyan - solves whole problem lists with bounded concurrency
+"""
+
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional, Dict, Any, List, Iterable, Iterator, Union
+
+from pragyan.models import Question, Solution, ProgrammingLanguage, BatchConfig
+from pragyan.scraper import QuestionScraper
+from pragyan.webdriver_pool import WebDriverPool
+from pragyan.utils import sanitize_filename
+from pragyan import ratelimit, tracing
+
+
+@dataclass
+class BatchItem:
+    """A single problem in a batch - a URL or the problem text"""
+    source: str
+    id: str = ""
+    language: Optional[str] = None
+
+    @property
+    def is_url(self) -> bool:
+        """Whether the source is a URL to scrape"""
+        return self.source.startswith(('http://', 'https://'))
+
+
+@dataclass
+class BatchResult:
+    """Outcome of processing one batch item"""
+    item: BatchItem
+    question: Optional[Question] = None
+    analysis: Optional[Dict[str, Any]] = None
+    solution: Optional[Solution] = None
+    video_path: Optional[Path] = None
+    error: Optional[str] = None
+    failed_stage: Optional[str] = None
+    stage_times: Dict[str, float] = field(default_factory=dict)
+    elapsed: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        """Whether every stage succeeded"""
+        return self.error is None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert result to a JSON-serializable dictionary"""
+        return {
+            "id": self.item.id,
+            "input": self.item.source,
+            "status": "ok" if self.ok else "error",
+            "error": self.error,
+            "failed_stage": self.failed_stage,
+            "question": self.question.to_dict() if self.question else None,
+            "analysis": self.analysis,
+            "solution": self.solution.to_dict() if self.solution else None,
+            "video_path": str(self.video_path) if self.video_path else None,
+            "stage_times": {k: round(v, 3) for k, v in self.stage_times.items()},
+            "elapsed": round(self.elapsed, 3),
+        }
+
+
+def load_batch_items(path: Union[str, Path]) -> List[BatchItem]:
+    """
+    Read batch items from a file
+
+    Each non-empty line is either a JSON object (JSONL) with a "url", "text"
+    or "input" field plus optional "id" and "language", or a plain URL/text.
+    Lines starting with '#' are ignored.
+
+    Args:
+        path: Path to the batch file
+
+    Returns:
+        List of batch items
+    """
+    items = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line_no, line in enumerate(f, 1):
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+
+            if line.startswith('{'):
+                try:
+                    data = json.loads(line)
+                except json.JSONDecodeError as e:
+                    raise ValueError(f"Invalid JSON on line {line_no}: {e}")
+
+                source = data.get("url") or data.get("text") or data.get("input")
+                if not source:
+                    raise ValueError(f"Line {line_no} needs a 'url', 'text' or 'input' field")
+
+                items.append(BatchItem(
+                    source=source,
+                    id=str(data.get("id", line_no)),
+                    language=data.get("language"),
+                ))
+            else:
+                items.append(BatchItem(source=line, id=str(line_no)))
+
+    return items
+
+
+class BatchRunner:
+    """
+    Runs the Pragyan pipeline over many problems at once
+
+    Every item moves through scrape -> analyze -> solve -> render in a worker
+    thread. Each stage has its own concurrency limit, so slow stages (browser
+    scraping, Manim rendering) cannot starve the LLM stages and vice versa.
+    """
+
+    def __init__(self, pragyan, config: Optional[BatchConfig] = None):
+        """
+        Initialize the batch runner
+
+        Args:
+            pragyan: Configured Pragyan instance (its LLM client is shared)
+            config: Per-stage concurrency limits
+        """
+        self.pragyan = pragyan
+        self.config = config or BatchConfig()
+        self._limits = {
+            stage: threading.BoundedSemaphore(max(1, limit))
+            for stage, limit in self.config.stage_limits.items()
+        }
+
+    @contextmanager
+    def _stage(self, name: str, result: BatchResult):
+        """Hold a slot for a stage and record how long it took"""
+        with self._limits[name]:
+            result.failed_stage = name
+            start = time.perf_counter()
+            yield
+            result.stage_times[name] = time.perf_counter() - start
+            result.failed_stage = None
+
+    def run(
+        self,
+        items: Iterable[Union[str, BatchItem]],
+        language: Union[str, ProgrammingLanguage] = "python",
+        generate_video: bool = False
+    ) -> Iterator[BatchResult]:
+        """
+        Process items, yielding each result as soon as it finishes
+
+        Args:
+            items: URLs/texts or BatchItem objects
+            language: Default programming language for items without one
+            generate_video: Whether to render an explanation video per item
+
+        Yields:
+            BatchResult objects in completion order
+        """
+        batch_items = [
+            item if isinstance(item, BatchItem) else BatchItem(source=item, id=str(i))
+            for i, item in enumerate(items, 1)
+        ]
+        if not batch_items:
+            return
+
+        # One browser per scrape slot; browsers start only if a page needs one
+        driver_pool = WebDriverPool(size=self.config.scrape_concurrency)
+        scraper = QuestionScraper(driver_pool=driver_pool, cache=self.pragyan.scraper.cache)
+
+        workers = self.config.max_workers or sum(self.config.stage_limits.values())
+        pool = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="pragyan-batch")
+        futures = [
+            pool.submit(self._process_item, item, scraper, language, generate_video)
+            for item in batch_items
+        ]
+
+        try:
+            for future in as_completed(futures):
+                yield future.result()
+        finally:
+            # Stop queued items if the consumer stops early
+            for future in futures:
+                future.cancel()
+            pool.shutdown(wait=True)
+            driver_pool.close()
+
+    def _process_item(
+        self,
+        item: BatchItem,
+        scraper: QuestionScraper,
+        default_language: Union[str, ProgrammingLanguage],
+        generate_video: bool
+    ) -> BatchResult:
+        # Worker threads do not inherit the caller's context, so each item starts its own trace root
+        with tracing.span("batch.item", tracer=getattr(self.pragyan, "tracer", None), id=item.id):
+            # Batch LLM requests queue behind interactive ones when a rate limiter is shared
+            with ratelimit.priority(ratelimit.BATCH):
+                return self._run_item(item, scraper, default_language, generate_video)
+
+    def _run_item(
+        self,
+        item: BatchItem,
+        scraper: QuestionScraper,
+        default_language: Union[str, ProgrammingLanguage],
+        generate_video: bool
+    ) -> BatchResult:
+        result = BatchResult(item=item)
+        start = time.perf_counter()
+
+        language = item.language or default_language
+        if isinstance(language, str):
+            language = ProgrammingLanguage.from_string(language)
+
+        try:
+            with self._stage("scrape", result):
+                if item.is_url:
+                    result.question = scraper.scrape_url(item.source)
+                else:
+                    result.question = self.pragyan.parse_question(item.source)
+
+            with self._stage("analyze", result):
+                result.analysis = self.pragyan.analyze(result.question)
+
+            with self._stage("solve", result):
+                result.solution = self.pragyan.solve(result.question, language, result.analysis)
+
+            if generate_video:
+                with self._stage("render", result):
+                    result.video_path = self._render(result)
+        except Exception as e:
+            result.error = str(e)
+
+        result.elapsed = time.perf_counter() - start
+        return result
+
+    def _render(self, result: BatchResult) -> Optional[Path]:
+        """Render the video for one item, falling back to the simple generator"""
+        from pragyan.video_generator import VideoGenerator, SimpleVideoGenerator
+
+        output_filename = f"pragyan_{sanitize_filename(result.item.id, 50)}.mp4"
+
+        try:
+            # Video generators keep per-render temp state, so use one per item
+            generator = VideoGenerator(self.pragyan.video_config)
+            generator.set_llm_client(self.pragyan.llm)
+            return generator.generate_video(
+                result.question, result.solution, result.analysis,
+                output_filename=output_filename
+            )
+        except Exception:
+            simple = SimpleVideoGenerator(self.pragyan.video_config)
+            return simple.generate_slideshow(result.question, result.solution, result.analysis)
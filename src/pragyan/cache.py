@@ -0,0 +1,629 @@
+"""
+Cache module for Pragyan - persistent, content-addressed on-disk caches
+Lets repeated runs reuse results that were already paid for (LLM responses, etc.)
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional, Any, Dict, Iterator, Tuple
+from urllib.parse import urlparse, urlunparse, parse_qsl, urlencode
+
+from pragyan.models import LLMConfig, VideoConfig, Question
+
+
+def get_cache_dir() -> Path:
+    """Get the root directory used for all Pragyan caches"""
+    env_dir = os.environ.get("PRAGYAN_CACHE_DIR")
+    if env_dir:
+        return Path(env_dir)
+
+    xdg_dir = os.environ.get("XDG_CACHE_HOME")
+    base = Path(xdg_dir) if xdg_dir else Path.home() / ".cache"
+    return base / "pragyan"
+
+
+def make_cache_key(*parts: Any) -> str:
+    """
+    Build a stable content hash from arbitrary JSON-serializable parts
+
+    Args:
+        parts: Values that together identify the cached item
+
+    Returns:
+        Hex SHA-256 digest
+    """
+    payload = json.dumps(parts, sort_keys=True, default=str, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class CacheStats:
+    """Hit/miss counters for a cache"""
+    hits: int = 0
+    misses: int = 0
+    writes: int = 0
+    evictions: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of lookups served from the cache"""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert stats to dictionary"""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "writes": self.writes,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hit_rate, 4),
+        }
+
+
+class DiskCache:
+    """
+    Content-addressed on-disk cache with size and age based eviction
+
+    Entries are JSON files sharded by the first two hex digits of their key.
+    The file modification time marks when an entry was written (used for
+    age-based expiry) and the access time marks its last hit (used for
+    least-recently-used eviction when the cache grows past its limits).
+    """
+
+    suffix = ".json"
+
+    # Eviction scans the whole directory, so only do it every few writes
+    EVICT_INTERVAL = 32
+
+    def __init__(
+        self,
+        directory: Path,
+        max_entries: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        max_age: Optional[float] = None,
+        enabled: bool = True,
+        bypass: bool = False,
+    ):
+        """
+        Initialize the cache
+
+        Args:
+            directory: Directory holding the cache entries
+            max_entries: Maximum number of entries to keep (None = unlimited)
+            max_bytes: Maximum total size on disk in bytes (None = unlimited)
+            max_age: Maximum entry age in seconds (None = never expire)
+            enabled: Set to False to disable both reads and writes
+            bypass: Skip reads but still store fresh results (forces a refresh)
+        """
+        self.directory = Path(directory)
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.enabled = enabled and not os.environ.get("PRAGYAN_NO_CACHE")
+        self.bypass = bypass
+        self.stats = CacheStats()
+        self._lock = threading.Lock()
+        self._writes_since_evict = 0
+
+    def _path(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}{self.suffix}"
+
+    def _is_expired(self, mtime: float, now: Optional[float] = None) -> bool:
+        if self.max_age is None:
+            return False
+        return (now or time.time()) - mtime > self.max_age
+
+    def _count(self, field: str):
+        with self._lock:
+            setattr(self.stats, field, getattr(self.stats, field) + 1)
+
+    def _lookup(self, key: str) -> Optional[Path]:
+        """Path of a live entry, or None (expired entries are removed)"""
+        path = self._path(key)
+        try:
+            stat = path.stat()
+            if self._is_expired(stat.st_mtime):
+                self.delete(key)
+                return None
+
+            # Record the hit for LRU eviction without touching the write time
+            os.utime(path, (time.time(), stat.st_mtime))
+        except OSError:
+            return None
+        return path
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Look up a cached value
+
+        Args:
+            key: Cache key (see make_cache_key)
+
+        Returns:
+            The cached value, or None on a miss
+        """
+        if not self.enabled or self.bypass:
+            return None
+
+        path = self._lookup(key)
+        if path is None:
+            self._count("misses")
+            return None
+
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            self._count("misses")
+            return None
+
+        self._count("hits")
+        return entry.get("value")
+
+    def set(self, key: str, value: Any):
+        """
+        Store a value in the cache
+
+        Args:
+            key: Cache key (see make_cache_key)
+            value: JSON-serializable value
+        """
+        if not self.enabled:
+            return
+
+        try:
+            with self._atomic_write(key) as tmp_path:
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump({"key": key, "created": time.time(), "value": value}, f, ensure_ascii=False)
+        except (OSError, TypeError, ValueError):
+            return
+
+        self._count("writes")
+        self._maybe_evict()
+
+    @contextmanager
+    def _atomic_write(self, key: str) -> Iterator[Path]:
+        """
+        Yield a temp path to write the entry to, then move it into place
+
+        Writing to a temp file first means concurrent readers never see
+        partial entries.
+        """
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            yield tmp_path
+            os.replace(tmp_path, path)
+        finally:
+            if tmp_path.exists():
+                tmp_path.unlink()
+
+    def touch(self, key: str):
+        """Mark an entry as freshly written (restarts its age)"""
+        try:
+            os.utime(self._path(key), None)
+        except OSError:
+            pass
+
+    def delete(self, key: str) -> bool:
+        """Remove an entry, returning True if it existed"""
+        try:
+            self._path(key).unlink()
+            return True
+        except OSError:
+            return False
+
+    def clear(self) -> int:
+        """Remove every entry, returning how many were removed"""
+        removed = 0
+        for path in self._iter_entries():
+            try:
+                path.unlink()
+                removed += 1
+            except OSError:
+                pass
+        return removed
+
+    def _iter_entries(self) -> Iterator[Path]:
+        if not self.directory.exists():
+            return
+        for shard in self.directory.iterdir():
+            if shard.is_dir():
+                yield from shard.glob(f"*{self.suffix}")
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self._iter_entries())
+
+    def size_bytes(self) -> int:
+        """Total size of all entries on disk"""
+        total = 0
+        for path in self._iter_entries():
+            try:
+                total += path.stat().st_size
+            except OSError:
+                pass
+        return total
+
+    def _maybe_evict(self):
+        if self.max_entries is None and self.max_bytes is None and self.max_age is None:
+            return
+        with self._lock:
+            self._writes_since_evict += 1
+            if self._writes_since_evict < self.EVICT_INTERVAL:
+                return
+            self._writes_since_evict = 0
+        self.evict()
+
+    def evict(self) -> int:
+        """
+        Drop expired entries, then least-recently-used entries until the
+        cache fits within max_entries and max_bytes
+
+        Returns:
+            Number of entries removed
+        """
+        now = time.time()
+        entries = []
+        removed = 0
+
+        for path in self._iter_entries():
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            if self._is_expired(stat.st_mtime, now):
+                try:
+                    path.unlink()
+                    removed += 1
+                except OSError:
+                    pass
+                continue
+            entries.append((max(stat.st_atime, stat.st_mtime), stat.st_size, path))
+
+        # Oldest access first
+        entries.sort(key=lambda e: e[0])
+        total_bytes = sum(e[1] for e in entries)
+        count = len(entries)
+
+        for _, size, path in entries:
+            over_count = self.max_entries is not None and count > self.max_entries
+            over_bytes = self.max_bytes is not None and total_bytes > self.max_bytes
+            if not (over_count or over_bytes):
+                break
+            try:
+                path.unlink()
+            except OSError:
+                continue
+            count -= 1
+            total_bytes -= size
+            removed += 1
+
+        with self._lock:
+            self.stats.evictions += removed
+        return removed
+
+
+class ResponseCache(DiskCache):
+    """
+    Persistent cache for LLM responses
+
+    Keyed on provider, model, temperature, system prompt and prompt, so a
+    response is only reused for an identical request to the same model.
+    """
+
+    def __init__(
+        self,
+        directory: Optional[Path] = None,
+        max_entries: Optional[int] = 10000,
+        max_bytes: Optional[int] = 256 * 1024 * 1024,
+        max_age: Optional[float] = 30 * 24 * 3600,
+        enabled: bool = True,
+        bypass: bool = False,
+    ):
+        """
+        Initialize the response cache
+
+        Args:
+            directory: Cache directory (defaults to <cache dir>/llm)
+            max_entries: Maximum number of cached responses
+            max_bytes: Maximum total size on disk in bytes
+            max_age: Maximum response age in seconds (default 30 days)
+            enabled: Set to False to disable caching entirely
+            bypass: Ignore cached responses but store fresh ones
+        """
+        super().__init__(
+            directory or get_cache_dir() / "llm",
+            max_entries=max_entries,
+            max_bytes=max_bytes,
+            max_age=max_age,
+            enabled=enabled,
+            bypass=bypass,
+        )
+
+    @staticmethod
+    def key_for(
+        config: LLMConfig,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        kind: str = "text"
+    ) -> str:
+        """
+        Build the cache key for an LLM request
+
+        Args:
+            config: LLM configuration (provider, model, temperature)
+            prompt: User prompt
+            system_prompt: Optional system prompt
+            kind: Response kind ("text" or "json")
+
+        Returns:
+            Hex cache key
+        """
+        return make_cache_key(
+            kind,
+            config.provider.value,
+            config.model,
+            config.temperature,
+            config.max_tokens,
+            system_prompt or "",
+            prompt,
+        )
+
+
+class RenderCache(DiskCache):
+    """
+    Persistent cache of rendered videos
+
+    Keyed by a hash of the scene source, the scene class name and the
+    VideoConfig fields that affect the output, so byte-identical scenes
+    (template visualizers, the generic fallback scene) are only rendered once.
+    """
+
+    suffix = ".mp4"
+
+    def __init__(
+        self,
+        directory: Optional[Path] = None,
+        max_entries: Optional[int] = 500,
+        max_bytes: Optional[int] = 5 * 1024 * 1024 * 1024,
+        max_age: Optional[float] = None,
+        enabled: bool = True,
+        bypass: bool = False,
+    ):
+        """
+        Initialize the render cache
+
+        Args:
+            directory: Cache directory (defaults to <cache dir>/renders)
+            max_entries: Maximum number of cached videos
+            max_bytes: Maximum total size on disk in bytes (default 5 GB)
+            max_age: Maximum video age in seconds (None = never expire)
+            enabled: Set to False to disable caching entirely
+            bypass: Ignore cached videos but store fresh renders
+        """
+        super().__init__(
+            directory or get_cache_dir() / "renders",
+            max_entries=max_entries,
+            max_bytes=max_bytes,
+            max_age=max_age,
+            enabled=enabled,
+            bypass=bypass,
+        )
+
+    @staticmethod
+    def key_for(scene_source: str, scene_class_name: str, config: VideoConfig) -> str:
+        """
+        Build the cache key for a render
+
+        Args:
+            scene_source: Full source of the scene file
+            scene_class_name: Scene class that is rendered
+            config: Video configuration
+
+        Returns:
+            Hex cache key
+        """
+        source_hash = hashlib.sha256(scene_source.encode("utf-8")).hexdigest()
+        return make_cache_key(
+            "render",
+            source_hash,
+            scene_class_name,
+            config.video_quality,
+            config.pixel_width,
+            config.pixel_height,
+            config.fps,
+            config.background_color,
+        )
+
+    def get(self, key: str) -> Optional[Path]:
+        """
+        Look up a cached video
+
+        Args:
+            key: Cache key (see key_for)
+
+        Returns:
+            Path to the cached MP4, or None on a miss
+        """
+        if not self.enabled or self.bypass:
+            return None
+
+        path = self._lookup(key)
+        self._count("hits" if path is not None else "misses")
+        return path
+
+    def set(self, key: str, video_path: Path):
+        """
+        Copy a rendered video into the cache
+
+        Args:
+            key: Cache key (see key_for)
+            video_path: Path to the rendered MP4
+        """
+        if not self.enabled:
+            return
+
+        try:
+            with self._atomic_write(key) as tmp_path:
+                shutil.copyfile(video_path, tmp_path)
+        except OSError:
+            return
+
+        self._count("writes")
+        self._maybe_evict()
+
+
+# Hosts whose problem URLs never need the query string (?envType=..., tabs, tracking)
+_QUERYLESS_HOSTS = ("leetcode.com", "geeksforgeeks.org", "codeforces.com", "hackerrank.com")
+
+# Trailing path segments that show another tab of the same problem
+_PROBLEM_TABS = ("description", "editorial", "solutions", "submissions", "discussion")
+
+
+def normalize_url(url: str) -> str:
+    """
+    Normalize a problem URL so that links to the same problem share a cache entry
+
+    Lowercases the scheme and host, drops "www.", fragments, tracking
+    parameters and trailing slashes. For known problem sites the query string
+    and tab suffixes (/description, /editorial, ...) are dropped as well.
+
+    Args:
+        url: Problem URL
+
+    Returns:
+        Normalized URL
+    """
+    parsed = urlparse(url.strip())
+    host = parsed.netloc.lower()
+    if host.startswith("www."):
+        host = host[4:]
+
+    path = parsed.path.rstrip("/")
+    known_site = host.endswith(_QUERYLESS_HOSTS)
+    if known_site:
+        query = ""
+        segments = path.split("/")
+        while len(segments) > 3 and segments[-1].lower() in _PROBLEM_TABS:
+            segments.pop()
+        path = "/".join(segments)
+    else:
+        params = [(k, v) for k, v in parse_qsl(parsed.query) if not k.lower().startswith("utm_")]
+        query = urlencode(sorted(params))
+
+    return urlunparse(((parsed.scheme or "https").lower(), host, path, "", query, ""))
+
+
+class ScrapeCache(DiskCache):
+    """
+    Persistent cache of scraped questions
+
+    Keyed by normalized URL. Entries younger than `ttl` are served directly;
+    older entries are revalidated with ETag/Last-Modified when the page was
+    fetched over plain HTTP, and scraped again otherwise.
+    """
+
+    def __init__(
+        self,
+        directory: Optional[Path] = None,
+        ttl: float = 7 * 24 * 3600,
+        max_entries: Optional[int] = 20000,
+        max_bytes: Optional[int] = 128 * 1024 * 1024,
+        enabled: bool = True,
+        bypass: bool = False,
+    ):
+        """
+        Initialize the scrape cache
+
+        Args:
+            directory: Cache directory (defaults to <cache dir>/questions)
+            ttl: Seconds an entry is served without revalidation (default 7 days)
+            max_entries: Maximum number of cached questions
+            max_bytes: Maximum total size on disk in bytes
+            enabled: Set to False to disable caching entirely
+            bypass: Ignore cached questions but store fresh ones
+        """
+        # Stale entries are kept for revalidation, so there is no hard max_age
+        super().__init__(
+            directory or get_cache_dir() / "questions",
+            max_entries=max_entries,
+            max_bytes=max_bytes,
+            max_age=None,
+            enabled=enabled,
+            bypass=bypass,
+        )
+        self.ttl = ttl
+
+    @staticmethod
+    def key_for(url: str) -> str:
+        """Build the cache key for a problem URL"""
+        return make_cache_key("question", normalize_url(url))
+
+    def lookup(self, url: str) -> Optional[Tuple[Question, Dict[str, Any], bool]]:
+        """
+        Look up a cached question
+
+        Args:
+            url: Problem URL
+
+        Returns:
+            (question, validators, is_fresh) or None on a miss. validators holds
+            the "etag" and "last_modified" of the fetched page, if any.
+        """
+        if not self.enabled or self.bypass:
+            return None
+
+        path = self._lookup(self.key_for(url))
+        if path is None:
+            self._count("misses")
+            return None
+
+        try:
+            age = time.time() - path.stat().st_mtime
+            with open(path, "r", encoding="utf-8") as f:
+                value = json.load(f)["value"]
+            question = Question.from_dict(value["question"])
+        except (OSError, ValueError, KeyError, TypeError):
+            self._count("misses")
+            return None
+
+        # Stale entries count as misses: they cost at least a revalidation request
+        is_fresh = age <= self.ttl
+        self._count("hits" if is_fresh else "misses")
+        return question, value.get("validators") or {}, is_fresh
+
+    def store(
+        self,
+        url: str,
+        question: Question,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None
+    ):
+        """
+        Cache a scraped question
+
+        Args:
+            url: Problem URL
+            question: Scraped question
+            etag: ETag of the fetched page, for later revalidation
+            last_modified: Last-Modified of the fetched page
+        """
+        validators = {k: v for k, v in (("etag", etag), ("last_modified", last_modified)) if v}
+        self.set(self.key_for(url), {"question": question.to_dict(), "validators": validators})
+
+    def refresh(self, url: str):
+        """Mark a revalidated entry as fresh again"""
+        self.touch(self.key_for(url))
+
+    def invalidate(self, url: str) -> bool:
+        """Forget a cached question, returning True if it was cached"""
+        return self.delete(self.key_for(url))
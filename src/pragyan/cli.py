@@ -7,20 +7,64 @@ from pathlib import Path
 from typing import Optional
 
 import click
-from rich.console import Console
-from rich.panel import Panel
-from rich.progress import Progress, SpinnerColumn, TextColumn
-from rich.syntax import Syntax
-from rich.markdown import Markdown
-from rich.table import Table
-from rich.prompt import Prompt, Confirm
 
-from pragyan.models import ProgrammingLanguage, VideoConfig
-from pragyan.main import Pragyan
-from pragyan.logger import get_logger, PragyanLogger
+from pragyan.models import ProgrammingLanguage, VideoConfig, BatchConfig, RateLimitConfig
 
 
-console = Console()
+class _LazyConsole:
+    """Creates the rich Console on first use so that rich is only imported when output is printed"""
+    
+    _console = None
+    
+    def __getattr__(self, name):
+        if _LazyConsole._console is None:
+            from rich.console import Console
+            _LazyConsole._console = Console()
+        return getattr(_LazyConsole._console, name)
+    
+    # Special methods are looked up on the type, not through __getattr__ (rich's Live uses "with console")
+    def __enter__(self):
+        return self.__getattr__("__enter__")()
+    
+    def __exit__(self, *exc):
+        return self.__getattr__("__exit__")(*exc)
+
+
+console = _LazyConsole()
+
+
+class _CodeStreamPrinter:
+    """Prints the solution code line by line while the LLM response streams in"""
+    
+    def __init__(self, language: str):
+        self.language = language
+        self.code = ""
+        self.printed = 0
+    
+    def __call__(self, parser):
+        """on_progress callback: print the code lines completed by the latest chunk"""
+        code = parser.get("code")
+        if code is None:
+            code = parser.get("solution.code")
+        if not isinstance(code, str):
+            return
+        self.code = code
+        self._print_lines(code.split("\n")[:-1])
+    
+    def finish(self):
+        """Print the last line once the response has ended"""
+        self._print_lines(self.code.split("\n"))
+        if self.printed:
+            console.rule(style="dim")
+    
+    def _print_lines(self, lines):
+        from rich.syntax import Syntax
+        
+        if self.printed == 0 and lines:
+            console.rule(f"[bold green]Solution ({self.language}) - streaming[/bold green]", style="dim")
+        for line in lines[self.printed:]:
+            console.print(Syntax(line, self.language, theme="monokai", background_color="default"))
+        self.printed = max(self.printed, len(lines))
 
 
 def print_banner():
@@ -38,11 +82,14 @@ def print_banner():
 ║        AI-Powered DSA Solver with Video Explanations          ║
 ╚═══════════════════════════════════════════════════════════════╝
     """
-    console.print(banner, style="bold cyan")
+    # Plain click output, so quick commands that show the banner do not load rich
+    click.echo(click.style(banner, fg="cyan", bold=True))
 
 
 def get_language_choice() -> ProgrammingLanguage:
     """Interactive language selection"""
+    from rich.table import Table
+    from rich.prompt import Prompt
     languages = [
         ("1", "Python", ProgrammingLanguage.PYTHON),
         ("2", "Java", ProgrammingLanguage.JAVA),
@@ -80,6 +127,7 @@ def get_language_choice() -> ProgrammingLanguage:
 
 def get_api_key() -> tuple:
     """Get API key from user"""
+    from rich.prompt import Prompt
     console.print("\n[bold yellow]API Key Configuration:[/bold yellow]\n")
     console.print("  [1] Gemini API Key (Google AI)")
     console.print("  [2] Groq API Key (Free tier available)")
@@ -104,6 +152,7 @@ def get_api_key() -> tuple:
 
 def get_question_input() -> tuple:
     """Get question input from user"""
+    from rich.prompt import Prompt
     console.print("\n[bold yellow]Question Input:[/bold yellow]\n")
     console.print("  [1] Enter a LeetCode/Problem URL")
     console.print("  [2] Type/Paste the problem text")
@@ -148,7 +197,16 @@ def cli():
 @click.option('--no-video', is_flag=True, help='Skip video generation')
 @click.option('--output-dir', '-o', type=click.Path(), help='Output directory for video')
 @click.option('--quality', '-q', type=click.Choice(['low', 'medium', 'high']), default='medium', help='Video quality')
-def solve(url, text, language, provider, api_key, no_video, output_dir, quality):
+@click.option('--cache', 'use_cache', is_flag=True, help='Reuse cached questions and LLM responses from earlier runs')
+@click.option('--refresh-cache', is_flag=True, help='Ignore cached questions and LLM responses but store fresh ones')
+@click.option('--strategy', type=click.Choice(['sequential', 'speculative', 'fused']), default='sequential',
+              help='Run analysis and solving one after another, at the same time, or as one request')
+@click.option('--timings', is_flag=True, help='Show how long each stage and LLM call took')
+@click.option('--trace', 'trace_file', type=click.Path(dir_okay=False),
+              help='Write a trace of every stage (.json = Chrome trace format, otherwise JSONL)')
+@click.option('--stream/--no-stream', default=True, help='Show the solution code while it is being generated')
+def solve(url, text, language, provider, api_key, no_video, output_dir, quality, use_cache, refresh_cache, strategy,
+          timings, trace_file, stream):
     """
     Solve a DSA problem and generate an explanation video
     
@@ -156,6 +214,12 @@ def solve(url, text, language, provider, api_key, no_video, output_dir, quality)
         pragyan solve -u https://leetcode.com/problems/two-sum
         pragyan solve -t "Given an array, find two numbers that add up to target"
     """
+    from rich.panel import Panel
+    from rich.progress import Progress, SpinnerColumn, TextColumn
+    from rich.syntax import Syntax
+    from pragyan.main import Pragyan
+    from pragyan.cache import ResponseCache, ScrapeCache
+    from pragyan.tracing import Tracer
     print_banner()
     
     # Get inputs interactively if not provided
@@ -189,10 +253,15 @@ def solve(url, text, language, provider, api_key, no_video, output_dir, quality)
         try:
             # Create Pragyan instance
             task = progress.add_task("Initializing Pragyan...", total=None)
+            response_cache = ResponseCache(bypass=refresh_cache) if use_cache or refresh_cache else None
+            scrape_cache = ScrapeCache(bypass=refresh_cache) if use_cache or refresh_cache else None
             pragyan = Pragyan(
                 provider=provider,
                 api_key=api_key,
-                video_config=video_config
+                video_config=video_config,
+                cache=response_cache,
+                scrape_cache=scrape_cache,
+                tracer=Tracer() if timings or trace_file else None
             )
             progress.update(task, description="[green]✓ Initialized[/green]")
             
@@ -206,14 +275,21 @@ def solve(url, text, language, provider, api_key, no_video, output_dir, quality)
             
             progress.update(task, description=f"[green]✓ Question loaded: {question.title[:50]}...[/green]")
             
-            # Analyze
-            progress.update(task, description="Analyzing question...")
-            analysis = pragyan.analyze(question)
-            progress.update(task, description="[green]✓ Analysis complete[/green]")
-            
-            # Generate solution
-            progress.update(task, description=f"Generating {lang.value} solution...")
-            solution = pragyan.solve(question, lang, analysis)
+            printer = _CodeStreamPrinter(lang.value) if stream else None
+            if strategy == "sequential":
+                # Analyze
+                progress.update(task, description="Analyzing question...")
+                analysis = pragyan.analyze(question)
+                progress.update(task, description="[green]✓ Analysis complete[/green]")
+                
+                # Generate solution
+                progress.update(task, description=f"Generating {lang.value} solution...")
+                solution = pragyan.solve(question, lang, analysis, on_progress=printer)
+            else:
+                progress.update(task, description=f"Analyzing and generating {lang.value} solution...")
+                solution, analysis = pragyan.solve_complete(question, lang, strategy, on_progress=printer)
+            if printer is not None:
+                printer.finish()
             progress.update(task, description="[green]✓ Solution generated[/green]")
             
             # Generate video
@@ -291,6 +367,100 @@ def solve(url, text, language, provider, api_key, no_video, output_dir, quality)
             title="[bold magenta]Generated Video[/bold magenta]",
             border_style="magenta"
         ))
+    
+    # Timings
+    if pragyan.tracer is not None:
+        from pragyan.logger import get_logger
+        console.print("\n")
+        get_logger(verbose=True).log_trace_summary(pragyan.tracer)
+        if trace_file:
+            console.print(f"[dim]Trace written to {pragyan.tracer.export(trace_file)}[/dim]")
+
+
+@cli.command()
+@click.argument('input_file', type=click.Path(exists=True, dir_okay=False))
+@click.option('--output', '-o', type=click.Path(dir_okay=False), default='pragyan_results.jsonl', help='JSONL file for per-item results')
+@click.option('--language', '-l', default='python', help='Default programming language')
+@click.option('--provider', '-p', type=click.Choice(['gemini', 'groq']), required=True, help='LLM provider')
+@click.option('--api-key', '-k', envvar='PRAGYAN_API_KEY', required=True, help='API key for the provider')
+@click.option('--video', is_flag=True, help='Also render an explanation video per problem')
+@click.option('--quality', '-q', type=click.Choice(['low', 'medium', 'high']), default='low', help='Video quality')
+@click.option('--scrape-concurrency', type=int, default=4, show_default=True, help='Pages scraped at once')
+@click.option('--analyze-concurrency', type=int, default=8, show_default=True, help='Analysis requests at once')
+@click.option('--solve-concurrency', type=int, default=8, show_default=True, help='Solution requests at once')
+@click.option('--render-concurrency', type=int, default=1, show_default=True, help='Videos rendered at once')
+@click.option('--cache', 'use_cache', is_flag=True, help='Reuse cached questions and LLM responses from earlier runs')
+@click.option('--rpm', type=int, help="Stay under this many requests per minute (your plan's rate limit)")
+@click.option('--tpm', type=int, help='Stay under this many tokens per minute')
+def batch(input_file, output, language, provider, api_key, video, quality, scrape_concurrency,
+          analyze_concurrency, solve_concurrency, render_concurrency, use_cache, rpm, tpm):
+    """
+    Solve every problem listed in a file
+    
+    INPUT_FILE has one URL or problem text per line, or JSONL objects with
+    "url"/"text", optional "id" and "language". Each result is written to
+    the output file as soon as its problem finishes.
+    
+    Example:
+        pragyan batch problems.txt -p groq -o results.jsonl --solve-concurrency 16
+    """
+    import json
+    from rich.progress import Progress, SpinnerColumn, TextColumn
+    from pragyan.main import Pragyan
+    from pragyan.batch import load_batch_items
+    from pragyan.cache import ResponseCache, ScrapeCache
+    from pragyan.ratelimit import RateLimiter
+    
+    items = load_batch_items(input_file)
+    if not items:
+        console.print("[yellow]No problems found in input file[/yellow]")
+        return
+    
+    batch_config = BatchConfig(
+        scrape_concurrency=scrape_concurrency,
+        analyze_concurrency=analyze_concurrency,
+        solve_concurrency=solve_concurrency,
+        render_concurrency=render_concurrency,
+    )
+    
+    pragyan = Pragyan(
+        provider=provider,
+        api_key=api_key,
+        video_config=VideoConfig(video_quality=f"{quality}_quality"),
+        cache=ResponseCache() if use_cache else None,
+        scrape_cache=ScrapeCache() if use_cache else None,
+        rate_limiter=RateLimiter({
+            provider: RateLimitConfig(requests_per_minute=rpm, tokens_per_minute=tpm)
+        }) if rpm or tpm else None,
+    )
+    
+    succeeded = 0
+    failed = 0
+    
+    with open(output, "w", encoding="utf-8") as out, Progress(
+        SpinnerColumn(),
+        TextColumn("[progress.description]{task.description}"),
+        console=console,
+    ) as progress:
+        task = progress.add_task(f"Solving {len(items)} problems...", total=len(items))
+        
+        for result in pragyan.process_batch(items, language, generate_video=video, batch_config=batch_config):
+            out.write(json.dumps(result.to_dict(), ensure_ascii=False) + "\n")
+            out.flush()
+            
+            if result.ok:
+                succeeded += 1
+            else:
+                failed += 1
+                progress.console.print(f"[red]✗ {result.item.id}: {result.failed_stage} failed: {result.error}[/red]")
+            
+            progress.update(
+                task,
+                advance=1,
+                description=f"Solved {succeeded + failed}/{len(items)} ([green]{succeeded} ok[/green], [red]{failed} failed[/red])"
+            )
+    
+    console.print(f"\n[bold green]✓ Results written to {output}[/bold green]")
 
 
 @cli.command()
@@ -304,6 +474,9 @@ def analyze(url, provider, api_key):
     Example:
         pragyan analyze https://leetcode.com/problems/two-sum -p gemini -k YOUR_KEY
     """
+    from rich.panel import Panel
+    from rich.progress import Progress, SpinnerColumn, TextColumn
+    from pragyan.main import Pragyan
     print_banner()
     
     with Progress(
@@ -342,11 +515,174 @@ def analyze(url, provider, api_key):
         ))
 
 
+# Bar colours for approaches in the runtime chart, in order
+_CHART_COLORS = ["cyan", "magenta", "green", "yellow", "blue", "red"]
+
+
+def _format_seconds(seconds: float) -> str:
+    if seconds >= 1:
+        return f"{seconds:.2f} s"
+    if seconds >= 1e-3:
+        return f"{seconds * 1e3:.1f} ms"
+    return f"{seconds * 1e6:.0f} µs"
+
+
+def _format_bytes(size: Optional[int]) -> str:
+    if size is None:
+        return "-"
+    for unit in ("B", "KB", "MB"):
+        if size < 1024:
+            return f"{size:.0f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GB"
+
+
+def _runtime_chart(benchmark: dict, width: int = 40, max_rows: int = 6) -> list:
+    """
+    Log-scale bar chart of measured runtimes: for each input size one bar per approach
+    
+    Args:
+        benchmark: ApproachTable.to_dict()
+        width: Characters in the longest bar
+        max_rows: Sizes shown (evenly spread, always including the largest)
+        
+    Returns:
+        Lines with rich markup
+    """
+    import math
+    
+    approaches = benchmark.get("approaches", [])
+    sizes = benchmark.get("sizes", [])
+    times = [{point["n"]: point["time_s"] for point in approach["points"]} for approach in approaches]
+    measured = [t for row in times for t in row.values() if t > 0]
+    if not measured or not sizes:
+        return []
+    if len(sizes) > max_rows:
+        step = (len(sizes) - 1) / (max_rows - 1)
+        sizes = [sizes[round(i * step)] for i in range(max_rows)]
+    low, high = math.log10(min(measured)), math.log10(max(measured))
+    name_width = max(len(approach["name"]) for approach in approaches)
+    
+    lines = []
+    for n in sizes:
+        lines.append(f"[bold]n = {n:,}[/bold]")
+        for index, (approach, row) in enumerate(zip(approaches, times)):
+            color = _CHART_COLORS[index % len(_CHART_COLORS)]
+            label = approach["name"].ljust(name_width)
+            if n not in row:
+                lines.append(f"  {label}  [dim]not run ({approach.get('stopped') or approach.get('status')})[/dim]")
+                continue
+            share = (math.log10(max(row[n], 1e-12)) - low) / (high - low) if high > low else 1.0
+            bar = "█" * max(1, round(1 + share * (width - 1)))
+            lines.append(f"  {label}  [{color}]{bar}[/{color}] {_format_seconds(row[n])}")
+    return lines
+
+
+def _print_benchmark(benchmark: dict):
+    """Measured-vs-claimed table and runtime chart for compare --benchmark"""
+    from rich.panel import Panel
+    from rich.table import Table
+    
+    table = Table(title="Measured on the same inputs")
+    for column in ("Approach", "Time: claimed / measured", "Space: claimed / measured",
+                   "Largest n", "Runtime", "Peak memory", "Verdict"):
+        table.add_column(column)
+    for approach in benchmark.get("approaches", []):
+        last = approach["points"][-1] if approach["points"] else None
+        if approach["status"] != "ok":
+            verdict = f"[red]{approach['status']}: {approach.get('error') or ''}[/red]"
+        elif approach["would_tle"]:
+            verdict = f"[red]TLE at {approach['max_size']:,}[/red]" if approach.get("max_size") else "[red]TLE[/red]"
+        elif approach["time_mismatch"]:
+            verdict = "[yellow]claim does not match[/yellow]"
+        else:
+            verdict = "[green]ok[/green]"
+        table.add_row(
+            approach["name"],
+            f"{approach['claimed_time'] or '?'} / {approach['measured_time'] or '?'}",
+            f"{approach['claimed_space'] or '?'} / {approach['measured_space'] or '?'}",
+            f"{last['n']:,}" if last else "-",
+            _format_seconds(last["time_s"]) if last else "-",
+            _format_bytes(last["peak_bytes"]) if last else "-",
+            verdict,
+        )
+    console.print(table)
+    
+    chart = _runtime_chart(benchmark)
+    if chart:
+        console.print(Panel("\n".join(chart), title="[bold blue]Runtime (log scale)[/bold blue]", border_style="blue"))
+    if benchmark.get("fastest"):
+        console.print(f"[bold green]Fastest measured:[/bold green] {benchmark['fastest']}")
+
+
+@cli.command()
+@click.argument('url')
+@click.option('--provider', '-p', type=click.Choice(['gemini', 'groq']), required=True)
+@click.option('--api-key', '-k', envvar='PRAGYAN_API_KEY', required=True)
+@click.option('--benchmark/--no-benchmark', default=True, show_default=True,
+              help='Run every approach on the same inputs and chart the measured runtimes')
+@click.option('--max-size', type=int, help='Largest input size to run (default: the constraint limit)')
+@click.option('--json', 'json_file', type=click.Path(dir_okay=False), help='Also write the comparison to this JSON file')
+def compare(url, provider, api_key, benchmark, max_size, json_file):
+    """
+    Compare approaches to a DSA problem, measured head-to-head
+    
+    Example:
+        pragyan compare https://leetcode.com/problems/two-sum -p gemini -k YOUR_KEY
+    """
+    import json
+    from rich.progress import Progress, SpinnerColumn, TextColumn
+    from rich.table import Table
+    from pragyan.main import Pragyan
+    from pragyan.models import ProfileConfig
+    print_banner()
+    
+    config = ProfileConfig(max_size=max_size) if max_size else ProfileConfig()
+    with Progress(
+        SpinnerColumn(),
+        TextColumn("[progress.description]{task.description}"),
+        console=console,
+    ) as progress:
+        task = progress.add_task("Comparing approaches...", total=None)
+        
+        pragyan = Pragyan(provider=provider, api_key=api_key)
+        question = pragyan.scrape_question(url)
+        if benchmark:
+            progress.update(task, description="Generating and benchmarking approaches...")
+        result = pragyan.compare_approaches(question, benchmark=benchmark, config=config)
+        
+        progress.update(task, description="[green]✓ Comparison complete[/green]")
+    
+    table = Table(title=f"Approaches: {question.title}")
+    for column in ("Approach", "Time", "Space", "Best for"):
+        table.add_column(column)
+    for approach in result.get("approaches", []):
+        table.add_row(approach.get("name", "?"), approach.get("time_complexity", "?"),
+                      approach.get("space_complexity", "?"), approach.get("best_for", ""))
+    console.print("\n")
+    console.print(table)
+    if result.get("recommended"):
+        console.print(f"[bold]Recommended:[/bold] {result['recommended']} - {result.get('recommendation_reason', '')}")
+    
+    if result.get("benchmark"):
+        console.print("\n")
+        _print_benchmark(result["benchmark"])
+    
+    if json_file:
+        Path(json_file).write_text(json.dumps(result, indent=2), encoding="utf-8")
+        console.print(f"\n[bold green]✓ Comparison written to {json_file}[/bold green]")
+
+
 @cli.command()
 def interactive():
     """
     Start interactive mode with step-by-step prompts
     """
+    from rich.panel import Panel
+    from rich.syntax import Syntax
+    from rich.prompt import Prompt, Confirm
+    from pragyan.main import Pragyan
+    from pragyan.logger import get_logger
     print_banner()
     
     console.print("\n[bold cyan]Welcome to Pragyan Interactive Mode![/bold cyan]\n")
@@ -411,7 +747,9 @@ def interactive():
         
         # Generate solution
         logger.log_solving_start(language.value)
-        solution = pragyan.solve(question, language, analysis)
+        printer = _CodeStreamPrinter(language.value)
+        solution = pragyan.solve(question, language, analysis, on_progress=printer)
+        printer.finish()
         logger.log_solution_generated(solution)
         
         # Log step by step
@@ -476,11 +814,7 @@ def languages():
     """List all supported programming languages"""
     print_banner()
     
-    console.print("\n[bold cyan]Supported Programming Languages:[/bold cyan]\n")
-    
-    table = Table(show_header=True, header_style="bold magenta")
-    table.add_column("Language", style="cyan")
-    table.add_column("Aliases", style="dim")
+    click.echo(click.style("\nSupported Programming Languages:\n", fg="cyan", bold=True))
     
     langs = [
         ("Python", "python, py"),
@@ -496,19 +830,76 @@ def languages():
         ("C#", "csharp, c#, cs"),
     ]
     
+    # Plain aligned columns: importing rich.table alone costs more than the 100 ms budget
+    width = max(len(name) for name, _ in langs) + 2
+    click.echo(click.style(f"  {'Language':<{width}}Aliases", fg="magenta", bold=True))
     for name, aliases in langs:
-        table.add_row(name, aliases)
+        click.echo(f"  {click.style(f'{name:<{width}}', fg='cyan')}{click.style(aliases, dim=True)}")
+
+
+@cli.group()
+def cache():
+    """Inspect or clear the on-disk caches"""
+    pass
+
+
+@cache.command(name="stats")
+def cache_stats():
+    """Show cache location, entry count and size"""
+    from rich.table import Table
+    from pragyan.cache import ResponseCache, RenderCache, ScrapeCache
+    caches = [
+        ("Scraped questions", ScrapeCache()),
+        ("LLM responses", ResponseCache()),
+        ("Rendered videos", RenderCache()),
+    ]
+    
+    table = Table(show_header=True, header_style="bold magenta")
+    table.add_column("Cache", style="cyan")
+    table.add_column("Location", style="dim")
+    table.add_column("Entries", justify="right")
+    table.add_column("Size", justify="right")
+    
+    for name, disk_cache in caches:
+        size_mb = disk_cache.size_bytes() / (1024 * 1024)
+        table.add_row(name, str(disk_cache.directory), str(len(disk_cache)), f"{size_mb:.1f} MB")
     
     console.print(table)
 
 
+@cache.command(name="clear")
+def cache_clear():
+    """Delete all cached entries"""
+    from pragyan.cache import ResponseCache, RenderCache, ScrapeCache
+    removed = ScrapeCache().clear()
+    console.print(f"[green]✓ Removed {removed} cached questions[/green]")
+    removed = ResponseCache().clear()
+    console.print(f"[green]✓ Removed {removed} cached LLM responses[/green]")
+    removed = RenderCache().clear()
+    console.print(f"[green]✓ Removed {removed} cached videos[/green]")
+
+
+@cache.command(name="invalidate")
+@click.argument('urls', nargs=-1, required=True)
+def cache_invalidate(urls):
+    """Forget cached questions for URLS so they are scraped again"""
+    from pragyan.cache import ScrapeCache
+    scrape_cache = ScrapeCache()
+    for url in urls:
+        if scrape_cache.invalidate(url):
+            console.print(f"[green]✓ Invalidated {url}[/green]")
+        else:
+            console.print(f"[yellow]Not cached: {url}[/yellow]")
+
+
 @cli.command()
 def version():
     """Show version information"""
     from pragyan import __version__
     
-    console.print(f"\n[bold cyan]Pragyan[/bold cyan] version [bold]{__version__}[/bold]")
-    console.print("[dim]AI-Powered DSA Question Solver with Video Explanations[/dim]\n")
+    # Plain click output keeps this command from loading rich
+    click.echo(f"\n{click.style('Pragyan', fg='cyan', bold=True)} version {click.style(__version__, bold=True)}")
+    click.echo(click.style("AI-Powered DSA Question Solver with Video Explanations", dim=True) + "\n")
 
 
 def main():
@@ -0,0 +1,399 @@
+"""
+Constraint parsing for Pragyan - turns problem constraints into typed bounds and inputs
+Reads lines such as "2 <= nums.length <= 10^4" and builds arguments of a chosen size from them
+"""
+
+import ast
+import math
+import operator
+import random
+import re
+import string
+from dataclasses import dataclass, field
+from typing import Optional, Dict, Any, List, Iterable, Union
+
+
+Number = Union[int, float]
+
+_COMPARISON = re.compile(r"\s*(<=|>=|==|≤|≥|<|>|=)\s*")
+_SUPERSCRIPTS = str.maketrans("⁰¹²³⁴⁵⁶⁷⁸⁹⁻", "0123456789-")
+# "10<sup>4</sup>" loses its markup when scraped and reads "104"; "2<sup>31</sup>" reads "231"
+_STRIPPED_POWER = re.compile(r"(?<![\d.^*])(10)([1-9])(?![\d.])|(?<![\d.^*])(2)(31|32|63)(?![\d.])")
+_LENGTH = re.compile(r"^(?:len\((\w+)\)|(\w+)\s*\.\s*(?:length|size\(\)|len\(\)|count))$")
+_ELEMENT = re.compile(r"^(\w+)\s*((?:\[\s*\w+\s*\])+)(?:\s*\.\s*(?:length|size\(\)))?$")
+_NAME = re.compile(r"^[A-Za-z_]\w*$")
+
+_CHARSETS = [
+    (re.compile(r"lower\s*-?\s*case", re.I), string.ascii_lowercase),
+    (re.compile(r"upper\s*-?\s*case", re.I), string.ascii_uppercase),
+    (re.compile(r"\bdigits?\b", re.I), string.digits),
+    (re.compile(r"(?<!case )english letters", re.I), string.ascii_letters),
+    (re.compile(r"'0'\s*(?:and|or|,)\s*'1'|\bbinary\b", re.I), "01"),
+    (re.compile(r"parenthes[ie]s|brackets|'\('", re.I), "()"),
+]
+# Parameters that are strings even when no constraint says what they consist of
+_STRING_NAMES = {"s", "t", "p", "word", "text", "pattern", "str", "string", "sentence", "digits", "num1", "num2"}
+
+_OPERATORS = {
+    ast.Add: operator.add, ast.Sub: operator.sub, ast.Mult: operator.mul,
+    ast.Pow: operator.pow, ast.USub: operator.neg, ast.UAdd: operator.pos,
+}
+
+
+def _arithmetic(node: ast.AST) -> Number:
+    if isinstance(node, ast.Constant) and isinstance(node.value, (int, float)):
+        return node.value
+    if isinstance(node, ast.BinOp) and type(node.op) in _OPERATORS:
+        return _OPERATORS[type(node.op)](_arithmetic(node.left), _arithmetic(node.right))
+    if isinstance(node, ast.UnaryOp) and type(node.op) in _OPERATORS:
+        return _OPERATORS[type(node.op)](_arithmetic(node.operand))
+    raise ValueError("Not a number")
+
+
+def parse_number(text: str) -> Optional[Number]:
+    """
+    Value of a bound such as "10^4", "2 * 10^5", "-2^31", "10⁹ + 7" or "1e5"
+
+    Returns:
+        The number, or None if text is not numeric (e.g. "nums.length")
+    """
+    text = text.strip().translate(_SUPERSCRIPTS).replace("−", "-").replace("×", "*")
+    text = re.sub(r"(?<=\d),(?=\d{3}\b)", "", text)
+    text = _STRIPPED_POWER.sub(lambda m: f"{m.group(1)}^{m.group(2)}" if m.group(1) else f"2^{m.group(4)}", text)
+    text = re.sub(r"(?<=\d)\s*[xX]\s*(?=\d)", "*", text).replace("^", "**")
+    try:
+        value = _arithmetic(ast.parse(text, mode="eval").body)
+    except (SyntaxError, ValueError, TypeError, OverflowError):
+        return None
+    return int(value) if isinstance(value, float) and value.is_integer() and "." not in text else value
+
+
+@dataclass
+class Bound:
+    """One parsed constraint: low <= subject <= high"""
+    subject: str  # "nums.length", "nums[i]", "n", ...
+    low: Optional[Number] = None
+    high: Optional[Number] = None
+    high_ref: Optional[str] = None  # Upper bound given by another subject, e.g. "nums.length"
+    text: str = ""
+
+    @property
+    def variable(self) -> str:
+        """Name of the parameter the bound is about"""
+        return re.match(r"\w+", self.subject).group(0)
+
+    @property
+    def kind(self) -> str:
+        """What is bounded: "length" (of an array or string), "element" (its items) or "value" (a scalar)"""
+        match = _ELEMENT.match(self.subject)
+        if match:
+            return "length" if self.subject.rstrip().endswith(("length", "size()")) else "element"
+        return "length" if _LENGTH.match(self.subject) else "value"
+
+    @property
+    def depth(self) -> int:
+        """Indexing depth: 0 for nums / nums.length, 1 for nums[i] / grid[i].length, 2 for grid[i][j]"""
+        return self.subject.count("[")
+
+
+def _subject(text: str) -> str:
+    """Canonical form of a constraint subject: "len(nums)" -> "nums.length" """
+    text = re.sub(r"\s+", "", text)
+    match = _LENGTH.match(text)
+    if match:
+        return f"{match.group(1) or match.group(2)}.length"
+    text = re.sub(r"\.(?:size\(\)|len\(\)|count)$", ".length", text)
+    return text
+
+
+def parse_constraint(text: str) -> List[Bound]:
+    """
+    Bounds stated by one constraint line
+
+    Handles chains ("1 <= m, n <= 200"), one-sided bounds ("n >= 1"),
+    equalities ("m == grid.length") and scraped powers ("10<sup>4</sup>" -> "104").
+
+    Args:
+        text: One constraint, e.g. "2 <= nums.length <= 10^4"
+
+    Returns:
+        One Bound per subject; empty when the line states no bounds
+    """
+    cleaned = text.translate(_SUPERSCRIPTS).replace("&lt;", "<").replace("&gt;", ">").strip().rstrip(".")
+    parts = _COMPARISON.split(cleaned)
+    if len(parts) < 3:
+        return []
+
+    operands, operators = parts[0::2], parts[1::2]
+    bounds: Dict[str, Bound] = {}
+    for index, operand in enumerate(operands):
+        if parse_number(operand) is not None:
+            continue
+        for name in (piece.strip() for piece in operand.split(",")):
+            subject = _subject(name)
+            if not subject or not re.match(r"\w", subject):
+                continue
+            bound = bounds.setdefault(subject, Bound(subject=subject, text=text.strip()))
+            if index > 0:
+                _apply(bound, operands[index - 1], operators[index - 1], side="left")
+            if index + 1 < len(operands):
+                _apply(bound, operands[index + 1], operators[index], side="right")
+    # "m == grid.length" names a size instead of bounding it (see Constraints.aliases)
+    return [b for b in bounds.values() if (b.low, b.high, b.high_ref) != (None, None, None)]
+
+
+def _apply(bound: Bound, other: str, op: str, side: str):
+    """Record "other op subject" (side="left") or "subject op other" (side="right") on bound"""
+    value = parse_number(other)
+    if op in ("==", "="):
+        if value is not None:
+            bound.low = bound.high = value
+        return
+    # Normalize to "subject <= other" (upper) or "other <= subject" (lower)
+    upper = (op in ("<=", "≤", "<")) == (side == "right")
+    strict = op in ("<", ">")
+    if value is None:
+        if upper:
+            bound.high_ref = _subject(other)
+        return
+    if isinstance(value, int) and strict:
+        value = value - 1 if upper else value + 1
+    if upper:
+        bound.high = value
+    else:
+        bound.low = value
+
+
+@dataclass
+class Constraints:
+    """All bounds and character sets stated for a problem"""
+    bounds: List[Bound] = field(default_factory=list)
+    charsets: Dict[str, str] = field(default_factory=dict)  # variable -> allowed characters
+    aliases: Dict[str, str] = field(default_factory=dict)  # "m" -> "grid.length" from "m == grid.length"
+
+    @classmethod
+    def parse(cls, lines: Iterable[str]) -> "Constraints":
+        """
+        Parse constraint lines as returned by QuestionScraper._extract_constraints
+
+        Args:
+            lines: Question.constraints
+
+        Returns:
+            Constraints with every bound that could be read
+        """
+        constraints = cls()
+        for line in lines:
+            for bound in parse_constraint(line):
+                constraints.bounds.append(bound)
+            constraints._read_alias(line)
+            constraints._read_charset(line)
+        return constraints
+
+    def _read_alias(self, line: str):
+        match = re.match(r"^\s*(\w+)\s*==?\s*([\w.\[\]()]+)\s*$", line)
+        if match and parse_number(match.group(2)) is None:
+            self.aliases[match.group(1)] = _subject(match.group(2))
+            self.aliases[_subject(match.group(2))] = match.group(1)
+
+    def _read_charset(self, line: str):
+        match = re.match(r"^\s*([\w\s,]+?)\s+(?:consists?|contains?|is made up|only contains?|are)\b(.*)$", line, re.I)
+        if not match:
+            return
+        characters = "".join(chars for pattern, chars in _CHARSETS if pattern.search(match.group(2)))
+        for name in re.split(r"\s*(?:,|\band\b)\s*", match.group(1).strip()):
+            if _NAME.match(name) and characters:
+                self.charsets[name] = "".join(dict.fromkeys(characters))
+
+    def find(self, subject: str) -> Optional[Bound]:
+        """The bound on subject (or on its alias), if one was stated"""
+        for candidate in (subject, self.aliases.get(subject)):
+            for bound in self.bounds:
+                if bound.subject == candidate:
+                    return bound
+        return None
+
+    def length(self, name: str, depth: int = 0) -> Optional[Bound]:
+        """Bound on the length of name (depth 1: of each name[i])"""
+        return self.find(name + "[i]" * depth + ".length") or self.find(f"{name}[0]" * depth + ".length")
+
+    def element(self, name: str) -> Optional[Bound]:
+        """Bound on the innermost items of name"""
+        candidates = [b for b in self.bounds if b.variable == name and b.kind == "element"]
+        return max(candidates, key=lambda b: b.depth) if candidates else None
+
+    def value(self, name: str) -> Optional[Bound]:
+        """Bound on a scalar parameter"""
+        return self.find(name)
+
+    def shape(self, name: str) -> str:
+        """How a parameter is built: "int", "list", "grid", "str" or "str_list" """
+        element = self.element(name)
+        if self.length(name, depth=1) or (element is not None and element.depth >= 2) or self.aliases.get(f"{name}[i].length"):
+            return "str_list" if name in self.charsets and element is None else "grid"
+        if name in self.charsets or name in _STRING_NAMES:
+            return "str" if self.length(name) is None or element is None else "list"
+        if self.length(name) is not None or element is not None:
+            return "list"
+        if name.endswith("s") and len(name) > 2 and self.value(name) is None:
+            return "list"  # nums, prices, heights, ...
+        return "int"
+
+    def max_size(self, name: str) -> Optional[int]:
+        """Largest total size (length, or cells of a grid) constraints allow for name"""
+        shape = self.shape(name)
+        if shape == "int":
+            bound = self.value(name)
+            return int(bound.high) if bound and bound.high is not None else None
+        rows = self.length(name)
+        if rows is None or rows.high is None:
+            return None
+        if shape in ("grid", "str_list"):
+            cols = self.length(name, depth=1)
+            return int(rows.high) * int(cols.high) if cols and cols.high is not None else None
+        return int(rows.high)
+
+    def size_parameter(self, parameters: List[str]) -> tuple:
+        """
+        The parameter that grows with the input size, and the largest size allowed for it
+
+        The first array, string or grid parameter; when there is none, the
+        first scalar with a stated bound (n in "1 <= n <= 45").
+
+        Returns:
+            (name, max_size), either of which may be None
+        """
+        sized = [name for name in parameters if self.shape(name) != "int"]
+        if not sized:
+            sized = [name for name in parameters if self.value(name) is not None] or parameters[:1]
+        if not sized:
+            return None, None
+        limits = [limit for limit in (self.max_size(name) for name in sized) if limit]
+        return sized[0], min(limits) if limits else None
+
+
+def _clamp(bound: Optional[Bound], default_low: Number, default_high: Number, size: int) -> tuple:
+    low = default_low if bound is None or bound.low is None else bound.low
+    high = default_high if bound is None or bound.high is None else bound.high
+    if bound is not None and bound.high is None and bound.high_ref is not None:
+        high = size  # e.g. "1 <= k <= nums.length"
+    return low, max(low, high)
+
+
+# Element orders for synthesize_arguments; every order but "random" is a worst case for some algorithm
+ORDERS = ("random", "sorted", "reversed", "equal", "distinct", "pipe_organ", "deep")
+# Two-column grids with these names are edge lists, whose deepest shape is a path
+_EDGE_NAMES = {"edges", "connections", "prerequisites", "roads", "pairs", "times", "flights"}
+
+
+def _arrange(values: List[Any], order: str, top: Any) -> List[Any]:
+    """values put in order ("distinct" and "deep" are drawn distinct beforehand)"""
+    if order in ("sorted", "deep"):
+        return sorted(values)
+    if order == "reversed":
+        return sorted(values, reverse=True)
+    if order == "equal":
+        return [top] * len(values)
+    if order == "pipe_organ":
+        values = sorted(values)
+        return values[0::2] + values[1::2][::-1]  # rises to the middle, then falls
+    return values
+
+
+def _draw_values(low: Number, high: Number, count: int, order: str, rng: random.Random) -> List[Number]:
+    if isinstance(low, float) or isinstance(high, float):
+        return [rng.uniform(low, high) for _ in range(count)]
+    low, high = int(low), int(high)
+    if order in ("distinct", "deep") and high - low + 1 >= count:
+        return rng.sample(range(low, high + 1), count)
+    return [rng.randint(low, high) for _ in range(count)]
+
+
+def _draw_text(alphabet: str, count: int, order: str, rng: random.Random) -> str:
+    if order in ("equal", "deep"):
+        return alphabet[0] * count  # "aaaa...": every substring is a palindrome, every prefix matches
+    if order == "distinct":
+        return "".join(alphabet[i % len(alphabet)] for i in range(count))
+    return "".join(_arrange([rng.choice(alphabet) for _ in range(count)], order, alphabet[-1]))
+
+
+def _grid_sides(constraints: Constraints, name: str, size: int) -> tuple:
+    """(rows, cols) with about size cells, square unless the row length is capped"""
+    cols = max(1, math.isqrt(size))
+    bound = constraints.length(name, depth=1)
+    if bound is not None and bound.high is not None and bound.high < cols:
+        cols = max(1, int(bound.high))
+    return max(1, size // cols), cols
+
+
+def synthesize_arguments(
+    parameters: List[str],
+    constraints: Constraints,
+    size: int,
+    rng: Optional[random.Random] = None,
+    order: str = "random"
+) -> List[Any]:
+    """
+    Arguments where every array, string or grid has size total elements
+
+    When no parameter is an array or string, the first integer parameter with
+    an upper bound is set to size instead (e.g. n for "1 <= n <= 45").
+
+    Orders other than "random" build worst cases: "sorted", "reversed" and
+    "pipe_organ" (rising then falling) arrays, "equal" (every element the
+    maximum, every character the same), "distinct" (no repeated values) and
+    "deep" - shapes that maximize recursion depth: strictly increasing arrays,
+    grids that are one connected region, edge lists that form a single path.
+    Other scalars take their upper bound in every order but "random".
+
+    Args:
+        parameters: Parameter names of the solution's entry point
+        constraints: Parsed problem constraints
+        size: Length of each array/string (cells of a grid)
+        rng: Random source (seed it for repeatable inputs)
+        order: One of ORDERS
+
+    Returns:
+        One value per parameter
+    """
+    if order not in ORDERS:
+        raise ValueError(f"Unknown order {order!r}; expected one of {', '.join(ORDERS)}")
+    rng = rng or random.Random(0)
+    shapes = {name: constraints.shape(name) for name in parameters}
+    sized_scalar = None
+    if all(shape == "int" for shape in shapes.values()):
+        sized_scalar = next((name for name in parameters if constraints.value(name) is not None), parameters[0] if parameters else None)
+
+    arguments = []
+    for name in parameters:
+        shape = shapes[name]
+        if name == sized_scalar:
+            arguments.append(size)
+            continue
+        if shape == "int":
+            low, high = _clamp(constraints.value(name), 0, size, size)
+            high = min(high, 10**18)
+            arguments.append(rng.randint(int(low), int(high)) if order == "random" else int(high))
+        elif shape == "str":
+            alphabet = constraints.charsets.get(name, string.ascii_lowercase)
+            arguments.append(_draw_text(alphabet, size, order, rng))
+        elif shape == "str_list":
+            rows, cols = _grid_sides(constraints, name, size)
+            alphabet = constraints.charsets.get(name, string.ascii_lowercase)
+            arguments.append(_arrange([_draw_text(alphabet, cols, order, rng) for _ in range(rows)], order, alphabet[0] * cols))
+        else:
+            element = constraints.element(name)
+            low, high = _clamp(element, -10**4, 10**4, size)
+            if shape == "grid":
+                rows, cols = _grid_sides(constraints, name, size)
+                if order == "deep" and cols == 2 and name in _EDGE_NAMES:
+                    start = int(element.low) if element is not None and element.low is not None else 0
+                    arguments.append([[start + i, start + i + 1] for i in range(rows)])
+                    continue
+                cells = _arrange(_draw_values(low, high, rows * cols, order, rng), order, high)
+                if order == "deep":
+                    cells = [high] * len(cells)  # one region covering the whole grid
+                arguments.append([cells[r * cols:(r + 1) * cols] for r in range(rows)])
+            else:
+                arguments.append(_arrange(_draw_values(low, high, size, order, rng), order, high))
+    return arguments
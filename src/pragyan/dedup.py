@@ -0,0 +1,148 @@
+"""
+Code deduplication for Pragyan - trims repeated blocks from LLM-generated code
+Runs in a single pass so long or badly repeated outputs stay cheap to clean
+"""
+
+from typing import List, Dict
+
+
+# A repeat must span this many consecutive non-blank lines...
+MIN_BLOCK_LINES = 4
+# ...with at least this many non-whitespace characters, so runs of "}" or "pass" don't count
+MIN_BLOCK_CHARS = 60
+# Outputs shorter than this are returned unchanged
+MIN_CODE_LINES = 10
+
+_HASH_BASE = 1_000_003
+_HASH_MOD = (1 << 61) - 1
+
+_OPENERS = "{[("
+_CLOSERS = "}])"
+_ENDINGS = ("return", "true", "false", "none", "null", "}")
+
+
+class _Prefix:
+    """Running totals that make the completeness check O(1) for any prefix"""
+
+    def __init__(self, lines: List[str], rows: List[int]):
+        self.lines = lines
+        self.rows = rows
+        # Bracket balance before each line (index len(lines) = whole text)
+        self.balance = [0] * (len(lines) + 1)
+        for i, line in enumerate(lines):
+            opens = sum(line.count(c) for c in _OPENERS)
+            closes = sum(line.count(c) for c in _CLOSERS)
+            self.balance[i + 1] = self.balance[i] + opens - closes
+
+    def is_complete(self, count: int) -> bool:
+        """
+        Whether the first `count` non-blank lines look like complete code
+
+        Brackets balanced within 2, at least 5 lines, and either a typical
+        last line (return, closing brace...) or at least 10 lines.
+        """
+        if count < 5:
+            return False
+        end = self.rows[count - 1] + 1
+        if abs(self.balance[end]) > 2:
+            return False
+        tail = " ".join(self.lines[row] for row in self.rows[max(0, count - 3):count]).lower()
+        if any(ending in tail for ending in _ENDINGS):
+            return True
+        return count >= 10
+
+
+def _block_hashes(ids: List[int], k: int) -> List[int]:
+    """Polynomial rolling hash of every k-line window of interned line ids"""
+    if len(ids) < k:
+        return []
+    top = pow(_HASH_BASE, k - 1, _HASH_MOD)
+    value = 0
+    for line_id in ids[:k]:
+        value = (value * _HASH_BASE + line_id) % _HASH_MOD
+    hashes = [value]
+    for i in range(k, len(ids)):
+        value = ((value - ids[i - k] * top) * _HASH_BASE + ids[i]) % _HASH_MOD
+        hashes.append(value)
+    return hashes
+
+
+def find_repeat(code: str) -> int:
+    """
+    Line index where the first repeated block starts, or -1
+
+    A block is MIN_BLOCK_LINES consecutive non-blank lines (compared after
+    stripping) that already occurred, without overlap, earlier in the code.
+    Only repeats whose preceding code is complete count, so repeated
+    fragments inside an unfinished solution are kept.
+
+    Args:
+        code: Generated code
+
+    Returns:
+        0-based line index to cut at, or -1 if nothing repeats
+    """
+    lines = code.split("\n")
+    rows = [i for i, line in enumerate(lines) if line.strip()]
+    if len(rows) < MIN_BLOCK_LINES * 2:
+        return -1
+
+    # Intern stripped lines so windows compare as small integers
+    interned: Dict[str, int] = {}
+    ids = []
+    sizes = []
+    for row in rows:
+        stripped = lines[row].strip()
+        ids.append(interned.setdefault(stripped, len(interned) + 1))
+        sizes.append(len("".join(stripped.split())))
+
+    k = MIN_BLOCK_LINES
+    window_chars = [sum(sizes[:k])]
+    for i in range(k, len(sizes)):
+        window_chars.append(window_chars[-1] - sizes[i - k] + sizes[i])
+
+    prefix = _Prefix(lines, rows)
+    first_seen: Dict[int, List[int]] = {}
+
+    for start, block_hash in enumerate(_block_hashes(ids, k)):
+        if window_chars[start] >= MIN_BLOCK_CHARS:
+            earlier = first_seen.get(block_hash)
+            if earlier is not None:
+                # Hash equality is verified, so collisions can't cut code
+                match = next(
+                    (j for j in earlier if start - j >= k and ids[j:j + k] == ids[start:start + k]),
+                    None
+                )
+                if match is not None and prefix.is_complete(start):
+                    return rows[start]
+            bucket = first_seen.setdefault(block_hash, [])
+            if len(bucket) < 2:
+                bucket.append(start)
+    return -1
+
+
+def deduplicate_code(code: str) -> str:
+    """
+    Remove accidentally duplicated code blocks from an LLM response
+
+    Handles a solution pasted twice, a partial restart after the full
+    solution, and sliding window repetition (the tail repeated again and
+    again from a later start each time). Runs in O(n) in the code length.
+
+    Args:
+        code: Generated code
+
+    Returns:
+        Code up to the first repeated block
+    """
+    if not code:
+        return code
+
+    lines = code.split("\n")
+    if len(lines) < MIN_CODE_LINES:
+        return code
+
+    cut = find_repeat(code)
+    if cut < 0:
+        return code
+    return "\n".join(lines[:cut]).rstrip()
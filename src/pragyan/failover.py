@@ -0,0 +1,285 @@
+"""
+Provider failover for Pragyan - retries, falls back and hedges across LLM providers
+Keeps the pipeline moving when one provider is slow, rate limited or down
+"""
+
+import math
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Optional, Dict, Any, List, Iterator, Tuple, TYPE_CHECKING
+
+from pragyan.models import LLMConfig, FailoverConfig
+from pragyan.llm_client import BaseLLMClient, create_client
+from pragyan import tracing
+
+if TYPE_CHECKING:
+    from pragyan.ratelimit import RateLimiter
+
+
+# HTTP statuses where asking the same provider again cannot help
+_PERMANENT_STATUSES = (400, 401, 403, 404)
+
+
+def _status(error: BaseException) -> Optional[int]:
+    """HTTP status of a provider SDK error (groq: status_code, google: code)"""
+    for attr in ("status_code", "code"):
+        value = getattr(error, attr, None)
+        if isinstance(value, int):
+            return value
+    return None
+
+
+def is_rate_limit(error: BaseException) -> bool:
+    """Whether a provider error means the request was rate limited"""
+    name = type(error).__name__
+    return _status(error) == 429 or "RateLimit" in name or "ResourceExhausted" in name
+
+
+def _retry_after(error: BaseException) -> Optional[float]:
+    """Seconds from a Retry-After header on the error's response, if any"""
+    headers = getattr(getattr(error, "response", None), "headers", None)
+    if not headers:
+        return None
+    try:
+        return float(headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
+
+
+class _AllFailed(Exception):
+    """Both legs of a hedged request failed (errors are already recorded)"""
+
+
+class _Slot:
+    """One provider entry with its client, recent latencies and rate-limit cooldown"""
+
+    def __init__(self, config: LLMConfig, rate_limiter: Optional["RateLimiter"] = None):
+        self.config = config
+        self.rate_limiter = rate_limiter
+        self.name = f"{config.provider.value}:{config.model}"
+        self.latencies: deque = deque(maxlen=100)
+        self.cooldown_until = 0.0
+        self._client: Optional[BaseLLMClient] = None
+        self._lock = threading.Lock()
+
+    @property
+    def client(self) -> BaseLLMClient:
+        # Built on first use, so a missing SDK only fails over instead of failing construction
+        with self._lock:
+            if self._client is None:
+                client = create_client(self.config)
+                if self.rate_limiter is not None:
+                    from pragyan.ratelimit import RateLimitedClient
+                    client = RateLimitedClient(client, self.rate_limiter)
+                self._client = client
+            return self._client
+
+    def percentile(self, fraction: float) -> Optional[float]:
+        """Latency at this percentile of recent successful requests"""
+        samples = sorted(self.latencies)
+        if not samples:
+            return None
+        return samples[min(len(samples) - 1, max(0, math.ceil(fraction * len(samples)) - 1))]
+
+
+class FailoverClient(BaseLLMClient):
+    """
+    Provider client that spreads one request over an ordered list of providers
+
+    Each provider is tried in turn. Transient errors are retried on the same
+    provider with exponential backoff and full jitter; rate limits and
+    permanent errors (bad key, unknown model) move straight to the next one,
+    and a rate-limited provider is tried last until its cooldown ends. With
+    hedging on, the next provider is also asked once the first has taken
+    longer than its usual (p95) latency, and whichever answers first wins.
+
+    Example:
+        >>> llm = LLMClient("gemini", GEMINI_KEY, fallbacks=[
+        ...     LLMConfig(provider=LLMProvider.GROQ, api_key=GROQ_KEY),
+        ... ], failover=FailoverConfig(hedge=True))
+    """
+
+    def __init__(
+        self,
+        configs: List[LLMConfig],
+        failover: Optional[FailoverConfig] = None,
+        seed: Optional[int] = None,
+        rate_limiter: Optional["RateLimiter"] = None
+    ):
+        """
+        Initialize the failover client
+
+        Args:
+            configs: Providers in order of preference
+            failover: Retry, failover and hedging policy
+            seed: Optional seed for the backoff jitter
+            rate_limiter: Optional RateLimiter applied to each provider's own budget
+        """
+        if not configs:
+            raise ValueError("At least one provider is required")
+        super().__init__(configs[0])
+        self.failover = failover or FailoverConfig()
+        self.slots = [_Slot(config, rate_limiter) for config in configs]
+        self._random = random.Random(seed)
+
+    def generate(self, prompt: str, system_prompt: Optional[str] = None) -> str:
+        """Generate a response from the first provider that answers"""
+        return self._call("generate", prompt, system_prompt)
+
+    def generate_json(self, prompt: str, system_prompt: Optional[str] = None) -> Dict[str, Any]:
+        """Generate a JSON response from the first provider that answers"""
+        return self._call("generate_json", prompt, system_prompt)
+
+    def generate_stream(self, prompt: str, system_prompt: Optional[str] = None) -> Iterator[str]:
+        """Stream from the first provider that starts answering (no failover after the first chunk)"""
+        return self._stream("generate_stream", prompt, system_prompt)
+
+    def generate_json_stream(self, prompt: str, system_prompt: Optional[str] = None) -> Iterator[str]:
+        """Stream JSON from the first provider that starts answering"""
+        return self._stream("generate_json_stream", prompt, system_prompt)
+
+    def stats(self) -> List[Dict[str, Any]]:
+        """Per-provider request count, p50/p95 latency and remaining cooldown"""
+        now = time.monotonic()
+        return [{
+            "provider": slot.name,
+            "requests": len(slot.latencies),
+            "p50": slot.percentile(0.5),
+            "p95": slot.percentile(0.95),
+            "cooldown": max(0.0, slot.cooldown_until - now),
+        } for slot in self.slots]
+
+    # Scheduling
+
+    def _ordered_slots(self) -> List[_Slot]:
+        """Providers in preference order, rate-limited ones last"""
+        now = time.monotonic()
+        ready = [slot for slot in self.slots if slot.cooldown_until <= now]
+        return ready + [slot for slot in self.slots if slot.cooldown_until > now]
+
+    def _hedge_delay(self, slot: _Slot) -> Optional[float]:
+        if self.failover.hedge_delay is not None:
+            return self.failover.hedge_delay
+        if len(slot.latencies) < self.failover.hedge_min_samples:
+            return None
+        return slot.percentile(self.failover.hedge_percentile)
+
+    def _call(self, method: str, prompt: str, system_prompt: Optional[str]) -> Any:
+        slots = self._ordered_slots()
+        errors: List[Tuple[str, BaseException]] = []
+
+        if self.failover.hedge and len(slots) > 1:
+            delay = self._hedge_delay(slots[0])
+            if delay is not None:
+                try:
+                    return self._hedged(slots[0], slots[1], delay, method, prompt, system_prompt, errors)
+                except _AllFailed:
+                    slots = slots[2:]
+
+        for slot in slots:
+            try:
+                result = self._with_retries(slot, method, prompt, system_prompt)
+            except Exception as e:
+                errors.append((slot.name, e))
+                continue
+            tracing.annotate(served_by=slot.name, failovers=len(errors))
+            return result
+        raise self._exhausted(errors)
+
+    def _hedged(
+        self,
+        primary: _Slot,
+        backup: _Slot,
+        delay: float,
+        method: str,
+        prompt: str,
+        system_prompt: Optional[str],
+        errors: List[Tuple[str, BaseException]]
+    ) -> Any:
+        """Ask primary, and backup too if primary takes longer than delay; first success wins"""
+        pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="pragyan-hedge")
+        run = tracing.propagate(self._with_retries)
+        try:
+            pending = {pool.submit(run, primary, method, prompt, system_prompt): primary}
+            done, _ = wait(pending, timeout=delay)
+            hedged = not done
+            if hedged or next(iter(done)).exception() is not None:
+                pending[pool.submit(run, backup, method, prompt, system_prompt)] = backup
+
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    slot = pending.pop(future)
+                    error = future.exception()
+                    if error is None:
+                        tracing.annotate(served_by=slot.name, failovers=len(errors), hedged=hedged)
+                        return future.result()
+                    errors.append((slot.name, error))
+            raise _AllFailed()
+        finally:
+            # The slower request is left to finish in the background; its result is dropped
+            pool.shutdown(wait=False)
+
+    def _with_retries(self, slot: _Slot, method: str, prompt: str, system_prompt: Optional[str]) -> Any:
+        attempt = 0
+        while True:
+            started = time.perf_counter()
+            try:
+                result = getattr(slot.client, method)(prompt, system_prompt)
+            except Exception as e:
+                if not self._should_retry(slot, e, attempt):
+                    raise
+                backoff = min(self.failover.backoff_max, self.failover.backoff_base * 2 ** attempt)
+                time.sleep(self._random.uniform(0, backoff))
+                attempt += 1
+                continue
+            slot.latencies.append(time.perf_counter() - started)
+            return result
+
+    def _note_rate_limit(self, slot: _Slot, error: BaseException) -> bool:
+        """Put a rate-limited provider on cooldown; True if error was a rate limit"""
+        if not is_rate_limit(error):
+            return False
+        cooldown = _retry_after(error)
+        slot.cooldown_until = time.monotonic() + (
+            self.failover.rate_limit_cooldown if cooldown is None else cooldown
+        )
+        return True
+
+    def _should_retry(self, slot: _Slot, error: BaseException, attempt: int) -> bool:
+        """Whether the same provider gets another attempt after error"""
+        if self._note_rate_limit(slot, error):
+            return False
+        if isinstance(error, ImportError) or _status(error) in _PERMANENT_STATUSES:
+            return False
+        return attempt < self.failover.max_retries
+
+    def _stream(self, method: str, prompt: str, system_prompt: Optional[str]) -> Iterator[str]:
+        errors: List[Tuple[str, BaseException]] = []
+        for slot in self._ordered_slots():
+            started = time.perf_counter()
+            try:
+                chunks = iter(getattr(slot.client, method)(prompt, system_prompt))
+                first = next(chunks, None)
+            except Exception as e:
+                self._note_rate_limit(slot, e)
+                errors.append((slot.name, e))
+                continue
+
+            tracing.annotate(served_by=slot.name, failovers=len(errors))
+            if first is not None:
+                yield first
+                yield from chunks
+            slot.latencies.append(time.perf_counter() - started)
+            return
+        raise self._exhausted(errors)
+
+    @staticmethod
+    def _exhausted(errors: List[Tuple[str, BaseException]]) -> RuntimeError:
+        summary = "; ".join(f"{name}: {type(e).__name__}: {e}" for name, e in errors)
+        error = RuntimeError(f"All LLM providers failed ({summary})")
+        error.__cause__ = errors[-1][1] if errors else None
+        return error
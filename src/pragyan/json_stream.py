@@ -0,0 +1,412 @@
+"""
+Streaming JSON parser for Pragyan - reads LLM JSON responses chunk by chunk
+Yields fields such as "code" or "solution.step_by_step" as soon as each one is complete
+"""
+
+import json
+import re
+from typing import Any, Iterable, Iterator, List, Optional, Tuple
+
+
+_PREAMBLE, _VALUE, _KEY, _COLON, _AFTER_VALUE, _STRING, _LITERAL, _DONE = range(8)
+
+# Characters that end a run of plain string content
+_STRING_SPECIAL = re.compile(r'["\\\x00-\x1f]')
+# Characters of true/false/null and numbers (plus Python's True/False/None)
+_LITERAL_CHARS = re.compile(r'[A-Za-z0-9+\-.]*')
+_INTEGER = re.compile(r'-?\d+')
+
+_ESCAPES = {'"': '"', "\\": "\\", "/": "/", "b": "\b", "f": "\f", "n": "\n", "r": "\r", "t": "\t"}
+_LITERALS = {"true": True, "false": False, "null": None, "True": True, "False": False, "None": None}
+
+_MISSING = object()
+# C decoder for complete responses; strict=False accepts raw control characters in strings
+_DECODER = json.JSONDecoder(strict=False)
+
+
+def _is_fence(text: str) -> bool:
+    """Whether text is only whitespace and an opening ```json fence"""
+    return text.strip().strip("`").strip().lower() in ("", "json")
+
+
+class JSONStreamParser:
+    """
+    Incremental, fault-tolerant JSON parser for model output
+
+    Feed it chunks as they arrive from the provider. It skips any preamble
+    and ```json fences before the first object, accepts raw newlines, tabs and
+    other control characters inside strings, keeps unknown escapes such as
+    "\\d" literally, tolerates trailing commas and ignores anything after the
+    closing brace. Every character is looked at once.
+
+    Example:
+        >>> parser = JSONStreamParser()
+        >>> for chunk in chunks:
+        ...     for path, value in parser.feed(chunk):
+        ...         print(path, value)  # "code", "solution.step_by_step", ...
+        >>> result = parser.close()
+    """
+
+    def __init__(self, max_depth: int = 2):
+        """
+        Initialize the parser
+
+        Args:
+            max_depth: Deepest object nesting whose completed fields are reported
+                (1 = top-level keys, 2 = also "solution.code" style keys)
+        """
+        self.max_depth = max_depth
+        self._state = _PREAMBLE
+        self._preamble = ""
+        # One [container, current key] frame per open object/array
+        self._stack: List[list] = []
+        self._string: List[str] = []
+        self._string_is_key = False
+        self._literal: List[str] = []
+        self._carry = ""  # escape sequence split across chunks
+        self._root: Any = _MISSING
+        self._events: List[Tuple[str, Any]] = []
+
+    @property
+    def done(self) -> bool:
+        """Whether the outermost value has been closed"""
+        return self._state == _DONE
+
+    def feed(self, chunk: str) -> List[Tuple[str, Any]]:
+        """
+        Consume the next chunk of the response
+
+        Args:
+            chunk: Text as received from the provider
+
+        Returns:
+            (dotted path, value) for every field completed by this chunk
+
+        Raises:
+            ValueError: If the text cannot be JSON
+        """
+        self._events = []
+        data = self._carry + chunk
+        self._carry = ""
+        i, n = 0, len(data)
+
+        while i < n and self._state != _DONE:
+            state = self._state
+            if state == _STRING:
+                i = self._read_string(data, i)
+                continue
+            if state == _LITERAL:
+                i = self._read_literal(data, i)
+                continue
+            if state == _PREAMBLE:
+                i = self._read_preamble(data, i)
+                continue
+
+            c = data[i]
+            i += 1
+            if c <= " ":
+                continue
+
+            if state == _VALUE:
+                if c == "{" or c == "[":
+                    self._open(c)
+                elif c == '"':
+                    self._start_string(is_key=False)
+                elif c == "]" and self._stack and isinstance(self._stack[-1][0], list):
+                    self._close()  # empty array or trailing comma
+                else:
+                    self._literal = [c]
+                    self._state = _LITERAL
+            elif state == _KEY:
+                if c == '"':
+                    self._start_string(is_key=True)
+                elif c == "}":
+                    self._close()  # empty object or trailing comma
+                else:
+                    raise ValueError(f"Expected a key, found {c!r}")
+            elif state == _COLON:
+                if c != ":":
+                    raise ValueError(f"Expected ':', found {c!r}")
+                self._state = _VALUE
+            elif state == _AFTER_VALUE:
+                if c == ",":
+                    self._state = _KEY if isinstance(self._stack[-1][0], dict) else _VALUE
+                elif c == "}" or c == "]":
+                    if (c == "}") != isinstance(self._stack[-1][0], dict):
+                        raise ValueError(f"Mismatched {c!r}")
+                    self._close()
+                else:
+                    raise ValueError(f"Expected ',' or a closing bracket, found {c!r}")
+
+        return self._events
+
+    def close(self) -> Any:
+        """
+        Finish parsing once the response has ended
+
+        Returns:
+            The parsed value
+
+        Raises:
+            ValueError: If the response ended before the JSON did
+        """
+        if self._state == _LITERAL:
+            self._finish_literal()
+        if self._root is _MISSING:
+            if self._state == _PREAMBLE:
+                raise ValueError("No JSON object found")
+            raise ValueError("Response ended before the JSON was complete")
+        return self._root
+
+    def partial(self) -> Optional[Tuple[str, str]]:
+        """
+        The string value being read right now, for showing it as it streams
+
+        Returns:
+            (dotted path, text so far), or None when not inside a string field
+        """
+        if self._state != _STRING or self._string_is_key:
+            return None
+        path = self._path()
+        if path is None:
+            return None
+        text = "".join(self._string)
+        self._string = [text]
+        return path, text
+
+    def get(self, path: str, default: Any = None) -> Any:
+        """
+        Current value of a field: complete, or the text so far for a string being read
+
+        Args:
+            path: Dotted key path, e.g. "code" or "solution.code"
+            default: Returned while the field has not started
+
+        Returns:
+            The field's value so far
+        """
+        current = self.partial()
+        if current is not None and current[0] == path:
+            return current[1]
+
+        stack = self._stack
+        value: Any = self._root if self._root is not _MISSING else (stack[0][0] if stack else None)
+        for depth, key in enumerate(path.split(".")):
+            if isinstance(value, dict) and key in value:
+                value = value[key]
+            elif depth + 1 < len(stack) and stack[depth][0] is value and stack[depth][1] == key:
+                # Open objects are only attached to their parent once they close
+                value = stack[depth + 1][0]
+            else:
+                return default
+        return value
+
+    # Internals
+
+    def _path(self) -> Optional[str]:
+        """Dotted key path to the value being built, if every parent is an object"""
+        if not all(isinstance(frame[0], dict) for frame in self._stack):
+            return None
+        return ".".join(frame[1] for frame in self._stack)
+
+    def _read_preamble(self, data: str, i: int) -> int:
+        brace = data.find("{", i)
+        bracket = data.find("[", i)
+        # A top-level array is only accepted when nothing but a code fence precedes it,
+        # otherwise "[" in a sentence before the object would be mistaken for JSON
+        if bracket != -1 and (brace == -1 or bracket < brace) and self._blank_preamble(data[i:bracket]):
+            start = bracket
+        elif brace != -1:
+            start = brace
+        else:
+            self._note_preamble(data[i:])
+            return len(data)
+        self._open(data[start])
+        return start + 1
+
+    def _note_preamble(self, text: str):
+        if len(self._preamble) <= 32:
+            self._preamble += text[:33]
+
+    def _blank_preamble(self, text: str) -> bool:
+        self._note_preamble(text)
+        return len(self._preamble) <= 32 and _is_fence(self._preamble)
+
+    def _open(self, opener: str):
+        self._stack.append([{} if opener == "{" else [], None])
+        self._state = _KEY if opener == "{" else _VALUE
+
+    def _close(self):
+        container, _ = self._stack.pop()
+        self._add_value(container)
+
+    def _add_value(self, value: Any):
+        if not self._stack:
+            self._root = value
+            self._state = _DONE
+            return
+
+        frame = self._stack[-1]
+        container = frame[0]
+        if isinstance(container, dict):
+            container[frame[1]] = value
+            if len(self._stack) <= self.max_depth:
+                path = self._path()
+                if path is not None:
+                    self._events.append((path, value))
+        else:
+            container.append(value)
+        self._state = _AFTER_VALUE
+
+    def _start_string(self, is_key: bool):
+        self._string = []
+        self._string_is_key = is_key
+        self._state = _STRING
+
+    def _finish_string(self):
+        text = "".join(self._string)
+        self._string = []
+        if self._string_is_key:
+            self._stack[-1][1] = text
+            self._state = _COLON
+        else:
+            self._add_value(text)
+
+    def _read_string(self, data: str, i: int) -> int:
+        n = len(data)
+        parts = self._string
+        while True:
+            match = _STRING_SPECIAL.search(data, i)
+            if match is None:
+                parts.append(data[i:])
+                return n
+
+            pos = match.start()
+            if pos > i:
+                parts.append(data[i:pos])
+            c = data[pos]
+
+            if c == '"':
+                self._finish_string()
+                return pos + 1
+
+            if c != "\\":
+                # Raw control character inside a string - keep it as the model meant it
+                parts.append(c)
+                i = pos + 1
+                continue
+
+            if pos + 1 >= n:
+                self._carry = data[pos:]
+                return n
+            escape = data[pos + 1]
+            if escape in _ESCAPES:
+                parts.append(_ESCAPES[escape])
+                i = pos + 2
+            elif escape == "u":
+                char, i = self._read_unicode_escape(data, pos)
+                if char is None:
+                    self._carry = data[pos:]
+                    return n
+                parts.append(char)
+            else:
+                # Unknown escape such as \d in a regex - keep it literally
+                parts.append("\\" + escape)
+                i = pos + 2
+
+    @staticmethod
+    def _read_unicode_escape(data: str, pos: int) -> Tuple[Optional[str], int]:
+        """Decode \\uXXXX (and a following low surrogate) at pos; (None, pos) if cut off"""
+        hex_digits = data[pos + 2:pos + 6]
+        if len(hex_digits) < 4:
+            return None, pos
+        try:
+            code = int(hex_digits, 16)
+        except ValueError:
+            return "\\u", pos + 2
+
+        if 0xD800 <= code < 0xDC00:
+            following = data[pos + 6:pos + 12]
+            if len(following) < 6 and "\\u".startswith(following[:2]):
+                return None, pos
+            if following.startswith("\\u"):
+                try:
+                    low = int(following[2:], 16)
+                except ValueError:
+                    low = 0
+                if 0xDC00 <= low < 0xE000:
+                    return chr(0x10000 + ((code - 0xD800) << 10) + (low - 0xDC00)), pos + 12
+        return chr(code), pos + 6
+
+    def _read_literal(self, data: str, i: int) -> int:
+        match = _LITERAL_CHARS.match(data, i)
+        end = match.end()
+        self._literal.append(data[i:end])
+        if end == len(data):
+            return end  # token may continue in the next chunk
+        self._finish_literal()
+        return end
+
+    def _finish_literal(self):
+        token = "".join(self._literal)
+        self._literal = []
+        if token in _LITERALS:
+            value = _LITERALS[token]
+        elif _INTEGER.fullmatch(token):
+            value = int(token)
+        else:
+            try:
+                value = float(token)
+            except ValueError:
+                raise ValueError(f"Unexpected token {token!r}")
+        self._add_value(value)
+
+
+def iter_json_fields(chunks: Iterable[str], max_depth: int = 2) -> Iterator[Tuple[str, Any]]:
+    """
+    Yield (dotted path, value) for each field of a streamed JSON response as it completes
+
+    The final item is ("", whole value) once the stream ends.
+
+    Args:
+        chunks: Response text chunks, e.g. from LLMClient.generate_stream
+        max_depth: Deepest object nesting whose fields are reported
+
+    Raises:
+        ValueError: If the stream does not contain a complete JSON value
+    """
+    parser = JSONStreamParser(max_depth=max_depth)
+    for chunk in chunks:
+        yield from parser.feed(chunk)
+        if parser.done:
+            break
+    yield "", parser.close()
+
+
+def parse_json_text(text: str) -> Any:
+    """
+    Parse a complete model response with the same tolerances as the stream parser
+
+    Well-formed JSON (raw control characters in strings and text around it
+    included) goes through the C decoder in one pass; anything it rejects,
+    such as trailing commas or "\\d" escapes, through JSONStreamParser.
+
+    Args:
+        text: Full response text
+
+    Returns:
+        The parsed value
+    """
+    brace = text.find("{")
+    bracket = text.find("[")
+    if bracket != -1 and (brace == -1 or bracket < brace) and _is_fence(text[:bracket]):
+        brace = bracket
+    if brace != -1:
+        try:
+            return _DECODER.raw_decode(text, brace)[0]
+        except ValueError:
+            pass
+
+    parser = JSONStreamParser(max_depth=0)
+    parser.feed(text)
+    return parser.close()
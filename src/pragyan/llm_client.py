@@ -2,94 +2,47 @@
 LLM Client module for Gemini and Groq API integrations
 """
 
+import hashlib
 import json
-import re
-from typing import Optional, Dict, Any, List
+import os
+import random
+import time
+from pathlib import Path
+from typing import Optional, Dict, Any, List, Tuple, Union, Iterable, Iterator, Callable, TYPE_CHECKING
 from abc import ABC, abstractmethod
 
-from pragyan.models import LLMProvider, LLMConfig, Question, Solution, ProgrammingLanguage
+from pragyan.models import LLMProvider, LLMConfig, FailoverConfig, Question, Solution, ProgrammingLanguage
+from pragyan.cache import ResponseCache
+from pragyan.dedup import deduplicate_code
+from pragyan.json_stream import JSONStreamParser, parse_json_text
+from pragyan.singleflight import SingleFlight, get_default_group
+from pragyan import tracing
+
+if TYPE_CHECKING:
+    from pragyan.ratelimit import RateLimiter
+
+
+def _record_usage(usage: Any, prompt_field: str, completion_field: str):
+    """Attach provider-reported token counts to the current trace span"""
+    if usage is None:
+        return
+    prompt_tokens = getattr(usage, prompt_field, None)
+    completion_tokens = getattr(usage, completion_field, None)
+    if isinstance(prompt_tokens, int):
+        tracing.annotate(prompt_tokens=prompt_tokens)
+    if isinstance(completion_tokens, int):
+        tracing.annotate(completion_tokens=completion_tokens)
 
 
 def _clean_and_parse_json(response: str) -> Dict[str, Any]:
     """
-    Clean LLM response and parse as JSON with robust error handling.
-    Handles control characters, markdown code blocks, and common issues.
+    Parse an LLM response as JSON with robust error handling.
+    Handles control characters, markdown code blocks, and text around the JSON
+    in a single pass (see pragyan.json_stream).
     """
-    # Strip whitespace
-    response = response.strip()
-    
-    # Remove markdown code blocks
-    if response.startswith("```json"):
-        response = response[7:]
-    if response.startswith("```"):
-        response = response[3:]
-    if response.endswith("```"):
-        response = response[:-3]
-    
-    response = response.strip()
-    
-    # Try parsing as-is first
     try:
-        return json.loads(response)
-    except json.JSONDecodeError:
-        pass
-    
-    # Remove control characters except for those inside strings
-    # First, find the first { and last }
-    start_idx = response.find('{')
-    end_idx = response.rfind('}')
-    
-    if start_idx == -1 or end_idx == -1:
-        # Try to find array brackets
-        start_idx = response.find('[')
-        end_idx = response.rfind(']')
-    
-    if start_idx != -1 and end_idx != -1:
-        response = response[start_idx:end_idx + 1]
-    
-    # Replace problematic control characters within string values
-    # Handle unescaped newlines and tabs in strings
-    def escape_string_content(match):
-        content = match.group(1)
-        # Escape control characters
-        content = content.replace('\n', '\\n')
-        content = content.replace('\r', '\\r')
-        content = content.replace('\t', '\\t')
-        content = content.replace('\b', '\\b')
-        content = content.replace('\f', '\\f')
-        return f'"{content}"'
-    
-    # This regex finds string values and escapes control chars inside them
-    try:
-        # First attempt: try to fix common issues
-        cleaned = response
-        
-        # Replace literal newlines that might be in the middle of strings
-        # by using a more aggressive approach
-        cleaned = re.sub(r'(?<!\\)\n(?=.*?")', '\\n', cleaned)
-        cleaned = re.sub(r'(?<!\\)\r(?=.*?")', '\\r', cleaned)
-        cleaned = re.sub(r'(?<!\\)\t(?=.*?")', '\\t', cleaned)
-        
-        return json.loads(cleaned)
-    except json.JSONDecodeError:
-        pass
-    
-    # More aggressive cleaning: remove all control characters
-    try:
-        # Remove all control characters except spaces
-        cleaned = ''.join(char if ord(char) >= 32 or char in '\n\r\t' else ' ' for char in response)
-        # Then normalize whitespace within strings
-        cleaned = re.sub(r'\s+', ' ', cleaned)
-        return json.loads(cleaned)
-    except json.JSONDecodeError:
-        pass
-    
-    # Last resort: try to extract and rebuild JSON manually
-    try:
-        # Very aggressive: just keep valid JSON characters
-        cleaned = re.sub(r'[\x00-\x1f\x7f-\x9f]', '', response)
-        return json.loads(cleaned)
-    except json.JSONDecodeError as e:
+        return parse_json_text(response)
+    except ValueError as e:
         raise ValueError(f"Failed to parse JSON response: {str(e)}\nResponse was: {response[:500]}...")
 
 
@@ -108,6 +61,18 @@ class BaseLLMClient(ABC):
     def generate_json(self, prompt: str, system_prompt: Optional[str] = None) -> Dict[str, Any]:
         """Generate a JSON response from the LLM"""
         pass
+    
+    def generate_stream(self, prompt: str, system_prompt: Optional[str] = None) -> Iterator[str]:
+        """Generate a response as text chunks (one chunk unless the provider streams)"""
+        yield self.generate(prompt, system_prompt)
+    
+    def generate_json_stream(self, prompt: str, system_prompt: Optional[str] = None) -> Iterator[str]:
+        """Generate a JSON response as raw text chunks, for JSONStreamParser"""
+        return self.generate_stream(*self._json_prompts(prompt, system_prompt))
+    
+    def _json_prompts(self, prompt: str, system_prompt: Optional[str]) -> Tuple[str, Optional[str]]:
+        """Prompts with the provider's instruction to answer in JSON only"""
+        return prompt, system_prompt
 
 
 class GeminiClient(BaseLLMClient):
@@ -134,19 +99,37 @@ class GeminiClient(BaseLLMClient):
         except ImportError:
             raise ImportError("Please install google-generativeai: pip install google-generativeai")
     
+    @staticmethod
+    def _full_prompt(prompt: str, system_prompt: Optional[str]) -> str:
+        if system_prompt:
+            return f"{system_prompt}\n\n{prompt}"
+        return prompt
+    
     def generate(self, prompt: str, system_prompt: Optional[str] = None) -> str:
         """Generate a response using Gemini"""
-        full_prompt = prompt
-        if system_prompt:
-            full_prompt = f"{system_prompt}\n\n{prompt}"
-        
-        response = self.model.generate_content(full_prompt)
+        response = self.model.generate_content(self._full_prompt(prompt, system_prompt))
+        _record_usage(getattr(response, "usage_metadata", None), "prompt_token_count", "candidates_token_count")
+        tracing.annotate(response_chars=len(response.text))
         return response.text
     
+    def generate_stream(self, prompt: str, system_prompt: Optional[str] = None) -> Iterator[str]:
+        """Generate a response using Gemini, yielding text as it is produced"""
+        response = self.model.generate_content(self._full_prompt(prompt, system_prompt), stream=True)
+        chars = 0
+        for chunk in response:
+            text = chunk.text
+            if text:
+                chars += len(text)
+                yield text
+        _record_usage(getattr(response, "usage_metadata", None), "prompt_token_count", "candidates_token_count")
+        tracing.annotate(response_chars=chars)
+    
+    def _json_prompts(self, prompt: str, system_prompt: Optional[str]) -> Tuple[str, Optional[str]]:
+        return f"{prompt}\n\nRespond ONLY with valid JSON, no markdown code blocks or extra text.", system_prompt
+    
     def generate_json(self, prompt: str, system_prompt: Optional[str] = None) -> Dict[str, Any]:
         """Generate a JSON response using Gemini"""
-        json_prompt = f"{prompt}\n\nRespond ONLY with valid JSON, no markdown code blocks or extra text."
-        response = self.generate(json_prompt, system_prompt)
+        response = self.generate(*self._json_prompts(prompt, system_prompt))
         
         return _clean_and_parse_json(response)
 
@@ -162,7 +145,370 @@ class GroqClient(BaseLLMClient):
         except ImportError:
             raise ImportError("Please install groq: pip install groq")
     
+    def _request(self, prompt: str, system_prompt: Optional[str]) -> Dict[str, Any]:
+        """Arguments for chat.completions.create"""
+        messages = []
+        
+        if system_prompt:
+            messages.append({"role": "system", "content": system_prompt})
+        
+        messages.append({"role": "user", "content": prompt})
+        
+        return {
+            # Ensure model name is set
+            "model": self.config.model or "llama-3.3-70b-versatile",
+            "messages": messages,
+            "temperature": self.config.temperature,
+            "max_tokens": self.config.max_tokens,
+        }
+    
+    def generate(self, prompt: str, system_prompt: Optional[str] = None) -> str:
+        """Generate a response using Groq"""
+        response = self.client.chat.completions.create(**self._request(prompt, system_prompt))
+        
+        content = response.choices[0].message.content or ""
+        _record_usage(getattr(response, "usage", None), "prompt_tokens", "completion_tokens")
+        tracing.annotate(response_chars=len(content))
+        return content
+    
+    def generate_stream(self, prompt: str, system_prompt: Optional[str] = None) -> Iterator[str]:
+        """Generate a response using Groq, yielding text as it is produced"""
+        stream = self.client.chat.completions.create(**self._request(prompt, system_prompt), stream=True)
+        chars = 0
+        usage = None
+        for chunk in stream:
+            if chunk.choices:
+                text = chunk.choices[0].delta.content
+                if text:
+                    chars += len(text)
+                    yield text
+            # Groq reports token usage on the last chunk
+            usage = getattr(getattr(chunk, "x_groq", None), "usage", None) or usage
+        _record_usage(usage, "prompt_tokens", "completion_tokens")
+        tracing.annotate(response_chars=chars)
+    
+    def _json_prompts(self, prompt: str, system_prompt: Optional[str]) -> Tuple[str, Optional[str]]:
+        json_system = system_prompt or ""
+        json_system += "\nYou must respond ONLY with valid JSON, no markdown code blocks or extra text."
+        return prompt, json_system
+    
+    def generate_json(self, prompt: str, system_prompt: Optional[str] = None) -> Dict[str, Any]:
+        """Generate a JSON response using Groq"""
+        response = self.generate(*self._json_prompts(prompt, system_prompt))
+        
+        return _clean_and_parse_json(response)
+
+
+# Canned responses used by the fake provider when no fixture matches,
+# keyed by a phrase that identifies each prompt built by _PromptMixin
+_FAKE_ANALYSIS = {
+    "title": "Two Sum",
+    "difficulty": "Easy",
+    "topics": ["array", "hash table"],
+    "main_concept": "Hash map lookup",
+    "sub_concepts": ["complement search"],
+    "approach": "Store each value's index in a hash map and look up target - value",
+    "intuition": "Each pair is found the moment its second element is seen",
+    "edge_cases": ["duplicate values", "negative numbers"],
+    "similar_problems": ["3Sum", "Two Sum II"],
+}
+
+_FAKE_SOLUTION = {
+    "code": (
+        "def two_sum(nums, target):\n"
+        "    # Map each value to its index\n"
+        "    seen = {}\n"
+        "    for i, num in enumerate(nums):\n"
+        "        complement = target - num\n"
+        "        if complement in seen:\n"
+        "            return [seen[complement], i]\n"
+        "        seen[num] = i\n"
+        "    return []"
+    ),
+    "explanation": "One pass over the array with a hash map of values already seen.",
+    "time_complexity": "O(n) - each element is visited once",
+    "space_complexity": "O(n) - the hash map holds up to n entries",
+    "concept": "Hash map lookup",
+    "approach": "Iterate once, checking whether the complement was seen before storing the value.",
+    "step_by_step": [
+        "Step 1: Create an empty hash map",
+        "Step 2: For each number, compute target - number",
+        "Step 3: Return both indices if the complement is in the map",
+        "Step 4: Otherwise store the number's index",
+    ],
+    "example_walkthrough": "nums = [2, 7, 11, 15], target = 9: 2 is stored, 7 finds 2 -> [0, 1]",
+}
+
+_FAKE_APPROACHES = {
+    "approaches": [
+        {
+            "name": "Brute force",
+            "description": "Check every pair of indices.",
+            "time_complexity": "O(n^2)",
+            "space_complexity": "O(1)",
+            "code": (
+                "class Solution:\n"
+                "    def twoSum(self, nums, target):\n"
+                "        for i in range(len(nums)):\n"
+                "            for j in range(i + 1, len(nums)):\n"
+                "                if nums[i] + nums[j] == target:\n"
+                "                    return [i, j]\n"
+                "        return []"
+            ),
+            "pros": ["No extra memory"],
+            "cons": ["Quadratic time"],
+            "best_for": "Very small inputs",
+        },
+        {
+            "name": "Hash map",
+            "description": _FAKE_SOLUTION["explanation"],
+            "time_complexity": "O(n)",
+            "space_complexity": "O(n)",
+            "code": _FAKE_SOLUTION["code"],
+            "pros": ["Single pass"],
+            "cons": ["Linear extra memory"],
+            "best_for": "Any input size",
+        },
+    ],
+    "recommended": "Hash map",
+    "recommendation_reason": "Linear time at the cost of linear memory",
+}
+
+_FAKE_DEFAULTS = [
+    ('"analysis": {', {"analysis": _FAKE_ANALYSIS, "solution": _FAKE_SOLUTION}),
+    ("Generate a complete solution", _FAKE_SOLUTION),
+    ("Analyze this DSA problem", _FAKE_ANALYSIS),
+    ("Analyze different approaches", _FAKE_APPROACHES),
+    ("Create a detailed video script", {"scenes": [
+        {"scene_type": kind, "title": kind.title(), "narration": f"{kind} scene", "duration": 5}
+        for kind in ("intro", "concept", "approach", "code", "example", "complexity", "outro")
+    ]}),
+    ("generate detailed animation steps", {
+        "algorithm_type": "array",
+        "visualization_type": "array",
+        "initial_state": {"description": "Input array", "data": [2, 7, 11, 15]},
+        "steps": [
+            {"step_number": i + 1, "action": "check", "description": f"Check index {i}",
+             "state_changes": {"positions": [i], "markers": {"i": i}}}
+            for i in range(4)
+        ],
+        "final_state": {"description": "Pair found", "data": [2, 7, 11, 15], "result": "[0, 1]"},
+    }),
+]
+
+
+def _fake_fixture_key(prompt: str, system_prompt: Optional[str]) -> str:
+    """Key a recorded response by its exact request"""
+    return hashlib.sha256(f"{system_prompt or ''}\x00{prompt}".encode("utf-8")).hexdigest()
+
+
+class _FakeResponder:
+    """Response lookup and latency model shared by FakeClient and AsyncFakeClient"""
+    
+    def _setup(
+        self,
+        fixtures: Optional[Union[str, Path, Dict[str, Any]]],
+        latency: Optional[float],
+        jitter: Optional[float],
+        seed: int
+    ):
+        if fixtures is None:
+            fixtures = os.environ.get("PRAGYAN_FAKE_FIXTURES")
+        if isinstance(fixtures, (str, Path)):
+            with open(fixtures, "r", encoding="utf-8") as f:
+                fixtures = json.load(f)
+        fixtures = fixtures or {}
+        
+        self.recorded: Dict[str, Any] = dict(fixtures.get("recorded", {}))
+        self.rules: List[Dict[str, Any]] = list(fixtures.get("rules", []))
+        self.latency = float(os.environ.get("PRAGYAN_FAKE_LATENCY", 0.0)) if latency is None else latency
+        self.jitter = float(os.environ.get("PRAGYAN_FAKE_JITTER", 0.0)) if jitter is None else jitter
+        self._random = random.Random(seed)
+        self.calls = 0
+    
+    def _delay(self) -> float:
+        """Seconds the next request takes (seeded, so runs are reproducible)"""
+        self.calls += 1
+        delay = self.latency
+        if self.jitter:
+            delay += self._random.uniform(-self.jitter, self.jitter)
+        return max(0.0, delay)
+    
+    def _respond(self, prompt: str, system_prompt: Optional[str]) -> str:
+        """Recorded response for this exact request, else the first matching rule, else a default"""
+        response: Any = self.recorded.get(_fake_fixture_key(prompt, system_prompt))
+        if response is None:
+            response = next((rule["response"] for rule in self.rules if rule.get("match", "") in prompt), None)
+        if response is None:
+            response = next((canned for marker, canned in _FAKE_DEFAULTS if marker in prompt), None)
+        if response is None:
+            response = f"Fake response ({len(prompt)} prompt characters)"
+        
+        text = response if isinstance(response, str) else json.dumps(response, indent=2)
+        tracing.annotate(response_chars=len(text))
+        return text
+
+
+class FakeClient(_FakeResponder, BaseLLMClient):
+    """
+    Offline provider for tests and benchmarks
+    
+    Replays responses in this order: a response recorded for the exact
+    prompt (see record_fixture), the first rule whose "match" text occurs
+    in the prompt, then built-in answers for each of Pragyan's own prompts.
+    Each request sleeps for latency +/- jitter seconds from a seeded RNG.
+    
+    Fixtures are a dict or JSON file: {"recorded": {key: response}, "rules":
+    [{"match": "...", "response": ...}]}. Without arguments the fixture file,
+    latency and jitter come from PRAGYAN_FAKE_FIXTURES, PRAGYAN_FAKE_LATENCY
+    and PRAGYAN_FAKE_JITTER.
+    """
+    
+    # Size of the pieces generate_stream yields, roughly a few tokens each
+    stream_chunk_chars = 24
+    
+    def __init__(
+        self,
+        config: LLMConfig,
+        fixtures: Optional[Union[str, Path, Dict[str, Any]]] = None,
+        latency: Optional[float] = None,
+        jitter: Optional[float] = None,
+        seed: int = 0
+    ):
+        super().__init__(config)
+        self._setup(fixtures, latency, jitter, seed)
+    
     def generate(self, prompt: str, system_prompt: Optional[str] = None) -> str:
+        """Return the fixture response after the simulated latency"""
+        time.sleep(self._delay())
+        return self._respond(prompt, system_prompt)
+    
+    def generate_stream(self, prompt: str, system_prompt: Optional[str] = None) -> Iterator[str]:
+        """Yield the fixture response in stream_chunk_chars pieces spread over the simulated latency"""
+        text = self._respond(prompt, system_prompt)
+        size = self.stream_chunk_chars
+        chunks = [text[i:i + size] for i in range(0, len(text), size)] or [""]
+        delay = self._delay() / len(chunks)
+        for chunk in chunks:
+            time.sleep(delay)
+            yield chunk
+    
+    def generate_json(self, prompt: str, system_prompt: Optional[str] = None) -> Dict[str, Any]:
+        """Return the fixture response parsed like a real provider's"""
+        return _clean_and_parse_json(self.generate(prompt, system_prompt))
+
+
+def record_fixture(
+    path: Union[str, Path],
+    prompt: str,
+    system_prompt: Optional[str],
+    response: Union[str, Dict[str, Any]]
+):
+    """
+    Add a real response to a fixture file so FakeClient can replay it
+    
+    Args:
+        path: Fixture JSON file (created if missing)
+        prompt: Prompt sent to the provider
+        system_prompt: System prompt sent to the provider
+        response: Text or parsed JSON the provider returned
+    """
+    path = Path(path)
+    fixtures = json.loads(path.read_text(encoding="utf-8")) if path.exists() else {}
+    fixtures.setdefault("recorded", {})[_fake_fixture_key(prompt, system_prompt)] = response
+    path.write_text(json.dumps(fixtures, indent=2), encoding="utf-8")
+
+
+def create_client(config: LLMConfig) -> BaseLLMClient:
+    """
+    Provider client for a configuration
+    
+    Args:
+        config: Provider, key and model
+        
+    Returns:
+        GeminiClient, GroqClient or FakeClient
+    """
+    if config.provider == LLMProvider.GEMINI:
+        return GeminiClient(config)
+    elif config.provider == LLMProvider.GROQ:
+        return GroqClient(config)
+    elif config.provider == LLMProvider.FAKE:
+        return FakeClient(config)
+    raise ValueError(f"Unsupported provider: {config.provider}")
+
+
+class AsyncBaseLLMClient(ABC):
+    """Abstract base class for asyncio LLM clients"""
+    
+    def __init__(self, config: LLMConfig):
+        self.config = config
+    
+    @abstractmethod
+    async def generate(self, prompt: str, system_prompt: Optional[str] = None) -> str:
+        """Generate a response from the LLM"""
+        pass
+    
+    @abstractmethod
+    async def generate_json(self, prompt: str, system_prompt: Optional[str] = None) -> Dict[str, Any]:
+        """Generate a JSON response from the LLM"""
+        pass
+
+
+class AsyncGeminiClient(AsyncBaseLLMClient):
+    """Asyncio client for Google Gemini API"""
+    
+    def __init__(self, config: LLMConfig):
+        super().__init__(config)
+        try:
+            import google.generativeai as genai
+            genai.configure(api_key=config.api_key)
+            
+            generation_config = genai.GenerationConfig(
+                temperature=config.temperature,
+                max_output_tokens=config.max_tokens,
+            )
+            
+            model_name = config.model or "gemini-2.0-flash"
+            
+            self.model = genai.GenerativeModel(
+                model_name=model_name,
+                generation_config=generation_config,
+            )
+        except ImportError:
+            raise ImportError("Please install google-generativeai: pip install google-generativeai")
+    
+    async def generate(self, prompt: str, system_prompt: Optional[str] = None) -> str:
+        """Generate a response using Gemini"""
+        full_prompt = prompt
+        if system_prompt:
+            full_prompt = f"{system_prompt}\n\n{prompt}"
+        
+        response = await self.model.generate_content_async(full_prompt)
+        _record_usage(getattr(response, "usage_metadata", None), "prompt_token_count", "candidates_token_count")
+        tracing.annotate(response_chars=len(response.text))
+        return response.text
+    
+    async def generate_json(self, prompt: str, system_prompt: Optional[str] = None) -> Dict[str, Any]:
+        """Generate a JSON response using Gemini"""
+        json_prompt = f"{prompt}\n\nRespond ONLY with valid JSON, no markdown code blocks or extra text."
+        response = await self.generate(json_prompt, system_prompt)
+        
+        return _clean_and_parse_json(response)
+
+
+class AsyncGroqClient(AsyncBaseLLMClient):
+    """Asyncio client for Groq API"""
+    
+    def __init__(self, config: LLMConfig):
+        super().__init__(config)
+        try:
+            from groq import AsyncGroq
+            self.client = AsyncGroq(api_key=config.api_key)
+        except ImportError:
+            raise ImportError("Please install groq: pip install groq")
+    
+    async def generate(self, prompt: str, system_prompt: Optional[str] = None) -> str:
         """Generate a response using Groq"""
         messages = []
         
@@ -171,61 +517,79 @@ class GroqClient(BaseLLMClient):
         
         messages.append({"role": "user", "content": prompt})
         
-        # Ensure model name is set
         model_name = self.config.model or "llama-3.3-70b-versatile"
         
-        response = self.client.chat.completions.create(
+        response = await self.client.chat.completions.create(
             model=model_name,
             messages=messages,
             temperature=self.config.temperature,
             max_tokens=self.config.max_tokens,
         )
         
-        content = response.choices[0].message.content
-        return content if content else ""
+        content = response.choices[0].message.content or ""
+        _record_usage(getattr(response, "usage", None), "prompt_tokens", "completion_tokens")
+        tracing.annotate(response_chars=len(content))
+        return content
     
-    def generate_json(self, prompt: str, system_prompt: Optional[str] = None) -> Dict[str, Any]:
+    async def generate_json(self, prompt: str, system_prompt: Optional[str] = None) -> Dict[str, Any]:
         """Generate a JSON response using Groq"""
         json_system = system_prompt or ""
         json_system += "\nYou must respond ONLY with valid JSON, no markdown code blocks or extra text."
         
-        response = self.generate(prompt, json_system)
+        response = await self.generate(prompt, json_system)
         
         return _clean_and_parse_json(response)
 
 
-class LLMClient:
-    """Factory class for creating LLM clients"""
+class AsyncFakeClient(_FakeResponder, AsyncBaseLLMClient):
+    """Asyncio counterpart of FakeClient (latency is an asyncio.sleep)"""
     
-    def __init__(self, provider: str, api_key: str, model: Optional[str] = None):
-        """
-        Initialize LLM client
-        
-        Args:
-            provider: Either "gemini" or "groq"
-            api_key: API key for the provider
-            model: Optional model name override
-        """
-        llm_provider = LLMProvider(provider.lower())
-        self.config = LLMConfig(provider=llm_provider, api_key=api_key, model=model)
-        
-        if llm_provider == LLMProvider.GEMINI:
-            self.client = GeminiClient(self.config)
-        elif llm_provider == LLMProvider.GROQ:
-            self.client = GroqClient(self.config)
-        else:
-            raise ValueError(f"Unsupported provider: {provider}")
+    def __init__(
+        self,
+        config: LLMConfig,
+        fixtures: Optional[Union[str, Path, Dict[str, Any]]] = None,
+        latency: Optional[float] = None,
+        jitter: Optional[float] = None,
+        seed: int = 0
+    ):
+        super().__init__(config)
+        self._setup(fixtures, latency, jitter, seed)
     
-    def generate(self, prompt: str, system_prompt: Optional[str] = None) -> str:
-        """Generate a response"""
-        return self.client.generate(prompt, system_prompt)
+    async def generate(self, prompt: str, system_prompt: Optional[str] = None) -> str:
+        """Return the fixture response after the simulated latency"""
+        import asyncio
+        await asyncio.sleep(self._delay())
+        return self._respond(prompt, system_prompt)
     
-    def generate_json(self, prompt: str, system_prompt: Optional[str] = None) -> Dict[str, Any]:
-        """Generate a JSON response"""
-        return self.client.generate_json(prompt, system_prompt)
+    async def generate_json(self, prompt: str, system_prompt: Optional[str] = None) -> Dict[str, Any]:
+        """Return the fixture response parsed like a real provider's"""
+        return _clean_and_parse_json(await self.generate(prompt, system_prompt))
+
+
+class _PromptMixin:
+    """Prompt construction and response handling shared by LLMClient and AsyncLLMClient"""
     
-    def analyze_question(self, question: Question) -> Dict[str, Any]:
-        """Analyze a DSA question and extract key information"""
+    config: LLMConfig
+    cache: Optional[ResponseCache]
+    
+    def _span_attributes(self, prompt: str, system_prompt: Optional[str]) -> Dict[str, Any]:
+        """Request attributes recorded on the llm.* trace spans"""
+        return {
+            "provider": self.config.provider.value,
+            "model": self.config.model,
+            "prompt_chars": len(prompt),
+            "system_chars": len(system_prompt or ""),
+        }
+    
+    def _cache_key(self, prompt: str, system_prompt: Optional[str], kind: str) -> Optional[str]:
+        """Cache key for a request, or None when caching is off"""
+        if self.cache is None:
+            return None
+        return self.cache.key_for(self.config, prompt, system_prompt, kind=kind)
+    
+    @staticmethod
+    def _analysis_prompts(question: Question) -> Tuple[str, str]:
+        """Build (prompt, system_prompt) for question analysis"""
         system_prompt = """You are an expert DSA instructor and competitive programmer. 
 Analyze the given problem and extract key information about the concepts, approach, and solution strategy."""
         
@@ -246,15 +610,15 @@ Provide your analysis in the following JSON format:
     "similar_problems": ["names of similar problems"]
 }}"""
         
-        return self.generate_json(prompt, system_prompt)
+        return prompt, system_prompt
     
-    def generate_solution(
-        self, 
+    @staticmethod
+    def _solution_prompts(
         question: Question, 
         language: ProgrammingLanguage,
         analysis: Optional[Dict[str, Any]] = None
-    ) -> Solution:
-        """Generate a complete solution for the DSA question"""
+    ) -> Tuple[str, str]:
+        """Build (prompt, system_prompt) for solution generation"""
         system_prompt = """You are an expert competitive programmer and coding instructor.
 Generate clean, efficient, and well-documented code solutions.
 Always include detailed comments explaining the logic.
@@ -283,8 +647,54 @@ Provide your solution in the following JSON format:
 CRITICAL: The code field must contain the solution exactly ONCE. No repetition or duplication.
 Make sure the code is complete, syntactically correct, and follows best practices for {lang_name}."""
         
-        result = self.generate_json(prompt, system_prompt)
+        return prompt, system_prompt
+    
+    @staticmethod
+    def _fused_prompts(question: Question, language: ProgrammingLanguage) -> Tuple[str, str]:
+        """Build (prompt, system_prompt) that asks for analysis and solution in one response"""
+        system_prompt = """You are an expert DSA instructor and competitive programmer.
+First analyze the problem, then generate a clean, efficient, well-documented solution based on that analysis.
+Always include detailed comments explaining the logic.
+IMPORTANT: Do NOT repeat or duplicate any code. Generate the solution only once."""
         
+        lang_name = language.value
+        
+        prompt = f"""Analyze this DSA problem and then solve it in {lang_name}:
+
+{question.to_prompt()}
+
+Provide your response in the following JSON format:
+{{
+    "analysis": {{
+        "title": "Problem title",
+        "difficulty": "Easy/Medium/Hard",
+        "topics": ["array", "dynamic programming", etc.],
+        "main_concept": "The primary concept/technique needed",
+        "sub_concepts": ["related concepts"],
+        "approach": "Brief description of the approach",
+        "intuition": "Why this approach works",
+        "edge_cases": ["edge cases to consider"],
+        "similar_problems": ["names of similar problems"]
+    }},
+    "solution": {{
+        "code": "The complete, working code solution with comments. DO NOT DUPLICATE CODE - write each line only once.",
+        "explanation": "Detailed explanation of the solution",
+        "time_complexity": "O(?) with brief explanation",
+        "space_complexity": "O(?) with brief explanation",
+        "concept": "Main concept/technique used (one sentence)",
+        "approach": "Step-by-step approach description (2-3 sentences)",
+        "step_by_step": ["Step 1: ...", "Step 2: ...", ...],
+        "example_walkthrough": "Detailed walkthrough of Example 1 showing how the algorithm works"
+    }}
+}}
+
+CRITICAL: The code field must contain the solution exactly ONCE. No repetition or duplication.
+Make sure the code is complete, syntactically correct, and follows best practices for {lang_name}."""
+        
+        return prompt, system_prompt
+    
+    def _build_solution(self, result: Dict[str, Any], language: ProgrammingLanguage) -> Solution:
+        """Turn a parsed solution response into a Solution"""
         # Clean the code - remove any accidental duplications
         code = result.get("code", "")
         code = self._deduplicate_code(code)
@@ -303,128 +713,15 @@ Make sure the code is complete, syntactically correct, and follows best practice
     
     def _deduplicate_code(self, code: str) -> str:
         """Remove accidentally duplicated code blocks - handles sliding window repetition"""
-        if not code:
-            return code
-        
-        lines = code.split('\n')
-        if len(lines) < 10:
-            return code
-        
-        # Method 1: Find the first complete code block (class/function definition to its end)
-        # Look for common code patterns
-        code_start = -1
-        brace_count = 0
-        indent_stack = []
-        
-        for i, line in enumerate(lines):
-            stripped = line.strip()
-            
-            # Find start of main code block
-            if code_start == -1:
-                if stripped.startswith(('class ', 'def ', 'function ', 'public ', 'private ', 'int ', 'void ')):
-                    code_start = i
-                    if stripped.endswith(':'):
-                        # Python-style - track by indentation
-                        indent_stack = [len(line) - len(line.lstrip())]
-                    continue
-            
-            # Once we found the start, look for where the main block ends
-            if code_start >= 0 and i > code_start:
-                current_indent = len(line) - len(line.lstrip()) if stripped else -1
-                
-                # If we see the same or similar line as earlier in the code, we might have repetition
-                # Check if this line matches a line from the beginning of the code block
-                for j in range(code_start, min(code_start + 30, i)):
-                    if lines[j].strip() == stripped and stripped and len(stripped) > 20:
-                        # Found a repeat - return everything up to here
-                        # But make sure we have a complete block
-                        candidate = '\n'.join(lines[:i])
-                        if self._is_complete_code(candidate):
-                            return candidate
-        
-        # Method 2: Check for exact half/third duplication
-        half = len(lines) // 2
-        first_half = '\n'.join(lines[:half])
-        second_half = '\n'.join(lines[half:])
-        
-        if first_half.strip() == second_half.strip():
-            return first_half
-        
-        # Method 3: Find repeating suffix pattern
-        # The pattern shows lines repeating with increasing offsets
-        # Find where the code logically ends (look for main block or example usage)
-        for i, line in enumerate(lines):
-            stripped = line.strip()
-            if 'Example usage' in line or 'if __name__' in stripped:
-                # Include this and maybe one more line, then stop
-                end_idx = min(i + 5, len(lines))
-                for j in range(i + 1, end_idx):
-                    if not lines[j].strip():
-                        continue
-                    # Check if what follows is a repeat
-                    remaining = '\n'.join(lines[j:])
-                    main_code = '\n'.join(lines[:j])
-                    if any(lines[j].strip() == lines[k].strip() for k in range(code_start if code_start >= 0 else 0, min(j, 20))):
-                        return main_code
-        
-        # Method 4: Track unique lines and stop at first repeat of a significant line
-        seen_lines = {}
-        result = []
-        
-        for i, line in enumerate(lines):
-            stripped = line.strip()
-            
-            # Skip empty lines and comments for uniqueness check
-            if not stripped or stripped.startswith('#') or stripped.startswith('//'):
-                result.append(line)
-                continue
-            
-            # For substantial lines, check if we've seen them
-            if len(stripped) > 30:
-                if stripped in seen_lines:
-                    # We've hit a repeat - stop here
-                    # But first, make sure the code so far is complete
-                    candidate = '\n'.join(result)
-                    if self._is_complete_code(candidate):
-                        return candidate
-                seen_lines[stripped] = i
-            
-            result.append(line)
-        
-        return '\n'.join(result)
+        return deduplicate_code(code)
     
-    def _is_complete_code(self, code: str) -> bool:
-        """Check if code appears to be complete (balanced braces, has return, etc.)"""
-        if not code.strip():
-            return False
-        
-        # Check for balanced braces/brackets
-        opens = code.count('{') + code.count('[') + code.count('(')
-        closes = code.count('}') + code.count(']') + code.count(')')
-        
-        # Allow small imbalance for incomplete strings
-        if abs(opens - closes) > 2:
-            return False
-        
-        # Check it has some substance
-        lines = [l for l in code.split('\n') if l.strip()]
-        if len(lines) < 5:
-            return False
-        
-        # Check for common endings
-        last_lines = '\n'.join(lines[-3:]).lower()
-        if any(x in last_lines for x in ['return', 'true', 'false', 'none', 'null', '}']):
-            return True
-        
-        return len(lines) >= 10
-    
-    def generate_video_script(
-        self, 
+    @staticmethod
+    def _video_script_prompts(
         question: Question, 
         solution: Solution,
         analysis: Dict[str, Any]
-    ) -> List[Dict[str, Any]]:
-        """Generate a script for the explanation video"""
+    ) -> Tuple[str, str]:
+        """Build (prompt, system_prompt) for the explanation video script"""
         system_prompt = """You are an expert at creating educational content for programming tutorials.
 Create engaging, clear, and well-structured video scripts that explain DSA concepts effectively."""
         
@@ -472,11 +769,11 @@ Include these scenes:
 
 Each scene should have clear narration and visual elements that support the explanation."""
         
-        result = self.generate_json(prompt, system_prompt)
-        return result.get("scenes", [])
+        return prompt, system_prompt
     
-    def generate_manim_code(self, scene: Dict[str, Any], question: Question, solution: Solution) -> str:
-        """Generate Manim code for a specific scene"""
+    @staticmethod
+    def _manim_code_prompts(scene: Dict[str, Any], question: Question, solution: Solution) -> Tuple[str, str]:
+        """Build (prompt, system_prompt) for Manim code of a single scene"""
         system_prompt = """You are an expert at creating Manim animations for educational videos.
 Generate clean, working Manim Community Edition code that creates beautiful animations."""
         
@@ -499,15 +796,15 @@ Return ONLY the Python code for the Manim scene class, no explanation.
 The class should inherit from Scene and have a construct method.
 Use manim.community edition syntax."""
 
-        return self.generate(prompt, system_prompt)
+        return prompt, system_prompt
     
-    def generate_algorithm_animation_steps(
-        self, 
+    @staticmethod
+    def _animation_steps_prompts(
         question: Question, 
         solution: Solution,
         analysis: Dict[str, Any]
-    ) -> Dict[str, Any]:
-        """Generate detailed step-by-step animation instructions for algorithm execution"""
+    ) -> Tuple[str, str]:
+        """Build (prompt, system_prompt) for the algorithm execution trace"""
         system_prompt = """You are an expert at analyzing algorithms and creating step-by-step execution traces.
 For each algorithm, provide detailed steps showing exactly how it executes on the given input.
 Focus on visualization - what changes at each step, what should be highlighted, what values to show."""
@@ -571,4 +868,401 @@ For backtracking algorithms (like N-Queens), show placement AND backtracking ste
 For sorting, show every comparison and swap.
 For graph algorithms, show the traversal order with queue/stack states."""
         
+        return prompt, system_prompt
+
+
+class LLMClient(_PromptMixin):
+    """Factory class for creating LLM clients"""
+    
+    def __init__(
+        self,
+        provider: str,
+        api_key: str,
+        model: Optional[str] = None,
+        cache: Optional[ResponseCache] = None,
+        fallbacks: Optional[List[LLMConfig]] = None,
+        failover: Optional[FailoverConfig] = None,
+        rate_limiter: Optional["RateLimiter"] = None,
+        coalesce: bool = True,
+    ):
+        """
+        Initialize LLM client
+        
+        Args:
+            provider: "gemini", "groq" or "fake" (offline fixtures, see FakeClient)
+            api_key: API key for the provider
+            model: Optional model name override
+            cache: Optional response cache; identical requests are then served from disk
+            fallbacks: Optional providers to fail over to, in order of preference
+            failover: Optional retry/failover/hedging policy (see FailoverClient)
+            rate_limiter: Optional shared RateLimiter; requests then wait for their
+                provider's per-minute budgets instead of hitting its rate limits
+            coalesce: Share one provider request between identical requests made at the
+                same time, from any LLMClient in the process (see SingleFlight)
+        """
+        llm_provider = LLMProvider(provider.lower())
+        self.config = LLMConfig(provider=llm_provider, api_key=api_key, model=model)
+        self.cache = cache
+        self.flights: Optional[SingleFlight] = get_default_group() if coalesce else None
+        
+        if fallbacks or failover is not None:
+            from pragyan.failover import FailoverClient
+            self.client = FailoverClient([self.config] + list(fallbacks or []), failover, rate_limiter=rate_limiter)
+        elif rate_limiter is not None:
+            from pragyan.ratelimit import RateLimitedClient
+            self.client = RateLimitedClient(create_client(self.config), rate_limiter)
+        else:
+            self.client = create_client(self.config)
+    
+    def generate(self, prompt: str, system_prompt: Optional[str] = None) -> str:
+        """Generate a response"""
+        with tracing.span("llm.generate", **self._span_attributes(prompt, system_prompt)) as span:
+            key = self._cache_key(prompt, system_prompt, "text")
+            if key is not None:
+                cached = self.cache.get(key)
+                span.set(cache_hit=isinstance(cached, str))
+                if isinstance(cached, str):
+                    return cached
+            
+            response, shared = self._coalesced(span, "text", prompt, system_prompt, self.client.generate)
+            if key is not None and not shared:
+                self.cache.set(key, response)
+            return response
+    
+    def generate_json(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        on_progress: Optional[Callable[[JSONStreamParser], None]] = None
+    ) -> Dict[str, Any]:
+        """
+        Generate a JSON response
+        
+        Args:
+            prompt: User prompt
+            system_prompt: Optional system prompt
+            on_progress: Optional callback; the response is then streamed and the
+                callback gets the JSONStreamParser after every chunk
+        """
+        if on_progress is not None:
+            parser = JSONStreamParser()
+            for _ in self.generate_json_stream(prompt, system_prompt, parser):
+                on_progress(parser)
+            return parser.close()
+        
+        with tracing.span("llm.generate_json", **self._span_attributes(prompt, system_prompt)) as span:
+            key = self._cache_key(prompt, system_prompt, "json")
+            if key is not None:
+                cached = self.cache.get(key)
+                span.set(cache_hit=cached is not None)
+                if cached is not None:
+                    return cached
+            
+            result, shared = self._coalesced(span, "json", prompt, system_prompt, self.client.generate_json)
+            if key is not None and not shared:
+                self.cache.set(key, result)
+            return result
+    
+    def generate_stream(self, prompt: str, system_prompt: Optional[str] = None) -> Iterator[str]:
+        """
+        Generate a response, yielding text chunks as the provider produces them
+        
+        The complete text is cached like generate()'s once the stream ends.
+        """
+        with tracing.span("llm.generate_stream", **self._span_attributes(prompt, system_prompt)) as span:
+            key = self._cache_key(prompt, system_prompt, "text")
+            if key is not None:
+                cached = self.cache.get(key)
+                span.set(cache_hit=isinstance(cached, str))
+                if isinstance(cached, str):
+                    yield cached
+                    return
+            
+            # Clients that don't stream answer in one chunk
+            stream = getattr(self.client, "generate_stream", None)
+            if stream is None:
+                open_stream = lambda: [self.client.generate(prompt, system_prompt)]
+            else:
+                open_stream = lambda: stream(prompt, system_prompt)
+            chunks, shared = self._coalesced_stream(span, "text_stream", prompt, system_prompt, open_stream)
+            
+            started = time.perf_counter()
+            received = []
+            for chunk in chunks:
+                if not received:
+                    span.set(first_chunk_s=round(time.perf_counter() - started, 6))
+                received.append(chunk)
+                yield chunk
+            
+            if key is not None and not shared:
+                self.cache.set(key, "".join(received))
+    
+    def generate_json_stream(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        parser: Optional[JSONStreamParser] = None
+    ) -> Iterator[str]:
+        """
+        Generate a JSON response, yielding raw text chunks as they arrive
+        
+        Args:
+            prompt: User prompt
+            system_prompt: Optional system prompt
+            parser: Optional JSONStreamParser, fed each chunk before it is yielded so
+                fields can be read (parser.get("code")) while the response streams
+        
+        Yields:
+            Response text chunks; the parsed result is cached like generate_json()'s
+        """
+        parser = parser if parser is not None else JSONStreamParser()
+        with tracing.span("llm.generate_json_stream", **self._span_attributes(prompt, system_prompt)) as span:
+            key = self._cache_key(prompt, system_prompt, "json")
+            if key is not None:
+                cached = self.cache.get(key)
+                span.set(cache_hit=cached is not None)
+                if cached is not None:
+                    text = json.dumps(cached)
+                    parser.feed(text)
+                    yield text
+                    return
+            
+            # Clients that don't stream answer in one chunk
+            stream = getattr(self.client, "generate_json_stream", None)
+            if stream is None:
+                open_stream = lambda: [json.dumps(self.client.generate_json(prompt, system_prompt))]
+            else:
+                open_stream = lambda: stream(prompt, system_prompt)
+            chunks, shared = self._coalesced_stream(span, "json_stream", prompt, system_prompt, open_stream)
+            
+            started = time.perf_counter()
+            first = True
+            for chunk in chunks:
+                if first:
+                    span.set(first_chunk_s=round(time.perf_counter() - started, 6))
+                    first = False
+                parser.feed(chunk)
+                yield chunk
+            
+            if key is not None and not shared:
+                self.cache.set(key, parser.close())
+    
+    def _flight_key(self, kind: str, prompt: str, system_prompt: Optional[str]) -> Tuple[str, str]:
+        """Identity of a request for coalescing; the API key keeps accounts apart"""
+        return ResponseCache.key_for(self.config, prompt, system_prompt, kind=kind), self.config.api_key
+    
+    def _coalesced(
+        self,
+        span: Any,
+        kind: str,
+        prompt: str,
+        system_prompt: Optional[str],
+        call: Callable[[str, Optional[str]], Any]
+    ) -> Tuple[Any, bool]:
+        """Make the provider call, or share an identical one already in flight"""
+        if self.flights is None:
+            return call(prompt, system_prompt), False
+        key = self._flight_key(kind, prompt, system_prompt)
+        result, shared = self.flights.do(key, lambda: call(prompt, system_prompt))
+        span.set(coalesced=shared)
+        return result, shared
+    
+    def _coalesced_stream(
+        self,
+        span: Any,
+        kind: str,
+        prompt: str,
+        system_prompt: Optional[str],
+        open_stream: Callable[[], Iterable[str]]
+    ) -> Tuple[Iterable[str], bool]:
+        """Open the provider stream, or follow an identical one already in flight"""
+        if self.flights is None:
+            return open_stream(), False
+        chunks, shared = self.flights.stream(self._flight_key(kind, prompt, system_prompt), open_stream)
+        span.set(coalesced=shared)
+        return chunks, shared
+    
+    def analyze_question(self, question: Question) -> Dict[str, Any]:
+        """Analyze a DSA question and extract key information"""
+        prompt, system_prompt = self._analysis_prompts(question)
         return self.generate_json(prompt, system_prompt)
+    
+    def generate_solution(
+        self, 
+        question: Question, 
+        language: ProgrammingLanguage,
+        analysis: Optional[Dict[str, Any]] = None,
+        on_progress: Optional[Callable[[JSONStreamParser], None]] = None
+    ) -> Solution:
+        """Generate a complete solution for the DSA question (streamed when on_progress is given)"""
+        prompt, system_prompt = self._solution_prompts(question, language, analysis)
+        result = self.generate_json(prompt, system_prompt, on_progress)
+        return self._build_solution(result, language)
+    
+    def analyze_and_solve(
+        self,
+        question: Question,
+        language: ProgrammingLanguage,
+        on_progress: Optional[Callable[[JSONStreamParser], None]] = None
+    ) -> Tuple[Dict[str, Any], Solution]:
+        """Get analysis and solution from a single structured request (streamed when on_progress is given)"""
+        prompt, system_prompt = self._fused_prompts(question, language)
+        result = self.generate_json(prompt, system_prompt, on_progress)
+        return result.get("analysis", {}), self._build_solution(result.get("solution", {}), language)
+    
+    def generate_video_script(
+        self, 
+        question: Question, 
+        solution: Solution,
+        analysis: Dict[str, Any]
+    ) -> List[Dict[str, Any]]:
+        """Generate a script for the explanation video"""
+        prompt, system_prompt = self._video_script_prompts(question, solution, analysis)
+        result = self.generate_json(prompt, system_prompt)
+        return result.get("scenes", [])
+    
+    def generate_manim_code(self, scene: Dict[str, Any], question: Question, solution: Solution) -> str:
+        """Generate Manim code for a specific scene"""
+        prompt, system_prompt = self._manim_code_prompts(scene, question, solution)
+        return self.generate(prompt, system_prompt)
+    
+    def generate_algorithm_animation_steps(
+        self, 
+        question: Question, 
+        solution: Solution,
+        analysis: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Generate detailed step-by-step animation instructions for algorithm execution"""
+        prompt, system_prompt = self._animation_steps_prompts(question, solution, analysis)
+        return self.generate_json(prompt, system_prompt)
+
+
+class AsyncLLMClient(_PromptMixin):
+    """
+    Asyncio counterpart of LLMClient
+    
+    Uses the providers' async SDKs so a single event loop can keep many
+    requests in flight. Prompts, caching and response handling are shared
+    with LLMClient.
+    """
+    
+    def __init__(
+        self,
+        provider: str,
+        api_key: str,
+        model: Optional[str] = None,
+        cache: Optional[ResponseCache] = None,
+        rate_limiter: Optional["RateLimiter"] = None,
+    ):
+        """
+        Initialize async LLM client
+        
+        Args:
+            provider: "gemini", "groq" or "fake" (offline fixtures, see FakeClient)
+            api_key: API key for the provider
+            model: Optional model name override
+            cache: Optional response cache; identical requests are then served from disk
+            rate_limiter: Optional RateLimiter shared with other clients, sync or async
+        """
+        llm_provider = LLMProvider(provider.lower())
+        self.config = LLMConfig(provider=llm_provider, api_key=api_key, model=model)
+        self.cache = cache
+        
+        if llm_provider == LLMProvider.GEMINI:
+            self.client = AsyncGeminiClient(self.config)
+        elif llm_provider == LLMProvider.GROQ:
+            self.client = AsyncGroqClient(self.config)
+        elif llm_provider == LLMProvider.FAKE:
+            self.client = AsyncFakeClient(self.config)
+        else:
+            raise ValueError(f"Unsupported provider: {provider}")
+        
+        if rate_limiter is not None:
+            from pragyan.ratelimit import AsyncRateLimitedClient
+            self.client = AsyncRateLimitedClient(self.client, rate_limiter)
+    
+    async def generate(self, prompt: str, system_prompt: Optional[str] = None) -> str:
+        """Generate a response"""
+        with tracing.span("llm.generate", **self._span_attributes(prompt, system_prompt)) as span:
+            key = self._cache_key(prompt, system_prompt, "text")
+            if key is None:
+                return await self.client.generate(prompt, system_prompt)
+            
+            cached = self.cache.get(key)
+            if isinstance(cached, str):
+                span.set(cache_hit=True)
+                return cached
+            
+            span.set(cache_hit=False)
+            response = await self.client.generate(prompt, system_prompt)
+            self.cache.set(key, response)
+            return response
+    
+    async def generate_json(self, prompt: str, system_prompt: Optional[str] = None) -> Dict[str, Any]:
+        """Generate a JSON response"""
+        with tracing.span("llm.generate_json", **self._span_attributes(prompt, system_prompt)) as span:
+            key = self._cache_key(prompt, system_prompt, "json")
+            if key is None:
+                return await self.client.generate_json(prompt, system_prompt)
+            
+            cached = self.cache.get(key)
+            if cached is not None:
+                span.set(cache_hit=True)
+                return cached
+            
+            span.set(cache_hit=False)
+            result = await self.client.generate_json(prompt, system_prompt)
+            self.cache.set(key, result)
+            return result
+    
+    async def analyze_question(self, question: Question) -> Dict[str, Any]:
+        """Analyze a DSA question and extract key information"""
+        prompt, system_prompt = self._analysis_prompts(question)
+        return await self.generate_json(prompt, system_prompt)
+    
+    async def generate_solution(
+        self, 
+        question: Question, 
+        language: ProgrammingLanguage,
+        analysis: Optional[Dict[str, Any]] = None
+    ) -> Solution:
+        """Generate a complete solution for the DSA question"""
+        prompt, system_prompt = self._solution_prompts(question, language, analysis)
+        result = await self.generate_json(prompt, system_prompt)
+        return self._build_solution(result, language)
+    
+    async def analyze_and_solve(
+        self,
+        question: Question,
+        language: ProgrammingLanguage
+    ) -> Tuple[Dict[str, Any], Solution]:
+        """Get analysis and solution from a single structured request"""
+        prompt, system_prompt = self._fused_prompts(question, language)
+        result = await self.generate_json(prompt, system_prompt)
+        return result.get("analysis", {}), self._build_solution(result.get("solution", {}), language)
+    
+    async def generate_video_script(
+        self, 
+        question: Question, 
+        solution: Solution,
+        analysis: Dict[str, Any]
+    ) -> List[Dict[str, Any]]:
+        """Generate a script for the explanation video"""
+        prompt, system_prompt = self._video_script_prompts(question, solution, analysis)
+        result = await self.generate_json(prompt, system_prompt)
+        return result.get("scenes", [])
+    
+    async def generate_manim_code(self, scene: Dict[str, Any], question: Question, solution: Solution) -> str:
+        """Generate Manim code for a specific scene"""
+        prompt, system_prompt = self._manim_code_prompts(scene, question, solution)
+        return await self.generate(prompt, system_prompt)
+    
+    async def generate_algorithm_animation_steps(
+        self, 
+        question: Question, 
+        solution: Solution,
+        analysis: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Generate detailed step-by-step animation instructions for algorithm execution"""
+        prompt, system_prompt = self._animation_steps_prompts(question, solution, analysis)
+        return await self.generate_json(prompt, system_prompt)
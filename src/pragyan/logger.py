@@ -268,6 +268,46 @@ class PragyanLogger:
         console.print("[bold green]" + "=" * 60 + "[/bold green]")
         console.print()
     
+    def log_trace_summary(self, tracer: Any):
+        """Show where the time went, one row per span name of a Tracer"""
+        rows = tracer.summary()
+        if not self.verbose or not rows:
+            return
+        
+        table = Table(title="[bold cyan]Time by Stage[/bold cyan]", border_style="cyan")
+        table.add_column("Span", style="bold white")
+        table.add_column("Calls", justify="right")
+        table.add_column("Total", justify="right")
+        table.add_column("Mean", justify="right")
+        table.add_column("Max", justify="right")
+        table.add_column("Details", style="dim")
+        
+        for row in rows:
+            totals = row["totals"]
+            details = []
+            if "cache_hit" in totals:
+                details.append(f"{totals['cache_hit']}/{row['count']} cached")
+            if "prompt_tokens" in totals or "completion_tokens" in totals:
+                details.append(f"{totals.get('prompt_tokens', 0)} in / {totals.get('completion_tokens', 0)} out tokens")
+            elif "prompt_chars" in totals:
+                details.append(f"{totals['prompt_chars']} prompt chars")
+            if "output_bytes" in totals:
+                details.append(f"{totals['output_bytes'] / (1024 * 1024):.1f} MB")
+            if row["errors"]:
+                details.append(f"[red]{row['errors']} failed[/red]")
+            
+            table.add_row(
+                row["name"],
+                str(row["count"]),
+                f"{row['total']:.2f}s",
+                f"{row['mean']:.2f}s",
+                f"{row['max']:.2f}s",
+                ", ".join(details),
+            )
+        
+        console.print(table)
+        console.print()
+    
     def log_error(self, stage: str, error: str):
         """Log an error"""
         console.print(f"[bold red]Error in {stage}:[/bold red] {error}")
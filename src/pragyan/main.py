@@ -2,17 +2,27 @@
 Main module for Pragyan - orchestrates all components
 """
 
+import atexit
 from pathlib import Path
-from typing import Optional, Dict, Any, Union
+from typing import Optional, Dict, Any, List, Union, Iterable, Iterator, Callable
 
 from pragyan.models import (
     Question, Solution, VideoConfig, 
-    ProgrammingLanguage, LLMProvider
+    ProgrammingLanguage, LLMProvider, LLMConfig, BatchConfig, SolveStrategy, FailoverConfig,
+    ExecutionConfig, ProfileConfig
 )
-from pragyan.llm_client import LLMClient
+from pragyan.llm_client import LLMClient, AsyncLLMClient
+from pragyan.json_stream import JSONStreamParser
+from pragyan.cache import ResponseCache, ScrapeCache
 from pragyan.scraper import QuestionScraper
 from pragyan.solver import DSASolver
 from pragyan.video_generator import VideoGenerator, SimpleVideoGenerator
+from pragyan.batch import BatchRunner, BatchItem, BatchResult
+from pragyan.tracing import Tracer
+from pragyan.ratelimit import RateLimiter
+from pragyan.sandbox import SandboxPool, ExecutionReport
+from pragyan.profiler import ComplexityReport
+from pragyan import tracing
 
 
 class Pragyan:
@@ -45,24 +55,45 @@ class Pragyan:
         api_key: str,
         model: Optional[str] = None,
         video_config: Optional[VideoConfig] = None,
+        cache: Optional[ResponseCache] = None,
+        scrape_cache: Optional[ScrapeCache] = None,
+        tracer: Optional[Tracer] = None,
+        fallbacks: Optional[List[LLMConfig]] = None,
+        failover: Optional[FailoverConfig] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        execution_config: Optional[ExecutionConfig] = None,
     ):
         """
         Initialize Pragyan
         
         Args:
-            provider: LLM provider - either "gemini" or "groq"
+            provider: LLM provider - "gemini", "groq" or "fake" (offline)
             api_key: API key for the provider
             model: Optional model name override
             video_config: Optional video configuration
+            cache: Optional LLM response cache for reusing results across runs
+            scrape_cache: Optional cache of scraped questions, keyed by URL
+            tracer: Optional tracer that records a span per stage and LLM call
+            fallbacks: Optional providers to fail over to when the main one errors,
+                is rate limited or (with failover.hedge) is slow
+            failover: Optional retry/failover/hedging policy
+            rate_limiter: Optional RateLimiter that keeps requests within each
+                provider's per-minute budgets (share one across instances)
+            execution_config: Optional worker count and limits for verify_solution;
+                without it the process-wide sandbox is used
         """
         self.provider = provider.lower()
         self.api_key = api_key
+        self.tracer = tracer
         
         # Initialize LLM client
-        self.llm = LLMClient(provider=self.provider, api_key=api_key, model=model)
+        self.llm = LLMClient(
+            provider=self.provider, api_key=api_key, model=model, cache=cache,
+            fallbacks=fallbacks, failover=failover, rate_limiter=rate_limiter
+        )
         
         # Initialize components
-        self.scraper = QuestionScraper()
+        self.scraper = QuestionScraper(cache=scrape_cache)
         self.solver = DSASolver(self.llm)
         
         # Video configuration
@@ -71,6 +102,18 @@ class Pragyan:
         # Video generator (lazy initialized)
         self._video_generator = None
         self._simple_video_generator = None
+        
+        # Execution sandbox (lazy initialized)
+        self.execution_config = execution_config
+        self._sandbox: Optional[SandboxPool] = None
+    
+    @property
+    def sandbox(self) -> Optional[SandboxPool]:
+        """Get or create the sandbox for execution_config (None = the process-wide one)"""
+        if self._sandbox is None and self.execution_config is not None:
+            self._sandbox = SandboxPool(self.execution_config)
+            atexit.register(self._sandbox.close)
+        return self._sandbox
     
     @property
     def video_generator(self) -> VideoGenerator:
@@ -98,7 +141,8 @@ class Pragyan:
         Returns:
             Question object with extracted information
         """
-        return self.scraper.scrape_url(url)
+        with tracing.activate(self.tracer):
+            return self.scraper.scrape_url(url)
     
     def parse_question(self, text: str) -> Question:
         """
@@ -122,13 +166,15 @@ class Pragyan:
         Returns:
             Dictionary containing analysis results
         """
-        return self.solver.analyze(question)
+        with tracing.activate(self.tracer):
+            return self.solver.analyze(question)
     
     def solve(
         self,
         question: Question,
         language: Union[str, ProgrammingLanguage],
-        analysis: Optional[Dict[str, Any]] = None
+        analysis: Optional[Dict[str, Any]] = None,
+        on_progress: Optional[Callable[[JSONStreamParser], None]] = None
     ) -> Solution:
         """
         Generate a solution for the DSA question
@@ -137,6 +183,8 @@ class Pragyan:
             question: The DSA question to solve
             language: Programming language (string or enum)
             analysis: Optional pre-computed analysis
+            on_progress: Optional callback to stream the solution; called with the
+                JSONStreamParser after every chunk, e.g. to show parser.get("code")
             
         Returns:
             Solution object with code and explanation
@@ -144,12 +192,15 @@ class Pragyan:
         if isinstance(language, str):
             language = ProgrammingLanguage.from_string(language)
         
-        return self.solver.solve(question, language, analysis)
+        with tracing.activate(self.tracer):
+            return self.solver.solve(question, language, analysis, on_progress)
     
     def solve_complete(
         self,
         question: Question,
-        language: Union[str, ProgrammingLanguage]
+        language: Union[str, ProgrammingLanguage],
+        strategy: Union[str, SolveStrategy] = SolveStrategy.SEQUENTIAL,
+        on_progress: Optional[Callable[[JSONStreamParser], None]] = None
     ) -> tuple:
         """
         Complete analysis and solution generation
@@ -157,6 +208,10 @@ class Pragyan:
         Args:
             question: The DSA question
             language: Programming language
+            strategy: "sequential", "speculative" (both requests at once) or
+                "fused" (one request returns both)
+            on_progress: Optional callback to stream the solution request (the
+                code is at "solution.code" for the fused strategy)
             
         Returns:
             Tuple of (Solution, analysis dict)
@@ -164,7 +219,8 @@ class Pragyan:
         if isinstance(language, str):
             language = ProgrammingLanguage.from_string(language)
         
-        return self.solver.solve_with_analysis(question, language)
+        with tracing.activate(self.tracer):
+            return self.solver.solve_with_analysis(question, language, strategy, on_progress)
     
     def generate_video(
         self,
@@ -196,16 +252,18 @@ class Pragyan:
             )
         
         # Dynamic scene generation handles everything - no need for video_script
-        return self.video_generator.generate_video(
-            question, solution, analysis, output_filename=output_filename
-        )
+        with tracing.activate(self.tracer):
+            return self.video_generator.generate_video(
+                question, solution, analysis, output_filename=output_filename
+            )
     
     def process(
         self,
         input_source: str,
         language: Union[str, ProgrammingLanguage] = "python",
         generate_video: bool = True,
-        output_filename: Optional[str] = None
+        output_filename: Optional[str] = None,
+        strategy: Union[str, SolveStrategy] = SolveStrategy.SEQUENTIAL
     ) -> Dict[str, Any]:
         """
         Complete processing pipeline
@@ -215,6 +273,8 @@ class Pragyan:
             language: Programming language for solution
             generate_video: Whether to generate explanation video
             output_filename: Optional video output filename
+            strategy: How analysis and solving are scheduled
+                ("sequential", "speculative" or "fused")
             
         Returns:
             Dictionary with question, analysis, solution, and video_path
@@ -222,6 +282,21 @@ class Pragyan:
         # Determine if input is URL or text
         is_url = input_source.startswith(('http://', 'https://'))
         
+        with tracing.span(
+            "process", tracer=self.tracer,
+            input="url" if is_url else "text", strategy=SolveStrategy(strategy).value
+        ):
+            return self._process(input_source, is_url, language, generate_video, output_filename, strategy)
+    
+    def _process(
+        self,
+        input_source: str,
+        is_url: bool,
+        language: Union[str, ProgrammingLanguage],
+        generate_video: bool,
+        output_filename: Optional[str],
+        strategy: Union[str, SolveStrategy]
+    ) -> Dict[str, Any]:
         # Get question
         if is_url:
             question = self.scrape_question(input_source)
@@ -233,7 +308,7 @@ class Pragyan:
             language = ProgrammingLanguage.from_string(language)
         
         # Analyze and solve
-        solution, analysis = self.solve_complete(question, language)
+        solution, analysis = self.solve_complete(question, language, strategy)
         
         # Generate video if requested
         video_path = None
@@ -258,6 +333,31 @@ class Pragyan:
             "video_path": video_path,
         }
     
+    def process_batch(
+        self,
+        items: Iterable[Union[str, BatchItem]],
+        language: Union[str, ProgrammingLanguage] = "python",
+        generate_video: bool = False,
+        batch_config: Optional[BatchConfig] = None
+    ) -> Iterator[BatchResult]:
+        """
+        Process many problems concurrently
+        
+        Scraping, analysis, solving and rendering each have their own
+        concurrency limit (see BatchConfig). Results are yielded as soon
+        as each item finishes, so they can be streamed to disk.
+        
+        Args:
+            items: URLs/problem texts or BatchItem objects
+            language: Default programming language for items without one
+            generate_video: Whether to generate an explanation video per item
+            batch_config: Optional per-stage concurrency limits
+            
+        Returns:
+            Iterator of BatchResult objects in completion order
+        """
+        return BatchRunner(self, batch_config).run(items, language, generate_video)
+    
     def generate_test_cases(self, question: Question, num_cases: int = 5) -> list:
         """
         Generate test cases for a problem
@@ -271,6 +371,73 @@ class Pragyan:
         """
         return self.solver.generate_test_cases(question, num_cases)
     
+    def verify_solution(
+        self,
+        question: Question,
+        solution: Solution,
+        test_cases: Optional[List[Dict[str, Any]]] = None,
+        num_cases: int = 5
+    ) -> ExecutionReport:
+        """
+        Run a solution's code against test cases in isolated worker processes
+        
+        Args:
+            question: The DSA question
+            solution: Solution to check
+            test_cases: Cases to run; defaults to the question's examples plus
+                num_cases generated ones
+            num_cases: Number of test cases to generate when none are given
+            
+        Returns:
+            ExecutionReport with pass/fail and runtime per case
+        """
+        with tracing.activate(self.tracer):
+            return self.solver.verify_solution(question, solution, test_cases, num_cases, self.sandbox)
+    
+    def profile_solution(
+        self,
+        question: Question,
+        solution: Solution,
+        config: Optional[ProfileConfig] = None
+    ) -> ComplexityReport:
+        """
+        Measure a solution's time and memory growth on inputs built from the question's constraints
+        
+        Args:
+            question: The DSA question
+            solution: Python solution to profile
+            config: Sizes, repeats and time budget
+            
+        Returns:
+            ComplexityReport with measured vs. claimed complexity and a TLE projection
+            at the constraint limit
+        """
+        with tracing.activate(self.tracer):
+            return self.solver.profile_solution(question, solution, config, self.sandbox)
+    
+    def stress_solution(
+        self,
+        question: Question,
+        solution: Solution,
+        orders: Optional[List[str]] = None,
+        size: Optional[int] = None
+    ) -> ExecutionReport:
+        """
+        Run a solution on worst-case inputs (sorted, reversed, all-equal, deep recursion shapes, ...)
+        at the largest size the question's constraints allow
+        
+        Args:
+            question: The DSA question
+            solution: Python solution to run
+            orders: Input orders to try (default: all)
+            size: Input size to use instead of the constraint limit
+            
+        Returns:
+            ExecutionReport with one case per input, failing on timeouts, memory errors and crashes
+        """
+        with tracing.activate(self.tracer):
+            return self.solver.stress_solution(question, solution, orders, size, self.sandbox)
+    
     def explain_concept(self, concept: str) -> str:
         """
         Get a detailed explanation of a DSA concept
@@ -283,17 +450,257 @@ class Pragyan:
         """
         return self.solver.explain_concept(concept)
     
-    def compare_approaches(self, question: Question) -> Dict[str, Any]:
+    def compare_approaches(
+        self,
+        question: Question,
+        benchmark: bool = False,
+        config: Optional[ProfileConfig] = None
+    ) -> Dict[str, Any]:
         """
         Compare different approaches to solve the problem
         
         Args:
             question: The DSA question
+            benchmark: Also get runnable code for each approach and measure their
+                runtimes and peak memory on the same inputs at increasing sizes
+            config: Sizes, repeats and time budget for the measurements
             
         Returns:
-            Dictionary with different approaches and trade-offs
+            Dictionary with different approaches and trade-offs; with benchmark,
+            "benchmark" holds the measured table next to the claimed complexities
         """
-        return self.solver.compare_approaches(question)
+        with tracing.activate(self.tracer):
+            return self.solver.compare_approaches(question, benchmark, config, self.sandbox if benchmark else None)
+
+
+class AsyncPragyan:
+    """
+    Asyncio version of Pragyan for services that solve many problems at once
+    
+    LLM calls go through the providers' async SDKs and scraping through an
+    async HTTP client, so one event loop can keep hundreds of requests in
+    flight. Rendering still happens in Manim subprocesses and is run in a
+    worker thread.
+    
+    Example:
+        >>> import asyncio
+        >>> from pragyan import AsyncPragyan
+        >>> 
+        >>> pragyan = AsyncPragyan(provider="groq", api_key="YOUR_API_KEY")
+        >>> result = asyncio.run(pragyan.process(
+        ...     "https://leetcode.com/problems/two-sum", generate_video=False
+        ... ))
+    """
+    
+    def __init__(
+        self,
+        provider: str,
+        api_key: str,
+        model: Optional[str] = None,
+        video_config: Optional[VideoConfig] = None,
+        cache: Optional[ResponseCache] = None,
+        scrape_cache: Optional[ScrapeCache] = None,
+        tracer: Optional[Tracer] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+    ):
+        """
+        Initialize AsyncPragyan
+        
+        Args:
+            provider: LLM provider - "gemini", "groq" or "fake" (offline)
+            api_key: API key for the provider
+            model: Optional model name override
+            video_config: Optional video configuration
+            cache: Optional LLM response cache for reusing results across runs
+            scrape_cache: Optional cache of scraped questions, keyed by URL
+            tracer: Optional tracer that records a span per stage and LLM call
+            rate_limiter: Optional RateLimiter, which may be shared with threaded clients
+        """
+        self.provider = provider.lower()
+        self.api_key = api_key
+        self.model = model
+        self.cache = cache
+        self.tracer = tracer
+        
+        self.llm = AsyncLLMClient(
+            provider=self.provider, api_key=api_key, model=model, cache=cache, rate_limiter=rate_limiter
+        )
+        self.scraper = QuestionScraper(cache=scrape_cache)
+        self.video_config = video_config or VideoConfig()
+        
+        # Sync client for the video generator, which runs in a worker thread
+        self._sync_llm: Optional[LLMClient] = None
+    
+    async def scrape_question(self, url: str) -> Question:
+        """Scrape a question from a URL"""
+        with tracing.activate(self.tracer):
+            return await self.scraper.scrape_url_async(url)
+    
+    def parse_question(self, text: str) -> Question:
+        """Parse a question from plain text"""
+        return self.scraper.parse_text_question(text)
+    
+    async def analyze(self, question: Question) -> Dict[str, Any]:
+        """Analyze a question to understand concepts and approach"""
+        with tracing.activate(self.tracer), tracing.span("analyze"):
+            return await self.llm.analyze_question(question)
+    
+    async def solve(
+        self,
+        question: Question,
+        language: Union[str, ProgrammingLanguage],
+        analysis: Optional[Dict[str, Any]] = None
+    ) -> Solution:
+        """Generate a solution for the DSA question"""
+        if isinstance(language, str):
+            language = ProgrammingLanguage.from_string(language)
+        
+        if analysis is None:
+            analysis = await self.analyze(question)
+        
+        return await self._generate_solution(question, language, analysis)
+    
+    async def _generate_solution(
+        self,
+        question: Question,
+        language: ProgrammingLanguage,
+        analysis: Optional[Dict[str, Any]]
+    ) -> Solution:
+        with tracing.activate(self.tracer), tracing.span(
+            "solve", language=language.value, with_analysis=analysis is not None
+        ):
+            return await self.llm.generate_solution(question, language, analysis)
+    
+    async def solve_complete(
+        self,
+        question: Question,
+        language: Union[str, ProgrammingLanguage],
+        strategy: Union[str, SolveStrategy] = SolveStrategy.SEQUENTIAL
+    ) -> tuple:
+        """Complete analysis and solution generation, returns (Solution, analysis dict)"""
+        import asyncio
+        
+        if isinstance(language, str):
+            language = ProgrammingLanguage.from_string(language)
+        strategy = SolveStrategy(strategy)
+        
+        if strategy == SolveStrategy.FUSED:
+            with tracing.activate(self.tracer), tracing.span("analyze_and_solve", language=language.value):
+                analysis, solution = await self.llm.analyze_and_solve(question, language)
+        elif strategy == SolveStrategy.SPECULATIVE:
+            analysis, solution = await asyncio.gather(
+                self.analyze(question),
+                self._generate_solution(question, language, None),
+            )
+        else:
+            analysis = await self.analyze(question)
+            solution = await self.solve(question, language, analysis)
+        
+        return solution, analysis
+    
+    async def generate_video(
+        self,
+        question: Question,
+        solution: Solution,
+        analysis: Optional[Dict[str, Any]] = None,
+        output_filename: Optional[str] = None,
+        use_simple: bool = False
+    ) -> Path:
+        """Generate an explanation video in a worker thread"""
+        import asyncio
+        
+        if analysis is None:
+            analysis = await self.analyze(question)
+        
+        if use_simple:
+            generator = SimpleVideoGenerator(self.video_config)
+            return await asyncio.to_thread(generator.generate_slideshow, question, solution, analysis)
+        
+        if self._sync_llm is None:
+            self._sync_llm = LLMClient(
+                provider=self.provider, api_key=self.api_key, model=self.model, cache=self.cache
+            )
+        
+        # Video generators keep per-render temp state, so use one per call
+        video_generator = VideoGenerator(self.video_config)
+        video_generator.set_llm_client(self._sync_llm)
+        with tracing.activate(self.tracer):
+            # to_thread copies the context, so render spans join this trace
+            return await asyncio.to_thread(
+                video_generator.generate_video, question, solution, analysis,
+                output_filename=output_filename
+            )
+    
+    async def process(
+        self,
+        input_source: str,
+        language: Union[str, ProgrammingLanguage] = "python",
+        generate_video: bool = True,
+        output_filename: Optional[str] = None,
+        strategy: Union[str, SolveStrategy] = SolveStrategy.SEQUENTIAL
+    ) -> Dict[str, Any]:
+        """
+        Complete processing pipeline
+        
+        Args:
+            input_source: URL or text of the problem
+            language: Programming language for solution
+            generate_video: Whether to generate explanation video
+            output_filename: Optional video output filename
+            strategy: How analysis and solving are scheduled
+                ("sequential", "speculative" or "fused")
+            
+        Returns:
+            Dictionary with question, analysis, solution, and video_path
+        """
+        is_url = input_source.startswith(('http://', 'https://'))
+        
+        with tracing.span(
+            "process", tracer=self.tracer,
+            input="url" if is_url else "text", strategy=SolveStrategy(strategy).value
+        ):
+            return await self._process(input_source, is_url, language, generate_video, output_filename, strategy)
+    
+    async def _process(
+        self,
+        input_source: str,
+        is_url: bool,
+        language: Union[str, ProgrammingLanguage],
+        generate_video: bool,
+        output_filename: Optional[str],
+        strategy: Union[str, SolveStrategy]
+    ) -> Dict[str, Any]:
+        if is_url:
+            question = await self.scrape_question(input_source)
+        else:
+            question = self.parse_question(input_source)
+        
+        if isinstance(language, str):
+            language = ProgrammingLanguage.from_string(language)
+        
+        solution, analysis = await self.solve_complete(question, language, strategy)
+        
+        video_path = None
+        if generate_video:
+            try:
+                video_path = await self.generate_video(
+                    question, solution, analysis, output_filename
+                )
+            except Exception:
+                # Try simple video generator as fallback
+                try:
+                    video_path = await self.generate_video(
+                        question, solution, analysis, output_filename, use_simple=True
+                    )
+                except Exception:
+                    pass  # Video generation failed
+        
+        return {
+            "question": question,
+            "analysis": analysis,
+            "solution": solution,
+            "video_path": video_path,
+        }
 
 
 def solve_from_url(
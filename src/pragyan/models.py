@@ -54,6 +54,14 @@ class LLMProvider(Enum):
     """Supported LLM providers"""
     GEMINI = "gemini"
     GROQ = "groq"
+    FAKE = "fake"  # Offline fixture responses for tests and benchmarks
+
+
+class SolveStrategy(Enum):
+    """How analysis and solution generation are scheduled"""
+    SEQUENTIAL = "sequential"    # analyze, then solve with the analysis as context
+    SPECULATIVE = "speculative"  # send both requests at the same time
+    FUSED = "fused"              # one structured prompt returns both
 
 
 @dataclass
@@ -67,6 +75,7 @@ class Question:
     topics: List[str] = field(default_factory=list)
     url: Optional[str] = None
     raw_text: Optional[str] = None
+    scrape_tier: Optional[str] = None  # api, structured, http, browser, langchain
     
     def to_prompt(self) -> str:
         """Convert question to a prompt string"""
@@ -90,6 +99,35 @@ class Question:
                 prompt += f"- {constraint}\n"
         
         return prompt
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert question to dictionary"""
+        return {
+            "title": self.title,
+            "description": self.description,
+            "examples": self.examples,
+            "constraints": self.constraints,
+            "difficulty": self.difficulty,
+            "topics": self.topics,
+            "url": self.url,
+            "raw_text": self.raw_text,
+            "scrape_tier": self.scrape_tier,
+        }
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Question":
+        """Create a question from a dictionary produced by to_dict"""
+        return cls(
+            title=data.get("title", ""),
+            description=data.get("description", ""),
+            examples=data.get("examples") or [],
+            constraints=data.get("constraints") or [],
+            difficulty=data.get("difficulty"),
+            topics=data.get("topics") or [],
+            url=data.get("url"),
+            raw_text=data.get("raw_text"),
+            scrape_tier=data.get("scrape_tier"),
+        )
 
 
 @dataclass
@@ -132,6 +170,13 @@ class VideoConfig:
     code_font: str = "Consolas"
     include_audio: bool = False
     animation_speed: float = 1.0
+    use_render_cache: bool = True  # Reuse earlier renders of byte-identical scenes
+    render_workers: Optional[int] = None  # Parallel section renders (None = CPU count, 1 = off)
+    scene_source: str = "trace"  # trace (compiled step trace), code (free-form LLM scene), generic
+    scene_repair_attempts: int = 1  # LLM repair rounds for generated scenes that fail validation
+    max_video_seconds: Optional[float] = None  # Budget for estimated video length
+    max_render_seconds: Optional[float] = None  # Budget for estimated render time
+    over_budget: str = "downgrade"  # reject, trim, downgrade
     
     @property
     def pixel_height(self) -> int:
@@ -167,6 +212,72 @@ class LLMConfig:
                 self.model = "gemini-3.0-pro-preview"
             elif self.provider == LLMProvider.GROQ:
                 self.model = "openai/gpt-oss-120b"
+            elif self.provider == LLMProvider.FAKE:
+                self.model = "fake"
+
+
+@dataclass
+class BatchConfig:
+    """Concurrency limits for batch processing, one per pipeline stage"""
+    scrape_concurrency: int = 4
+    analyze_concurrency: int = 8
+    solve_concurrency: int = 8
+    render_concurrency: int = 1
+    max_workers: Optional[int] = None  # Defaults to the sum of the stage limits
+    
+    @property
+    def stage_limits(self) -> Dict[str, int]:
+        """Get concurrency limit for each stage"""
+        return {
+            "scrape": self.scrape_concurrency,
+            "analyze": self.analyze_concurrency,
+            "solve": self.solve_concurrency,
+            "render": self.render_concurrency,
+        }
+
+
+@dataclass
+class FailoverConfig:
+    """Retry, failover and hedging policy for an LLM client with several providers"""
+    max_retries: int = 2  # Extra attempts on the same provider after a transient error
+    backoff_base: float = 0.5  # Seconds before the first retry; doubles each time, with full jitter
+    backoff_max: float = 8.0
+    rate_limit_cooldown: float = 30.0  # Seconds a rate-limited provider is tried last (unless it says when)
+    hedge: bool = False  # Also ask the next provider when the first is slower than usual
+    hedge_percentile: float = 0.95  # Latency percentile of the first provider that triggers the hedge
+    hedge_delay: Optional[float] = None  # Fixed hedge delay in seconds instead of the percentile
+    hedge_min_samples: int = 5  # Latencies observed before the percentile is trusted
+
+
+@dataclass
+class RateLimitConfig:
+    """Client-side request and token budgets for one provider or model"""
+    requests_per_minute: Optional[int] = None
+    tokens_per_minute: Optional[int] = None  # Prompt + completion tokens
+    completion_tokens_estimate: int = 1024  # Reserved per request until the real size is known
+
+
+@dataclass
+class ExecutionConfig:
+    """Worker pool size and resource limits for running generated solutions"""
+    workers: Optional[int] = None  # Pre-warmed worker processes (None = CPU count)
+    cpu_time_limit: float = 2.0  # CPU seconds per test case (whole seconds for compiled programs)
+    wall_time_limit: float = 10.0  # Wall-clock seconds per test case (catches sleeping or blocked code)
+    memory_limit_mb: int = 256  # Address space per run (a heap cap for JVM, Node and Go)
+    compile_timeout: float = 60.0
+
+
+@dataclass
+class ProfileConfig:
+    """Input sizes and time budget for measuring how a solution's cost grows"""
+    min_size: int = 16
+    growth: float = 2.0  # Each input is this many times larger than the previous one
+    max_size: int = 1 << 17  # Largest input tried (the constraint limit if that is smaller)
+    repeats: int = 3  # Timed calls per size; the fastest counts
+    size_time_budget: float = 0.5  # Stop growing once a call takes longer than this many seconds
+    time_limit: float = 2.0  # Projected seconds at the constraint limit that count as a TLE
+    order: str = "random"  # Element order of the inputs, e.g. "sorted" or "deep" (see constraints.ORDERS)
+    seed: int = 0
 
 
 @dataclass 
@@ -0,0 +1,408 @@
+"""
+Complexity profiler for Pragyan - measures how a generated solution's cost really grows
+Runs the code on inputs of growing size, fits growth curves and checks them against the claimed complexity
+"""
+
+import math
+import re
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Optional, Dict, Any, List, Tuple, Callable
+
+from pragyan.models import Question, Solution, ProgrammingLanguage, ProfileConfig
+from pragyan.constraints import Constraints
+from pragyan.stress import StressGenerator, StressInput
+from pragyan.sandbox import SandboxPool, get_default_sandbox
+from pragyan._sandbox_worker import entry_parameters
+from pragyan import tracing
+
+
+# Growth models from slowest- to fastest-growing
+MODELS: List[Tuple[str, Callable[[float], float]]] = [
+    ("O(1)", lambda n: 1.0),
+    ("O(log n)", lambda n: math.log2(max(n, 2.0))),
+    ("O(n)", lambda n: float(n)),
+    ("O(n log n)", lambda n: n * math.log2(max(n, 2.0))),
+    ("O(n^2)", lambda n: float(n) ** 2),
+    ("O(n^3)", lambda n: float(n) ** 3),
+    ("O(2^n)", lambda n: 2.0 ** min(n, 1000)),
+]
+_RANK = {name: rank for rank, (name, _) in enumerate(MODELS)}
+_GROWTH = dict(MODELS)
+
+# A log factor is too small to tell apart reliably over the sizes we can afford to run
+_ALIKE = {frozenset(("O(1)", "O(log n)")), frozenset(("O(n)", "O(n log n)"))}
+
+# Claimed complexities as written by the model, normalized (see parse_complexity)
+_CLAIMS = {
+    "1": "O(1)",
+    "logn": "O(log n)",
+    "n": "O(n)", "n+m": "O(n)", "m+n": "O(n)", "m*n": "O(n)", "n*m": "O(n)", "mn": "O(n)", "nm": "O(n)",
+    "nlogn": "O(n log n)",
+    "n^2": "O(n^2)", "n*n": "O(n^2)",
+    "n^3": "O(n^3)",
+    "2^n": "O(2^n)", "n*2^n": "O(2^n)",
+}
+# Fewer sizes than this cannot tell the models apart
+_MIN_POINTS = 4
+# Calls faster than this are mostly interpreter overhead
+_MIN_TIME = 2e-5
+# Peaks that never reach this many bytes are interpreter bookkeeping, i.e. constant space
+_MIN_BYTES = 4096
+
+
+def parse_complexity(text: Optional[str]) -> Optional[str]:
+    """
+    The growth model of a claimed complexity such as "O(n log n) - sorting dominates"
+
+    Grid sizes (m*n, m+n) count as O(n) because profiling grows the number of cells.
+
+    Returns:
+        A name from MODELS, or None when the claim is missing or uses other variables
+    """
+    if not text:
+        return None
+    match = re.search(r"O\s*\(((?:[^()]|\([^()]*\))*)\)", text, re.IGNORECASE)
+    if not match:
+        return None
+    claim = match.group(1).lower().replace("²", "^2").replace("³", "^3")
+    claim = re.sub(r"log\s*_?\s*2?\s*\(?\s*n\s*\)?", "logn", claim)
+    claim = re.sub(r"[\s·⋅×]", "", claim).replace("**", "^").replace("*logn", "logn")
+    claim = re.sub(r"\^\{(\w+)\}", r"^\1", claim)
+    return _CLAIMS.get(claim)
+
+
+@dataclass
+class GrowthFit:
+    """cost(n) = coefficient * model(n) + constant, fitted to measurements"""
+    model: str
+    coefficient: float
+    constant: float
+    error: float  # Root mean square relative error of the fit
+
+    def predict(self, n: float) -> float:
+        """Fitted cost at size n"""
+        return self.coefficient * _GROWTH[self.model](n) + self.constant
+
+
+def _fit_model(name: str, points: List[Tuple[float, float]]) -> Optional[GrowthFit]:
+    """Weighted least squares (weights 1/y^2, i.e. relative error) with non-negative terms"""
+    f = _GROWTH[name]
+    rows = []
+    for n, y in points:
+        x = f(n)
+        if not math.isfinite(x):
+            return None
+        rows.append((x, y, 1.0 / (y * y)))
+
+    sw = sum(w for _, _, w in rows)
+    sx = sum(w * x for x, _, w in rows)
+    sy = sum(w * y for _, y, w in rows)
+    sxx = sum(w * x * x for x, _, w in rows)
+    sxy = sum(w * x * y for x, y, w in rows)
+    det = sxx * sw - sx * sx
+    a, b = ((sxy * sw - sx * sy) / det, (sxx * sy - sx * sxy) / det) if det > 1e-12 * sxx * sw else (0.0, sy / sw)
+    if b < 0:
+        a, b = sxy / sxx, 0.0
+    if a < 0:
+        a, b = 0.0, sy / sw
+
+    error = math.sqrt(sum(((a * x + b - y) / y) ** 2 for x, y, _ in rows) / len(rows))
+    return GrowthFit(name, a, b, error)
+
+
+def fit_growth(points: List[Tuple[float, float]], tolerance: float = 0.05) -> Optional[GrowthFit]:
+    """
+    The growth model that best explains (size, cost) measurements
+
+    Every model in MODELS is fitted as a * model(n) + b; among those within
+    tolerance of the best fit, the slowest-growing one wins, so noise does not
+    push the answer towards a steeper curve.
+
+    Args:
+        points: (n, cost) pairs, e.g. (size, seconds) or (size, bytes)
+        tolerance: Extra relative error allowed for a simpler model
+
+    Returns:
+        The chosen fit, or None with fewer than four distinct sizes
+    """
+    points = [(float(n), max(float(y), 1e-12)) for n, y in points if n and y is not None]
+    if len({n for n, _ in points}) < _MIN_POINTS:
+        return None
+    largest = max(n for n, _ in points)
+    fits = [
+        fit for name, _ in MODELS
+        if not (name == "O(2^n)" and largest > 64)
+        for fit in [_fit_model(name, points)] if fit is not None
+    ]
+    best = min(fit.error for fit in fits)
+    return next(fit for fit in fits if fit.error <= best * (1 + tolerance) + tolerance / 10)
+
+
+@dataclass
+class ProfilePoint:
+    """Measurements at one input size"""
+    n: int
+    time_s: float
+    peak_bytes: Optional[int] = None
+
+
+@dataclass
+class ComplexityReport:
+    """Measured growth of a solution next to the complexity it claims"""
+    status: str = "ok"  # "ok", "unsupported" or "error"
+    points: List[ProfilePoint] = field(default_factory=list)
+    size_parameter: Optional[str] = None  # Parameter whose size was grown
+    time_fit: Optional[GrowthFit] = None
+    space_fit: Optional[GrowthFit] = None
+    claimed_time: Optional[str] = None
+    claimed_space: Optional[str] = None
+    max_size: Optional[int] = None  # Largest size the constraints allow
+    projected_max_s: Optional[float] = None  # Fitted time at max_size
+    time_limit: float = 2.0
+    stopped: Optional[str] = None  # Why sizes stopped growing early ("timeout", "memory", "error")
+    error: Optional[str] = None
+
+    @property
+    def time_mismatch(self) -> Optional[bool]:
+        """Whether measured and claimed time complexity differ (None if either is unknown)"""
+        return _mismatch(self.time_fit, self.claimed_time)
+
+    @property
+    def space_mismatch(self) -> Optional[bool]:
+        """Whether measured and claimed space complexity differ (None if either is unknown)"""
+        return _mismatch(self.space_fit, self.claimed_space)
+
+    @property
+    def would_tle(self) -> Optional[bool]:
+        """Whether the solution is projected to exceed time_limit at the largest allowed input"""
+        if self.stopped == "timeout" and (self.max_size is None or self.points[-1:] and self.points[-1].n < self.max_size):
+            return True
+        if self.projected_max_s is None:
+            return None
+        return self.projected_max_s > self.time_limit
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert report to a JSON-serializable dictionary"""
+        return {
+            "status": self.status,
+            "size_parameter": self.size_parameter,
+            "measured_time": self.time_fit.model if self.time_fit else None,
+            "measured_space": self.space_fit.model if self.space_fit else None,
+            "claimed_time": self.claimed_time,
+            "claimed_space": self.claimed_space,
+            "time_mismatch": self.time_mismatch,
+            "space_mismatch": self.space_mismatch,
+            "max_size": self.max_size,
+            "projected_max_s": self.projected_max_s,
+            "would_tle": self.would_tle,
+            "stopped": self.stopped,
+            "error": self.error,
+            "points": [{"n": p.n, "time_s": p.time_s, "peak_bytes": p.peak_bytes} for p in self.points],
+        }
+
+
+def _mismatch(fit: Optional[GrowthFit], claimed: Optional[str]) -> Optional[bool]:
+    if fit is None or claimed is None:
+        return None
+    return fit.model != claimed and frozenset((fit.model, claimed)) not in _ALIKE
+
+
+@dataclass
+class ApproachTable:
+    """Measurements of several approaches to one problem, all run on the same inputs"""
+    sizes: List[int] = field(default_factory=list)  # Input sizes every approach was given
+    reports: Dict[str, ComplexityReport] = field(default_factory=dict)  # Approach name -> its measurements
+
+    @property
+    def fastest(self) -> Optional[str]:
+        """The approach that got furthest through the sizes, the quickest one at that size on ties"""
+        measured = [(name, report.points[-1]) for name, report in self.reports.items() if report.points]
+        if not measured:
+            return None
+        return min(measured, key=lambda item: (-item[1].n, item[1].time_s))[0]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert table to a JSON-serializable dictionary"""
+        return {
+            "sizes": self.sizes,
+            "fastest": self.fastest,
+            "approaches": [{"name": name, **report.to_dict()} for name, report in self.reports.items()],
+        }
+
+
+class ComplexityProfiler:
+    """
+    Measures a solution's running time and memory on inputs of growing size
+
+    Inputs are synthesized from the question's constraints (array lengths,
+    value ranges, character sets), growing geometrically from min_size up to
+    the constraint limit or until one call exceeds the per-size budget. The
+    measurements are fitted against O(1) ... O(2^n) and compared with the
+    solution's claimed time and space complexity, and the time fit is
+    extrapolated to the largest input the constraints allow.
+
+    Example:
+        >>> report = ComplexityProfiler().profile(question, solution)
+        >>> if report.time_mismatch or report.would_tle:
+        ...     print(report.time_fit.model, "measured,", report.claimed_time, "claimed")
+        >>> table = ComplexityProfiler().compare(question, {"Brute force": slow, "Hash map": fast})
+    """
+
+    def __init__(self, config: Optional[ProfileConfig] = None, sandbox: Optional[SandboxPool] = None):
+        """
+        Initialize the profiler
+
+        Args:
+            config: Sizes, repeats and time budget
+            sandbox: Worker pool the solution runs in (defaults to the process-wide one)
+        """
+        self.config = config or ProfileConfig()
+        self.sandbox = sandbox
+
+    def profile(self, question: Question, solution: Solution, entry_point: Optional[str] = None) -> ComplexityReport:
+        """
+        Profile a solution against its question's constraints
+
+        Args:
+            question: Question whose constraints shape the inputs
+            solution: Python solution to profile
+            entry_point: Function or Solution method to call instead of the one found automatically
+
+        Returns:
+            ComplexityReport with measurements, fits, mismatches and the TLE projection
+        """
+        report, parameters = self._start(solution, entry_point)
+        if parameters is None:
+            return report
+
+        with tracing.span("profile", language=solution.language.value) as span:
+            constraints = Constraints.parse(question.constraints)
+            with StressGenerator(constraints, parameters, seed=self.config.seed) as generator:
+                inputs = self._write_inputs(generator)
+                self._measure(self.sandbox or get_default_sandbox(), solution, inputs, report, generator, entry_point)
+            span.set(
+                sizes=len(report.points),
+                measured_time=report.time_fit.model if report.time_fit else None,
+                time_mismatch=report.time_mismatch,
+            )
+        return report
+
+    def compare(self, question: Question, solutions: Dict[str, Solution]) -> ApproachTable:
+        """
+        Profile several solutions to the same question side by side
+
+        Every approach gets the same generated inputs, and the approaches run
+        at the same time in separate sandbox workers (up to the pool size), so
+        timings are only comparable when the machine has a core per worker.
+
+        Args:
+            question: Question whose constraints shape the inputs
+            solutions: Approach name -> Python solution; all must take the same arguments
+
+        Returns:
+            ApproachTable with one ComplexityReport per approach
+        """
+        table = ApproachTable()
+        parameters: Dict[str, Optional[List[str]]] = {}
+        for name, solution in solutions.items():
+            table.reports[name], parameters[name] = self._start(solution)
+        shared = next((names for names in parameters.values() if names is not None), None)
+        if shared is None:
+            return table
+        for name, names in parameters.items():
+            if names is not None and len(names) != len(shared):
+                table.reports[name].status = "error"
+                table.reports[name].error = f"Takes ({', '.join(names)}), other approaches take ({', '.join(shared)})"
+                parameters[name] = None
+        runnable = [name for name, names in parameters.items() if names is not None]
+
+        with tracing.span("profile.compare", approaches=len(runnable)) as span:
+            sandbox = self.sandbox or get_default_sandbox()
+            constraints = Constraints.parse(question.constraints)
+            with StressGenerator(constraints, shared, seed=self.config.seed) as generator:
+                inputs = self._write_inputs(generator)
+                table.sizes = [stress_input.size for stress_input in inputs]
+
+                def measure(name: str):
+                    self._measure(sandbox, solutions[name], inputs, table.reports[name], generator)
+
+                with ThreadPoolExecutor(max_workers=max(1, min(sandbox.size, len(runnable))),
+                                        thread_name_prefix="pragyan-compare") as pool:
+                    list(pool.map(tracing.propagate(measure), runnable))
+            span.set(fastest=table.fastest)
+        return table
+
+    def _start(self, solution: Solution, entry_point: Optional[str] = None) -> Tuple[ComplexityReport, Optional[List[str]]]:
+        """An empty report for solution, and its parameters (None when it cannot be profiled)"""
+        report = ComplexityReport(
+            claimed_time=parse_complexity(solution.time_complexity),
+            claimed_space=parse_complexity(solution.space_complexity),
+            time_limit=self.config.time_limit,
+        )
+        if solution.language != ProgrammingLanguage.PYTHON:
+            report.status, report.error = "unsupported", "Only Python solutions can be profiled"
+            return report, None
+        try:
+            return report, entry_parameters(solution.code, entry_point)
+        except (SyntaxError, ValueError) as e:
+            report.status, report.error = "error", f"{type(e).__name__}: {e}"
+            return report, None
+
+    def _write_inputs(self, generator: StressGenerator) -> List[StressInput]:
+        return [generator.write(n, self.config.order) for n in self._sizes(generator.max_size)]
+
+    def _measure(
+        self,
+        sandbox: SandboxPool,
+        solution: Solution,
+        inputs: List[StressInput],
+        report: ComplexityReport,
+        generator: StressGenerator,
+        entry_point: Optional[str] = None
+    ):
+        report.size_parameter, report.max_size = generator.size_parameter, generator.max_size
+        raw = sandbox.profile(
+            solution, inputs, repeats=self.config.repeats,
+            size_time_budget=self.config.size_time_budget, entry_point=entry_point,
+        )
+        self._read_points(report, raw)
+
+    def _sizes(self, max_size: Optional[int]) -> List[int]:
+        """Sizes to run: geometric up to the limit, or every few steps for small limits such as n <= 45"""
+        cap = min(self.config.max_size, max_size) if max_size else self.config.max_size
+        if cap <= 64:
+            step = max(1, cap // 12)
+            return list(range(step, cap + 1, step))
+        sizes, n = [], float(min(self.config.min_size, cap))
+        while n <= cap:
+            if not sizes or int(n) > sizes[-1]:
+                sizes.append(int(n))
+            n *= self.config.growth
+        if sizes[-1] != cap:
+            sizes.append(cap)
+        return sizes
+
+    def _read_points(self, report: ComplexityReport, raw: List[Dict[str, Any]]):
+        for point in raw:
+            if point.get("status") != "ok":
+                report.stopped = point.get("status")
+                if point.get("n") is None:
+                    report.status, report.error = "error", point.get("error")
+                elif point.get("error"):
+                    report.error = point["error"]
+                break
+            report.points.append(ProfilePoint(point["n"], point["time_s"], point.get("peak_bytes")))
+
+        # Sizes where the call is too quick to time say more about the interpreter than the algorithm
+        timed = [(p.n, p.time_s) for p in report.points if p.time_s >= _MIN_TIME]
+        if len(timed) < _MIN_POINTS:
+            timed = [(p.n, p.time_s) for p in report.points]
+        report.time_fit = fit_growth(timed)
+        peaks = [(p.n, p.peak_bytes + 1) for p in report.points if p.peak_bytes is not None]
+        if len(peaks) >= _MIN_POINTS and max(peak for _, peak in peaks) < _MIN_BYTES:
+            report.space_fit = GrowthFit("O(1)", 0.0, sum(peak for _, peak in peaks) / len(peaks), 0.0)
+        else:
+            report.space_fit = fit_growth(peaks)
+        if report.time_fit is not None and report.max_size:
+            report.projected_max_s = round(report.time_fit.predict(report.max_size), 6)
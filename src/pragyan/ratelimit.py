@@ -0,0 +1,370 @@
+"""
+Rate limiting for Pragyan - keeps LLM requests within each provider's per-minute budgets
+Callers queue fairly by priority instead of failing with provider rate-limit errors
+"""
+
+import contextvars
+import heapq
+import itertools
+import json
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Optional, Dict, Any, List, Iterator, Callable, Union
+
+from pragyan.models import LLMConfig, RateLimitConfig
+from pragyan.llm_client import BaseLLMClient, AsyncBaseLLMClient
+from pragyan import tracing
+
+
+# Lower values are served first
+INTERACTIVE = 0
+BATCH = 10
+
+_priority: contextvars.ContextVar[int] = contextvars.ContextVar("pragyan_priority", default=INTERACTIVE)
+
+
+@contextmanager
+def priority(level: int) -> Iterator[None]:
+    """
+    Queue LLM requests made inside the block at this priority
+
+    Requests default to INTERACTIVE; BatchRunner marks its work BATCH so a
+    user waiting on a single solve is served ahead of queued batch items.
+    """
+    token = _priority.set(level)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+def estimate_tokens(*texts: Optional[str]) -> int:
+    """Rough token count (4 characters per token) of prompt or response text"""
+    return max(1, sum(len(text or "") for text in texts) // 4)
+
+
+class TokenBucket:
+    """Budget that refills continuously up to one minute's worth"""
+
+    def __init__(self, per_minute: float, clock: Callable[[], float] = time.monotonic):
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.level = self.capacity
+        self._clock = clock
+        self._updated = clock()
+
+    def _refill(self):
+        now = self._clock()
+        self.level = min(self.capacity, self.level + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def wait_time(self, amount: float) -> float:
+        """Seconds until amount is available (requests above capacity wait for a full bucket)"""
+        self._refill()
+        amount = min(amount, self.capacity)
+        return 0.0 if self.level >= amount else (amount - self.level) / self.rate
+
+    def take(self, amount: float):
+        self._refill()
+        self.level -= min(amount, self.capacity)
+
+    def adjust(self, amount: float):
+        """Charge (positive) or refund (negative) once the real usage is known"""
+        self._refill()
+        self.level = min(self.capacity, self.level - amount)
+
+
+class _Waiter:
+    __slots__ = ("priority", "seq", "tokens", "wake", "granted", "queued_at")
+
+    def __init__(self, priority: int, seq: int, tokens: int, wake: Callable[[], None], queued_at: float):
+        self.priority = priority
+        self.seq = seq
+        self.tokens = tokens
+        self.wake = wake
+        self.granted = False
+        self.queued_at = queued_at
+
+    def __lt__(self, other: "_Waiter") -> bool:
+        return (self.priority, self.seq) < (other.priority, other.seq)
+
+
+class _Lane:
+    """Budgets, queue and wait statistics of one provider/model"""
+
+    def __init__(self, name: str, limits: RateLimitConfig):
+        self.name = name
+        self.limits = limits
+        self.requests = TokenBucket(limits.requests_per_minute) if limits.requests_per_minute else None
+        self.tokens = TokenBucket(limits.tokens_per_minute) if limits.tokens_per_minute else None
+        self.queue: List[_Waiter] = []
+        self.granted = 0
+        self.max_queued = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self.recent_waits: deque = deque(maxlen=200)
+
+    def wait_time(self, tokens: int) -> float:
+        return max(
+            self.requests.wait_time(1) if self.requests else 0.0,
+            self.tokens.wait_time(tokens) if self.tokens else 0.0,
+        )
+
+    def take(self, tokens: int):
+        if self.requests:
+            self.requests.take(1)
+        if self.tokens:
+            self.tokens.take(tokens)
+
+
+class Reservation:
+    """Budget held for one request; settle() corrects the token estimate afterwards"""
+
+    def __init__(self, limiter: "RateLimiter", lane: _Lane, tokens: int, waited: float):
+        self._limiter = limiter
+        self._lane = lane
+        self.tokens = tokens
+        self.waited = waited
+
+    def settle(self, actual_tokens: int):
+        """Charge or refund the difference between the estimate and the real token count"""
+        if self._lane.tokens is None:
+            return
+        with self._limiter._lock:
+            self._lane.tokens.adjust(actual_tokens - self.tokens)
+            self.tokens = actual_tokens
+            self._limiter._dispatch(self._lane)
+
+
+class RateLimiter:
+    """
+    Shared scheduler for LLM requests across threads and asyncio tasks
+
+    Each provider (or provider:model) has a requests-per-minute and a
+    tokens-per-minute token bucket. A request waits until both can pay for
+    it; waiting requests are served strictly by priority, then in arrival
+    order, so a large request cannot be overtaken indefinitely by small ones.
+    Providers without limits are never delayed.
+
+    Example:
+        >>> limiter = RateLimiter({
+        ...     "groq": RateLimitConfig(requests_per_minute=30, tokens_per_minute=6000),
+        ...     "gemini:gemini-2.0-flash": RateLimitConfig(requests_per_minute=15),
+        ... })
+        >>> pragyan = Pragyan(provider="groq", api_key=KEY, rate_limiter=limiter)
+    """
+
+    def __init__(self, limits: Optional[Dict[str, RateLimitConfig]] = None):
+        """
+        Initialize the rate limiter
+
+        Args:
+            limits: Budgets keyed by provider ("groq") or provider and model
+                ("groq:llama-3.3-70b-versatile"); the more specific key wins
+        """
+        self.limits = dict(limits or {})
+        self._lanes: Dict[str, _Lane] = {}
+        self._lock = threading.Lock()
+        self._ready = threading.Condition(self._lock)
+        self._seq = itertools.count()
+
+    def limits_for(self, config: LLMConfig) -> RateLimitConfig:
+        """Budgets that apply to a provider and model (unlimited if none are configured)"""
+        specific = self.limits.get(f"{config.provider.value}:{config.model}")
+        return specific or self.limits.get(config.provider.value) or RateLimitConfig()
+
+    def _lane(self, config: LLMConfig) -> _Lane:
+        name = f"{config.provider.value}:{config.model}"
+        lane = self._lanes.get(name)
+        if lane is None:
+            lane = self._lanes[name] = _Lane(name, self.limits_for(config))
+        return lane
+
+    def estimate(self, config: LLMConfig, prompt: str, system_prompt: Optional[str] = None) -> int:
+        """Tokens to reserve for a request: the prompt plus the expected completion"""
+        return estimate_tokens(prompt, system_prompt) + self.limits_for(config).completion_tokens_estimate
+
+    def _dispatch(self, lane: _Lane) -> Optional[float]:
+        """Grant queued requests the budget now allows; seconds until the next can go (lock held)"""
+        while lane.queue:
+            head = lane.queue[0]
+            delay = lane.wait_time(head.tokens)
+            if delay > 0:
+                return delay
+            heapq.heappop(lane.queue)
+            lane.take(head.tokens)
+            head.granted = True
+            head.wake()
+        return None
+
+    def _abandon(self, lane: _Lane, waiter: _Waiter):
+        """Withdraw an interrupted or cancelled request: dequeue it, or refund its budget (lock held)"""
+        if waiter.granted:
+            if lane.requests:
+                lane.requests.adjust(-1)
+            if lane.tokens:
+                lane.tokens.adjust(-waiter.tokens)
+        elif waiter in lane.queue:
+            lane.queue.remove(waiter)
+            heapq.heapify(lane.queue)
+        self._dispatch(lane)
+
+    def _enqueue(self, lane: _Lane, tokens: int, level: Optional[int], wake: Callable[[], None]) -> _Waiter:
+        waiter = _Waiter(
+            _priority.get() if level is None else level, next(self._seq), tokens, wake, time.monotonic()
+        )
+        heapq.heappush(lane.queue, waiter)
+        lane.max_queued = max(lane.max_queued, len(lane.queue))
+        return waiter
+
+    def _granted(self, lane: _Lane, waiter: _Waiter) -> Reservation:
+        waited = time.monotonic() - waiter.queued_at
+        lane.granted += 1
+        lane.wait_total += waited
+        lane.wait_max = max(lane.wait_max, waited)
+        lane.recent_waits.append(waited)
+        tracing.annotate(rate_limit_wait=round(waited, 6))
+        return Reservation(self, lane, waiter.tokens, waited)
+
+    def acquire(self, config: LLMConfig, tokens: int = 1, level: Optional[int] = None) -> Reservation:
+        """
+        Block until the provider's budget allows a request
+
+        Args:
+            config: Provider and model the request goes to
+            tokens: Tokens to reserve (see estimate())
+            level: Priority (defaults to the one set with priority())
+
+        Returns:
+            Reservation to settle() with the real token count
+        """
+        with self._lock:
+            lane = self._lane(config)
+            waiter = self._enqueue(lane, tokens, level, self._ready.notify_all)
+            try:
+                while True:
+                    delay = self._dispatch(lane)
+                    if waiter.granted:
+                        return self._granted(lane, waiter)
+                    self._ready.wait(timeout=delay)
+            except BaseException:
+                self._abandon(lane, waiter)
+                raise
+
+    async def acquire_async(self, config: LLMConfig, tokens: int = 1, level: Optional[int] = None) -> Reservation:
+        """Asyncio counterpart of acquire(); waits without blocking the event loop"""
+        import asyncio
+
+        loop = asyncio.get_running_loop()
+        ready = asyncio.Event()
+
+        def wake():
+            # Called with the lock held, possibly from another thread
+            self._ready.notify_all()
+            try:
+                loop.call_soon_threadsafe(ready.set)
+            except RuntimeError:
+                pass  # the waiting loop has been closed
+
+        with self._lock:
+            lane = self._lane(config)
+            waiter = self._enqueue(lane, tokens, level, wake)
+            delay = self._dispatch(lane)
+
+        try:
+            while not waiter.granted:
+                try:
+                    await asyncio.wait_for(ready.wait(), timeout=delay)
+                except asyncio.TimeoutError:
+                    pass
+                ready.clear()
+                with self._lock:
+                    delay = self._dispatch(lane)
+        except BaseException:
+            with self._lock:
+                self._abandon(lane, waiter)
+            raise
+
+        with self._lock:
+            return self._granted(lane, waiter)
+
+    def metrics(self) -> Dict[str, Dict[str, Any]]:
+        """Queue depth and wait times per provider:model"""
+        with self._lock:
+            result = {}
+            for name, lane in self._lanes.items():
+                waits = sorted(lane.recent_waits)
+                result[name] = {
+                    "queued": len(lane.queue),
+                    "max_queued": lane.max_queued,
+                    "granted": lane.granted,
+                    "wait_total": lane.wait_total,
+                    "wait_mean": lane.wait_total / lane.granted if lane.granted else 0.0,
+                    "wait_p95": waits[int(0.95 * (len(waits) - 1))] if waits else 0.0,
+                    "wait_max": lane.wait_max,
+                }
+            return result
+
+
+def _result_tokens(prompt: str, system_prompt: Optional[str], result: Union[str, Dict[str, Any]]) -> int:
+    text = result if isinstance(result, str) else json.dumps(result)
+    return estimate_tokens(prompt, system_prompt, text)
+
+
+class RateLimitedClient(BaseLLMClient):
+    """Provider client wrapper that waits for the rate limiter before every request"""
+
+    def __init__(self, client: BaseLLMClient, limiter: RateLimiter):
+        super().__init__(client.config)
+        self.client = client
+        self.limiter = limiter
+
+    def _call(self, method: str, prompt: str, system_prompt: Optional[str]) -> Any:
+        reservation = self.limiter.acquire(self.config, self.limiter.estimate(self.config, prompt, system_prompt))
+        result = getattr(self.client, method)(prompt, system_prompt)
+        reservation.settle(_result_tokens(prompt, system_prompt, result))
+        return result
+
+    def generate(self, prompt: str, system_prompt: Optional[str] = None) -> str:
+        return self._call("generate", prompt, system_prompt)
+
+    def generate_json(self, prompt: str, system_prompt: Optional[str] = None) -> Dict[str, Any]:
+        return self._call("generate_json", prompt, system_prompt)
+
+    def generate_stream(self, prompt: str, system_prompt: Optional[str] = None) -> Iterator[str]:
+        return self._stream("generate_stream", prompt, system_prompt)
+
+    def generate_json_stream(self, prompt: str, system_prompt: Optional[str] = None) -> Iterator[str]:
+        return self._stream("generate_json_stream", prompt, system_prompt)
+
+    def _stream(self, method: str, prompt: str, system_prompt: Optional[str]) -> Iterator[str]:
+        reservation = self.limiter.acquire(self.config, self.limiter.estimate(self.config, prompt, system_prompt))
+        chunks = []
+        for chunk in getattr(self.client, method)(prompt, system_prompt):
+            chunks.append(chunk)
+            yield chunk
+        reservation.settle(_result_tokens(prompt, system_prompt, "".join(chunks)))
+
+
+class AsyncRateLimitedClient(AsyncBaseLLMClient):
+    """Asyncio counterpart of RateLimitedClient"""
+
+    def __init__(self, client: AsyncBaseLLMClient, limiter: RateLimiter):
+        super().__init__(client.config)
+        self.client = client
+        self.limiter = limiter
+
+    async def _call(self, method: str, prompt: str, system_prompt: Optional[str]) -> Any:
+        tokens = self.limiter.estimate(self.config, prompt, system_prompt)
+        reservation = await self.limiter.acquire_async(self.config, tokens)
+        result = await getattr(self.client, method)(prompt, system_prompt)
+        reservation.settle(_result_tokens(prompt, system_prompt, result))
+        return result
+
+    async def generate(self, prompt: str, system_prompt: Optional[str] = None) -> str:
+        return await self._call("generate", prompt, system_prompt)
+
+    async def generate_json(self, prompt: str, system_prompt: Optional[str] = None) -> Dict[str, Any]:
+        return await self._call("generate_json", prompt, system_prompt)
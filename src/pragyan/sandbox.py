@@ -0,0 +1,493 @@
+"""
+Execution sandbox for Pragyan - runs generated solutions against test cases
+Each run happens in a separate, resource-limited process started by a pool of warm workers
+"""
+
+import atexit
+import json
+import os
+import queue
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional, Dict, Any, List, Iterable, Tuple, Union
+
+from pragyan.models import Solution, ProgrammingLanguage, ExecutionConfig
+from pragyan.stress import StressInput
+from pragyan import tracing
+
+
+_WORKER_SCRIPT = str(Path(__file__).with_name("_sandbox_worker.py"))
+
+
+@dataclass(frozen=True)
+class _Toolchain:
+    """How to build and start a program in one language ({mem} = memory limit in MB)"""
+    source: str
+    compile: Tuple[str, ...] = ()
+    run: Tuple[str, ...] = ("./main",)
+    limit_address_space: bool = True  # Off for runtimes that reserve far more virtual memory than they use
+
+
+# Python runs in-process in the worker (function calls); everything else as a stdin/stdout program
+_TOOLCHAINS: Dict[ProgrammingLanguage, _Toolchain] = {
+    ProgrammingLanguage.C: _Toolchain("main.c", ("gcc", "-O2", "-o", "main", "main.c", "-lm")),
+    ProgrammingLanguage.CPP: _Toolchain("main.cpp", ("g++", "-O2", "-std=c++17", "-o", "main", "main.cpp")),
+    ProgrammingLanguage.RUST: _Toolchain("main.rs", ("rustc", "-O", "-o", "main", "main.rs")),
+    ProgrammingLanguage.GO: _Toolchain("main.go", ("go", "build", "-o", "main", "main.go"), limit_address_space=False),
+    ProgrammingLanguage.SWIFT: _Toolchain("main.swift", ("swiftc", "-O", "-o", "main", "main.swift")),
+    ProgrammingLanguage.JAVA: _Toolchain(
+        "{java_class}.java", ("javac", "{java_class}.java"), ("java", "-Xmx{mem}m", "{java_class}"),
+        limit_address_space=False
+    ),
+    ProgrammingLanguage.KOTLIN: _Toolchain(
+        "main.kt", ("kotlinc", "main.kt", "-include-runtime", "-d", "main.jar"), ("java", "-Xmx{mem}m", "-jar", "main.jar"),
+        limit_address_space=False
+    ),
+    ProgrammingLanguage.JAVASCRIPT: _Toolchain(
+        "main.js", (), ("node", "--max-old-space-size={mem}", "main.js"), limit_address_space=False
+    ),
+    ProgrammingLanguage.TYPESCRIPT: _Toolchain(
+        "main.ts", ("tsc", "--target", "es2020", "main.ts"), ("node", "--max-old-space-size={mem}", "main.js"),
+        limit_address_space=False
+    ),
+    ProgrammingLanguage.CSHARP: _Toolchain(
+        "Main.cs", ("mcs", "-out:main.exe", "Main.cs"), ("mono", "main.exe"), limit_address_space=False
+    ),
+}
+
+_JAVA_CLASS = re.compile(r"public\s+(?:final\s+)?class\s+(\w+)")
+
+
+@dataclass
+class CaseResult:
+    """Outcome of one test case"""
+    index: int
+    status: str  # "passed", "failed", "error", "timeout" or "memory"
+    runtime_s: float = 0.0  # Wall-clock time of the call (or the whole program run)
+    cpu_s: float = 0.0
+    input: Any = None
+    expected: Any = None
+    output: Optional[str] = None
+    error: Optional[str] = None
+
+    @property
+    def passed(self) -> bool:
+        """Whether the output matched the expected output"""
+        return self.status == "passed"
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert result to a JSON-serializable dictionary"""
+        return {
+            "index": self.index,
+            "status": self.status,
+            "runtime_s": self.runtime_s,
+            "cpu_s": self.cpu_s,
+            "input": self.input,
+            "expected": self.expected,
+            "output": self.output,
+            "error": self.error,
+        }
+
+
+@dataclass
+class ExecutionReport:
+    """Outcome of running one solution against its test cases"""
+    language: ProgrammingLanguage
+    status: str = "ok"  # "ok", "compile_error", "unsupported" or "error"
+    cases: List[CaseResult] = field(default_factory=list)
+    error: Optional[str] = None  # Compiler output or why nothing ran
+    elapsed: float = 0.0
+
+    @property
+    def passed(self) -> bool:
+        """Whether there were test cases and every one passed"""
+        return self.status == "ok" and bool(self.cases) and all(case.passed for case in self.cases)
+
+    @property
+    def pass_count(self) -> int:
+        """Number of passing test cases"""
+        return sum(case.passed for case in self.cases)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert report to a JSON-serializable dictionary"""
+        return {
+            "language": self.language.value,
+            "status": self.status,
+            "passed": self.passed,
+            "pass_count": self.pass_count,
+            "total": len(self.cases),
+            "error": self.error,
+            "elapsed": self.elapsed,
+            "cases": [case.to_dict() for case in self.cases],
+        }
+
+
+def normalize_test_case(test_case: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    {"input", "expected"} from a generated test case or question example
+
+    Accepts "expected_output" (generate_test_cases), "output" (scraped
+    examples) or "expected"; returns None when there is nothing to compare to.
+    """
+    if not isinstance(test_case, dict) or "input" not in test_case:
+        return None
+    for key in ("expected_output", "expected", "output"):
+        if key in test_case:
+            return {"input": test_case["input"], "expected": test_case[key]}
+    return None
+
+
+class _Worker:
+    """One warm sandbox worker process (see _sandbox_worker.py)"""
+
+    def __init__(self):
+        self.proc = subprocess.Popen(
+            [sys.executable, "-I", "-u", _WORKER_SCRIPT],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            encoding="utf-8",
+        )
+
+    @property
+    def alive(self) -> bool:
+        return self.proc.poll() is None
+
+    def request(self, payload: Dict[str, Any], timeout: float) -> Optional[Dict[str, Any]]:
+        """Send one request; None if the worker died or had to be killed"""
+        timer = threading.Timer(timeout, self.proc.kill)
+        timer.daemon = True
+        timer.start()
+        try:
+            self.proc.stdin.write(json.dumps(payload) + "\n")
+            self.proc.stdin.flush()
+            line = self.proc.stdout.readline()
+        except OSError:
+            line = ""
+        finally:
+            timer.cancel()
+        return json.loads(line) if line else None
+
+    def close(self):
+        try:
+            self.proc.stdin.close()
+            self.proc.wait(timeout=2)
+        except (OSError, subprocess.TimeoutExpired):
+            self.proc.kill()
+
+
+class SandboxPool:
+    """
+    Pool of pre-warmed worker processes that run generated solutions
+
+    Python solutions are called as functions (a Solution method or a top-level
+    function, with arguments read from inputs like "nums = [2,7], target = 9")
+    and all test cases of one solution run in a single forked process. Other
+    languages are compiled once and run as stdin/stdout programs, one process
+    per case. Every run gets a CPU time limit per case, a memory limit and a
+    wall-clock timeout; a run that hangs or crashes only costs its worker.
+
+    This isolates crashes and runaway solutions from Pragyan, but it is not a
+    security boundary against deliberately malicious code.
+
+    Example:
+        >>> with SandboxPool(ExecutionConfig(cpu_time_limit=1.0)) as sandbox:
+        ...     report = sandbox.run(solution, test_cases)
+        >>> print(f"{report.pass_count}/{len(report.cases)} passed")
+    """
+
+    def __init__(self, config: Optional[ExecutionConfig] = None):
+        """
+        Initialize the pool (workers start on start() or the first run)
+
+        Args:
+            config: Worker count and resource limits
+        """
+        self.config = config or ExecutionConfig()
+        self.size = max(1, self.config.workers or os.cpu_count() or 2)
+        self._idle: "queue.Queue[_Worker]" = queue.Queue()
+        self._lock = threading.Lock()
+        self._started = False
+        self._closed = False
+
+    def __enter__(self) -> "SandboxPool":
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def start(self) -> "SandboxPool":
+        """Start every worker now, so the first runs don't pay for interpreter startup"""
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Sandbox pool is closed")
+            if not self._started:
+                for _ in range(self.size):
+                    self._idle.put(_Worker())
+                self._started = True
+        return self
+
+    def close(self):
+        """Stop every idle worker; busy ones stop when their run finishes"""
+        with self._lock:
+            self._closed = True
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                break
+
+    def _request(self, payload: Dict[str, Any], timeout: float) -> Optional[Dict[str, Any]]:
+        self.start()
+        worker = self._idle.get()
+        response = None
+        try:
+            response = worker.request(payload, timeout)
+        finally:
+            # A worker that died, was killed or asked to be recycled is replaced with a fresh one
+            if response is None or response.get("recycle") or not worker.alive:
+                worker.close()
+                worker = _Worker()
+            if self._closed:
+                worker.close()
+            else:
+                self._idle.put(worker)
+        return response
+
+    def run(
+        self,
+        solution: Solution,
+        test_cases: Iterable[Dict[str, Any]],
+        entry_point: Optional[str] = None
+    ) -> ExecutionReport:
+        """
+        Run a solution against test cases
+
+        Args:
+            solution: Solution whose code and language are run
+            test_cases: Dicts with "input" and "expected_output" (or "output")
+            entry_point: Python only - function or Solution method to call,
+                instead of the one found automatically
+
+        Returns:
+            ExecutionReport with pass/fail and runtime per case
+        """
+        cases = [case for case in map(normalize_test_case, test_cases) if case is not None]
+        started = time.perf_counter()
+        with tracing.span("sandbox.run", language=solution.language.value, cases=len(cases)) as span:
+            if not cases:
+                report = ExecutionReport(solution.language, status="error", error="No test cases with an expected output")
+            elif solution.language == ProgrammingLanguage.PYTHON:
+                report = self._run_python(solution, cases, entry_point)
+            else:
+                report = self._run_program(solution, cases)
+            report.elapsed = round(time.perf_counter() - started, 6)
+            span.set(status=report.status, passed=report.pass_count)
+        return report
+
+    def run_many(
+        self,
+        jobs: Iterable[Tuple[Solution, List[Dict[str, Any]]]]
+    ) -> List[ExecutionReport]:
+        """
+        Run several (solution, test_cases) pairs in parallel, one per worker
+
+        Returns:
+            Reports in the order of jobs
+        """
+        jobs = list(jobs)
+        with ThreadPoolExecutor(max_workers=self.size, thread_name_prefix="pragyan-sandbox") as pool:
+            return list(pool.map(tracing.propagate(lambda job: self.run(*job)), jobs))
+
+    def stress(
+        self,
+        solution: Solution,
+        inputs: Iterable[StressInput],
+        entry_point: Optional[str] = None
+    ) -> ExecutionReport:
+        """
+        Run a Python solution on generated worst-case inputs (see StressGenerator)
+
+        There is no expected output: a case passes when it finishes within this
+        pool's CPU, wall-clock and memory limits. Arguments are memory-mapped
+        from the input files by the worker rather than sent through the pipe.
+
+        Args:
+            solution: Python solution to run
+            inputs: Inputs written by StressGenerator
+            entry_point: Function or Solution method to call instead of the one found automatically
+
+        Returns:
+            ExecutionReport with one case per input, labelled with its order and size
+        """
+        if solution.language != ProgrammingLanguage.PYTHON:
+            raise ValueError(f"Stress inputs run Python solutions only, not {solution.language.value}")
+        cases = [stress_input.to_case() for stress_input in inputs]
+        started = time.perf_counter()
+        with tracing.span("sandbox.stress", language=solution.language.value, cases=len(cases)) as span:
+            report = self._run_python(solution, cases, entry_point)
+            report.elapsed = round(time.perf_counter() - started, 6)
+            span.set(status=report.status, passed=report.pass_count)
+        return report
+
+    def profile(
+        self,
+        solution: Solution,
+        inputs: Iterable[Union[Tuple[int, List[Any]], StressInput]],
+        repeats: int = 3,
+        size_time_budget: float = 1.0,
+        entry_point: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Time a Python solution on inputs of growing size (see ComplexityProfiler)
+
+        All sizes run in one forked process with this pool's limits per call;
+        sizes stop growing after the first call slower than size_time_budget.
+
+        Args:
+            solution: Python solution to profile
+            inputs: (size, arguments) pairs or StressInputs, smallest first
+            repeats: Timed calls per size; the fastest is reported
+            size_time_budget: Seconds per call after which larger sizes are skipped
+            entry_point: Function or Solution method to call instead of the one found automatically
+
+        Returns:
+            One dict per size tried: n, status ("ok", "timeout", "memory", "error"),
+            time_s and peak_bytes (traced Python allocations during the call)
+        """
+        if solution.language != ProgrammingLanguage.PYTHON:
+            raise ValueError(f"Profiling runs Python solutions only, not {solution.language.value}")
+        points = [
+            item.to_point() if isinstance(item, StressInput) else {"n": item[0], "args": json.dumps(item[1])}
+            for item in inputs
+        ]
+        payload = {
+            "mode": "profile", "code": solution.code, "entry_point": entry_point,
+            "inputs": points,
+            "repeats": repeats, "size_time_budget": size_time_budget, **self._limits(),
+        }
+        timeout = self.config.wall_time_limit * 6 * repeats * max(1, len(points)) + 15
+        with tracing.span("sandbox.profile", sizes=len(points)):
+            response = self._request(payload, timeout)
+        if response is None:
+            return [{"n": points[0]["n"] if points else None, "status": "timeout", "error": "Sandbox worker stopped"}]
+        if "error" in response:
+            return [{"n": None, "status": "error", "error": response["error"]}]
+        return response["points"]
+
+    def _limits(self) -> Dict[str, Any]:
+        return {
+            "cpu_time_limit": self.config.cpu_time_limit,
+            "wall_time_limit": self.config.wall_time_limit,
+            "memory_limit_mb": self.config.memory_limit_mb,
+        }
+
+    def _run_python(
+        self,
+        solution: Solution,
+        cases: List[Dict[str, Any]],
+        entry_point: Optional[str]
+    ) -> ExecutionReport:
+        payload = {"mode": "python", "code": solution.code, "cases": cases, "entry_point": entry_point, **self._limits()}
+        timeout = self.config.wall_time_limit * len(cases) + 15
+        return self._report(solution.language, cases, self._request(payload, timeout))
+
+    def _run_program(self, solution: Solution, cases: List[Dict[str, Any]]) -> ExecutionReport:
+        language = solution.language
+        toolchain = _TOOLCHAINS.get(language)
+        if toolchain is None:
+            return ExecutionReport(language, status="unsupported", error=f"Cannot run {language.value} code")
+
+        names = {"mem": str(self.config.memory_limit_mb), "java_class": self._java_class(solution.code)}
+        compile_cmd = [part.format(**names) for part in toolchain.compile]
+        run_cmd = [part.format(**names) for part in toolchain.run]
+        missing = [cmd[0] for cmd in (compile_cmd, run_cmd) if cmd and not cmd[0].startswith(".") and not shutil.which(cmd[0])]
+        if missing:
+            return ExecutionReport(language, status="unsupported", error=f"{', '.join(missing)} not found on PATH")
+
+        directory = tempfile.mkdtemp(prefix="pragyan-sandbox-")
+        try:
+            Path(directory, toolchain.source.format(**names)).write_text(solution.code, encoding="utf-8")
+            error = self._compile(compile_cmd, directory)
+            if error is not None:
+                return ExecutionReport(language, status="compile_error", error=error)
+
+            payload = {
+                "mode": "program", "argv": run_cmd, "cwd": directory, "cases": cases,
+                "limit_address_space": toolchain.limit_address_space, **self._limits(),
+            }
+            timeout = (self.config.wall_time_limit + 1) * len(cases) + 15
+            return self._report(language, cases, self._request(payload, timeout))
+        finally:
+            shutil.rmtree(directory, ignore_errors=True)
+
+    def _compile(self, command: List[str], directory: str) -> Optional[str]:
+        """Build the program; compiler output on failure, None on success"""
+        if not command:
+            return None
+        with tracing.span("sandbox.compile", compiler=command[0]):
+            try:
+                proc = subprocess.run(
+                    command, cwd=directory, capture_output=True, text=True, timeout=self.config.compile_timeout
+                )
+            except subprocess.TimeoutExpired:
+                return f"Compilation took longer than {self.config.compile_timeout}s"
+        if proc.returncode != 0:
+            return (proc.stderr or proc.stdout).strip()[-2000:] or f"{command[0]} exited with {proc.returncode}"
+        return None
+
+    @staticmethod
+    def _java_class(code: str) -> str:
+        match = _JAVA_CLASS.search(code)
+        return match.group(1) if match else "Main"
+
+    @staticmethod
+    def _report(
+        language: ProgrammingLanguage,
+        cases: List[Dict[str, Any]],
+        response: Optional[Dict[str, Any]]
+    ) -> ExecutionReport:
+        if response is None:
+            return ExecutionReport(language, status="error", error="Sandbox worker stopped (timeout or crash)", cases=[
+                CaseResult(index, "timeout", input=case["input"], expected=case.get("expected"))
+                for index, case in enumerate(cases)
+            ])
+        if "error" in response:
+            return ExecutionReport(language, status="error", error=response["error"])
+
+        results = []
+        for case, result in zip(cases, response["cases"]):
+            results.append(CaseResult(
+                index=result["index"],
+                status=result["status"],
+                runtime_s=result["runtime_s"],
+                cpu_s=result["cpu_s"],
+                input=case["input"],
+                expected=case.get("expected"),
+                output=result["output"],
+                error=result["error"],
+            ))
+        return ExecutionReport(language, cases=results)
+
+
+_default_sandbox: Optional[SandboxPool] = None
+_default_sandbox_lock = threading.Lock()
+
+
+def get_default_sandbox() -> SandboxPool:
+    """Get the process-wide sandbox shared by callers that were not given one"""
+    global _default_sandbox
+    with _default_sandbox_lock:
+        if _default_sandbox is None or _default_sandbox._closed:
+            _default_sandbox = SandboxPool()
+            atexit.register(_default_sandbox.close)
+        return _default_sandbox
@@ -0,0 +1,333 @@
+"""
+Scene estimator for Pragyan - predicts video length and render cost from scene source
+Lets callers plan (or refuse) a render before Manim is started
+"""
+
+import ast
+from dataclasses import dataclass
+from typing import Optional, Dict, Any, List, Tuple
+
+from pragyan.models import VideoConfig
+
+
+# Manim's own defaults when run_time / wait duration are not given
+DEFAULT_RUN_TIME = 1.0
+DEFAULT_WAIT_TIME = 1.0
+
+# Assumed iteration count for loops whose length is not a literal
+DEFAULT_LOOP_ITERATIONS = 4
+
+# (resolution, fps) of each video_quality preset, highest first
+QUALITY_PRESETS = {
+    "production_quality": ("4k", 60),
+    "high_quality": ("1080p", 60),
+    "medium_quality": ("720p", 30),
+    "low_quality": ("480p", 15),
+}
+
+# Rough Cairo renderer costs, measured on a single core
+RENDER_STARTUP_SECONDS = 8.0
+SECONDS_PER_PLAY = 0.3
+SECONDS_PER_MEGAPIXEL_FRAME = 0.05
+
+
+@dataclass
+class SceneEstimate:
+    """Predicted length and render cost of a scene"""
+    duration: float
+    play_calls: int
+    wait_calls: int
+    fps: int
+    pixel_width: int
+    pixel_height: int
+
+    @property
+    def frames(self) -> int:
+        """Number of frames Manim will render"""
+        return int(round(self.duration * self.fps))
+
+    @property
+    def frame_seconds(self) -> float:
+        """Part of the render time spent drawing frames (scales with duration)"""
+        megapixels = self.pixel_width * self.pixel_height / 1_000_000
+        return self.frames * megapixels * SECONDS_PER_MEGAPIXEL_FRAME
+
+    @property
+    def render_seconds(self) -> float:
+        """Estimated single-process render time in seconds"""
+        return RENDER_STARTUP_SECONDS + self.play_calls * SECONDS_PER_PLAY + self.frame_seconds
+
+    def for_config(self, config: VideoConfig) -> "SceneEstimate":
+        """The same scene rendered with another resolution and frame rate"""
+        return SceneEstimate(
+            duration=self.duration,
+            play_calls=self.play_calls,
+            wait_calls=self.wait_calls,
+            fps=config.fps,
+            pixel_width=config.pixel_width,
+            pixel_height=config.pixel_height,
+        )
+
+    def by_quality(self) -> Dict[str, Dict[str, float]]:
+        """Frame count and render seconds for every video_quality preset"""
+        presets = {}
+        for quality, (resolution, fps) in QUALITY_PRESETS.items():
+            estimate = self.for_config(VideoConfig(resolution=resolution, fps=fps))
+            presets[quality] = {
+                "frames": estimate.frames,
+                "render_seconds": round(estimate.render_seconds, 1),
+            }
+        return presets
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert estimate to dictionary"""
+        return {
+            "duration": round(self.duration, 2),
+            "play_calls": self.play_calls,
+            "wait_calls": self.wait_calls,
+            "frames": self.frames,
+            "render_seconds": round(self.render_seconds, 1),
+            "by_quality": self.by_quality(),
+        }
+
+
+@dataclass
+class _Cost:
+    duration: float = 0.0
+    plays: int = 0
+    waits: int = 0
+
+    def __add__(self, other: "_Cost") -> "_Cost":
+        return _Cost(self.duration + other.duration, self.plays + other.plays, self.waits + other.waits)
+
+    def __mul__(self, factor: int) -> "_Cost":
+        return _Cost(self.duration * factor, self.plays * factor, self.waits * factor)
+
+
+def _number(node: Optional[ast.AST]) -> Optional[float]:
+    """Value of a numeric literal (including simple arithmetic), else None"""
+    if node is None:
+        return None
+    try:
+        value = ast.literal_eval(node)
+    except (ValueError, TypeError, SyntaxError, MemoryError, RecursionError):
+        if isinstance(node, ast.BinOp):
+            left, right = _number(node.left), _number(node.right)
+            if left is not None and right is not None:
+                if isinstance(node.op, ast.Mult):
+                    return left * right
+                if isinstance(node.op, ast.Div) and right:
+                    return left / right
+                if isinstance(node.op, ast.Add):
+                    return left + right
+                if isinstance(node.op, ast.Sub):
+                    return left - right
+        return None
+    return float(value) if isinstance(value, (int, float)) and not isinstance(value, bool) else None
+
+
+def _keyword(call: ast.Call, name: str) -> Optional[ast.AST]:
+    for keyword in call.keywords:
+        if keyword.arg == name:
+            return keyword.value
+    return None
+
+
+def _loop_iterations(node: ast.AST) -> int:
+    """Iterations of a for loop when they can be read from the source"""
+    if not isinstance(node, ast.For):
+        return DEFAULT_LOOP_ITERATIONS
+
+    target = node.iter
+    if isinstance(target, (ast.List, ast.Tuple)):
+        return len(target.elts)
+
+    if isinstance(target, ast.Call) and isinstance(target.func, ast.Name):
+        if target.func.id == "range":
+            bounds = [_number(arg) for arg in target.args]
+            if bounds and all(b is not None for b in bounds):
+                start, stop, step = 0.0, bounds[0], 1.0
+                if len(bounds) >= 2:
+                    start, stop = bounds[0], bounds[1]
+                if len(bounds) == 3 and bounds[2]:
+                    step = bounds[2]
+                return max(0, int((stop - start) / step))
+        if target.func.id == "enumerate" and target.args:
+            if isinstance(target.args[0], (ast.List, ast.Tuple)):
+                return len(target.args[0].elts)
+
+    return DEFAULT_LOOP_ITERATIONS
+
+
+class _SceneCostVisitor:
+    """Adds up play/wait time through a scene's construct method"""
+
+    def __init__(self, functions: Dict[str, ast.AST]):
+        self.functions = functions
+        self._active: List[str] = []
+
+    def function_cost(self, name: str) -> _Cost:
+        # Recursive helpers (backtracking) are counted once
+        if name not in self.functions or name in self._active:
+            return _Cost()
+        self._active.append(name)
+        try:
+            return self.block_cost(self.functions[name].body)
+        finally:
+            self._active.pop()
+
+    def block_cost(self, statements: List[ast.stmt]) -> _Cost:
+        total = _Cost()
+        for statement in statements:
+            total = total + self.statement_cost(statement)
+        return total
+
+    def statement_cost(self, node: ast.stmt) -> _Cost:
+        if isinstance(node, (ast.For, ast.While)):
+            return self.block_cost(node.body) * _loop_iterations(node) + self.block_cost(node.orelse)
+        if isinstance(node, ast.If):
+            # Assume the more expensive branch is taken
+            body, orelse = self.block_cost(node.body), self.block_cost(node.orelse)
+            return body if body.duration >= orelse.duration else orelse
+        if isinstance(node, ast.With):
+            return self.block_cost(node.body)
+        if isinstance(node, ast.Try):
+            return self.block_cost(node.body) + self.block_cost(node.finalbody)
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            return _Cost()
+
+        total = _Cost()
+        for child in ast.walk(node):
+            if isinstance(child, ast.Call):
+                total = total + self.call_cost(child)
+        return total
+
+    def call_cost(self, call: ast.Call) -> _Cost:
+        func = call.func
+        if isinstance(func, ast.Attribute) and isinstance(func.value, ast.Name) and func.value.id == "self":
+            if func.attr == "play":
+                run_time = _number(_keyword(call, "run_time"))
+                return _Cost(duration=DEFAULT_RUN_TIME if run_time is None else run_time, plays=1)
+            if func.attr == "wait":
+                duration = _number(call.args[0] if call.args else _keyword(call, "duration"))
+                return _Cost(duration=DEFAULT_WAIT_TIME if duration is None else duration, waits=1)
+            return self.function_cost(func.attr)
+        if isinstance(func, ast.Name):
+            return self.function_cost(func.id)
+        return _Cost()
+
+
+def estimate_scene(
+    scene_source: str,
+    scene_class_name: str = "DSAExplanation",
+    config: Optional[VideoConfig] = None
+) -> SceneEstimate:
+    """
+    Estimate a scene's video length and render cost without running Manim
+
+    Sums run_time= and self.wait() values through construct(), following
+    calls to other methods of the scene and to nested helper functions.
+    Loops with literal bounds are multiplied out, other loops are assumed
+    to run DEFAULT_LOOP_ITERATIONS times and if/else takes the longer branch.
+
+    Args:
+        scene_source: Full source of the scene file
+        scene_class_name: Scene class that will be rendered
+        config: Video configuration (resolution and fps of the render)
+
+    Returns:
+        SceneEstimate
+
+    Raises:
+        ValueError: If the source does not parse or the class is missing
+    """
+    config = config or VideoConfig()
+
+    try:
+        tree = ast.parse(scene_source)
+    except SyntaxError as e:
+        raise ValueError(f"Scene does not parse: {e}")
+
+    classes = {node.name: node for node in tree.body if isinstance(node, ast.ClassDef)}
+    if scene_class_name not in classes:
+        raise ValueError(f"Scene class {scene_class_name} not found")
+
+    # Methods from the scene and its base classes in the same file, plus nested helpers
+    functions: Dict[str, ast.AST] = {}
+    class_chain = []
+    current = classes[scene_class_name]
+    while current is not None and current not in class_chain:
+        class_chain.append(current)
+        base = next((b.id for b in current.bases if isinstance(b, ast.Name) and b.id in classes), None)
+        current = classes.get(base) if base else None
+
+    for cls in reversed(class_chain):
+        for node in ast.walk(cls):
+            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                functions[node.name] = node
+    for node in class_chain[0].body:
+        if isinstance(node, ast.FunctionDef):
+            functions[node.name] = node
+
+    cost = _SceneCostVisitor(functions).function_cost("construct")
+
+    return SceneEstimate(
+        duration=cost.duration,
+        play_calls=cost.plays,
+        wait_calls=cost.waits,
+        fps=config.fps,
+        pixel_width=config.pixel_width,
+        pixel_height=config.pixel_height,
+    )
+
+
+class _TimeScaler(ast.NodeTransformer):
+    """Multiplies every run_time= and self.wait() duration by a factor"""
+
+    def __init__(self, factor: float):
+        self.factor = factor
+
+    def _scaled(self, node: Optional[ast.AST], default: float) -> ast.AST:
+        value = _number(node)
+        if value is None and node is not None:
+            return ast.BinOp(left=node, op=ast.Mult(), right=ast.Constant(round(self.factor, 3)))
+        return ast.Constant(round((default if value is None else value) * self.factor, 3))
+
+    def visit_Call(self, node: ast.Call) -> ast.AST:
+        self.generic_visit(node)
+        func = node.func
+        if not (isinstance(func, ast.Attribute) and isinstance(func.value, ast.Name) and func.value.id == "self"):
+            return node
+
+        if func.attr == "play":
+            run_time = _keyword(node, "run_time")
+            node.keywords = [k for k in node.keywords if k.arg != "run_time"]
+            node.keywords.append(ast.keyword(arg="run_time", value=self._scaled(run_time, DEFAULT_RUN_TIME)))
+        elif func.attr == "wait":
+            duration = node.args[0] if node.args else _keyword(node, "duration")
+            node.keywords = [k for k in node.keywords if k.arg != "duration"]
+            node.args = [self._scaled(duration, DEFAULT_WAIT_TIME)] + node.args[1:]
+        return node
+
+
+def trim_scene(scene_source: str, factor: float) -> str:
+    """
+    Speed a scene up by scaling every animation and wait by a factor
+
+    Args:
+        scene_source: Full source of the scene file
+        factor: Multiplier for all durations (e.g. 0.5 halves the video)
+
+    Returns:
+        Rewritten scene source
+    """
+    tree = _TimeScaler(factor).visit(ast.parse(scene_source))
+    return ast.unparse(ast.fix_missing_locations(tree))
+
+
+def downgrade_options(config: VideoConfig) -> List[Tuple[str, str, int]]:
+    """(video_quality, resolution, fps) presets cheaper than the current config"""
+    presets = list(QUALITY_PRESETS.items())
+    names = [quality for quality, _ in presets]
+    start = names.index(config.video_quality) + 1 if config.video_quality in names else 0
+    return [(quality, resolution, fps) for quality, (resolution, fps) in presets[start:]]
@@ -0,0 +1,206 @@
+"""
+Scene validator for Pragyan - static checks on generated Manim code
+Catches broken LLM output before a Manim subprocess is started for it
+"""
+
+import ast
+import builtins
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import List, Optional, Set, FrozenSet
+
+
+# Mobjects that need a LaTeX installation to render
+LATEX_NAMES = frozenset({
+    "Tex", "MathTex", "SingleStringMathTex", "TexTemplate", "TexTemplateLibrary",
+    "Title", "BulletedList", "BraceLabel", "BraceText",
+    "Matrix", "IntegerMatrix", "DecimalMatrix", "MobjectMatrix",
+    "MathTable", "IntegerTable", "DecimalTable",
+    "DecimalNumber", "Integer", "Variable",
+})
+
+# Modules generated scenes may import
+ALLOWED_IMPORTS = frozenset({
+    "manim", "numpy", "math", "random", "itertools", "collections",
+    "functools", "typing", "textwrap", "colorsys", "copy", "heapq",
+})
+
+# Builtins that reach the file system, network or interpreter
+FORBIDDEN_CALLS = frozenset({
+    "open", "exec", "eval", "compile", "__import__", "input",
+    "breakpoint", "globals", "locals", "vars", "getattr", "setattr", "delattr",
+})
+
+# Used when Manim itself is not importable (e.g. validating on a machine without it)
+FALLBACK_MANIM_NAMES = frozenset({
+    # Scenes and config
+    "Scene", "MovingCameraScene", "ThreeDScene", "ZoomedScene", "config",
+    # Mobjects
+    "Mobject", "VMobject", "Group", "VGroup", "Text", "MarkupText", "Paragraph", "Code",
+    "Circle", "Dot", "Square", "Rectangle", "RoundedRectangle", "Triangle", "Polygon",
+    "RegularPolygon", "Ellipse", "Annulus", "Arc", "Sector", "Star", "Line", "DashedLine",
+    "Arrow", "DoubleArrow", "Vector", "CurvedArrow", "Brace", "SurroundingRectangle",
+    "BackgroundRectangle", "Cross", "Underline", "Table", "NumberLine", "Axes",
+    "NumberPlane", "Graph", "DiGraph", "ImageMobject", "ValueTracker", "always_redraw",
+    # Animations
+    "Animation", "AnimationGroup", "LaggedStart", "Succession", "Create", "Uncreate",
+    "Write", "Unwrite", "FadeIn", "FadeOut", "GrowFromCenter", "GrowFromPoint",
+    "GrowFromEdge", "GrowArrow", "SpinInFromNothing", "DrawBorderThenFill",
+    "Transform", "ReplacementTransform", "TransformFromCopy", "FadeTransform",
+    "MoveToTarget", "ApplyMethod", "Indicate", "Flash", "Circumscribe", "Wiggle",
+    "FocusOn", "ShowPassingFlash", "Rotate", "Rotating", "ScaleInPlace", "ShrinkToCenter",
+    "MoveAlongPath", "Wait", "AddTextLetterByLetter",
+    # Directions and constants
+    "UP", "DOWN", "LEFT", "RIGHT", "IN", "OUT", "ORIGIN", "UL", "UR", "DL", "DR",
+    "PI", "TAU", "DEGREES", "SMALL_BUFF", "MED_SMALL_BUFF", "MED_LARGE_BUFF", "LARGE_BUFF",
+    "BOLD", "NORMAL", "ITALIC",
+    "linear", "smooth", "rate_functions", "there_and_back", "rush_into", "rush_from",
+    "interpolate_color", "color_gradient", "ManimColor",
+    # Colors
+    "WHITE", "BLACK", "GRAY", "GREY", "LIGHT_GRAY", "LIGHT_GREY", "DARK_GRAY", "DARK_GREY",
+    "BLUE", "BLUE_A", "BLUE_B", "BLUE_C", "BLUE_D", "BLUE_E",
+    "GREEN", "GREEN_A", "GREEN_B", "GREEN_C", "GREEN_D", "GREEN_E",
+    "RED", "RED_A", "RED_B", "RED_C", "RED_D", "RED_E",
+    "YELLOW", "YELLOW_A", "YELLOW_B", "YELLOW_C", "YELLOW_D", "YELLOW_E",
+    "GOLD", "GOLD_A", "GOLD_B", "GOLD_C", "GOLD_D", "GOLD_E",
+    "PURPLE", "PURPLE_A", "PURPLE_B", "PURPLE_C", "PURPLE_D", "PURPLE_E",
+    "TEAL", "TEAL_A", "TEAL_B", "TEAL_C", "TEAL_D", "TEAL_E",
+    "MAROON", "ORANGE", "PINK", "LIGHT_PINK",
+    # Re-exported by `from manim import *`
+    "np",
+})
+
+SCENE_BASES = ("Scene", "MovingCameraScene", "ThreeDScene", "ZoomedScene")
+
+
+@lru_cache(maxsize=1)
+def get_manim_names() -> FrozenSet[str]:
+    """Names made available by `from manim import *`"""
+    try:
+        import manim
+    except ImportError:
+        return FALLBACK_MANIM_NAMES
+    names = getattr(manim, "__all__", None) or [n for n in dir(manim) if not n.startswith("_")]
+    return frozenset(names) | {"np"}
+
+
+@dataclass
+class ValidationResult:
+    """Outcome of validating a scene"""
+    errors: List[str] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        """Whether the scene passed every check"""
+        return not self.errors
+
+    def __str__(self) -> str:
+        return "\n".join(f"- {error}" for error in self.errors)
+
+
+def _bound_names(tree: ast.AST) -> Set[str]:
+    """Every name the code itself defines, ignoring scope"""
+    names = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Name) and isinstance(node.ctx, (ast.Store, ast.Del)):
+            names.add(node.id)
+        elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            names.add(node.name)
+        elif isinstance(node, ast.arg):
+            names.add(node.arg)
+        elif isinstance(node, (ast.Import, ast.ImportFrom)):
+            for alias in node.names:
+                names.add((alias.asname or alias.name).split(".")[0])
+        elif isinstance(node, ast.ExceptHandler) and node.name:
+            names.add(node.name)
+        elif isinstance(node, (ast.Global, ast.Nonlocal)):
+            names.update(node.names)
+    return names
+
+
+def validate_scene_code(
+    code: str,
+    scene_class_name: str = "AlgorithmScene",
+    allowed_names: Optional[FrozenSet[str]] = None
+) -> ValidationResult:
+    """
+    Statically check generated Manim code before it is rendered
+
+    Checks that the code compiles, defines the expected Scene subclass with a
+    construct method, only uses Manim/builtin/locally defined names, and makes
+    no LaTeX, file system or network calls.
+
+    Args:
+        code: Full scene source
+        scene_class_name: Scene class that will be rendered
+        allowed_names: Names provided by Manim (defaults to get_manim_names())
+
+    Returns:
+        ValidationResult listing every problem found
+    """
+    result = ValidationResult()
+
+    try:
+        tree = ast.parse(code)
+        compile(tree, "<scene>", "exec")
+    except SyntaxError as e:
+        result.errors.append(f"Syntax error on line {e.lineno}: {e.msg}")
+        return result
+
+    # Expected scene class with a construct method
+    scene_class = next(
+        (node for node in tree.body if isinstance(node, ast.ClassDef) and node.name == scene_class_name),
+        None
+    )
+    if scene_class is None:
+        result.errors.append(f"Missing class {scene_class_name}(Scene)")
+    else:
+        bases = {base.id for base in scene_class.bases if isinstance(base, ast.Name)}
+        if not bases.intersection(SCENE_BASES):
+            result.errors.append(f"{scene_class_name} must extend Scene")
+        if not any(
+            isinstance(node, ast.FunctionDef) and node.name == "construct"
+            for node in scene_class.body
+        ):
+            result.errors.append(f"{scene_class_name} has no construct(self) method")
+
+    # Imports
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            modules = [alias.name for alias in node.names]
+        elif isinstance(node, ast.ImportFrom):
+            modules = [node.module or ""]
+        else:
+            continue
+        for module in modules:
+            if module.split(".")[0] not in ALLOWED_IMPORTS:
+                result.errors.append(f"Line {node.lineno}: import of '{module}' is not allowed")
+
+    # Names
+    manim_names = allowed_names if allowed_names is not None else get_manim_names()
+    known = manim_names | _bound_names(tree) | set(dir(builtins))
+    reported = set()
+
+    for node in ast.walk(tree):
+        if not isinstance(node, ast.Name) or not isinstance(node.ctx, ast.Load):
+            continue
+        name = node.id
+        if name in reported:
+            continue
+
+        if name in LATEX_NAMES:
+            result.errors.append(f"Line {node.lineno}: {name} needs LaTeX, use Text() instead")
+        elif name in FORBIDDEN_CALLS:
+            result.errors.append(f"Line {node.lineno}: {name}() is not allowed in scenes")
+        elif name not in known:
+            result.errors.append(f"Line {node.lineno}: unknown name '{name}'")
+        else:
+            continue
+        reported.add(name)
+
+    # Dunder attribute access is the usual way around the name checks
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Attribute) and node.attr.startswith("__") and node.attr != "__init__":
+            result.errors.append(f"Line {node.lineno}: access to '{node.attr}' is not allowed")
+
+    return result
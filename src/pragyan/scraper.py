@@ -4,11 +4,16 @@ Uses LangChain for intelligent web scraping
 """
 
 import re
-import time
-from typing import Optional, Dict, Any, List
+import json
+import threading
+from collections import OrderedDict
+from typing import Optional, Dict, Any, List, Callable, Tuple
 from urllib.parse import urlparse
 
 from pragyan.models import Question
+from pragyan.cache import ScrapeCache
+from pragyan import tracing
+from pragyan.webdriver_pool import WebDriverPool, get_default_pool, wait_until_ready
 
 
 class QuestionScraper:
@@ -26,39 +31,50 @@ class QuestionScraper:
         "practice.geeksforgeeks.org": "gfg",
     }
     
-    def __init__(self):
-        """Initialize the scraper"""
-        self._driver = None
+    HEADERS = {
+        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+    }
     
-    def _get_driver(self):
-        """Get or create Selenium WebDriver"""
-        if self._driver is None:
-            try:
-                from selenium import webdriver
-                from selenium.webdriver.chrome.service import Service
-                from selenium.webdriver.chrome.options import Options
-                from webdriver_manager.chrome import ChromeDriverManager
-                
-                options = Options()
-                options.add_argument("--headless")
-                options.add_argument("--no-sandbox")
-                options.add_argument("--disable-dev-shm-usage")
-                options.add_argument("--disable-gpu")
-                options.add_argument("--window-size=1920,1080")
-                options.add_argument("user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36")
-                
-                service = Service(ChromeDriverManager().install())
-                self._driver = webdriver.Chrome(service=service, options=options)
-            except Exception as e:
-                raise RuntimeError(f"Failed to initialize WebDriver: {e}")
+    LEETCODE_GRAPHQL_URL = "https://leetcode.com/graphql"
+    LEETCODE_QUESTION_QUERY = """
+    query questionData($titleSlug: String!) {
+        question(titleSlug: $titleSlug) {
+            title
+            content
+            difficulty
+            exampleTestcases
+            topicTags { name }
+        }
+    }
+    """
+    GFG_API_URL = "https://practiceapi.geeksforgeeks.org/api/latest/problems/{slug}/"
+    HACKERRANK_API_URL = "https://www.hackerrank.com/rest/contests/master/challenges/{slug}"
+    
+    # Validators (ETag / Last-Modified) remembered for conditional GETs
+    MAX_CONDITIONAL_ENTRIES = 128
+    
+    def __init__(self, driver_pool: Optional[WebDriverPool] = None, cache: Optional[ScrapeCache] = None):
+        """
+        Initialize the scraper
         
-        return self._driver
+        Args:
+            driver_pool: Pool of browsers for JavaScript-rendered sites
+                (defaults to the process-wide pool)
+            cache: Optional cache of scraped questions for reusing results across runs
+        """
+        self._driver_pool = driver_pool
+        self.cache = cache
+        self._session = None
+        self._session_lock = threading.Lock()
+        self._validators: "OrderedDict[str, Tuple[Optional[str], Optional[str], bytes]]" = OrderedDict()
+        self._prefetched: Dict[str, bytes] = {}  # Bodies from failed revalidations, for the HTTP tier
     
-    def _close_driver(self):
-        """Close the WebDriver"""
-        if self._driver:
-            self._driver.quit()
-            self._driver = None
+    @property
+    def driver_pool(self) -> WebDriverPool:
+        """Browser pool used for JavaScript-rendered sites"""
+        if self._driver_pool is None:
+            self._driver_pool = get_default_pool()
+        return self._driver_pool
     
     def scrape_url(self, url: str) -> Question:
         """
@@ -70,10 +86,79 @@ class QuestionScraper:
         Returns:
             Question object with extracted information
         """
-        parsed = urlparse(url)
-        domain = parsed.netloc.lower()
+        with tracing.span("scrape", url=url) as span:
+            question = self._scrape(url)
+            span.set(
+                scrape_tier=question.scrape_tier,
+                cache_hit=question.scrape_tier == "cache",
+                description_chars=len(question.description or ""),
+            )
+            return question
+    
+    def _scrape(self, url: str) -> Question:
+        """Serve a URL from the cache or scrape it"""
+        if self.cache is None:
+            return self._scrape_uncached(url)
+        
+        cached = self.cache.lookup(url)
+        if cached is not None:
+            question, validators, is_fresh = cached
+            if is_fresh or (validators and self._is_unchanged(url, validators)):
+                if not is_fresh:
+                    self.cache.refresh(url)
+                question.scrape_tier = "cache"
+                return question
+        
+        try:
+            question = self._scrape_uncached(url)
+        finally:
+            with self._session_lock:
+                self._prefetched.pop(url, None)
+        self._store_in_cache(url, question)
+        return question
+    
+    def _store_in_cache(self, url: str, question: Question):
+        """Cache a freshly scraped question with the page's validators, if any"""
+        validators = {}
+        if question.scrape_tier in ("http", "structured"):
+            with self._session_lock:
+                etag, last_modified, _ = self._validators.get(url, (None, None, b""))
+            validators = {"etag": etag, "last_modified": last_modified}
+        self.cache.store(url, question, **validators)
+    
+    def _is_unchanged(self, url: str, validators: Dict[str, Any]) -> bool:
+        """
+        Revalidate a cached page with a conditional GET
         
-        site_type = self.SUPPORTED_SITES.get(domain)
+        A changed page comes back in full; its body is kept for the next
+        _http_get of the URL so the scrape that follows does not download it again.
+        """
+        headers = {}
+        if validators.get("etag"):
+            headers["If-None-Match"] = validators["etag"]
+        if validators.get("last_modified"):
+            headers["If-Modified-Since"] = validators["last_modified"]
+        
+        try:
+            response = self._get_session().get(url, headers=headers, timeout=10)
+        except Exception:
+            return False
+        if response.status_code == 304:
+            return True
+        if response.status_code == 200:
+            self._remember_validators(url, response)
+            with self._session_lock:
+                self._prefetched[url] = response.content
+        return False
+    
+    def _scrape_uncached(self, url: str) -> Question:
+        """Scrape a URL through the fast tiers, then the browser/LangChain fallbacks"""
+        site_type = self._site_type(url)
+        
+        # Fast tier: one HTTP round-trip to an API or the raw page
+        question = self._scrape_fast(url, site_type)
+        if question is not None:
+            return question
         
         if site_type == "leetcode":
             return self._scrape_leetcode(url)
@@ -87,30 +172,342 @@ class QuestionScraper:
             # Try generic scraping with LangChain
             return self._scrape_generic(url)
     
-    def _scrape_leetcode(self, url: str) -> Question:
-        """Scrape a LeetCode problem"""
-        try:
-            from bs4 import BeautifulSoup
-            from selenium.webdriver.common.by import By
-            from selenium.webdriver.support.ui import WebDriverWait
-            from selenium.webdriver.support import expected_conditions as EC
+    def _site_type(self, url: str) -> Optional[str]:
+        """Map a URL to one of the supported site types"""
+        domain = urlparse(url).netloc.lower()
+        return self.SUPPORTED_SITES.get(domain)
+    
+    def _get_session(self):
+        """Get the pooled keep-alive HTTP session"""
+        with self._session_lock:
+            if self._session is None:
+                import requests
+                from requests.adapters import HTTPAdapter
+                
+                session = requests.Session()
+                session.headers.update(self.HEADERS)
+                session.headers["Accept-Encoding"] = "gzip, deflate"
+                adapter = HTTPAdapter(pool_connections=8, pool_maxsize=16)
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                self._session = session
+            return self._session
+    
+    def _http_get(self, url: str, timeout: float = 10) -> bytes:
+        """
+        GET a page over the pooled session, revalidating earlier responses
+        
+        Args:
+            url: Page URL
+            timeout: Request timeout in seconds
             
-            driver = self._get_driver()
-            driver.get(url)
+        Returns:
+            Response body
+        """
+        headers = {}
+        with self._session_lock:
+            prefetched = self._prefetched.pop(url, None)
+            cached = self._validators.get(url)
+        if prefetched is not None:
+            return prefetched
+        if cached:
+            etag, last_modified, _ = cached
+            if etag:
+                headers["If-None-Match"] = etag
+            if last_modified:
+                headers["If-Modified-Since"] = last_modified
+        
+        response = self._get_session().get(url, headers=headers, timeout=timeout)
+        if response.status_code == 304 and cached:
+            return cached[2]
+        response.raise_for_status()
+        self._remember_validators(url, response)
+        return response.content
+    
+    def _remember_validators(self, url: str, response):
+        """Keep a 200 response's ETag / Last-Modified and body for later conditional GETs"""
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if etag or last_modified:
+            with self._session_lock:
+                self._validators[url] = (etag, last_modified, response.content)
+                self._validators.move_to_end(url)
+                while len(self._validators) > self.MAX_CONDITIONAL_ENTRIES:
+                    self._validators.popitem(last=False)
+    
+    def _scrape_fast(self, url: str, site_type: Optional[str]) -> Optional[Question]:
+        """
+        Try the browser-free tiers for a URL, cheapest first
+        
+        Args:
+            url: URL of the problem page
+            site_type: Site type from _site_type
             
-            # Wait for the content to load
-            time.sleep(3)
+        Returns:
+            Question tagged with the tier that served it, or None if every tier failed
+        """
+        tiers: Dict[Optional[str], List[Tuple[str, Callable[[str], Question]]]] = {
+            "leetcode": [("api", self._fetch_leetcode_api)],
+            "gfg": [
+                ("api", self._fetch_gfg_api),
+                ("structured", self._fetch_gfg_next_data),
+                ("http", lambda u: self._parse_gfg_html(self._http_get(u), u)),
+            ],
+            "hackerrank": [("api", self._fetch_hackerrank_api)],
+            "codeforces": [("http", lambda u: self._parse_codeforces_html(self._http_get(u), u))],
+            None: [("http", lambda u: self._parse_plain_html(self._http_get(u), u))],
+        }
+        
+        for tier, fetch in tiers.get(site_type, []):
+            try:
+                question = fetch(url)
+            except Exception:
+                continue
+            if question is not None and question.description:
+                question.scrape_tier = tier
+                return question
+        
+        return None
+    
+    @staticmethod
+    def _slug(url: str, marker: str) -> Optional[str]:
+        """Path segment following marker (e.g. the slug after /problems/)"""
+        match = re.search(rf'/{marker}/([^/?#]+)', url)
+        return match.group(1) if match else None
+    
+    @staticmethod
+    def _element_text(elem) -> str:
+        """Text of a parsed element, one line per string, with exponents kept inline (10<sup>4</sup> -> 10^4)"""
+        for sup in elem.find_all('sup'):
+            sup.replace_with(f"^{sup.get_text()}")
+        elem.smooth()
+        return elem.get_text(separator='\n', strip=True)
+    
+    @staticmethod
+    def _html_to_text(html: str) -> str:
+        from bs4 import BeautifulSoup
+        return QuestionScraper._element_text(BeautifulSoup(html or "", 'html.parser'))
+    
+    def _question_from_html_fields(
+        self,
+        url: str,
+        title: str,
+        content_html: str,
+        difficulty: Optional[str] = None,
+        topics: Optional[List[str]] = None
+    ) -> Question:
+        """Build a Question from a structured title and an HTML problem statement"""
+        description = self._html_to_text(content_html)
+        return Question(
+            title=title,
+            description=description,
+            examples=self._extract_examples(description),
+            constraints=self._extract_constraints(description),
+            difficulty=difficulty.title() if difficulty else None,
+            topics=topics or [],
+            url=url,
+            raw_text=description,
+        )
+    
+    def _fetch_leetcode_api(self, url: str) -> Optional[Question]:
+        """Fetch a LeetCode problem from its public GraphQL endpoint"""
+        slug = self._slug(url, "problems")
+        if not slug:
+            return None
+        
+        response = self._get_session().post(
+            self.LEETCODE_GRAPHQL_URL,
+            json={"query": self.LEETCODE_QUESTION_QUERY, "variables": {"titleSlug": slug}},
+            headers={"Referer": url, "Content-Type": "application/json"},
+            timeout=10,
+        )
+        response.raise_for_status()
+        data = (response.json().get("data") or {}).get("question")
+        if not data or not data.get("content"):
+            return None
+        
+        return self._question_from_html_fields(
+            url,
+            data.get("title", ""),
+            data["content"],
+            data.get("difficulty"),
+            [tag["name"] for tag in data.get("topicTags") or [] if tag.get("name")],
+        )
+    
+    def _fetch_gfg_api(self, url: str) -> Optional[Question]:
+        """Fetch a GeeksforGeeks practice problem from the practice API"""
+        slug = self._slug(url, "problems")
+        if not slug:
+            return None
+        
+        data = json.loads(self._http_get(self.GFG_API_URL.format(slug=slug)))
+        return self._question_from_gfg_data(url, data.get("results") or data)
+    
+    def _fetch_gfg_next_data(self, url: str) -> Optional[Question]:
+        """Read the problem from the page's embedded Next.js __NEXT_DATA__ JSON"""
+        html = self._http_get(url).decode("utf-8", errors="replace")
+        match = re.search(
+            r'<script id="__NEXT_DATA__" type="application/json"[^>]*>(.*?)</script>',
+            html, re.DOTALL
+        )
+        if not match:
+            return None
+        
+        problem = self._find_dict_with_key(json.loads(match.group(1)), "problem_question")
+        return self._question_from_gfg_data(url, problem) if problem else None
+    
+    def _question_from_gfg_data(self, url: str, data: Dict[str, Any]) -> Optional[Question]:
+        if not data.get("problem_question"):
+            return None
+        
+        tags = data.get("tags") or {}
+        topics = tags.get("topic_tags", []) if isinstance(tags, dict) else []
+        return self._question_from_html_fields(
+            url,
+            data.get("problem_name", ""),
+            data["problem_question"],
+            data.get("difficulty"),
+            [str(t) for t in topics],
+        )
+    
+    @classmethod
+    def _find_dict_with_key(cls, data: Any, key: str) -> Optional[Dict[str, Any]]:
+        """Depth-first search of nested JSON for the first dict holding key"""
+        if isinstance(data, dict):
+            if key in data:
+                return data
+            children = data.values()
+        elif isinstance(data, list):
+            children = data
+        else:
+            return None
+        
+        for child in children:
+            found = cls._find_dict_with_key(child, key)
+            if found is not None:
+                return found
+        return None
+    
+    def _fetch_hackerrank_api(self, url: str) -> Optional[Question]:
+        """Fetch a HackerRank challenge from its REST endpoint"""
+        slug = self._slug(url, "challenges")
+        if not slug:
+            return None
+        
+        model = json.loads(self._http_get(self.HACKERRANK_API_URL.format(slug=slug))).get("model") or {}
+        content = model.get("body_html") or model.get("problem_statement")
+        if not content:
+            return None
+        
+        return self._question_from_html_fields(
+            url,
+            model.get("name", ""),
+            content,
+            model.get("difficulty_name"),
+            [str(t) for t in model.get("tag_names") or []],
+        )
+    
+    async def scrape_url_async(self, url: str, client=None) -> Question:
+        """
+        Scrape a question from a URL without blocking the event loop
+        
+        Plain-HTML sites (GeeksforGeeks, Codeforces, unknown pages) are fetched
+        with httpx; other sites run the sync scraper (API tier first, then the
+        browser) in a thread.
+        
+        Args:
+            url: URL of the problem page
+            client: Optional shared httpx.AsyncClient (enables connection reuse)
             
-            # Wait for the problem description to be present
+        Returns:
+            Question object with extracted information
+        """
+        import asyncio
+        
+        if self.cache is not None:
+            cached = self.cache.lookup(url)
+            if cached is not None and cached[2]:
+                question = cached[0]
+                question.scrape_tier = "cache"
+                return question
+        
+        site_type = self._site_type(url)
+        parsers = {
+            "gfg": self._parse_gfg_html,
+            "codeforces": self._parse_codeforces_html,
+            None: self._parse_plain_html,
+        }
+        
+        if site_type in parsers:
             try:
-                WebDriverWait(driver, 10).until(
-                    EC.presence_of_element_located((By.CSS_SELECTOR, "[data-track-load='description_content']"))
-                )
-            except:
+                html = await self._fetch_async(url, client)
+                question = parsers[site_type](html, url)
+                if question.description:
+                    question.scrape_tier = "http"
+                    if self.cache is not None:
+                        self.cache.store(url, question)
+                    return question
+            except Exception:
                 pass
+        
+        # Browser-backed sites borrow a driver from the shared pool in a worker thread
+        return await asyncio.to_thread(self.scrape_url, url)
+    
+    async def scrape_urls_async(self, urls: List[str], concurrency: int = 8) -> List[Question]:
+        """
+        Scrape several URLs concurrently over one pooled HTTP client
+        
+        Args:
+            urls: URLs of the problem pages
+            concurrency: Maximum number of pages fetched at once
+            
+        Returns:
+            Questions in the same order as urls
+        """
+        import asyncio
+        import httpx
+        
+        semaphore = asyncio.Semaphore(concurrency)
+        
+        async with httpx.AsyncClient(headers=self.HEADERS, follow_redirects=True, timeout=10) as client:
+            async def scrape_one(url: str) -> Question:
+                async with semaphore:
+                    return await self.scrape_url_async(url, client)
+            
+            return list(await asyncio.gather(*(scrape_one(url) for url in urls)))
+    
+    async def _fetch_async(self, url: str, client=None) -> bytes:
+        """Fetch a page body with httpx"""
+        if client is not None:
+            response = await client.get(url)
+            response.raise_for_status()
+            return response.content
+        
+        try:
+            import httpx
+        except ImportError:
+            raise ImportError("Please install httpx: pip install httpx")
+        
+        async with httpx.AsyncClient(headers=self.HEADERS, follow_redirects=True, timeout=10) as own_client:
+            response = await own_client.get(url)
+            response.raise_for_status()
+            return response.content
+    
+    def _scrape_leetcode(self, url: str) -> Question:
+        """Scrape a LeetCode problem"""
+        try:
+            from bs4 import BeautifulSoup
+            
+            with self.driver_pool.driver() as driver:
+                driver.get(url)
+                
+                # Wait for the problem description to be rendered
+                wait_until_ready(driver, "[data-track-load='description_content']")
+                
+                # Get page source
+                page_source = driver.page_source
             
-            # Get page source
-            soup = BeautifulSoup(driver.page_source, 'html.parser')
+            soup = BeautifulSoup(page_source, 'html.parser')
             
             # Extract title
             title = ""
@@ -131,7 +528,7 @@ class QuestionScraper:
             if not desc_elem:
                 desc_elem = soup.find('div', class_=re.compile(r'.*description.*', re.I))
             if desc_elem:
-                description = desc_elem.get_text(separator='\n', strip=True)
+                description = self._element_text(desc_elem)
             
             # Extract difficulty
             difficulty = None
@@ -166,56 +563,55 @@ class QuestionScraper:
                 topics=topics,
                 url=url,
                 raw_text=description,
+                scrape_tier="browser",
             )
             
         except Exception as e:
             # Fallback to LangChain scraping
             return self._scrape_with_langchain(url)
-        finally:
-            self._close_driver()
     
     def _scrape_gfg(self, url: str) -> Question:
         """Scrape a GeeksforGeeks problem"""
         try:
-            from bs4 import BeautifulSoup
-            import requests
-            
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-            }
-            
-            response = requests.get(url, headers=headers, timeout=10)
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # Extract title
-            title = ""
-            title_elem = soup.find('h1')
-            if title_elem:
-                title = title_elem.get_text(strip=True)
-            
-            # Extract description
-            description = ""
-            problem_elem = soup.find('div', class_='problems_problem_content__Xm_eO')
-            if not problem_elem:
-                problem_elem = soup.find('article')
-            if problem_elem:
-                description = problem_elem.get_text(separator='\n', strip=True)
-            
-            examples = self._extract_examples(description)
-            constraints = self._extract_constraints(description)
-            
-            return Question(
-                title=title,
-                description=description,
-                examples=examples,
-                constraints=constraints,
-                url=url,
-                raw_text=description,
-            )
+            question = self._parse_gfg_html(self._http_get(url), url)
+            question.scrape_tier = "http"
+            return question
             
         except Exception as e:
             return self._scrape_with_langchain(url)
     
+    def _parse_gfg_html(self, html, url: str) -> Question:
+        """Parse a GeeksforGeeks problem page"""
+        from bs4 import BeautifulSoup
+        
+        soup = BeautifulSoup(html, 'html.parser')
+        
+        # Extract title
+        title = ""
+        title_elem = soup.find('h1')
+        if title_elem:
+            title = title_elem.get_text(strip=True)
+        
+        # Extract description
+        description = ""
+        problem_elem = soup.find('div', class_='problems_problem_content__Xm_eO')
+        if not problem_elem:
+            problem_elem = soup.find('article')
+        if problem_elem:
+            description = self._element_text(problem_elem)
+        
+        examples = self._extract_examples(description)
+        constraints = self._extract_constraints(description)
+        
+        return Question(
+            title=title,
+            description=description,
+            examples=examples,
+            constraints=constraints,
+            url=url,
+            raw_text=description,
+        )
+    
     def _scrape_hackerrank(self, url: str) -> Question:
         """Scrape a HackerRank problem"""
         return self._scrape_with_langchain(url)
@@ -223,43 +619,43 @@ class QuestionScraper:
     def _scrape_codeforces(self, url: str) -> Question:
         """Scrape a Codeforces problem"""
         try:
-            from bs4 import BeautifulSoup
-            import requests
-            
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-            }
-            
-            response = requests.get(url, headers=headers, timeout=10)
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # Extract title
-            title = ""
-            title_elem = soup.find('div', class_='title')
-            if title_elem:
-                title = title_elem.get_text(strip=True)
-            
-            # Extract description
-            description = ""
-            problem_elem = soup.find('div', class_='problem-statement')
-            if problem_elem:
-                description = problem_elem.get_text(separator='\n', strip=True)
-            
-            examples = self._extract_examples(description)
-            constraints = self._extract_constraints(description)
-            
-            return Question(
-                title=title,
-                description=description,
-                examples=examples,
-                constraints=constraints,
-                url=url,
-                raw_text=description,
-            )
+            question = self._parse_codeforces_html(self._http_get(url), url)
+            question.scrape_tier = "http"
+            return question
             
         except Exception as e:
             return self._scrape_with_langchain(url)
     
+    def _parse_codeforces_html(self, html, url: str) -> Question:
+        """Parse a Codeforces problem page"""
+        from bs4 import BeautifulSoup
+        
+        soup = BeautifulSoup(html, 'html.parser')
+        
+        # Extract title
+        title = ""
+        title_elem = soup.find('div', class_='title')
+        if title_elem:
+            title = title_elem.get_text(strip=True)
+        
+        # Extract description
+        description = ""
+        problem_elem = soup.find('div', class_='problem-statement')
+        if problem_elem:
+            description = self._element_text(problem_elem)
+        
+        examples = self._extract_examples(description)
+        constraints = self._extract_constraints(description)
+        
+        return Question(
+            title=title,
+            description=description,
+            examples=examples,
+            constraints=constraints,
+            url=url,
+            raw_text=description,
+        )
+    
     def _scrape_generic(self, url: str) -> Question:
         """Generic scraping for unsupported sites"""
         return self._scrape_with_langchain(url)
@@ -286,6 +682,7 @@ class QuestionScraper:
                     constraints=self._extract_constraints(content),
                     url=url,
                     raw_text=content,
+                    scrape_tier="langchain",
                 )
             else:
                 raise ValueError("No content found")
@@ -299,41 +696,41 @@ class QuestionScraper:
     def _scrape_with_requests(self, url: str) -> Question:
         """Fallback scraping with requests and BeautifulSoup"""
         try:
-            from bs4 import BeautifulSoup
-            import requests
-            
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-            }
-            
-            response = requests.get(url, headers=headers, timeout=10)
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # Remove script and style elements
-            for elem in soup(['script', 'style', 'nav', 'footer', 'header']):
-                elem.decompose()
-            
-            # Get text content
-            text = soup.get_text(separator='\n', strip=True)
-            
-            # Try to find title
-            title = ""
-            title_elem = soup.find('h1')
-            if title_elem:
-                title = title_elem.get_text(strip=True)
-            
-            return Question(
-                title=title or "Problem",
-                description=text[:5000],  # Limit description length
-                examples=self._extract_examples(text),
-                constraints=self._extract_constraints(text),
-                url=url,
-                raw_text=text,
-            )
+            question = self._parse_plain_html(self._http_get(url), url)
+            question.scrape_tier = "http"
+            return question
             
         except Exception as e:
             raise RuntimeError(f"Failed to scrape URL: {e}")
     
+    def _parse_plain_html(self, html, url: str) -> Question:
+        """Parse an arbitrary page by its visible text"""
+        from bs4 import BeautifulSoup
+        
+        soup = BeautifulSoup(html, 'html.parser')
+        
+        # Remove script and style elements
+        for elem in soup(['script', 'style', 'nav', 'footer', 'header']):
+            elem.decompose()
+        
+        # Get text content
+        text = self._element_text(soup)
+        
+        # Try to find title
+        title = ""
+        title_elem = soup.find('h1')
+        if title_elem:
+            title = title_elem.get_text(strip=True)
+        
+        return Question(
+            title=title or "Problem",
+            description=text[:5000],  # Limit description length
+            examples=self._extract_examples(text),
+            constraints=self._extract_constraints(text),
+            url=url,
+            raw_text=text,
+        )
+    
     def _extract_examples(self, text: str) -> List[Dict[str, Any]]:
         """Extract examples from problem description"""
         examples = []
@@ -371,10 +768,11 @@ class QuestionScraper:
         
         if constraint_match:
             constraint_text = constraint_match.group(1)
-            # Split by newlines or bullet points
-            items = re.split(r'[\n•\-\*]', constraint_text)
+            # Split by newlines or bullet points; a leading "-" is a bullet only when a space follows,
+            # so "-10^9 <= nums[i]" keeps its sign
+            items = re.split(r'[\n•]', constraint_text)
             for item in items:
-                item = item.strip()
+                item = re.sub(r'^[\-\*]\s+', '', item.strip()).strip()
                 if item and len(item) > 3:
                     constraints.append(item)
         
@@ -0,0 +1,161 @@
+"""
+Request coalescing for Pragyan - identical concurrent LLM calls share one request
+When several threads ask for the same thing at once, only the first one reaches the provider
+"""
+
+import copy
+import threading
+from typing import Any, Callable, Dict, Hashable, Iterable, Iterator, List, Optional, Tuple
+
+
+class _Flight:
+    """One call in progress: the chunks received so far and, once it ends, its outcome"""
+
+    def __init__(self):
+        self.owner = threading.get_ident()
+        self.cond = threading.Condition()
+        self.chunks: List[str] = []
+        self.done = False
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """
+    Coalesces identical concurrent calls into one
+
+    The first caller for a key runs the call; callers arriving with the same
+    key while it is in flight wait and receive its result (a deep copy, so
+    nobody can mutate another caller's dict) or its exception. Nothing is
+    remembered once the call ends - that is ResponseCache's job.
+
+    Example:
+        >>> flights = SingleFlight()
+        >>> result, shared = flights.do(key, lambda: client.generate_json(prompt))
+    """
+
+    def __init__(self):
+        self._flights: Dict[Hashable, _Flight] = {}
+        self._lock = threading.Lock()
+        self.leaders = 0
+        self.followers = 0
+
+    def _join(self, key: Hashable) -> Tuple[_Flight, bool]:
+        """The flight for key and whether this caller leads it"""
+        with self._lock:
+            flight = self._flights.get(key)
+            if flight is not None and flight.owner == threading.get_ident():
+                # The leader's own thread would wait on itself - run separately instead
+                return _Flight(), True
+            if flight is not None:
+                self.followers += 1
+                return flight, False
+            flight = self._flights[key] = _Flight()
+            self.leaders += 1
+            return flight, True
+
+    def _land(self, key: Hashable, flight: _Flight, result: Any = None, error: Optional[BaseException] = None):
+        # Unregister first so callers arriving from now on start a fresh request
+        with self._lock:
+            if self._flights.get(key) is flight:
+                del self._flights[key]
+        with flight.cond:
+            flight.result, flight.error, flight.done = result, error, True
+            flight.cond.notify_all()
+
+    def in_flight(self) -> int:
+        """Number of distinct calls currently running"""
+        with self._lock:
+            return len(self._flights)
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Tuple[Any, bool]:
+        """
+        Run fn, or wait for the identical call already running
+
+        Args:
+            key: Identity of the call (prompt, model, ...)
+            fn: The call itself
+
+        Returns:
+            (result, shared) - shared is True when another caller's request was reused
+        """
+        flight, leader = self._join(key)
+        if leader:
+            try:
+                result = fn()
+            except BaseException as e:
+                self._land(key, flight, error=e)
+                raise
+            self._land(key, flight, result=result)
+            return result, False
+
+        with flight.cond:
+            while not flight.done:
+                flight.cond.wait()
+        if flight.error is not None:
+            raise flight.error
+        return copy.deepcopy(flight.result), True
+
+    def stream(self, key: Hashable, fn: Callable[[], Iterable[str]]) -> Tuple[Iterator[str], bool]:
+        """
+        Stream fn's chunks, or replay those of the identical stream already running
+
+        Followers receive every chunk, including ones sent before they joined,
+        as the leader receives them. The returned iterator must be consumed,
+        since waiting followers are only released when it ends.
+
+        Args:
+            key: Identity of the call
+            fn: Opens the stream
+
+        Returns:
+            (chunks, shared)
+        """
+        flight, leader = self._join(key)
+        if leader:
+            return self._lead(key, flight, fn), False
+        return self._follow(flight), True
+
+    def _lead(self, key: Hashable, flight: _Flight, fn: Callable[[], Iterable[str]]) -> Iterator[str]:
+        error: Optional[BaseException] = RuntimeError("Shared LLM stream was abandoned by its consumer")
+        try:
+            for chunk in fn():
+                with flight.cond:
+                    flight.chunks.append(chunk)
+                    flight.cond.notify_all()
+                yield chunk
+            error = None
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            self._land(key, flight, error=error)
+
+    @staticmethod
+    def _follow(flight: _Flight) -> Iterator[str]:
+        sent = 0
+        while True:
+            with flight.cond:
+                while sent >= len(flight.chunks) and not flight.done:
+                    flight.cond.wait()
+                chunks = flight.chunks[sent:]
+                done, error = flight.done, flight.error
+            sent += len(chunks)
+            yield from chunks
+            if done:
+                if error is not None:
+                    raise error
+                return
+
+
+_default_group: Optional[SingleFlight] = None
+_default_group_lock = threading.Lock()
+
+
+def get_default_group() -> SingleFlight:
+    """Get the process-wide group shared by every LLMClient with coalescing on"""
+    global _default_group
+    with _default_group_lock:
+        if _default_group is None:
+            _default_group = SingleFlight()
+        return _default_group
@@ -2,10 +2,19 @@
 DSA Solver module for analyzing and solving DSA questions
 """
 
-from typing import Optional, Dict, Any, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Dict, Any, List, Tuple, Union, Callable
 
-from pragyan.models import Question, Solution, ProgrammingLanguage
+from pragyan.models import Question, Solution, ProgrammingLanguage, SolveStrategy, ProfileConfig
 from pragyan.llm_client import LLMClient
+from pragyan.json_stream import JSONStreamParser
+from pragyan.dedup import deduplicate_code
+from pragyan.sandbox import SandboxPool, ExecutionReport, get_default_sandbox
+from pragyan.profiler import ComplexityProfiler, ComplexityReport, ApproachTable
+from pragyan.stress import StressGenerator
+from pragyan.constraints import ORDERS
+from pragyan._sandbox_worker import entry_parameters
+from pragyan import tracing
 
 
 class DSASolver:
@@ -32,13 +41,15 @@ class DSASolver:
         Returns:
             Dictionary containing analysis results
         """
-        return self.llm.analyze_question(question)
+        with tracing.span("analyze"):
+            return self.llm.analyze_question(question)
     
     def solve(
         self,
         question: Question,
         language: ProgrammingLanguage,
-        analysis: Optional[Dict[str, Any]] = None
+        analysis: Optional[Dict[str, Any]] = None,
+        on_progress: Optional[Callable[[JSONStreamParser], None]] = None
     ) -> Solution:
         """
         Generate a solution for the DSA question
@@ -47,6 +58,8 @@ class DSASolver:
             question: The DSA question to solve
             language: Programming language for the solution
             analysis: Optional pre-computed analysis
+            on_progress: Optional callback to stream the solution; called with
+                the JSONStreamParser after every chunk (parser.get("code"))
             
         Returns:
             Solution object with code and explanation
@@ -54,25 +67,62 @@ class DSASolver:
         if analysis is None:
             analysis = self.analyze(question)
         
-        return self.llm.generate_solution(question, language, analysis)
+        return self._generate_solution(question, language, analysis, on_progress)
+    
+    def _generate_solution(
+        self,
+        question: Question,
+        language: ProgrammingLanguage,
+        analysis: Optional[Dict[str, Any]],
+        on_progress: Optional[Callable[[JSONStreamParser], None]] = None
+    ) -> Solution:
+        with tracing.span("solve", language=language.value, with_analysis=analysis is not None):
+            return self.llm.generate_solution(question, language, analysis, on_progress)
     
     def solve_with_analysis(
         self,
         question: Question,
-        language: ProgrammingLanguage
+        language: ProgrammingLanguage,
+        strategy: Union[str, SolveStrategy] = SolveStrategy.SEQUENTIAL,
+        on_progress: Optional[Callable[[JSONStreamParser], None]] = None
     ) -> Tuple[Solution, Dict[str, Any]]:
         """
         Analyze and solve a question, returning both results
         
+        Strategies:
+            sequential: analyze first, then solve with the analysis as context
+                (two round-trips back to back)
+            speculative: send both requests at the same time; the solution is
+                generated without the analysis as context
+            fused: a single structured prompt returns both
+        
         Args:
             question: The DSA question
             language: Programming language for the solution
+            strategy: How to schedule analysis and solution generation
+            on_progress: Optional callback to stream the solution request; the
+                code is at "code", or "solution.code" for the fused strategy
             
         Returns:
             Tuple of (Solution, analysis dict)
         """
+        strategy = SolveStrategy(strategy)
+        
+        if strategy == SolveStrategy.FUSED:
+            with tracing.span("analyze_and_solve", language=language.value):
+                analysis, solution = self.llm.analyze_and_solve(question, language, on_progress)
+            return solution, analysis
+        
+        if strategy == SolveStrategy.SPECULATIVE:
+            with ThreadPoolExecutor(max_workers=2, thread_name_prefix="pragyan-solve") as pool:
+                analysis_future = pool.submit(tracing.propagate(self.analyze), question)
+                solution_future = pool.submit(
+                    tracing.propagate(self._generate_solution), question, language, None, on_progress
+                )
+                return solution_future.result(), analysis_future.result()
+        
         analysis = self.analyze(question)
-        solution = self.solve(question, language, analysis)
+        solution = self.solve(question, language, analysis, on_progress)
         return solution, analysis
     
     def get_video_script(
@@ -126,6 +176,83 @@ Format:
             return result
         return result.get("test_cases", result.get("cases", []))
     
+    def verify_solution(
+        self,
+        question: Question,
+        solution: Solution,
+        test_cases: Optional[List[Dict[str, Any]]] = None,
+        num_cases: int = 5,
+        sandbox: Optional[SandboxPool] = None
+    ) -> ExecutionReport:
+        """
+        Run a solution's code against test cases in the execution sandbox
+        
+        Args:
+            question: The DSA question
+            solution: Solution to check
+            test_cases: Cases to run; defaults to the question's examples plus
+                num_cases generated ones
+            num_cases: Number of test cases to generate when none are given
+            sandbox: Worker pool to run in (defaults to the process-wide one)
+            
+        Returns:
+            ExecutionReport with pass/fail and runtime per case
+        """
+        with tracing.span("verify", language=solution.language.value):
+            if test_cases is None:
+                test_cases = list(question.examples)
+                if num_cases:
+                    test_cases += self.generate_test_cases(question, num_cases)
+            return (sandbox or get_default_sandbox()).run(solution, test_cases)
+    
+    def profile_solution(
+        self,
+        question: Question,
+        solution: Solution,
+        config: Optional[ProfileConfig] = None,
+        sandbox: Optional[SandboxPool] = None
+    ) -> ComplexityReport:
+        """
+        Measure how a solution's running time and memory grow and compare them with its claimed complexity
+        
+        Args:
+            question: The DSA question (its constraints shape the inputs)
+            solution: Python solution to profile
+            config: Sizes, repeats and time budget
+            sandbox: Worker pool to run in (defaults to the process-wide one)
+            
+        Returns:
+            ComplexityReport with the fitted growth, mismatches and TLE projection
+        """
+        return ComplexityProfiler(config, sandbox).profile(question, solution)
+    
+    def stress_solution(
+        self,
+        question: Question,
+        solution: Solution,
+        orders: Optional[List[str]] = None,
+        size: Optional[int] = None,
+        sandbox: Optional[SandboxPool] = None
+    ) -> ExecutionReport:
+        """
+        Run a solution on worst-case inputs at the question's constraint limits
+        
+        Args:
+            question: The DSA question (its constraints shape the inputs)
+            solution: Python solution to run
+            orders: Input orders to try (default: all of constraints.ORDERS)
+            size: Input size to use instead of the constraint limit
+            sandbox: Worker pool to run in (defaults to the process-wide one)
+            
+        Returns:
+            ExecutionReport with one case per input; a case passes when it finishes within the limits
+        """
+        with tracing.span("stress", language=solution.language.value):
+            parameters = entry_parameters(solution.code)
+            with StressGenerator.for_question(question, parameters) as generator:
+                inputs = generator.generate(orders or ORDERS, size)
+                return (sandbox or get_default_sandbox()).stress(solution, inputs)
+    
     def explain_concept(self, concept: str) -> str:
         """
         Get a detailed explanation of a DSA concept
@@ -149,16 +276,29 @@ Provide a clear, educational explanation suitable for a tutorial video."""
         
         return self.llm.generate(prompt)
     
-    def compare_approaches(self, question: Question) -> Dict[str, Any]:
+    def compare_approaches(
+        self,
+        question: Question,
+        benchmark: bool = False,
+        config: Optional[ProfileConfig] = None,
+        sandbox: Optional[SandboxPool] = None
+    ) -> Dict[str, Any]:
         """
         Compare different approaches to solve the problem
         
         Args:
             question: The DSA question
+            benchmark: Also ask for Python code for every approach and measure
+                them all on the same inputs (see benchmark_approaches)
+            config: Sizes, repeats and time budget for the measurements
+            sandbox: Worker pool to run in (defaults to the process-wide one)
             
         Returns:
-            Dictionary with different approaches and their trade-offs
+            Dictionary with different approaches and their trade-offs; with
+            benchmark, "benchmark" holds the measured table (ApproachTable.to_dict())
         """
+        code_field = """
+            "code": "Complete runnable Python 3 code for this approach: a class Solution whose method has the same name and parameters in every approach",""" if benchmark else ""
         prompt = f"""Analyze different approaches to solve this problem:
 
 {question.to_prompt()}
@@ -181,7 +321,7 @@ Return as JSON:
             "name": "Approach name",
             "description": "How it works",
             "time_complexity": "O(?)",
-            "space_complexity": "O(?)",
+            "space_complexity": "O(?)",{code_field}
             "pros": ["..."],
             "cons": ["..."],
             "best_for": "When to use this"
@@ -192,4 +332,45 @@ Return as JSON:
     "recommendation_reason": "Why this is recommended"
 }}"""
         
-        return self.llm.generate_json(prompt)
+        with tracing.span("compare_approaches", benchmark=benchmark):
+            result = self.llm.generate_json(prompt)
+            if benchmark:
+                table = self.benchmark_approaches(question, result.get("approaches") or [], config, sandbox)
+                result["benchmark"] = table.to_dict()
+            return result
+    
+    def benchmark_approaches(
+        self,
+        question: Question,
+        approaches: List[Dict[str, Any]],
+        config: Optional[ProfileConfig] = None,
+        sandbox: Optional[SandboxPool] = None
+    ) -> ApproachTable:
+        """
+        Run every approach's code on the same generated inputs at increasing sizes
+        
+        Args:
+            question: The DSA question (its constraints shape the inputs)
+            approaches: Approaches as returned by compare_approaches; those
+                without "code" are skipped
+            config: Sizes, repeats and time budget
+            sandbox: Worker pool to run in (defaults to the process-wide one)
+            
+        Returns:
+            ApproachTable with measured runtimes and peak memory next to the claimed complexities
+        """
+        solutions = {}
+        for index, approach in enumerate(approaches):
+            if not isinstance(approach, dict) or not approach.get("code"):
+                continue
+            name = approach.get("name") or f"Approach {index + 1}"
+            solutions[name] = Solution(
+                code=deduplicate_code(approach["code"]),
+                language=ProgrammingLanguage.PYTHON,
+                explanation=approach.get("description", ""),
+                time_complexity=approach.get("time_complexity", ""),
+                space_complexity=approach.get("space_complexity", ""),
+                concept="",
+                approach=name,
+            )
+        return ComplexityProfiler(config, sandbox).compare(question, solutions)
@@ -0,0 +1,178 @@
+"""
+Stress inputs for Pragyan - worst-case arguments at the constraint limits, kept on disk
+Arguments are written once to files the sandbox workers memory-map, instead of being sent as huge literals
+"""
+
+import io
+import json
+import random
+import shutil
+import tempfile
+from array import array
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional, Dict, Any, List, Iterable, Union
+
+from pragyan.models import Question
+from pragyan.constraints import Constraints, ORDERS, synthesize_arguments
+from pragyan._sandbox_worker import load_arguments
+
+
+# Size used when the constraints do not bound the input
+DEFAULT_SIZE = 10 ** 5
+_INT64 = (-(2 ** 63), 2 ** 63 - 1)
+
+
+def _array_kind(value: Any) -> Optional[str]:
+    """ "int64" or "float64" when value is a flat list that fits a raw array"""
+    if not isinstance(value, list) or not value:
+        return None
+    if all(type(item) is int and _INT64[0] <= item <= _INT64[1] for item in value):
+        return "int64"
+    if all(type(item) is float for item in value):
+        return "float64"
+    return None
+
+
+def write_arguments(arguments: List[Any], path: Union[str, Path]) -> List[Dict[str, Any]]:
+    """
+    Write positional arguments to a file the sandbox worker can load with load_arguments
+
+    Flat integer and float lists are stored as raw 8-byte values, which the
+    worker turns back into lists straight from a memory map; everything else is
+    streamed out as JSON by json.dump, so no input is ever held as one big string.
+
+    Args:
+        arguments: Values to pass to the solution, in order
+        path: File to write
+
+    Returns:
+        One segment per argument: {"kind", "offset", "count" or "length"}
+    """
+    segments = []
+    with open(path, "wb") as f:
+        for value in arguments:
+            offset = f.tell()
+            kind = _array_kind(value)
+            if kind is not None:
+                array("q" if kind == "int64" else "d", value).tofile(f)
+                segments.append({"kind": kind, "offset": offset, "count": len(value)})
+                continue
+            text = io.TextIOWrapper(f, encoding="utf-8")
+            json.dump(value, text, separators=(",", ":"))
+            text.flush()
+            text.detach()  # keep f open
+            segments.append({"kind": "json", "offset": offset, "length": f.tell() - offset})
+    return segments
+
+
+@dataclass
+class StressInput:
+    """One generated input: its arguments live in path, laid out as segments"""
+    order: str
+    size: int
+    path: str
+    segments: List[Dict[str, Any]] = field(default_factory=list)
+
+    @property
+    def label(self) -> str:
+        return f"{self.order} (n={self.size})"
+
+    def load(self) -> List[Any]:
+        """Read the arguments back"""
+        return load_arguments(self.path, self.segments)
+
+    def to_case(self) -> Dict[str, Any]:
+        """A sandbox test case that runs this input with no expected output"""
+        return {"input": self.label, "file": self.path, "segments": self.segments}
+
+    def to_point(self) -> Dict[str, Any]:
+        """A sandbox profile input of size n"""
+        return {"n": self.size, "file": self.path, "segments": self.segments}
+
+
+class StressGenerator:
+    """
+    Writes worst-case inputs for a solution to a temporary directory
+
+    Inputs take their shapes and value ranges from the problem constraints
+    and default to the largest size they allow. Files are removed by close()
+    (or on leaving a with block).
+
+    Example:
+        >>> with StressGenerator.for_question(question, ["nums", "target"]) as generator:
+        ...     report = sandbox.stress(solution, generator.generate())
+    """
+
+    def __init__(
+        self,
+        constraints: Constraints,
+        parameters: List[str],
+        directory: Optional[Union[str, Path]] = None,
+        seed: int = 0
+    ):
+        """
+        Initialize the generator
+
+        Args:
+            constraints: Parsed problem constraints
+            parameters: Parameter names of the solution's entry point
+            directory: Where to write input files (a new temporary directory by default)
+            seed: Seed for the random parts of every input
+        """
+        self.constraints = constraints
+        self.parameters = list(parameters)
+        self.size_parameter, self.max_size = constraints.size_parameter(self.parameters)
+        self._owns_directory = directory is None
+        self.directory = Path(directory or tempfile.mkdtemp(prefix="pragyan-stress-"))
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.seed = seed
+        self._count = 0
+
+    @classmethod
+    def for_question(cls, question: Question, parameters: List[str], **kwargs) -> "StressGenerator":
+        """Generator for a question's constraints (see __init__ for kwargs)"""
+        return cls(Constraints.parse(question.constraints), parameters, **kwargs)
+
+    def write(self, size: int, order: str = "random") -> StressInput:
+        """
+        Generate and write one input
+
+        Args:
+            size: Length of each array or string (cells of a grid)
+            order: One of constraints.ORDERS
+
+        Returns:
+            StressInput pointing at the written file
+        """
+        rng = random.Random(f"{self.seed}:{order}:{size}")
+        arguments = synthesize_arguments(self.parameters, self.constraints, size, rng, order)
+        self._count += 1
+        path = self.directory / f"input-{self._count:04d}-{order}-{size}.bin"
+        segments = write_arguments(arguments, path)
+        return StressInput(order, size, str(path), segments)
+
+    def generate(self, orders: Iterable[str] = ORDERS, size: Optional[int] = None) -> List[StressInput]:
+        """
+        One input per order at the largest allowed size
+
+        Args:
+            orders: Element orders to generate (see synthesize_arguments)
+            size: Size to use instead of the constraint limit
+
+        Returns:
+            The written inputs, in the order of orders
+        """
+        size = size or self.max_size or DEFAULT_SIZE
+        return [self.write(size, order) for order in orders]
+
+    def close(self):
+        """Delete the generated files"""
+        if self._owns_directory:
+            shutil.rmtree(self.directory, ignore_errors=True)
+
+    def __enter__(self) -> "StressGenerator":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
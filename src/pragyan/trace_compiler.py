@@ -0,0 +1,432 @@
+"""
+Trace compiler for Pragyan - turns an LLM execution trace into a Manim scene
+The LLM only describes what happens at each step (a small JSON document); the
+scene code around it is generated here, deterministically
+"""
+
+import math
+from dataclasses import dataclass, field
+from typing import Optional, Dict, Any, List, Set, Tuple
+
+
+# Name of the Scene class compile_trace() emits
+SCENE_CLASS = "TraceScene"
+
+# Largest structures that still fit on screen
+MAX_CELLS = 24
+MAX_GRID_SIDE = 12
+
+# Steps beyond this are merged so the scene stays within this many play() calls
+MAX_PLAYS = 40
+
+BASE_COLOR = "BLUE_E"
+COLORS = {
+    "green": "GREEN", "red": "RED", "yellow": "YELLOW", "blue": "BLUE", "orange": "ORANGE",
+    "purple": "PURPLE", "gold": "GOLD", "teal": "TEAL", "pink": "PINK", "white": "WHITE",
+    "gray": "GRAY", "grey": "GRAY", "maroon": "MAROON",
+}
+
+# Highlight color of each action when the trace does not name one
+ACTION_COLORS = {
+    "compare": "YELLOW", "check": "YELLOW", "highlight": "YELLOW", "swap": "BLUE",
+    "visit": "BLUE", "push": "BLUE", "place": "GREEN", "set": "GREEN", "update": "GREEN",
+    "insert": "GREEN", "found": "GREEN", "done": "GREEN", "mark": "PURPLE",
+    "remove": "RED", "pop": "RED", "delete": "RED", "backtrack": "RED", "invalid": "RED",
+}
+
+# Actions whose highlight stays after the step; all others are undone by the next step
+PERSISTENT_ACTIONS = frozenset({
+    "place", "set", "update", "insert", "found", "done", "mark", "visit", "remove", "delete",
+})
+SWAP_ACTIONS = frozenset({"swap", "exchange"})
+
+MARKER_COLORS = ["ORANGE", "TEAL", "PINK", "MAROON"]
+CAPTION_CHARS = 80
+
+
+@dataclass
+class TraceStep:
+    """One step of a trace, with positions resolved to slot indexes"""
+    number: int
+    action: str
+    description: str
+    positions: List[int] = field(default_factory=list)
+    values: List[str] = field(default_factory=list)
+    colors: List[str] = field(default_factory=list)
+    markers: Dict[str, Optional[int]] = field(default_factory=dict)
+    key: bool = False
+
+
+@dataclass
+class _State:
+    """What is on screen: slot, label and fill of each cell, slot of each marker"""
+    slot: List[int]
+    value: List[str]
+    color: List[str]
+    marker: Dict[str, Optional[int]]
+
+    def copy(self) -> "_State":
+        return _State(list(self.slot), list(self.value), list(self.color), dict(self.marker))
+
+
+def _label(value: Any) -> str:
+    """Cell text for a trace value (blank cells get a dot, since Text("") has no shape to transform)"""
+    if value is None or not str(value).strip():
+        return "\u00b7"
+    if isinstance(value, bool):
+        return "T" if value else "F"
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    return str(value)[:4]
+
+
+def _as_rows(data: Any) -> Optional[List[List[Any]]]:
+    """data as rows of cells, or None when it is not a board/grid"""
+    if not isinstance(data, list) or not data:
+        return None
+    if all(isinstance(row, list) for row in data):
+        return data
+    if all(isinstance(row, str) for row in data) and len({len(row) for row in data}) == 1 and len(data[0]) > 1:
+        return [list(row) for row in data]
+    return None
+
+
+def _caption(text: str, limit: int = CAPTION_CHARS) -> str:
+    text = " ".join(str(text).split())
+    return text if len(text) <= limit else text[:limit - 3].rstrip() + "..."
+
+
+def _color(name: Any, default: str) -> str:
+    if not isinstance(name, str):
+        return default
+    name = name.strip().lower()
+    return COLORS.get(name) or COLORS.get(name.split()[-1] if name else "", default)
+
+
+class TraceCompiler:
+    """
+    Compiles a step trace from LLMClient.generate_algorithm_animation_steps to Manim code
+
+    The data is drawn once, as a row (arrays, strings) or a grid (boards,
+    matrices) of cells, and every step only animates the cells, labels and
+    pointers it changes. Each play() call is one AnimationGroup holding the
+    net change of its steps; long traces merge consecutive steps so the scene
+    stays within max_plays calls.
+
+    Example:
+        >>> code = TraceCompiler(trace, title="Two Sum").compile()
+    """
+
+    def __init__(
+        self,
+        trace: Dict[str, Any],
+        title: str = "",
+        step_time: float = 1.0,
+        max_plays: int = MAX_PLAYS
+    ):
+        """
+        Initialize the compiler
+
+        Args:
+            trace: Parsed trace JSON (initial_state, steps, final_state, key_moments)
+            title: Heading shown above the data
+            step_time: run_time of one step in seconds
+            max_plays: Most play() calls to spend on the steps
+
+        Raises:
+            ValueError: If the trace has no data this compiler can draw
+        """
+        if not isinstance(trace, dict):
+            raise ValueError("Trace must be a JSON object")
+        self.trace = trace
+        self.title = _caption(title or trace.get("algorithm_type") or "Algorithm", 60)
+        self.step_time = step_time
+        self.max_plays = max(1, max_plays)
+
+        initial = trace.get("initial_state") or {}
+        data = initial.get("data")
+        if isinstance(data, str) and data:
+            data = list(data)
+        rows = _as_rows(data)
+        if rows is not None:
+            self.grid = True
+            self.rows = len(rows)
+            self.cols = max(len(row) for row in rows)
+            if self.rows > MAX_GRID_SIDE or self.cols > MAX_GRID_SIDE:
+                raise ValueError(f"Grid of {self.rows}x{self.cols} is too large to draw")
+            cells = [row[c] if c < len(row) else None for row in rows for c in range(self.cols)]
+        elif isinstance(data, list) and data and not any(isinstance(v, (dict, list)) for v in data):
+            self.grid = False
+            self.rows, self.cols = 1, len(data)
+            if self.cols > MAX_CELLS:
+                raise ValueError(f"Array of {self.cols} elements is too large to draw")
+            cells = data
+        else:
+            raise ValueError("Trace initial_state.data is not an array or grid")
+
+        self.size = len(cells)
+        self.side = (
+            min(0.8, 5.0 / self.rows, 12.0 / self.cols) if self.grid
+            else min(1.0, 12.0 / (1.1 * self.cols))
+        )
+        self.font_size = max(12, int(round(32 * self.side)))
+        self.initial = [_label(v) for v in cells]
+        self.description = _caption(initial.get("description") or "")
+
+        key_steps = {
+            moment.get("step") for moment in trace.get("key_moments") or []
+            if isinstance(moment, dict) and str(moment.get("importance", "high")).lower() == "high"
+        }
+        raw_steps = [s for s in trace.get("steps") or [] if isinstance(s, dict)]
+        self.steps = [self._parse_step(i + 1, raw, key_steps) for i, raw in enumerate(raw_steps)]
+        self.marker_names = []
+        for step in self.steps:
+            for name in step.markers:
+                if name not in self.marker_names:
+                    self.marker_names.append(name)
+
+    def _slot(self, position: Any) -> Optional[int]:
+        """Slot index of a trace position (an index, or [row, col] on grids)"""
+        if isinstance(position, bool):
+            return None
+        if isinstance(position, (list, tuple)) and len(position) == 2 and self.grid:
+            r, c = position
+            if isinstance(r, int) and isinstance(c, int) and 0 <= r < self.rows and 0 <= c < self.cols:
+                return r * self.cols + c
+            return None
+        if isinstance(position, int) and 0 <= position < self.size:
+            return position
+        return None
+
+    def _positions(self, raw: Any) -> List[int]:
+        if not isinstance(raw, list):
+            raw = [raw]
+        if self.grid and len(raw) == 2 and all(isinstance(v, int) for v in raw):
+            raw = [raw]  # a single [row, col]
+        slots = [self._slot(p) for p in raw]
+        return [s for s in slots if s is not None]
+
+    def _markers(self, raw: Any) -> Dict[str, Optional[int]]:
+        """{name: slot or None (hidden)} from {"pointer": name, "position": p} or {name: p}"""
+        if not isinstance(raw, dict):
+            return {}
+        if "position" in raw:
+            name = raw.get("pointer") or raw.get("name") or "pointer"
+            raw = {name: raw["position"]}
+        markers = {}
+        for name, position in raw.items():
+            slot = None if position is None else self._slot(position)
+            if isinstance(name, str) and (slot is not None or position is None):
+                markers[_caption(name, 12)] = slot
+        return markers
+
+    def _parse_step(self, index: int, raw: Dict[str, Any], key_steps: Set[Any]) -> TraceStep:
+        changes = raw.get("state_changes") if isinstance(raw.get("state_changes"), dict) else {}
+        number = raw.get("step_number") if isinstance(raw.get("step_number"), int) else index
+        highlights = changes.get("highlights") or []
+        values = changes.get("values")
+        return TraceStep(
+            number=number,
+            action=str(raw.get("action") or "step").strip().lower(),
+            description=str(raw.get("description") or raw.get("narration") or ""),
+            positions=self._positions(changes.get("positions", [])),
+            values=[_label(v) for v in values] if isinstance(values, list) else [],
+            colors=highlights if isinstance(highlights, list) else [highlights],
+            markers=self._markers(changes.get("markers")),
+            key=number in key_steps,
+        )
+
+    def _apply(self, state: _State, step: TraceStep, settled: List[str], temporary: Set[int]) -> _State:
+        """State after step (settled and temporary track which highlights to undo)"""
+        state = state.copy()
+        cell_at = {slot: cell for cell, slot in enumerate(state.slot)}
+        if step.action in SWAP_ACTIONS and len(step.positions) >= 2:
+            a, b = cell_at[step.positions[0]], cell_at[step.positions[1]]
+            state.slot[a], state.slot[b] = state.slot[b], state.slot[a]
+            cell_at = {slot: cell for cell, slot in enumerate(state.slot)}
+
+        if step.values and len(step.values) == len(step.positions):
+            for slot, value in zip(step.positions, step.values):
+                state.value[cell_at[slot]] = value
+        elif len(step.values) == self.size:
+            for slot, value in enumerate(step.values):
+                state.value[cell_at[slot]] = value
+
+        for cell in temporary:
+            state.color[cell] = settled[cell]
+        temporary.clear()
+        default = ACTION_COLORS.get(step.action, "YELLOW")
+        for i, slot in enumerate(step.positions):
+            cell = cell_at[slot]
+            name = step.colors[min(i, len(step.colors) - 1)] if step.colors else None
+            state.color[cell] = _color(name, default)
+            if step.action in PERSISTENT_ACTIONS:
+                settled[cell] = state.color[cell]
+            else:
+                temporary.add(cell)
+
+        state.marker.update(step.markers)
+        return state
+
+    def _batches(self) -> List[List[TraceStep]]:
+        """Consecutive steps sharing a play() call; key moments always get their own"""
+        per_play = max(1, math.ceil(len(self.steps) / self.max_plays))
+        batches: List[List[TraceStep]] = []
+        for step in self.steps:
+            last = batches[-1] if batches else None
+            if last and len(last) < per_play and not step.key and not last[-1].key:
+                last.append(step)
+            else:
+                batches.append([step])
+        return batches
+
+    def _marker_target(self, name: str, slot: int) -> str:
+        if self.grid:
+            return f"slots[{slot}]"
+        offset = self.side / 2 + 0.1 + 0.75 * self.marker_names.index(name)
+        return f"slots[{slot}] + DOWN * {offset:.2f}, aligned_edge=UP"
+
+    def _diff(self, before: _State, after: _State) -> Tuple[List[str], List[str]]:
+        """(statements to run first, animations) that take the screen from before to after"""
+        setup, animations = [], []
+        for cell in range(self.size):
+            moved = before.slot[cell] != after.slot[cell]
+            square = f"squares[{cell}].animate"
+            if moved:
+                square += f".move_to(slots[{after.slot[cell]}])"
+            if before.color[cell] != after.color[cell]:
+                square += f".set_fill({after.color[cell]}, opacity=0.6)"
+            if square != f"squares[{cell}].animate":
+                animations.append(square)
+            if before.value[cell] != after.value[cell]:
+                animations.append(
+                    f"Transform(labels[{cell}], Text({after.value[cell]!r}, font_size={self.font_size})"
+                    f".move_to(slots[{after.slot[cell]}]))"
+                )
+            elif moved:
+                animations.append(f"labels[{cell}].animate.move_to(slots[{after.slot[cell]}])")
+
+        for index, name in enumerate(self.marker_names):
+            old, new = before.marker.get(name), after.marker.get(name)
+            if old == new:
+                continue
+            if new is None:
+                animations.append(f"FadeOut(markers[{index}])")
+            elif old is None:
+                setup.append(f"markers[{index}].move_to({self._marker_target(name, new)})")
+                animations.append(f"FadeIn(markers[{index}])")
+            else:
+                animations.append(f"markers[{index}].animate.move_to({self._marker_target(name, new)})")
+        return setup, animations
+
+    def _play(self, lines: List[str], setup: List[str], animations: List[str], caption: str, run_time: float):
+        lines.extend(f"        {statement}" for statement in setup)
+        parts = []
+        if animations:
+            lag = 0.1 if len(animations) > 1 else 0
+            parts.append(f"AnimationGroup({', '.join(animations)}, lag_ratio={lag})")
+        parts.append(f"Transform(status, self.caption({caption!r}))")
+        lines.append(f"        self.play({', '.join(parts)}, run_time={run_time:.2f})")
+
+    def compile(self) -> str:
+        """
+        Generate the scene
+
+        Returns:
+            Source of a `TraceScene(Scene)` class, without imports or render config
+        """
+        step_time = self.step_time
+        lines = [
+            f"class {SCENE_CLASS}(Scene):",
+            "    def construct(self):",
+            f"        title = Text({self.title!r}, font_size=40, color=GOLD).to_edge(UP)",
+            f"        values = {self.initial!r}",
+            f"        squares = VGroup(*[Square(side_length={self.side:.2f}, color=WHITE, "
+            f"fill_color={BASE_COLOR}, fill_opacity=0.6) for _ in values])",
+        ]
+        if self.grid:
+            lines.append(f"        squares.arrange_in_grid(rows={self.rows}, cols={self.cols}, buff=0)")
+        else:
+            lines.append(f"        squares.arrange(RIGHT, buff={0.1 * self.side:.2f}).shift(UP * 0.3)")
+        lines += [
+            "        slots = [square.get_center() for square in squares]",
+            f"        labels = VGroup(*[Text(value, font_size={self.font_size}).move_to(slots[i]) "
+            "for i, value in enumerate(values)])",
+            f"        status = self.caption({self.description or self.title!r})",
+        ]
+        if self.marker_names:
+            colors = ", ".join(MARKER_COLORS[i % len(MARKER_COLORS)] for i in range(len(self.marker_names)))
+            if self.grid:
+                shape = f"Square(side_length={self.side:.2f}, color=color, stroke_width=6)"
+            else:
+                shape = ("VGroup(Arrow(DOWN * 0.6, ORIGIN, buff=0, color=color), "
+                         "Text(name, font_size=18, color=color)).arrange(DOWN, buff=0.05)")
+            lines += [
+                f"        marker_colors = [{colors}]",
+                f"        markers = [{shape} for name, color in zip({self.marker_names!r}, marker_colors)]",
+            ]
+        intro = ["Create(squares)", "Write(labels)", "FadeIn(status)"]
+        if not self.grid:
+            lines.append(
+                "        indices = VGroup(*[Text(str(i), font_size=16, color=GRAY)"
+                ".next_to(square, UP, buff=0.1) for i, square in enumerate(squares)])"
+            )
+            intro.append("FadeIn(indices)")
+        lines += [
+            "        self.play(Write(title), run_time=1.5)",
+            f"        self.play({', '.join(intro)}, run_time=1.5)",
+            "        self.wait(1)",
+        ]
+
+        state = _State(list(range(self.size)), list(self.initial), [BASE_COLOR] * self.size, {})
+        settled, temporary = [BASE_COLOR] * self.size, set()
+        batches = self._batches()
+        total = len(self.steps)
+        for batch in batches:
+            before = state
+            for step in batch:
+                state = self._apply(state, step, settled, temporary)
+            first, last = batch[0], batch[-1]
+            if len(batch) == 1:
+                label = f"Step {first.number}/{total}"
+            else:
+                label = f"Steps {first.number}-{last.number}/{total}"
+            caption = _caption(f"{label}: {last.description}" if last.description else label)
+            lines.append(f"        # {label}: {_caption(last.action, 20)}")
+            setup, animations = self._diff(before, state)
+            self._play(lines, setup, animations, caption, step_time * min(len(batch), 2))
+            lines.append(f"        self.wait({step_time * (1.5 if last.key else 0.5):.2f})")
+
+        final = self.trace.get("final_state") or {}
+        end = state.copy()
+        data = final.get("data")
+        rows = _as_rows(data) if self.grid else None
+        if rows is not None:
+            data = [row[c] if c < len(row) else None for row in rows for c in range(self.cols)]
+        if isinstance(data, list) and len(data) == self.size and not any(isinstance(v, (dict, list)) for v in data):
+            cell_at = {slot: cell for cell, slot in enumerate(end.slot)}
+            for slot, value in enumerate(data):
+                end.value[cell_at[slot]] = _label(value)
+        for cell in temporary:
+            end.color[cell] = settled[cell]
+        end.marker = {name: None for name in self.marker_names}
+        result = final.get("result")
+        summary = f"Result: {result}" if result not in (None, "") else final.get("description") or "Done"
+        lines.append("        # Final state")
+        setup, animations = self._diff(state, end)
+        self._play(lines, setup, animations, _caption(summary), step_time * 1.5)
+        lines += [
+            "        self.wait(2)",
+            "",
+            "    def caption(self, text):",
+            "        caption = Text(text, font_size=24)",
+            "        if caption.width > config.frame_width - 1:",
+            "            caption.scale_to_fit_width(config.frame_width - 1)",
+            "        return caption.to_edge(DOWN)",
+        ]
+        return "\n".join(lines) + "\n"
+
+
+def compile_trace(trace: Dict[str, Any], title: str = "", step_time: float = 1.0, max_plays: int = MAX_PLAYS) -> str:
+    """Manim source of a TraceScene class for trace (see TraceCompiler)"""
+    return TraceCompiler(trace, title, step_time, max_plays).compile()
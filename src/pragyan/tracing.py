@@ -0,0 +1,262 @@
+"""
+Tracing for Pragyan - nested timing spans across the solve pipeline
+Shows where the time in Pragyan.process goes (scraping, LLM calls, scene generation, rendering)
+"""
+
+import contextvars
+import itertools
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional, Dict, Any, List, Iterator, Callable, Union
+
+
+_current_span: contextvars.ContextVar[Optional["Span"]] = contextvars.ContextVar(
+    "pragyan_current_span", default=None
+)
+_active_tracer: contextvars.ContextVar[Optional["Tracer"]] = contextvars.ContextVar(
+    "pragyan_active_tracer", default=None
+)
+_span_ids = itertools.count(1)
+
+
+@dataclass
+class Span:
+    """One timed unit of work, such as a pipeline stage or an LLM call"""
+    name: str
+    span_id: int
+    parent_id: Optional[int] = None
+    start: float = 0.0  # time.perf_counter() at entry
+    end: Optional[float] = None
+    thread_id: int = 0
+    attributes: Dict[str, Any] = field(default_factory=dict)
+    error: Optional[str] = None
+    tracer: Optional["Tracer"] = field(default=None, repr=False, compare=False)
+
+    @property
+    def duration(self) -> float:
+        """Seconds between entry and exit (up to now while the span is open)"""
+        return (time.perf_counter() if self.end is None else self.end) - self.start
+
+    def set(self, **attributes):
+        """Attach attributes (sizes, token counts, cache hits...) to the span"""
+        self.attributes.update(attributes)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert span to dictionary"""
+        origin = self.tracer.origin if self.tracer else 0.0
+        return {
+            "name": self.name,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "start": round(self.start - origin, 6),
+            "duration": round(self.duration, 6),
+            "thread_id": self.thread_id,
+            "attributes": self.attributes,
+            "error": self.error,
+        }
+
+
+class _NoopSpan:
+    """Returned when no trace is active, so instrumented code needs no checks"""
+
+    def set(self, **attributes):
+        pass
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+class Tracer:
+    """
+    Collects the spans of one or more pipeline runs
+
+    Example:
+        >>> tracer = Tracer()
+        >>> pragyan = Pragyan(provider="groq", api_key=KEY, tracer=tracer)
+        >>> pragyan.process(url, generate_video=False)
+        >>> tracer.export_chrome("trace.json")  # open in chrome://tracing or Perfetto
+    """
+
+    def __init__(self):
+        self.origin = time.perf_counter()
+        self.wall_origin = time.time()
+        self._spans: List[Span] = []
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def span(self, name: str, **attributes) -> Iterator[Span]:
+        """
+        Time a block as a child of the current span
+
+        Args:
+            name: Span name, e.g. "llm.generate" or "video.render"
+            **attributes: Initial attributes
+
+        Yields:
+            The open Span, for attaching attributes discovered inside the block
+        """
+        parent = _current_span.get()
+        current = Span(
+            name=name,
+            span_id=next(_span_ids),
+            parent_id=parent.span_id if parent is not None and parent.tracer is self else None,
+            start=time.perf_counter(),
+            thread_id=threading.get_ident(),
+            attributes=dict(attributes),
+            tracer=self,
+        )
+        token = _current_span.set(current)
+        try:
+            yield current
+        except BaseException as e:
+            current.error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            current.end = time.perf_counter()
+            _current_span.reset(token)
+            with self._lock:
+                self._spans.append(current)
+
+    @property
+    def spans(self) -> List[Span]:
+        """Finished spans in start order"""
+        with self._lock:
+            return sorted(self._spans, key=lambda s: s.start)
+
+    def clear(self):
+        """Drop all recorded spans"""
+        with self._lock:
+            self._spans.clear()
+
+    def summary(self) -> List[Dict[str, Any]]:
+        """
+        Aggregate spans by name
+
+        Returns:
+            One row per span name with count, total/mean/max seconds and
+            summed numeric attributes, ordered by first occurrence
+        """
+        rows: Dict[str, Dict[str, Any]] = {}
+        for span in self.spans:
+            row = rows.setdefault(span.name, {
+                "name": span.name, "count": 0, "total": 0.0, "max": 0.0, "errors": 0, "totals": {},
+            })
+            row["count"] += 1
+            row["total"] += span.duration
+            row["max"] = max(row["max"], span.duration)
+            row["errors"] += span.error is not None
+            for key, value in span.attributes.items():
+                if isinstance(value, bool):
+                    row["totals"][key] = row["totals"].get(key, 0) + int(value)
+                elif isinstance(value, (int, float)):
+                    row["totals"][key] = row["totals"].get(key, 0) + value
+        for row in rows.values():
+            row["mean"] = row["total"] / row["count"]
+        return list(rows.values())
+
+    def export_jsonl(self, path: Union[str, Path]) -> Path:
+        """Write one JSON object per span"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            for span in self.spans:
+                f.write(json.dumps(span.to_dict(), default=str) + "\n")
+        return path
+
+    def to_chrome_events(self) -> List[Dict[str, Any]]:
+        """Spans as Chrome trace-event "complete" events (timestamps in microseconds)"""
+        pid = os.getpid()
+        events = []
+        for span in self.spans:
+            args = dict(span.attributes)
+            if span.error:
+                args["error"] = span.error
+            events.append({
+                "name": span.name,
+                "cat": span.name.split(".")[0],
+                "ph": "X",
+                "ts": round((span.start - self.origin) * 1_000_000),
+                "dur": round(span.duration * 1_000_000),
+                "pid": pid,
+                "tid": span.thread_id,
+                "args": args,
+            })
+        return events
+
+    def export_chrome(self, path: Union[str, Path]) -> Path:
+        """Write a trace viewable in chrome://tracing or ui.perfetto.dev"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": self.to_chrome_events(), "displayTimeUnit": "ms"}, f, default=str)
+        return path
+
+    def export(self, path: Union[str, Path]) -> Path:
+        """Write Chrome format for .json paths and JSONL otherwise"""
+        if Path(path).suffix == ".json":
+            return self.export_chrome(path)
+        return self.export_jsonl(path)
+
+
+def current_span() -> Optional[Span]:
+    """The innermost open span in this context, if any"""
+    return _current_span.get()
+
+
+@contextmanager
+def activate(tracer: Optional[Tracer]) -> Iterator[None]:
+    """Record spans opened inside the block in tracer (no-op for None)"""
+    if tracer is None:
+        yield
+        return
+    token = _active_tracer.set(tracer)
+    try:
+        yield
+    finally:
+        _active_tracer.reset(token)
+
+
+@contextmanager
+def span(name: str, tracer: Optional[Tracer] = None, **attributes) -> Iterator[Union[Span, _NoopSpan]]:
+    """
+    Time a block under the current trace
+
+    Opens a child of the current span, or a root span in the tracer made
+    current with activate(). Without either it does nothing, so
+    instrumentation is free when tracing is off.
+
+    Args:
+        name: Span name
+        tracer: Tracer to record in (defaults to the current span's or the active one)
+        **attributes: Initial attributes
+    """
+    if tracer is None:
+        parent = _current_span.get()
+        tracer = parent.tracer if parent is not None else _active_tracer.get()
+    if tracer is None:
+        yield _NOOP_SPAN
+        return
+    with tracer.span(name, **attributes) as current:
+        yield current
+
+
+def annotate(**attributes):
+    """Attach attributes to the current span, if one is open"""
+    current = _current_span.get()
+    if current is not None:
+        current.set(**attributes)
+
+
+def propagate(fn: Callable) -> Callable:
+    """
+    Bind fn to the current context so spans it opens in a worker thread
+    nest under the caller's span (ThreadPoolExecutor does not copy contextvars)
+    """
+    context = contextvars.copy_context()
+    # A Context can only be entered by one thread at a time, so every call gets a copy
+    return lambda *args, **kwargs: context.copy().run(fn, *args, **kwargs)
@@ -5,15 +5,23 @@ with proper animations, visual data structures, and algorithm visualizations
 
 import os
 import re
+import ast
 import shutil
 import tempfile
 import subprocess
 from pathlib import Path
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Tuple
+from dataclasses import replace
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
 
 from pragyan.models import Question, Solution, VideoConfig, AnimationScene
 from pragyan.algorithm_visualizers import get_visualizer_for_problem
+from pragyan.cache import RenderCache
+from pragyan.scene_validator import validate_scene_code, ValidationResult
+from pragyan.scene_estimator import SceneEstimate, estimate_scene, trim_scene, downgrade_options
+from pragyan.trace_compiler import compile_trace, SCENE_CLASS as TRACE_SCENE_CLASS
+from pragyan import tracing
 
 
 class VideoGenerator:
@@ -22,23 +30,45 @@ class VideoGenerator:
     with proper animations, visual data structures, and algorithm visualizations
     """
     
-    def __init__(self, config: Optional[VideoConfig] = None):
+    # Sections of the generic DSAExplanation scene: (scene class, construct call)
+    SECTION_SCENES = [
+        ("IntroSection", "self.intro_scene(TITLE, TOPICS)"),
+        ("ConceptSection", "self.concept_scene(CONCEPT)"),
+        ("DataStructureSection", "self.data_structure_scene(EXAMPLE_ARR)"),
+        ("AlgorithmSection", "self.algorithm_scene(EXAMPLE_ARR, ALGO_TYPE)"),
+        ("CodeSection", "self.code_scene(CODE_LINES)"),
+        ("ComplexitySection", "self.complexity_scene(TIME_COMPLEXITY, SPACE_COMPLEXITY)"),
+        ("OutroSection", "self.outro_scene(TITLE)"),
+    ]
+    
+    def __init__(self, config: Optional[VideoConfig] = None, render_cache: Optional[RenderCache] = None):
         self.config = config or VideoConfig()
         self._temp_dir = None
+        if render_cache is None and self.config.use_render_cache:
+            render_cache = RenderCache()
+        self.render_cache = render_cache
         self._verify_manim_installation()
         self.llm_client = None  # Can be set later for LLM-powered animations
         self._scene_class_name = "DSAExplanation"  # Track which scene class to render
+        self.last_estimate: Optional[SceneEstimate] = None  # Set when a render budget is checked
+    
+    @property
+    def manim_version(self) -> Optional[str]:
+        """Installed Manim version, read from package metadata"""
+        from importlib.metadata import version, PackageNotFoundError
+        try:
+            return version("manim")
+        except PackageNotFoundError:
+            return None
     
     def set_llm_client(self, llm_client):
         """Set LLM client for advanced animation generation"""
         self.llm_client = llm_client
     
     def _verify_manim_installation(self):
-        """Verify that Manim is properly installed"""
-        try:
-            import manim
-            self.manim_version = manim.__version__
-        except ImportError:
+        """Verify that Manim is properly installed (without importing it)"""
+        import importlib.util
+        if importlib.util.find_spec("manim") is None:
             raise ImportError(
                 "Manim is not installed. Please install it with: pip install manim\n"
                 "You may also need to install additional dependencies. "
@@ -62,18 +92,38 @@ class VideoGenerator:
         analysis: Dict[str, Any],
         video_script: Optional[List[Dict[str, Any]]] = None,
         output_filename: Optional[str] = None
+    ) -> Path:
+        with tracing.span("video"):
+            return self._generate_video(question, solution, analysis, output_filename)
+    
+    def _generate_video(
+        self,
+        question: Question,
+        solution: Solution,
+        analysis: Dict[str, Any],
+        output_filename: Optional[str] = None
     ) -> Path:
         temp_dir = self._get_temp_dir()
         
-        # Always use LLM to generate dynamic, problem-specific animation code
-        if self.llm_client:
-            scene_code, self._scene_class_name = self._generate_dynamic_scene(
-                question, solution, analysis
-            )
-        else:
-            # Fallback to generic animated scene if no LLM
-            scene_code = self._generate_animated_scene(question, solution, analysis)
-            self._scene_class_name = "DSAExplanation"
+        with tracing.span("video.scene") as span:
+            # Use the LLM for a problem-specific animation: a step trace compiled to
+            # Manim code, or the whole scene written by the LLM
+            if self.llm_client and self.config.scene_source == "trace":
+                scene_code, self._scene_class_name = self._generate_llm_powered_scene(
+                    question, solution, analysis
+                )
+            elif self.llm_client and self.config.scene_source == "code":
+                scene_code, self._scene_class_name = self._generate_dynamic_scene(
+                    question, solution, analysis
+                )
+            else:
+                # Fallback to generic animated scene if no LLM
+                scene_code = self._generate_animated_scene(question, solution, analysis)
+                self._scene_class_name = "DSAExplanation"
+            
+            # Check the estimated length/cost before committing render time to it
+            scene_code, render_config = self._apply_render_budget(scene_code, self._scene_class_name)
+            span.set(scene_class=self._scene_class_name, scene_chars=len(scene_code))
         
         scene_file = temp_dir / "dsa_explanation.py"
         with open(scene_file, "w", encoding="utf-8") as f:
@@ -84,9 +134,87 @@ class VideoGenerator:
         with open(debug_file, "w", encoding="utf-8") as f:
             f.write(scene_code)
         
-        output_path = self._render_video(scene_file, output_filename, self._scene_class_name)
+        output_path = self._render_video(scene_file, output_filename, self._scene_class_name, render_config)
         return output_path
     
+    def estimate(self, scene_code: str, scene_class_name: str = "DSAExplanation") -> SceneEstimate:
+        """
+        Estimate video length and render cost of a scene with this generator's config
+        
+        Args:
+            scene_code: Full scene source
+            scene_class_name: Scene class that will be rendered
+        
+        Returns:
+            SceneEstimate
+        """
+        return estimate_scene(scene_code, scene_class_name, self.config)
+    
+    def _over_budget(self, estimate: SceneEstimate, config: VideoConfig) -> bool:
+        if config.max_video_seconds is not None and estimate.duration > config.max_video_seconds:
+            return True
+        if config.max_render_seconds is not None and estimate.render_seconds > config.max_render_seconds:
+            return True
+        return False
+    
+    def _apply_render_budget(self, scene_code: str, scene_class_name: str) -> Tuple[str, VideoConfig]:
+        """
+        Reject, trim or downgrade a scene whose estimate is over the configured budget
+        
+        Args:
+            scene_code: Full scene source
+            scene_class_name: Scene class that will be rendered
+        
+        Returns:
+            tuple: (scene_code, config to render with)
+        """
+        config = self.config
+        if config.max_video_seconds is None and config.max_render_seconds is None:
+            return scene_code, config
+        
+        try:
+            estimate = self.estimate(scene_code, scene_class_name)
+        except ValueError:
+            return scene_code, config
+        
+        self.last_estimate = estimate
+        if not self._over_budget(estimate, config):
+            return scene_code, config
+        
+        if config.over_budget == "reject":
+            raise RuntimeError(
+                f"Scene is over budget: ~{estimate.duration:.0f}s of video, "
+                f"~{estimate.render_seconds:.0f}s to render"
+            )
+        
+        if config.over_budget == "downgrade":
+            for quality, resolution, fps in downgrade_options(config):
+                config = replace(config, video_quality=quality, resolution=resolution, fps=fps)
+                estimate = estimate.for_config(config)
+                if not self._over_budget(estimate, config):
+                    break
+            
+            scene_code = re.sub(r'^config\.pixel_height = .*$', f"config.pixel_height = {config.pixel_height}", scene_code, flags=re.MULTILINE)
+            scene_code = re.sub(r'^config\.pixel_width = .*$', f"config.pixel_width = {config.pixel_width}", scene_code, flags=re.MULTILINE)
+            scene_code = re.sub(r'^config\.frame_rate = .*$', f"config.frame_rate = {config.fps}", scene_code, flags=re.MULTILINE)
+        elif config.over_budget != "trim":
+            raise ValueError(f"Unknown over_budget action: {config.over_budget}")
+        
+        # Trimming also covers length budgets that a lower quality cannot fix
+        if self._over_budget(estimate, config) and estimate.duration > 0:
+            factor = 1.0
+            if config.max_video_seconds is not None:
+                factor = min(factor, config.max_video_seconds / estimate.duration)
+            if config.max_render_seconds is not None and estimate.frame_seconds > 0:
+                fixed_seconds = estimate.render_seconds - estimate.frame_seconds
+                factor = min(factor, max(0.1, (config.max_render_seconds - fixed_seconds) / estimate.frame_seconds))
+            scene_code = trim_scene(scene_code, factor)
+            self.last_estimate = self.estimate(scene_code, scene_class_name).for_config(config)
+        else:
+            self.last_estimate = estimate
+        
+        return scene_code, config
+    
     def _escape_for_python(self, s: str, max_len: int = 500) -> str:
         """Escape string for Python code embedding"""
         if not s:
@@ -286,9 +414,29 @@ IMPORTANT: Never use Tex, MathTex, or any LaTeX - only use Text() for all text r
             
             # Clean the response - extract just the Python code
             scene_code = self._extract_manim_code(raw_response)
+            final_code = self._add_scene_header(scene_code, question)
+            
+            # Catch broken code here rather than after Manim has started up
+            validation = validate_scene_code(final_code, "AlgorithmScene")
+            for _ in range(self.config.scene_repair_attempts):
+                if validation.ok:
+                    break
+                scene_code = self._repair_scene_code(scene_code, validation)
+                final_code = self._add_scene_header(scene_code, question)
+                validation = validate_scene_code(final_code, "AlgorithmScene")
             
-            # Add config header
-            final_code = f'''"""
+            if not validation.ok:
+                return self._generate_animated_scene(question, solution, analysis), "DSAExplanation"
+            
+            return final_code, "AlgorithmScene"
+            
+        except Exception as e:
+            # LLM scene generation failed, fall back silently
+            return self._generate_animated_scene(question, solution, analysis), "DSAExplanation"
+    
+    def _add_scene_header(self, scene_code: str, question: Question) -> str:
+        """Prefix LLM scene code with the imports and render config"""
+        final_code = f'''"""
 Dynamically generated Manim scene by Pragyan
 Problem: {self._escape_for_python(question.title, 100)}
 Generated using LLM-powered visualization
@@ -303,17 +451,35 @@ config.frame_rate = {self.config.fps}
 config.background_color = "{self.config.background_color}"
 
 '''
-            # Add the generated scene code (removing duplicate imports if present)
-            scene_code_cleaned = scene_code.replace("from manim import *", "").strip()
-            scene_code_cleaned = scene_code_cleaned.replace("import numpy as np", "").strip()
-            
-            final_code += scene_code_cleaned
-            
-            return final_code, "AlgorithmScene"
-            
-        except Exception as e:
-            # LLM scene generation failed, fall back silently
-            return self._generate_animated_scene(question, solution, analysis), "DSAExplanation"
+        # Add the generated scene code (removing duplicate imports if present)
+        scene_code_cleaned = scene_code.replace("from manim import *", "").strip()
+        scene_code_cleaned = scene_code_cleaned.replace("import numpy as np", "").strip()
+        
+        return final_code + scene_code_cleaned
+    
+    def _repair_scene_code(self, scene_code: str, validation: ValidationResult) -> str:
+        """Ask the LLM to fix the problems found by the validator"""
+        prompt = f'''This Manim Community Edition scene fails validation. Fix ONLY these problems and keep everything else unchanged.
+
+PROBLEMS:
+{validation}
+
+RULES:
+- The class must be named `AlgorithmScene`, extend `Scene` and define `construct(self)`
+- Use only names from `from manim import *`, numpy (as np) and Python builtins
+- Use `Text()` for all text - never `Tex`, `MathTex` or any other LaTeX mobject
+- No file, network or system access
+
+CODE:
+```python
+{scene_code}
+```
+
+Return ONLY the corrected Python code.'''
+        
+        system_prompt = "You fix Manim Community Edition code. Reply with the full corrected code only."
+        
+        return self._extract_manim_code(self.llm_client.generate(prompt, system_prompt))
     
     def _extract_manim_code(self, response: str) -> str:
         """Extract clean Manim code from LLM response"""
@@ -403,23 +569,32 @@ config.background_color = "{self.config.background_color}"
         question: Question,
         solution: Solution,
         analysis: Dict[str, Any]
-    ) -> str:
-        """Generate a scene using LLM to create custom animations"""
+    ) -> tuple:
+        """
+        Animate an execution trace from the LLM, compiled to Manim code by TraceCompiler.
+        The LLM only returns a small JSON trace, so there is no generated code to repair;
+        traces the compiler cannot draw fall back to the free-form LLM scene.
+        
+        Returns:
+            tuple: (scene_code, scene_class_name)
+        """
         if not self.llm_client:
-            return self._generate_animated_scene(question, solution, analysis)
+            return self._generate_animated_scene(question, solution, analysis), "DSAExplanation"
         
         try:
             # Get detailed animation steps from LLM
             animation_steps = self.llm_client.generate_algorithm_animation_steps(
                 question, solution, analysis
             )
-            
-            # TODO: Convert animation steps to Manim code
-            # For now, fallback to generic
-            return self._generate_animated_scene(question, solution, analysis)
+            scene_code = compile_trace(
+                animation_steps, question.title, step_time=1.0 / max(self.config.animation_speed, 0.1)
+            )
+            final_code = self._add_scene_header(scene_code, question)
+            if validate_scene_code(final_code, TRACE_SCENE_CLASS).ok:
+                return final_code, TRACE_SCENE_CLASS
         except Exception:
-            # Silent fallback
-            return self._generate_animated_scene(question, solution, analysis)
+            pass
+        return self._generate_dynamic_scene(question, solution, analysis)
     
     def _generate_animated_scene(
         self,
@@ -458,6 +633,12 @@ config.background_color = "{self.config.background_color}"
             code_for_display.append(clean_line)
         code_list = "[" + ", ".join(f'"{line}"' for line in code_for_display) + "]"
         
+        section_calls = "\n".join(f"        {call}" for _, call in self.SECTION_SCENES)
+        section_classes = "".join(
+            f"\n\nclass {name}(DSAExplanation):\n    def construct(self):\n        {call}\n"
+            for name, call in self.SECTION_SCENES
+        )
+        
         # Build scene code - use f-string ONLY for the header with variable substitution
         scene_header = f'''"""
 Manim scene for DSA explanation video - Generated by Pragyan
@@ -473,28 +654,26 @@ config.frame_rate = {self.config.fps}
 config.background_color = "{self.config.background_color}"
 
 
+# Data
+TITLE = "{title}"
+CONCEPT = "{concept}"
+APPROACH = "{approach}"
+TIME_COMPLEXITY = "{time_comp}"
+SPACE_COMPLEXITY = "{space_comp}"
+TOPICS = "{topics_str}"
+EXAMPLE_ARR = {example_arr}
+ALGO_TYPE = "{algo_type}"
+STEPS = {steps_list}
+CODE_LINES = {code_list}
+
+# Each section is also its own Scene so they can be rendered in parallel
+SECTION_SCENES = {[name for name, _ in self.SECTION_SCENES]!r}
+
+
 class DSAExplanation(Scene):
     def construct(self):
-        # Data
-        title = "{title}"
-        concept = "{concept}"
-        approach = "{approach}"
-        time_complexity = "{time_comp}"
-        space_complexity = "{space_comp}"
-        topics = "{topics_str}"
-        example_arr = {example_arr}
-        algo_type = "{algo_type}"
-        steps = {steps_list}
-        code_lines = {code_list}
-        
         # Run scenes
-        self.intro_scene(title, topics)
-        self.concept_scene(concept)
-        self.data_structure_scene(example_arr)
-        self.algorithm_scene(example_arr, algo_type)
-        self.code_scene(code_lines)
-        self.complexity_scene(time_complexity, space_complexity)
-        self.outro_scene(title)
+{section_calls}
 '''
         
         # The rest is a regular string with NO f-string formatting
@@ -801,33 +980,95 @@ class DSAExplanation(Scene):
         self.clear_all()
 '''
         
-        return scene_header + scene_body
+        return scene_header + scene_body + section_classes
     
-    def _render_video(self, scene_file: Path, output_filename: Optional[str] = None, scene_class_name: str = "DSAExplanation") -> Path:
+    def _render_video(
+        self,
+        scene_file: Path,
+        output_filename: Optional[str] = None,
+        scene_class_name: str = "DSAExplanation",
+        config: Optional[VideoConfig] = None
+    ) -> Path:
         """Render the Manim scene to video
         
         Args:
             scene_file: Path to the Python file containing the Manim scene
             output_filename: Optional custom output filename
             scene_class_name: Name of the Scene class to render (e.g., 'NQueensScene', 'BubbleSortScene')
+            config: Video configuration to render with (defaults to the generator's)
         """
+        config = config or self.config
+        with tracing.span("video.render", scene_class=scene_class_name, quality=config.video_quality) as span:
+            output_path = self._render_with_cache(scene_file, output_filename, scene_class_name, config, span)
+            span.set(output_bytes=output_path.stat().st_size)
+            return output_path
+    
+    def _render_with_cache(
+        self,
+        scene_file: Path,
+        output_filename: Optional[str],
+        scene_class_name: str,
+        config: VideoConfig,
+        span
+    ) -> Path:
+        """Copy a cached render for this scene and config, or render and cache it"""
+        scene_source = scene_file.read_text(encoding="utf-8")
+        
+        cache_key = None
+        if self.render_cache is not None:
+            cache_key = self.render_cache.key_for(scene_source, scene_class_name, config)
+            cached_video = self.render_cache.get(cache_key)
+            span.set(cache_hit=cached_video is not None)
+            if cached_video is not None:
+                output_path = self._output_path(output_filename)
+                shutil.copy(cached_video, output_path)
+                return output_path
+        
+        try:
+            video_file = None
+            sections = self._find_section_scenes(scene_source) if scene_class_name == "DSAExplanation" else []
+            if sections and self._render_workers() > 1 and shutil.which("ffmpeg"):
+                try:
+                    video_file = self._render_sections(scene_file, sections, config.video_quality)
+                    span.set(sections=len(sections))
+                except Exception:
+                    # Fall back to rendering the whole scene in one process
+                    video_file = None
+            
+            if video_file is None:
+                video_file = self._run_manim(scene_file, scene_class_name, self._get_temp_dir() / "media", config.video_quality)
+            
+            if cache_key is not None:
+                self.render_cache.set(cache_key, video_file)
+            
+            output_path = self._output_path(output_filename)
+            shutil.copy(video_file, output_path)
+            return output_path
+            
+        except subprocess.TimeoutExpired:
+            raise RuntimeError("Video rendering timed out after 5 minutes")
+        except Exception as e:
+            raise RuntimeError(f"Video generation failed: {str(e)}")
+    
+    def _run_manim(self, scene_file: Path, scene_class_name: str, media_dir: Path, video_quality: str) -> Path:
+        """Render one Scene class with Manim and return the produced MP4"""
         quality_map = {
             "low_quality": "-ql",
             "medium_quality": "-qm",
             "high_quality": "-qh",
             "production_quality": "-qp",
         }
-        quality_flag = quality_map.get(self.config.video_quality, "-qm")
+        quality_flag = quality_map.get(video_quality, "-qm")
         
         cmd = [
             "manim",
             quality_flag,
             str(scene_file),
             scene_class_name,  # Use the actual algorithm scene class name
-            "--media_dir", str(self._get_temp_dir() / "media"),
+            "--media_dir", str(media_dir),
         ]
         
-        try:
+        with tracing.span("video.manim", scene_class=scene_class_name, quality=video_quality) as span:
             result = subprocess.run(
                 cmd,
                 capture_output=True,
@@ -840,25 +1081,86 @@ class DSAExplanation(Scene):
                 raise RuntimeError(f"Manim rendering failed: {result.stderr}")
             
             # Find the output video
-            media_dir = self._get_temp_dir() / "media" / "videos" / "dsa_explanation"
+            videos_dir = media_dir / "videos" / scene_file.stem
             
-            for quality_dir in media_dir.iterdir() if media_dir.exists() else []:
+            for quality_dir in videos_dir.iterdir() if videos_dir.exists() else []:
                 for video_file in quality_dir.glob("*.mp4"):
-                    if output_filename:
-                        output_path = Path.cwd() / output_filename
-                    else:
-                        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                        output_path = Path.cwd() / f"dsa_explanation_{timestamp}.mp4"
-                    
-                    shutil.copy(video_file, output_path)
-                    return output_path
+                    span.set(output_bytes=video_file.stat().st_size)
+                    return video_file
             
             raise FileNotFoundError("No video file was generated")
-            
-        except subprocess.TimeoutExpired:
-            raise RuntimeError("Video rendering timed out after 5 minutes")
-        except Exception as e:
-            raise RuntimeError(f"Video generation failed: {str(e)}")
+    
+    def _render_workers(self) -> int:
+        """Number of Manim processes to run at once"""
+        return self.config.render_workers or os.cpu_count() or 1
+    
+    @staticmethod
+    def _find_section_scenes(scene_source: str) -> List[str]:
+        """Read the SECTION_SCENES list from a generated scene, if it has one"""
+        match = re.search(r'^SECTION_SCENES = (\[.*\])$', scene_source, re.MULTILINE)
+        if not match:
+            return []
+        try:
+            sections = ast.literal_eval(match.group(1))
+        except (ValueError, SyntaxError):
+            return []
+        return [name for name in sections if isinstance(name, str)]
+    
+    def _render_sections(self, scene_file: Path, sections: List[str], video_quality: str) -> Path:
+        """
+        Render each section scene in its own Manim process and join the results
+        
+        Args:
+            scene_file: Path to the generated scene file
+            sections: Section Scene class names, in playback order
+            video_quality: Manim quality preset
+        
+        Returns:
+            Path to the joined MP4
+        """
+        temp_dir = self._get_temp_dir()
+        workers = min(len(sections), self._render_workers())
+        
+        # Each section gets its own media dir so parallel renders never share caches
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            # propagate() keeps the section spans nested under video.render
+            render_section = tracing.propagate(
+                lambda name: self._run_manim(scene_file, name, temp_dir / f"media_{name}", video_quality)
+            )
+            parts = list(pool.map(render_section, sections))
+        
+        return self._concat_videos(parts, temp_dir / "dsa_explanation_joined.mp4")
+    
+    @staticmethod
+    def _concat_videos(parts: List[Path], output_path: Path) -> Path:
+        """Join MP4s with identical encoding settings without re-encoding"""
+        list_file = output_path.with_suffix(".txt")
+        with open(list_file, "w", encoding="utf-8") as f:
+            for part in parts:
+                escaped = str(part.resolve()).replace("'", "'\\''")
+                f.write(f"file '{escaped}'\n")
+        
+        cmd = [
+            "ffmpeg", "-y", "-loglevel", "error",
+            "-f", "concat", "-safe", "0",
+            "-i", str(list_file),
+            "-c", "copy",
+            str(output_path),
+        ]
+        with tracing.span("video.concat", parts=len(parts)):
+            result = subprocess.run(cmd, capture_output=True, text=True, timeout=120)
+        if result.returncode != 0:
+            raise RuntimeError(f"Joining section videos failed: {result.stderr}")
+        
+        return output_path
+    
+    def _output_path(self, output_filename: Optional[str] = None) -> Path:
+        """Get the destination path for a finished video"""
+        if output_filename:
+            return Path.cwd() / output_filename
+        
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        return Path.cwd() / f"dsa_explanation_{timestamp}.mp4"
 
 
 class SimpleVideoGenerator:
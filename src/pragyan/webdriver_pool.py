@@ -0,0 +1,225 @@
+"""
+WebDriver pool for Pragyan - keeps warm headless browsers for scraping
+Avoids a driver install and a Chrome cold start for every scraped page
+"""
+
+import atexit
+import queue
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Optional, Callable, Any, Iterator, List
+
+
+_driver_path_lock = threading.Lock()
+_driver_path: Optional[str] = None
+
+
+def _chromedriver_path() -> str:
+    """Resolve the chromedriver binary once per process"""
+    global _driver_path
+    with _driver_path_lock:
+        if _driver_path is None:
+            from webdriver_manager.chrome import ChromeDriverManager
+            _driver_path = ChromeDriverManager().install()
+        return _driver_path
+
+
+def create_chrome_driver(headless: bool = True):
+    """
+    Start a headless Chrome configured for scraping
+
+    Args:
+        headless: Run without a visible window
+
+    Returns:
+        selenium.webdriver.Chrome instance
+    """
+    from selenium import webdriver
+    from selenium.webdriver.chrome.service import Service
+    from selenium.webdriver.chrome.options import Options
+
+    options = Options()
+    if headless:
+        options.add_argument("--headless")
+    options.add_argument("--no-sandbox")
+    options.add_argument("--disable-dev-shm-usage")
+    options.add_argument("--disable-gpu")
+    options.add_argument("--window-size=1920,1080")
+    options.add_argument("user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36")
+    # Return from driver.get() at DOMContentLoaded; readiness waits cover the rest
+    options.page_load_strategy = "eager"
+
+    service = Service(_chromedriver_path())
+    return webdriver.Chrome(service=service, options=options)
+
+
+def wait_until_ready(driver, css_selector: Optional[str] = None, timeout: float = 10.0) -> bool:
+    """
+    Wait until the page has loaded and, optionally, an element is present
+
+    Args:
+        driver: Selenium WebDriver
+        css_selector: Element that marks the content as rendered
+        timeout: Maximum seconds to wait
+
+    Returns:
+        True if the page became ready, False on timeout
+    """
+    from selenium.common.exceptions import TimeoutException
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support.ui import WebDriverWait
+    from selenium.webdriver.support import expected_conditions as EC
+
+    try:
+        wait = WebDriverWait(driver, timeout, poll_frequency=0.1)
+        wait.until(lambda d: d.execute_script("return document.readyState") in ("interactive", "complete"))
+        if css_selector:
+            wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, css_selector)))
+        return True
+    except TimeoutException:
+        return False
+
+
+@dataclass
+class _PooledDriver:
+    driver: Any
+    pages: int = 0
+    created: float = field(default_factory=time.time)
+
+
+class WebDriverPool:
+    """
+    Thread-safe pool of reusable browser instances
+
+    Drivers are started lazily up to `size`, health-checked before every
+    checkout and recycled after `max_pages` page loads or `max_age` seconds,
+    so a long-running process never accumulates a bloated browser.
+    """
+
+    def __init__(
+        self,
+        size: int = 2,
+        max_pages: int = 50,
+        max_age: Optional[float] = 30 * 60,
+        factory: Optional[Callable[[], Any]] = None,
+    ):
+        """
+        Initialize the pool
+
+        Args:
+            size: Maximum number of browsers running at once
+            max_pages: Page loads after which a browser is restarted
+            max_age: Seconds after which a browser is restarted (None = never)
+            factory: Callable that starts a driver (defaults to headless Chrome)
+        """
+        self.size = max(1, size)
+        self.max_pages = max_pages
+        self.max_age = max_age
+        self.factory = factory or create_chrome_driver
+        self._idle: "queue.LifoQueue[_PooledDriver]" = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(self.size)
+        self._lock = threading.Lock()
+        self._live: List[_PooledDriver] = []
+        self._closed = False
+
+    def warm(self, count: Optional[int] = None):
+        """Start browsers ahead of time so the first scrapes skip the cold start"""
+        count = min(count or self.size, self.size)
+        with self._lock:
+            missing = count - len(self._live)
+        for _ in range(max(0, missing)):
+            self._idle.put(self._start())
+
+    def _start(self) -> _PooledDriver:
+        pooled = _PooledDriver(driver=self.factory())
+        with self._lock:
+            self._live.append(pooled)
+        return pooled
+
+    def _discard(self, pooled: _PooledDriver):
+        with self._lock:
+            if pooled in self._live:
+                self._live.remove(pooled)
+        try:
+            pooled.driver.quit()
+        except Exception:
+            pass
+
+    def _is_healthy(self, pooled: _PooledDriver) -> bool:
+        if pooled.pages >= self.max_pages:
+            return False
+        if self.max_age is not None and time.time() - pooled.created > self.max_age:
+            return False
+        try:
+            pooled.driver.execute_script("return 1")
+            return True
+        except Exception:
+            return False
+
+    def _checkout(self) -> _PooledDriver:
+        while True:
+            try:
+                pooled = self._idle.get_nowait()
+            except queue.Empty:
+                return self._start()
+            if self._is_healthy(pooled):
+                return pooled
+            self._discard(pooled)
+
+    @contextmanager
+    def driver(self, timeout: Optional[float] = None) -> Iterator[Any]:
+        """
+        Borrow a browser for one page
+
+        Args:
+            timeout: Seconds to wait for a free browser (None = wait forever)
+
+        Yields:
+            Selenium WebDriver
+        """
+        if self._closed:
+            raise RuntimeError("WebDriver pool is closed")
+        if not self._slots.acquire(timeout=timeout):
+            raise TimeoutError("No WebDriver available")
+
+        pooled = None
+        try:
+            pooled = self._checkout()
+            yield pooled.driver
+        finally:
+            if pooled is not None:
+                pooled.pages += 1
+                if self._closed:
+                    self._discard(pooled)
+                else:
+                    self._idle.put(pooled)
+            self._slots.release()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._live)
+
+    def close(self):
+        """Quit every browser in the pool"""
+        self._closed = True
+        while True:
+            try:
+                self._discard(self._idle.get_nowait())
+            except queue.Empty:
+                break
+
+
+_default_pool: Optional[WebDriverPool] = None
+_default_pool_lock = threading.Lock()
+
+
+def get_default_pool() -> WebDriverPool:
+    """Get the process-wide pool shared by scrapers that were not given one"""
+    global _default_pool
+    with _default_pool_lock:
+        if _default_pool is None or _default_pool._closed:
+            _default_pool = WebDriverPool()
+            atexit.register(_default_pool.close)
+        return _default_pool
@@ -2,7 +2,10 @@
 Tests for Pragyan package
 """
 
+import json
+import math
 import pytest
+from pathlib import Path
 from pragyan.models import (
     Question, Solution, ProgrammingLanguage, 
     VideoConfig, LLMConfig, LLMProvider
@@ -133,6 +136,86 @@ Output: [1,2]
         examples = scraper._extract_examples(text)
         
         assert len(examples) >= 1
+    
+    def test_extract_constraints_keeps_signs_and_powers(self):
+        """Negative bounds survive bullet splitting, and <sup> exponents stay on their line"""
+        from pragyan.scraper import QuestionScraper
+        
+        scraper = QuestionScraper()
+        text = "Constraints:\n- 2 <= nums.length <= 10^4\n-10^9 <= nums[i] <= 10^9\n* 1 <= k <= 5\nExample 1:"
+        
+        assert scraper._extract_constraints(text) == [
+            "2 <= nums.length <= 10^4", "-10^9 <= nums[i] <= 10^9", "1 <= k <= 5",
+        ]
+        
+        pytest.importorskip("bs4")
+        html = "<p><strong>Constraints:</strong></p><ul><li><code>-10<sup>9</sup> &lt;= target &lt;= 10<sup>9</sup></code></li></ul>"
+        assert scraper._extract_constraints(QuestionScraper._html_to_text(html)) == ["-10^9 <= target <= 10^9"]
+
+    
+    def test_fast_tier_skips_browser(self, monkeypatch):
+        """API results are used without starting a browser, tagged with their tier"""
+        from pragyan.scraper import QuestionScraper
+        
+        scraper = QuestionScraper()
+        monkeypatch.setattr(scraper, "_fetch_leetcode_api",
+                            lambda url: Question(title="Two Sum", description="Find two numbers"))
+        monkeypatch.setattr(scraper, "_scrape_leetcode", lambda url: pytest.fail("browser was used"))
+        
+        question = scraper.scrape_url("https://leetcode.com/problems/two-sum/")
+        assert question.title == "Two Sum"
+        assert question.scrape_tier == "api"
+    
+    def test_fast_tier_falls_back_to_browser(self, monkeypatch):
+        """Failed fast tiers fall through to the browser scraper"""
+        from pragyan.scraper import QuestionScraper
+        
+        def failing_api(url):
+            raise ConnectionError("blocked")
+        
+        scraper = QuestionScraper()
+        monkeypatch.setattr(scraper, "_fetch_leetcode_api", failing_api)
+        monkeypatch.setattr(scraper, "_scrape_leetcode",
+                            lambda url: Question(title="Two Sum", description="...", scrape_tier="browser"))
+        
+        assert scraper.scrape_url("https://leetcode.com/problems/two-sum/").scrape_tier == "browser"
+    
+    def test_conditional_get_reuses_body(self):
+        """A 304 response returns the body remembered from the earlier 200"""
+        from pragyan.scraper import QuestionScraper
+        
+        class FakeResponse:
+            def __init__(self, status_code, content=b"", headers=None):
+                self.status_code = status_code
+                self.content = content
+                self.headers = headers or {}
+            
+            def raise_for_status(self):
+                pass
+        
+        class FakeSession:
+            def __init__(self):
+                self.sent_headers = []
+            
+            def get(self, url, headers=None, timeout=None):
+                self.sent_headers.append(headers)
+                if headers.get("If-None-Match") == '"v1"':
+                    return FakeResponse(304)
+                return FakeResponse(200, b"<html>page</html>", {"ETag": '"v1"'})
+        
+        scraper = QuestionScraper()
+        scraper._session = FakeSession()
+        
+        assert scraper._http_get("https://example.com/p") == b"<html>page</html>"
+        assert scraper._http_get("https://example.com/p") == b"<html>page</html>"
+        assert scraper._session.sent_headers[1] == {"If-None-Match": '"v1"'}
+    
+    def test_find_embedded_problem(self):
+        """Structured page data is found anywhere in the embedded JSON"""
+        from pragyan.scraper import QuestionScraper
+        
+        data = {"props": {"pageProps": {"queries": [{"state": {"problem_question": "<p>Hi</p>"}}]}}}
+        assert QuestionScraper._find_dict_with_key(data, "problem_question") == {"problem_question": "<p>Hi</p>"}
 
 
 class TestUtils:
@@ -172,6 +255,279 @@ class TestUtils:
         assert format_complexity("(n^2)") == "O(n^2)"
 
 
+class StubClient:
+    """Offline stand-in for a provider client that counts its calls"""
+    
+    def __init__(self, config):
+        self.config = config
+        self.calls = 0
+    
+    def generate(self, prompt, system_prompt=None):
+        self.calls += 1
+        return f"response to {prompt}"
+    
+    def generate_json(self, prompt, system_prompt=None):
+        self.calls += 1
+        return {"prompt": prompt}
+
+
+@pytest.fixture
+def stub_llm(monkeypatch):
+    """Patch the Gemini client so LLMClient can be built without the SDK"""
+    from pragyan import llm_client
+    
+    monkeypatch.setattr(llm_client, "GeminiClient", StubClient)
+    return llm_client.LLMClient
+
+
+class AsyncStubClient:
+    """Async counterpart of StubClient"""
+    
+    def __init__(self, config):
+        self.config = config
+        self.calls = 0
+    
+    async def generate(self, prompt, system_prompt=None):
+        self.calls += 1
+        return f"response to {prompt}"
+    
+    async def generate_json(self, prompt, system_prompt=None):
+        self.calls += 1
+        if "Generate a complete solution" in prompt:
+            return {"code": "def solve(): pass", "concept": "Hashing", "time_complexity": "O(n)"}
+        return {"topics": ["array"], "main_concept": "Hashing"}
+
+
+class TestAsyncAPI:
+    """Test the asyncio API surface"""
+    
+    def test_async_client_shares_cache(self, tmp_path, monkeypatch):
+        """AsyncLLMClient uses the same cache layer as LLMClient"""
+        import asyncio
+        from pragyan import llm_client
+        from pragyan.cache import ResponseCache
+        
+        monkeypatch.setattr(llm_client, "AsyncGeminiClient", AsyncStubClient)
+        llm = llm_client.AsyncLLMClient("gemini", "key", cache=ResponseCache(directory=tmp_path))
+        
+        async def run():
+            return await asyncio.gather(llm.generate("hi"), llm.generate("there"))
+        
+        assert asyncio.run(run()) == ["response to hi", "response to there"]
+        assert asyncio.run(llm.generate("hi")) == "response to hi"
+        assert llm.client.calls == 2
+    
+    def test_async_process_text(self, monkeypatch):
+        """AsyncPragyan.process runs the pipeline on text input"""
+        import asyncio
+        from pragyan import llm_client
+        from pragyan.main import AsyncPragyan
+        
+        monkeypatch.setattr(llm_client, "AsyncGeminiClient", AsyncStubClient)
+        pragyan = AsyncPragyan(provider="gemini", api_key="key")
+        
+        result = asyncio.run(pragyan.process(
+            "Two Sum\nFind two numbers that add up to target", generate_video=False
+        ))
+        
+        assert result["question"].title == "Two Sum"
+        assert result["analysis"]["main_concept"] == "Hashing"
+        assert result["solution"].code == "def solve(): pass"
+        assert result["video_path"] is None
+
+
+class TestSolveStrategies:
+    """Test sequential, speculative and fused solving"""
+    
+    class RecordingClient(StubClient):
+        def __init__(self, config):
+            super().__init__(config)
+            self.prompts = []
+        
+        def generate_json(self, prompt, system_prompt=None):
+            import time
+            self.prompts.append(prompt)
+            time.sleep(0.05)
+            if '"analysis"' in prompt and '"solution"' in prompt:
+                return {"analysis": {"main_concept": "Hashing"}, "solution": {"code": "pass"}}
+            if "Generate a complete solution" in prompt:
+                return {"code": "pass"}
+            return {"main_concept": "Hashing"}
+    
+    def _pragyan(self, monkeypatch):
+        from pragyan import llm_client
+        from pragyan.main import Pragyan
+        
+        monkeypatch.setattr(llm_client, "GeminiClient", self.RecordingClient)
+        pragyan = Pragyan(provider="gemini", api_key="key")
+        return pragyan, pragyan.parse_question("Two Sum\nFind two numbers")
+    
+    def test_speculative_overlaps_requests(self, monkeypatch):
+        """Speculative mode sends analysis and solution requests at once"""
+        import time
+        
+        pragyan, question = self._pragyan(monkeypatch)
+        
+        start = time.perf_counter()
+        solution, analysis = pragyan.solve_complete(question, "python", "speculative")
+        elapsed = time.perf_counter() - start
+        
+        assert analysis == {"main_concept": "Hashing"}
+        assert solution.code == "pass"
+        assert len(pragyan.llm.client.prompts) == 2
+        assert elapsed < 0.095
+    
+    def test_fused_uses_one_request(self, monkeypatch):
+        """Fused mode gets analysis and solution from one prompt"""
+        pragyan, question = self._pragyan(monkeypatch)
+        
+        result = pragyan.process(
+            "Two Sum\nFind two numbers", generate_video=False, strategy="fused"
+        )
+        
+        assert len(pragyan.llm.client.prompts) == 1
+        assert result["analysis"] == {"main_concept": "Hashing"}
+        assert result["solution"].code == "pass"
+
+
+class TestBatch:
+    """Test batch processing"""
+    
+    def test_load_batch_items(self, tmp_path):
+        """Plain lines and JSONL objects can be mixed"""
+        from pragyan.batch import load_batch_items
+        
+        path = tmp_path / "problems.txt"
+        path.write_text(
+            "# nightly set\n"
+            "https://leetcode.com/problems/two-sum\n"
+            "\n"
+            '{"id": "rev", "text": "Reverse a string", "language": "java"}\n'
+        )
+        
+        items = load_batch_items(path)
+        
+        assert [item.id for item in items] == ["2", "rev"]
+        assert items[0].is_url
+        assert items[1].source == "Reverse a string"
+        assert items[1].language == "java"
+    
+    def test_process_batch_limits_stage_concurrency(self, monkeypatch):
+        """Each stage never exceeds its configured concurrency"""
+        import threading
+        import time
+        from pragyan import llm_client
+        from pragyan.main import Pragyan
+        from pragyan.models import BatchConfig
+        
+        active = {"now": 0, "peak": 0}
+        lock = threading.Lock()
+        
+        class SlowClient(StubClient):
+            def generate_json(self, prompt, system_prompt=None):
+                with lock:
+                    active["now"] += 1
+                    active["peak"] = max(active["peak"], active["now"])
+                time.sleep(0.02)
+                with lock:
+                    active["now"] -= 1
+                return {"code": "pass", "topics": []}
+        
+        monkeypatch.setattr(llm_client, "GeminiClient", SlowClient)
+        pragyan = Pragyan(provider="gemini", api_key="key")
+        config = BatchConfig(analyze_concurrency=1, solve_concurrency=1)
+        
+        items = [f"Problem {i}\nDescription {i}" for i in range(6)]
+        results = list(pragyan.process_batch(items, batch_config=config))
+        
+        assert len(results) == 6
+        assert all(r.ok for r in results)
+        assert active["peak"] <= 2
+        assert sorted(r.to_dict()["question"]["title"] for r in results) == [f"Problem {i}" for i in range(6)]
+    
+    def test_failed_item_reports_stage(self, monkeypatch):
+        """Errors are captured per item with the failing stage"""
+        from pragyan import llm_client
+        from pragyan.main import Pragyan
+        
+        class FailingClient(StubClient):
+            def generate_json(self, prompt, system_prompt=None):
+                raise RuntimeError("rate limited")
+        
+        monkeypatch.setattr(llm_client, "GeminiClient", FailingClient)
+        pragyan = Pragyan(provider="gemini", api_key="key")
+        
+        result = next(pragyan.process_batch(["Two Sum\nFind two numbers"]))
+        
+        assert not result.ok
+        assert result.failed_stage == "analyze"
+        assert result.to_dict()["status"] == "error"
+
+
+class TestResponseCache:
+    """Test the on-disk LLM response cache"""
+    
+    def test_repeat_requests_hit_cache(self, tmp_path, stub_llm):
+        """Identical requests are only sent to the provider once"""
+        from pragyan.cache import ResponseCache
+        
+        cache = ResponseCache(directory=tmp_path)
+        llm = stub_llm("gemini", "key", cache=cache)
+        
+        assert llm.generate("hello") == llm.generate("hello")
+        assert llm.generate_json("data") == {"prompt": "data"}
+        assert llm.generate_json("data") == {"prompt": "data"}
+        
+        assert llm.client.calls == 2
+        assert cache.stats.hits == 2
+        assert cache.stats.misses == 2
+    
+    def test_key_depends_on_config(self):
+        """Model, temperature and prompts all change the key"""
+        from pragyan.cache import ResponseCache
+        
+        base = LLMConfig(provider=LLMProvider.GROQ, api_key="a", model="m1")
+        key = ResponseCache.key_for(base, "prompt", "system")
+        
+        assert key == ResponseCache.key_for(LLMConfig(provider=LLMProvider.GROQ, api_key="b", model="m1"), "prompt", "system")
+        assert key != ResponseCache.key_for(LLMConfig(provider=LLMProvider.GROQ, api_key="a", model="m2"), "prompt", "system")
+        assert key != ResponseCache.key_for(LLMConfig(provider=LLMProvider.GROQ, api_key="a", model="m1", temperature=0.1), "prompt", "system")
+        assert key != ResponseCache.key_for(base, "prompt", "other system")
+        assert key != ResponseCache.key_for(base, "prompt", "system", kind="json")
+    
+    def test_bypass_refreshes_entries(self, tmp_path, stub_llm):
+        """Bypass skips lookups but still stores fresh responses"""
+        from pragyan.cache import ResponseCache
+        
+        llm = stub_llm("gemini", "key", cache=ResponseCache(directory=tmp_path, bypass=True))
+        llm.generate("hello")
+        llm.generate("hello")
+        assert llm.client.calls == 2
+        
+        cache = ResponseCache(directory=tmp_path)
+        assert len(cache) == 1
+    
+    def test_eviction_by_count_and_age(self, tmp_path):
+        """Least recently used and expired entries are evicted"""
+        import os
+        import time
+        from pragyan.cache import DiskCache
+        
+        cache = DiskCache(tmp_path, max_entries=2)
+        for i in range(3):
+            cache.set(f"{i:064x}", i)
+            path = cache._path(f"{i:064x}")
+            os.utime(path, (time.time() - 100 + i, time.time() - 100 + i))
+        
+        assert cache.evict() == 1
+        assert cache.get(f"{0:064x}") is None
+        assert cache.get(f"{2:064x}") == 2
+        
+        cache.max_age = 10
+        assert cache.evict() == 2
+        assert len(cache) == 0
+
+
 # Integration tests (require API keys)
 class TestIntegration:
     """Integration tests - these require actual API keys"""
@@ -195,3 +551,1467 @@ class TestIntegration:
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
+
+
+class TestRenderCache:
+    """Test the rendered video cache"""
+    
+    def test_key_depends_on_source_and_config(self):
+        """Scene source, class name and output settings all change the key"""
+        from pragyan.cache import RenderCache
+        
+        key = RenderCache.key_for("scene", "DSAExplanation", VideoConfig())
+        
+        assert key == RenderCache.key_for("scene", "DSAExplanation", VideoConfig(output_dir=Path("other")))
+        assert key != RenderCache.key_for("scene2", "DSAExplanation", VideoConfig())
+        assert key != RenderCache.key_for("scene", "NQueensScene", VideoConfig())
+        assert key != RenderCache.key_for("scene", "DSAExplanation", VideoConfig(video_quality="high_quality"))
+        assert key != RenderCache.key_for("scene", "DSAExplanation", VideoConfig(background_color="#000000"))
+    
+    def test_round_trip(self, tmp_path):
+        """Stored videos are returned on later lookups"""
+        from pragyan.cache import RenderCache
+        
+        video = tmp_path / "render.mp4"
+        video.write_bytes(b"video-bytes")
+        
+        cache = RenderCache(directory=tmp_path / "cache")
+        key = RenderCache.key_for("scene", "DSAExplanation", VideoConfig())
+        assert cache.get(key) is None
+        
+        cache.set(key, video)
+        cached = cache.get(key)
+        assert cached is not None
+        assert cached.read_bytes() == b"video-bytes"
+        assert cache.stats.hits == 1
+        assert cache.stats.misses == 1
+
+
+class TestSectionRendering:
+    """Test splitting the generic scene into parallel section renders"""
+    
+    @pytest.fixture
+    def generator(self, monkeypatch, tmp_path):
+        from pragyan.video_generator import VideoGenerator
+        monkeypatch.setattr(VideoGenerator, "_verify_manim_installation", lambda self: None)
+        return VideoGenerator(VideoConfig(use_render_cache=False))
+    
+    def test_generated_scene_has_sections(self, generator):
+        """Every section is emitted as its own Scene subclass"""
+        import ast
+        
+        question = Question(title="Two Sum", description="Find two numbers", examples=[{"input": "nums = [2,7,11,15]"}])
+        solution = Solution(
+            code="def f():\n    pass", language=ProgrammingLanguage.PYTHON, explanation="",
+            concept="Hash map", approach="One pass", time_complexity="O(n)", space_complexity="O(n)"
+        )
+        source = generator._generate_animated_scene(question, solution, {"topics": ["Array"]})
+        
+        tree = ast.parse(source)
+        classes = {node.name: node for node in tree.body if isinstance(node, ast.ClassDef)}
+        sections = generator._find_section_scenes(source)
+        
+        assert sections == [name for name, _ in generator.SECTION_SCENES]
+        assert "DSAExplanation" in classes
+        for name in sections:
+            assert classes[name].bases[0].id == "DSAExplanation"
+    
+    def test_scenes_without_sections(self, generator):
+        """LLM and visualizer scenes are rendered whole"""
+        assert generator._find_section_scenes("class NQueensScene(Scene):\n    pass\n") == []
+
+
+class TestSceneValidator:
+    """Test static validation of generated Manim scenes"""
+    
+    VALID_SCENE = (
+        "from manim import *\n\n"
+        "class AlgorithmScene(Scene):\n"
+        "    def construct(self):\n"
+        "        title = Text('Hi', color=GOLD)\n"
+        "        self.play(Write(title), run_time=1)\n"
+        "        for i in range(3):\n"
+        "            self.wait(i)\n"
+    )
+    
+    def test_valid_scene(self):
+        """A well-formed scene passes"""
+        from pragyan.scene_validator import validate_scene_code
+        assert validate_scene_code(self.VALID_SCENE).ok
+    
+    def test_structural_errors(self):
+        """Syntax errors and missing classes/methods are reported"""
+        from pragyan.scene_validator import validate_scene_code
+        
+        assert "Syntax error" in str(validate_scene_code("class AlgorithmScene(Scene:\n"))
+        assert "Missing class" in str(validate_scene_code(self.VALID_SCENE, "OtherScene"))
+        no_construct = self.VALID_SCENE.replace("def construct", "def build")
+        assert "construct" in str(validate_scene_code(no_construct))
+    
+    def test_forbidden_names(self):
+        """LaTeX, file/network access and unknown names are rejected"""
+        from pragyan.scene_validator import validate_scene_code
+        
+        errors = str(validate_scene_code(
+            self.VALID_SCENE
+            + "        self.add(MathTex('x^2'))\n"
+            + "        open('/etc/passwd')\n"
+            + "        self.add(Sparkle())\n"
+            + "import socket\n"
+        ))
+        assert "MathTex needs LaTeX" in errors
+        assert "open() is not allowed" in errors
+        assert "unknown name 'Sparkle'" in errors
+        assert "'socket' is not allowed" in errors
+    
+    def test_invalid_scene_gets_repaired(self, monkeypatch):
+        """A failing LLM scene gets one repair round before falling back"""
+        from pragyan.video_generator import VideoGenerator
+        monkeypatch.setattr(VideoGenerator, "_verify_manim_installation", lambda self: None)
+        
+        class RepairingLLM:
+            def __init__(self):
+                self.prompts = []
+            
+            def generate(self, prompt, system_prompt=None):
+                self.prompts.append(prompt)
+                if len(self.prompts) == 1:
+                    return TestSceneValidator.VALID_SCENE.replace("Text(", "Sparkle(")
+                return TestSceneValidator.VALID_SCENE
+        
+        generator = VideoGenerator(VideoConfig(use_render_cache=False))
+        generator.set_llm_client(RepairingLLM())
+        
+        question = Question(title="Two Sum", description="Find two numbers")
+        solution = Solution(
+            code="pass", language=ProgrammingLanguage.PYTHON, explanation="",
+            time_complexity="O(n)", space_complexity="O(n)", concept="", approach=""
+        )
+        code, scene_class_name = generator._generate_dynamic_scene(question, solution, {})
+        
+        assert scene_class_name == "AlgorithmScene"
+        assert len(generator.llm_client.prompts) == 2
+        assert "unknown name 'Sparkle'" in generator.llm_client.prompts[1]
+
+
+class TestSceneEstimator:
+    """Test static duration and render cost estimates"""
+    
+    SCENE = (
+        "from manim import *\n\n"
+        "class AlgorithmScene(Scene):\n"
+        "    def construct(self):\n"
+        "        self.play(Write(Text('Hi')), run_time=2)\n"
+        "        for i in range(3):\n"
+        "            self.step(i)\n"
+        "        self.wait(1.5)\n"
+        "\n"
+        "    def step(self, i):\n"
+        "        self.play(FadeIn(Dot()))\n"
+        "        self.wait()\n"
+    )
+    
+    def test_duration_and_frames(self):
+        """run_time, waits, loops and helper methods are added up"""
+        from pragyan.scene_estimator import estimate_scene
+        
+        estimate = estimate_scene(self.SCENE, "AlgorithmScene", VideoConfig(fps=30))
+        assert estimate.duration == pytest.approx(2 + 3 * (1 + 1) + 1.5)
+        assert estimate.play_calls == 4
+        assert estimate.wait_calls == 4
+        assert estimate.frames == 285
+        
+        presets = estimate.by_quality()
+        assert presets["low_quality"]["render_seconds"] < presets["high_quality"]["render_seconds"]
+    
+    def test_trim_scales_durations(self):
+        """Trimming scales every animation and wait"""
+        from pragyan.scene_estimator import estimate_scene, trim_scene
+        
+        trimmed = trim_scene(self.SCENE, 0.5)
+        assert estimate_scene(trimmed, "AlgorithmScene").duration == pytest.approx(4.75)
+    
+    def test_budget_actions(self, monkeypatch):
+        """Over-budget scenes are rejected, trimmed or downgraded"""
+        from pragyan.video_generator import VideoGenerator
+        monkeypatch.setattr(VideoGenerator, "_verify_manim_installation", lambda self: None)
+        
+        reject = VideoGenerator(VideoConfig(use_render_cache=False, max_video_seconds=5, over_budget="reject"))
+        with pytest.raises(RuntimeError):
+            reject._apply_render_budget(self.SCENE, "AlgorithmScene")
+        
+        trim = VideoGenerator(VideoConfig(use_render_cache=False, max_video_seconds=5, over_budget="trim"))
+        trim._apply_render_budget(self.SCENE, "AlgorithmScene")
+        assert trim.last_estimate.duration == pytest.approx(5, abs=0.01)
+        
+        downgrade = VideoGenerator(VideoConfig(
+            use_render_cache=False, video_quality="high_quality", max_render_seconds=20
+        ))
+        scene, config = downgrade._apply_render_budget(self.SCENE, "AlgorithmScene")
+        assert config.video_quality in ("medium_quality", "low_quality")
+        assert downgrade.last_estimate.render_seconds <= 20
+
+
+class TestTraceCompiler:
+    """Test compiling LLM step traces to Manim scenes"""
+    
+    TRACE = {
+        "initial_state": {"description": "Unsorted", "data": [5, 1, 4, 2]},
+        "steps": [
+            {"action": "compare", "description": "Compare 5 and 1",
+             "state_changes": {"positions": [0, 1], "markers": {"i": 0, "j": 1}}},
+            {"action": "swap", "description": "Swap them",
+             "state_changes": {"positions": [0, 1], "highlights": ["red", "red"]}},
+            {"action": "set", "description": "Write 9",
+             "state_changes": {"positions": [3], "values": [9], "markers": {"pointer": "j", "position": 3}}},
+        ],
+        "final_state": {"data": [1, 5, 4, 9], "result": "sorted"},
+        "key_moments": [{"step": 2, "importance": "high"}],
+    }
+    
+    def test_compiled_scene_is_valid(self):
+        """Every step animates the cells created up front, one AnimationGroup per play"""
+        from pragyan.trace_compiler import compile_trace, SCENE_CLASS
+        from pragyan.scene_validator import validate_scene_code
+        from pragyan.scene_estimator import estimate_scene
+        
+        code = compile_trace(self.TRACE, "Bubble Sort")
+        scene = "from manim import *\n\n" + code
+        assert validate_scene_code(scene, SCENE_CLASS).ok
+        assert code.count("Square(") == 1 and code.count("Arrow(") == 1
+        assert "squares[0].animate.move_to(slots[1]).set_fill(RED, opacity=0.6)" in code
+        assert "Transform(labels[3], Text('9'" in code
+        assert "markers[1].animate.move_to(slots[3]" in code
+        assert "Result: sorted" in code
+        # title, intro, three steps and the final state
+        assert estimate_scene(scene, SCENE_CLASS).play_calls == 6
+    
+    def test_long_traces_are_merged(self):
+        """Steps are merged to stay within max_plays, except key moments"""
+        from pragyan.trace_compiler import compile_trace, SCENE_CLASS
+        from pragyan.scene_estimator import estimate_scene
+        
+        trace = {
+            "initial_state": {"data": ["....", "....", "....", "...."]},
+            "steps": [
+                {"action": "place", "description": f"Queen in row {i % 4}",
+                 "state_changes": {"positions": [i % 4, (2 * i + 1) % 4], "values": ["Q"]}}
+                for i in range(100)
+            ],
+            "key_moments": [{"step": 50, "importance": "high"}],
+        }
+        code = compile_trace(trace, "N-Queens", max_plays=10)
+        assert "arrange_in_grid(rows=4, cols=4" in code
+        assert "# Step 50/100" in code
+        assert estimate_scene("from manim import *\n\n" + code, SCENE_CLASS).play_calls <= 10 + 4
+        
+        with pytest.raises(ValueError):
+            compile_trace({"initial_state": {"data": {"a": ["b"]}}, "steps": []})
+    
+    def test_video_generator_uses_trace(self, monkeypatch):
+        """The trace scene is used when it compiles, the LLM-written scene otherwise"""
+        from pragyan.video_generator import VideoGenerator
+        from pragyan.llm_client import LLMClient
+        monkeypatch.setattr(VideoGenerator, "_verify_manim_installation", lambda self: None)
+        
+        generator = VideoGenerator(VideoConfig(use_render_cache=False))
+        generator.set_llm_client(LLMClient("fake", ""))
+        question = Question(title="Two Sum", description="Find two numbers")
+        solution = Solution(
+            code="pass", language=ProgrammingLanguage.PYTHON, explanation="",
+            time_complexity="O(n)", space_complexity="O(n)", concept="", approach=""
+        )
+        code, scene_class_name = generator._generate_llm_powered_scene(question, solution, {})
+        assert scene_class_name == "TraceScene"
+        assert "config.frame_rate" in code and "Check index 3" in code
+        
+        monkeypatch.setattr(
+            generator.llm_client, "generate_algorithm_animation_steps", lambda *args: {"steps": []}
+        )
+        monkeypatch.setattr(
+            generator, "_generate_dynamic_scene", lambda *args: ("scene", "AlgorithmScene")
+        )
+        assert generator._generate_llm_powered_scene(question, solution, {}) == ("scene", "AlgorithmScene")
+
+
+class TestWebDriverPool:
+    """Test the reusable browser pool"""
+    
+    class FakeDriver:
+        started = 0
+        
+        def __init__(self):
+            TestWebDriverPool.FakeDriver.started += 1
+            self.alive = True
+            self.quit_called = False
+        
+        def execute_script(self, script):
+            if not self.alive:
+                raise RuntimeError("browser crashed")
+            return 1
+        
+        def quit(self):
+            self.quit_called = True
+    
+    @pytest.fixture
+    def pool(self):
+        from pragyan.webdriver_pool import WebDriverPool
+        TestWebDriverPool.FakeDriver.started = 0
+        pool = WebDriverPool(size=2, max_pages=3, factory=TestWebDriverPool.FakeDriver)
+        yield pool
+        pool.close()
+    
+    def test_drivers_are_reused_and_recycled(self, pool):
+        """Warm browsers are reused until they reach max_pages"""
+        seen = []
+        for _ in range(4):
+            with pool.driver() as driver:
+                seen.append(driver)
+        
+        assert seen[0] is seen[1] is seen[2]
+        assert seen[3] is not seen[0]
+        assert seen[0].quit_called
+        assert self.FakeDriver.started == 2
+    
+    def test_unhealthy_driver_is_replaced(self, pool):
+        """Crashed browsers are discarded at checkout"""
+        with pool.driver() as driver:
+            driver.alive = False
+        with pool.driver() as replacement:
+            assert replacement is not driver
+        assert driver.quit_called
+        assert len(pool) == 1
+    
+    def test_size_limits_concurrent_checkouts(self, pool):
+        """No more than size browsers are handed out at once"""
+        with pool.driver(), pool.driver():
+            with pytest.raises(TimeoutError):
+                with pool.driver(timeout=0.05):
+                    pass
+
+
+class TestScrapeCache:
+    """Test the persistent cache of scraped questions"""
+    
+    def test_normalize_url(self):
+        """Links to the same problem share one key"""
+        from pragyan.cache import normalize_url, ScrapeCache
+        
+        assert normalize_url("https://www.LeetCode.com/problems/two-sum/description/?envType=daily#top") == \
+            "https://leetcode.com/problems/two-sum"
+        assert normalize_url("https://example.com/p?id=5&utm_source=x") == "https://example.com/p?id=5"
+        assert ScrapeCache.key_for("https://leetcode.com/problems/two-sum/") == \
+            ScrapeCache.key_for("https://www.leetcode.com/problems/two-sum")
+    
+    def test_repeat_scrapes_hit_cache(self, tmp_path, monkeypatch):
+        """Fresh entries are served without scraping, and can be invalidated"""
+        from pragyan.cache import ScrapeCache
+        from pragyan.scraper import QuestionScraper
+        
+        calls = []
+        
+        def scrape(url):
+            calls.append(url)
+            return Question(title="Two Sum", description="Find two numbers", url=url, scrape_tier="api")
+        
+        scraper = QuestionScraper(cache=ScrapeCache(directory=tmp_path))
+        monkeypatch.setattr(scraper, "_scrape_uncached", scrape)
+        
+        url = "https://leetcode.com/problems/two-sum/"
+        assert scraper.scrape_url(url).scrape_tier == "api"
+        
+        cached = scraper.scrape_url(url + "description/")
+        assert cached.scrape_tier == "cache"
+        assert cached.title == "Two Sum"
+        assert len(calls) == 1
+        
+        assert scraper.cache.invalidate(url)
+        scraper.scrape_url(url)
+        assert len(calls) == 2
+    
+    def test_stale_entries_are_revalidated(self, tmp_path, monkeypatch):
+        """Stale entries with validators are reused after a 304"""
+        from pragyan.cache import ScrapeCache
+        from pragyan.scraper import QuestionScraper
+        
+        url = "https://codeforces.com/problemset/problem/1/A"
+        cache = ScrapeCache(directory=tmp_path, ttl=0)
+        cache.store(url, Question(title="Theatre Square", description="..."), etag='"v1"')
+        
+        scraper = QuestionScraper(cache=cache)
+        sent = []
+        monkeypatch.setattr(scraper, "_is_unchanged", lambda u, validators: sent.append(validators) or True)
+        monkeypatch.setattr(scraper, "_scrape_uncached", lambda u: pytest.fail("page was scraped again"))
+        
+        assert scraper.scrape_url(url).title == "Theatre Square"
+        assert sent == [{"etag": '"v1"'}]
+    
+    def test_changed_page_is_downloaded_once(self, tmp_path, monkeypatch):
+        """The full response to a failed revalidation is reused by the HTTP tier"""
+        from pragyan.cache import ScrapeCache
+        from pragyan.scraper import QuestionScraper
+        
+        class Response:
+            status_code = 200
+            headers = {"ETag": '"v2"'}
+            content = b"new statement"
+        
+        class Session:
+            def __init__(self):
+                self.requests = []
+            
+            def get(self, url, headers=None, timeout=None):
+                self.requests.append(headers)
+                return Response()
+        
+        url = "https://codeforces.com/problemset/problem/1/A"
+        cache = ScrapeCache(directory=tmp_path, ttl=0)
+        cache.store(url, Question(title="Theatre Square", description="old statement"), etag='"v1"')
+        
+        scraper = QuestionScraper(cache=cache)
+        scraper._session = Session()
+        monkeypatch.setattr(
+            scraper, "_parse_codeforces_html",
+            lambda html, u: Question(title="Theatre Square", description=html.decode(), url=u)
+        )
+        
+        question = scraper.scrape_url(url)
+        assert question.description == "new statement"
+        assert question.scrape_tier == "http"
+        assert scraper._session.requests == [{"If-None-Match": '"v1"'}]
+        assert cache.lookup(url)[1]["etag"] == '"v2"'
+
+
+class TestImportTime:
+    """Test that start-up does not load optional heavy dependencies"""
+    
+    HEAVY_MODULES = [
+        "google.generativeai", "groq", "manim", "moviepy", "selenium",
+        "langchain_community", "bs4", "httpx", "rich",
+    ]
+    
+    def _loaded_after(self, statement):
+        import json
+        import subprocess
+        import sys
+        
+        src = str(Path(__file__).resolve().parent.parent / "src")
+        probe = (
+            f"import sys\nsys.path.insert(0, {src!r})\n{statement}\n"
+            f"import json\nprint(json.dumps([m for m in {self.HEAVY_MODULES!r} if m in sys.modules]))"
+        )
+        output = subprocess.run([sys.executable, "-c", probe], capture_output=True, text=True, check=True)
+        return json.loads(output.stdout.strip().splitlines()[-1])
+    
+    def test_import_pragyan_is_light(self):
+        """import pragyan loads no heavy modules"""
+        assert self._loaded_after("import pragyan") == []
+    
+    def test_import_cli_is_light(self):
+        """Importing the CLI defers rich and the pipeline"""
+        assert self._loaded_after("import pragyan.cli") == []
+    
+    def test_quick_commands_are_light(self):
+        """version and languages print without loading rich"""
+        for command in ("version", "languages"):
+            statement = (
+                "from click.testing import CliRunner\nfrom pragyan.cli import cli\n"
+                f"assert CliRunner().invoke(cli, [{command!r}]).exit_code == 0"
+            )
+            assert self._loaded_after(statement) == []
+    
+    def test_lazy_exports_resolve(self):
+        """Public names are still importable from the package"""
+        import pragyan
+        
+        assert "Pragyan" in dir(pragyan)
+        assert pragyan.ProgrammingLanguage.PYTHON.value == "python"
+        with pytest.raises(AttributeError):
+            pragyan.DoesNotExist
+
+
+class TestTracing:
+    """Test pipeline tracing"""
+    
+    def test_spans_nest_and_summarize(self):
+        """Child spans record their parent and are aggregated by name"""
+        from pragyan import tracing
+        
+        tracer = tracing.Tracer()
+        with tracing.span("process", tracer=tracer):
+            for _ in range(2):
+                with tracing.span("llm.generate", prompt_chars=10) as span:
+                    span.set(cache_hit=True)
+        
+        root = next(s for s in tracer.spans if s.name == "process")
+        children = [s for s in tracer.spans if s.name == "llm.generate"]
+        assert all(s.parent_id == root.span_id for s in children)
+        
+        rows = {row["name"]: row for row in tracer.summary()}
+        assert rows["llm.generate"]["count"] == 2
+        assert rows["llm.generate"]["totals"] == {"prompt_chars": 20, "cache_hit": 2}
+    
+    def test_spans_without_tracer_are_noops(self):
+        """Instrumented code runs unchanged when tracing is off"""
+        from pragyan import tracing
+        
+        with tracing.span("scrape") as span:
+            span.set(url="x")
+            assert tracing.current_span() is None
+    
+    def test_exports(self, tmp_path):
+        """Traces export as JSONL and Chrome trace events"""
+        import json
+        from pragyan import tracing
+        
+        tracer = tracing.Tracer()
+        with pytest.raises(ValueError):
+            with tracing.span("video.render", tracer=tracer, quality="low_quality"):
+                raise ValueError("boom")
+        
+        lines = tracer.export(tmp_path / "trace.jsonl").read_text().splitlines()
+        assert json.loads(lines[0])["error"] == "ValueError: boom"
+        
+        chrome = json.loads(tracer.export(tmp_path / "trace.json").read_text())
+        event = chrome["traceEvents"][0]
+        assert event["ph"] == "X" and event["name"] == "video.render"
+        assert event["args"]["quality"] == "low_quality"
+    
+    def test_pipeline_spans(self, monkeypatch):
+        """Pragyan.process records stage and LLM call spans, including worker threads"""
+        from pragyan import llm_client
+        from pragyan.main import Pragyan
+        from pragyan.tracing import Tracer
+        
+        monkeypatch.setattr(llm_client, "GeminiClient", TestSolveStrategies.RecordingClient)
+        tracer = Tracer()
+        pragyan = Pragyan(provider="gemini", api_key="key", tracer=tracer)
+        pragyan.process("Two Sum\nFind two numbers", generate_video=False, strategy="speculative")
+        
+        spans = {s.name: s for s in tracer.spans}
+        assert {"process", "analyze", "solve", "llm.generate_json"} <= set(spans)
+        assert spans["analyze"].parent_id == spans["process"].span_id
+        assert spans["solve"].parent_id == spans["process"].span_id
+        assert spans["llm.generate_json"].attributes["prompt_chars"] > 0
+
+
+class TestFakeProvider:
+    """Test the offline fake LLM provider"""
+    
+    def test_process_offline(self):
+        """The fake provider answers every pipeline prompt"""
+        from pragyan.main import Pragyan
+        
+        pragyan = Pragyan(provider="fake", api_key="")
+        for strategy in ("sequential", "speculative", "fused"):
+            result = pragyan.process("Two Sum\nFind two numbers", generate_video=False, strategy=strategy)
+            assert result["analysis"]["main_concept"] == "Hash map lookup"
+            assert "def two_sum" in result["solution"].code
+    
+    def test_fixtures_take_precedence(self, tmp_path):
+        """Recorded responses beat rules, which beat the built-in answers"""
+        from pragyan.llm_client import FakeClient, record_fixture
+        
+        fixture_file = tmp_path / "fixtures.json"
+        record_fixture(fixture_file, "exact prompt", "system", {"answer": "recorded"})
+        fixtures = json.loads(fixture_file.read_text())
+        fixtures["rules"] = [{"match": "prompt", "response": "from rule"}]
+        fixture_file.write_text(json.dumps(fixtures))
+        
+        client = FakeClient(LLMConfig(provider=LLMProvider.FAKE, api_key=""), fixtures=fixture_file)
+        assert client.generate_json("exact prompt", "system") == {"answer": "recorded"}
+        assert client.generate("another prompt") == "from rule"
+        assert "Fake response" in client.generate("unmatched")
+    
+    def test_latency_is_reproducible(self):
+        """Jitter comes from a seeded RNG"""
+        from pragyan.llm_client import FakeClient
+        
+        config = LLMConfig(provider=LLMProvider.FAKE, api_key="")
+        first = FakeClient(config, latency=0.5, jitter=0.2, seed=7)
+        second = FakeClient(config, latency=0.5, jitter=0.2, seed=7)
+        delays = [first._delay() for _ in range(5)]
+        
+        assert delays == [second._delay() for _ in range(5)]
+        assert all(0.3 <= d <= 0.7 for d in delays)
+
+
+DEDUP_CORPUS = json.loads((Path(__file__).parent / "data" / "dedup_corpus.json").read_text())["cases"]
+
+
+class TestDeduplication:
+    """Test removal of repeated blocks from generated code"""
+    
+    @pytest.mark.parametrize("case", DEDUP_CORPUS, ids=[case["name"] for case in DEDUP_CORPUS])
+    def test_corpus(self, case):
+        """Duplicated outputs are trimmed and clean ones are left alone"""
+        from pragyan.dedup import deduplicate_code
+        
+        assert deduplicate_code(case["input"]) == case["expected"]
+    
+    def test_hash_collisions_do_not_cut(self, monkeypatch):
+        """Blocks with equal hashes are compared before cutting"""
+        from pragyan import dedup
+        
+        monkeypatch.setattr(dedup, "_block_hashes", lambda ids, k: [0] * max(0, len(ids) - k + 1))
+        case = next(c for c in DEDUP_CORPUS if c["name"] == "legit_similar_lines_unchanged")
+        assert dedup.deduplicate_code(case["input"]) == case["input"]
+    
+    def test_llm_client_uses_dedup(self, stub_llm):
+        """Solutions built by LLMClient are deduplicated"""
+        from pragyan.models import ProgrammingLanguage
+        
+        case = DEDUP_CORPUS[0]
+        solution = stub_llm("gemini", "key")._build_solution({"code": case["input"]}, ProgrammingLanguage.PYTHON)
+        assert solution.code == case["expected"]
+
+
+class TestJsonStream:
+    """Test incremental parsing of streamed JSON responses"""
+    
+    RESPONSE = (
+        'Sure! Here is the solution:\n```json\n{"code": "def f(x):\n\treturn x  # \\d+ stays",'
+        ' "explanation": "Uses a \\"set\\" \\u00e9\\ud83d\\ude00",'
+        ' "solution": {"step_by_step": ["a", "b",], "time_complexity": "O(n)"},'
+        ' "score": -1.5e2, "ok": true, "extra": null}\n```\nHope this helps!'
+    )
+    EXPECTED = {
+        "code": "def f(x):\n\treturn x  # \\d+ stays",
+        "explanation": 'Uses a "set" é\U0001F600',
+        "solution": {"step_by_step": ["a", "b"], "time_complexity": "O(n)"},
+        "score": -150.0,
+        "ok": True,
+        "extra": None,
+    }
+    
+    @pytest.mark.parametrize("size", [1, 2, 3, 7, 64, 10_000])
+    def test_any_chunking_gives_same_result(self, size):
+        """Splitting the response anywhere, even inside escapes, does not change the result"""
+        from pragyan.json_stream import JSONStreamParser
+        
+        parser = JSONStreamParser()
+        for i in range(0, len(self.RESPONSE), size):
+            parser.feed(self.RESPONSE[i:i + size])
+        assert parser.close() == self.EXPECTED
+    
+    def test_fields_yielded_as_they_complete(self):
+        """Each field is reported by the chunk that finishes it, before the response ends"""
+        from pragyan.json_stream import JSONStreamParser
+        
+        parser = JSONStreamParser()
+        assert parser.feed('{"code": "x = 1", "solution": {"time_') == [("code", "x = 1")]
+        assert parser.partial() is None
+        assert parser.feed('complexity": "O(1)", "step_by_step": ["go') == [("solution.time_complexity", "O(1)")]
+        assert parser.feed('"]') == [("solution.step_by_step", ["go"])]
+        assert parser.feed(', "explanation": "Sim') == []
+        assert parser.partial() == ("solution.explanation", "Sim")
+        events = parser.feed('ple"}}')
+        assert [path for path, _ in events] == ["solution.explanation", "solution"]
+        assert parser.done
+    
+    def test_iter_json_fields(self):
+        """iter_json_fields ends with the whole value and stops at the closing brace"""
+        from pragyan.json_stream import iter_json_fields
+        
+        items = list(iter_json_fields(iter(['{"a": 1, ', '"b": [2]}', "trailing text {"])))
+        assert items == [("a", 1), ("b", [2]), ("", {"a": 1, "b": [2]})]
+    
+    def test_top_level_array_only_after_fence(self):
+        """A "[" in prose before the object is not mistaken for JSON"""
+        from pragyan.json_stream import parse_json_text
+        
+        assert parse_json_text('```json\n[1, 2]\n```') == [1, 2]
+        assert parse_json_text('See [1] below: {"a": [1]}') == {"a": [1]}
+    
+    @pytest.mark.parametrize("text", ["no json here", '{"a": 1', '{"a" 1}', '{"a": nope}'])
+    def test_invalid_raises(self, text):
+        """Malformed or truncated responses raise ValueError"""
+        from pragyan.json_stream import parse_json_text
+        
+        with pytest.raises(ValueError):
+            parse_json_text(text)
+    
+    def test_clean_and_parse_json_uses_stream_parser(self):
+        """The provider clients' parser accepts fenced responses with raw control characters"""
+        from pragyan.llm_client import _clean_and_parse_json
+        
+        assert _clean_and_parse_json(self.RESPONSE) == self.EXPECTED
+        with pytest.raises(ValueError, match="Failed to parse JSON response"):
+            _clean_and_parse_json("nothing")
+
+
+class TestStreaming:
+    """Test streamed generation through LLMClient"""
+    
+    def test_fake_client_streams_in_chunks(self):
+        """FakeClient yields its response in several pieces"""
+        from pragyan.llm_client import FakeClient
+        
+        client = FakeClient(LLMConfig(provider=LLMProvider.FAKE, api_key=""), latency=0.0)
+        chunks = list(client.generate_stream("Explain hashing"))
+        
+        assert len(chunks) > 1
+        assert "".join(chunks) == client.generate("Explain hashing")
+    
+    def test_solution_code_visible_before_response_ends(self):
+        """on_progress sees the code grow while the solution streams"""
+        from pragyan.llm_client import LLMClient
+        from pragyan.models import ProgrammingLanguage
+        
+        llm = LLMClient("fake", "")
+        seen = []
+        
+        def on_progress(parser):
+            code = parser.get("code")
+            if code and not parser.done:
+                seen.append(code)
+        
+        question = Question(title="Two Sum", description="Find two numbers")
+        streamed = llm.generate_solution(question, ProgrammingLanguage.PYTHON, on_progress=on_progress)
+        
+        assert len(seen) > 1 and len(set(seen)) > 1
+        assert streamed.code.startswith(seen[0])
+        assert streamed == llm.generate_solution(question, ProgrammingLanguage.PYTHON)
+    
+    def test_fused_fields_readable_while_open(self):
+        """Nested fields can be read before their enclosing object closes"""
+        from pragyan.json_stream import JSONStreamParser
+        
+        parser = JSONStreamParser()
+        parser.feed('{"analysis": {"topics": ["dp"]}, "solution": {"code": "x = 1", "appro')
+        
+        assert parser.get("solution.code") == "x = 1"
+        assert parser.get("analysis.topics") == ["dp"]
+        assert parser.get("solution.approach") is None
+    
+    def test_streams_are_cached(self, stub_llm, tmp_path):
+        """A finished stream is cached and replayed as one chunk"""
+        from pragyan.cache import ResponseCache
+        
+        llm = stub_llm("gemini", "key", cache=ResponseCache(directory=tmp_path))
+        
+        assert "".join(llm.generate_stream("hello")) == "response to hello"
+        assert list(llm.generate_stream("hello")) == ["response to hello"]
+        assert llm.generate("hello") == "response to hello"
+        assert "".join(llm.generate_json_stream("data")) == '{"prompt": "data"}'
+        assert llm.generate_json("data") == {"prompt": "data"}
+        assert llm.client.calls == 2
+
+
+class ScriptedClient:
+    """Provider client that raises or returns the next item of a script"""
+    
+    def __init__(self, *script, delay=0.0):
+        self.script = list(script)
+        self.delay = delay
+        self.calls = 0
+    
+    def _next(self):
+        import time
+        
+        time.sleep(self.delay)
+        item = self.script[min(self.calls, len(self.script) - 1)]
+        self.calls += 1
+        if isinstance(item, BaseException):
+            raise item
+        return item
+    
+    def generate(self, prompt, system_prompt=None):
+        return self._next()
+    
+    def generate_json(self, prompt, system_prompt=None):
+        return {"answer": self._next()}
+    
+    def generate_stream(self, prompt, system_prompt=None):
+        yield from self._next().split(" ")
+
+
+class RateLimitError(Exception):
+    status_code = 429
+
+
+class AuthenticationError(Exception):
+    status_code = 401
+
+
+class TestFailover:
+    """Test retries, failover and hedging across providers"""
+    
+    @staticmethod
+    def make(*clients, **policy):
+        from pragyan.failover import FailoverClient
+        from pragyan.models import FailoverConfig
+        
+        configs = [LLMConfig(provider=LLMProvider.FAKE, api_key="", model=f"m{i}") for i in range(len(clients))]
+        failover = FailoverClient(configs, FailoverConfig(backoff_base=0.0, **policy), seed=0)
+        for slot, client in zip(failover.slots, clients):
+            slot._client = client
+        return failover
+    
+    def test_transient_errors_are_retried(self):
+        """Connection errors are retried on the same provider"""
+        primary = ScriptedClient(ConnectionError("reset"), ConnectionError("reset"), "ok")
+        backup = ScriptedClient("backup")
+        
+        assert self.make(primary, backup, max_retries=2).generate("p") == "ok"
+        assert (primary.calls, backup.calls) == (3, 0)
+    
+    def test_rate_limit_fails_over_and_cools_down(self):
+        """A rate-limited provider is skipped at once and tried last afterwards"""
+        primary = ScriptedClient(RateLimitError("slow down"), "primary")
+        backup = ScriptedClient("backup")
+        client = self.make(primary, backup, rate_limit_cooldown=60.0)
+        
+        assert client.generate_json("p") == {"answer": "backup"}
+        assert client.generate("p") == "backup"
+        assert primary.calls == 1
+        assert client.stats()[0]["cooldown"] > 0
+    
+    def test_permanent_errors_are_not_retried(self):
+        """Authentication errors move on without retrying, and total failure lists every provider"""
+        primary = ScriptedClient(AuthenticationError("bad key"))
+        backup = ScriptedClient(ConnectionError("down"))
+        
+        with pytest.raises(RuntimeError, match="m0: AuthenticationError.*m1: ConnectionError"):
+            self.make(primary, backup, max_retries=1).generate("p")
+        assert (primary.calls, backup.calls) == (1, 2)
+    
+    def test_hedge_takes_faster_provider(self):
+        """A slow first provider is hedged with the next one after the hedge delay"""
+        import time
+        
+        primary = ScriptedClient("slow", delay=0.5)
+        backup = ScriptedClient("fast")
+        client = self.make(primary, backup, hedge=True, hedge_delay=0.05)
+        
+        started = time.perf_counter()
+        assert client.generate("p") == "fast"
+        assert time.perf_counter() - started < 0.4
+    
+    def test_hedge_waits_for_enough_latency_samples(self):
+        """Without a fixed delay, hedging starts once the p95 latency is known"""
+        primary = ScriptedClient("primary")
+        backup = ScriptedClient("backup")
+        client = self.make(primary, backup, hedge=True, hedge_min_samples=3)
+        
+        for _ in range(5):
+            assert client.generate("p") == "primary"
+        assert client._hedge_delay(client.slots[0]) is not None
+        assert backup.calls == 0
+    
+    def test_stream_fails_over_before_first_chunk(self):
+        """Streams switch provider only if the first one fails before producing output"""
+        primary = ScriptedClient(ConnectionError("down"))
+        backup = ScriptedClient("hello streamed world")
+        
+        assert list(self.make(primary, backup).generate_stream("p")) == ["hello", "streamed", "world"]
+    
+    def test_llm_client_with_fallbacks(self, monkeypatch):
+        """LLMClient routes every request through the fallback chain"""
+        from pragyan import failover
+        from pragyan.llm_client import LLMClient, FakeClient
+        
+        def create_client(config):
+            if config.provider == LLMProvider.GEMINI:
+                raise ImportError("Please install google-generativeai")
+            return FakeClient(config)
+        
+        monkeypatch.setattr(failover, "create_client", create_client)
+        llm = LLMClient("gemini", "key", fallbacks=[LLMConfig(provider=LLMProvider.FAKE, api_key="")])
+        
+        question = Question(title="Two Sum", description="Find two numbers")
+        assert llm.analyze_question(question)["main_concept"] == "Hash map lookup"
+
+
+class TestRateLimiter:
+    """Test per-provider request and token budgets"""
+    
+    CONFIG = LLMConfig(provider=LLMProvider.FAKE, api_key="")
+    
+    @staticmethod
+    def limiter(**limits):
+        from pragyan.models import RateLimitConfig
+        from pragyan.ratelimit import RateLimiter
+        
+        return RateLimiter({"fake": RateLimitConfig(**limits)})
+    
+    def test_token_budget_delays_requests(self):
+        """Requests wait for the tokens-per-minute bucket to refill"""
+        import time
+        
+        limiter = self.limiter(tokens_per_minute=6000)  # 100 tokens per second
+        limiter.acquire(self.CONFIG, tokens=6000)
+        
+        started = time.perf_counter()
+        reservation = limiter.acquire(self.CONFIG, tokens=20)
+        assert 0.15 <= time.perf_counter() - started < 1.0
+        assert reservation.waited > 0
+        assert limiter.metrics()["fake:fake"]["granted"] == 2
+    
+    def test_unlimited_providers_never_wait(self):
+        """Providers without configured budgets are not delayed"""
+        from pragyan.ratelimit import RateLimiter
+        
+        limiter = RateLimiter()
+        for _ in range(100):
+            assert limiter.acquire(self.CONFIG, tokens=10**6).waited < 0.05
+    
+    def test_priority_order(self):
+        """Interactive requests are served before batch requests queued earlier"""
+        import threading
+        import time
+        from pragyan import ratelimit
+        
+        limiter = self.limiter(tokens_per_minute=12000)  # 200 tokens per second
+        limiter.acquire(self.CONFIG, tokens=12000)
+        order = []
+        
+        def request(name, level):
+            limiter.acquire(self.CONFIG, tokens=40, level=level)
+            order.append(name)
+        
+        batch = [threading.Thread(target=request, args=(f"batch{i}", ratelimit.BATCH)) for i in range(2)]
+        for thread in batch:
+            thread.start()
+            time.sleep(0.02)
+        with ratelimit.priority(ratelimit.INTERACTIVE):
+            interactive = threading.Thread(target=request, args=("interactive", None))
+            interactive.start()
+        for thread in batch + [interactive]:
+            thread.join(timeout=5)
+        
+        assert order == ["interactive", "batch0", "batch1"]
+        assert limiter.metrics()["fake:fake"]["max_queued"] == 3
+    
+    def test_settle_refunds_unused_estimate(self):
+        """Reserving too many tokens is corrected once the response size is known"""
+        limiter = self.limiter(tokens_per_minute=6000)
+        reservation = limiter.acquire(self.CONFIG, tokens=6000)
+        reservation.settle(100)
+        
+        assert limiter.acquire(self.CONFIG, tokens=5000).waited < 0.05
+    
+    def test_async_and_threaded_share_budget(self):
+        """asyncio tasks wait on the same buckets without blocking the loop"""
+        import asyncio
+        from pragyan.llm_client import AsyncLLMClient
+        
+        limiter = self.limiter(requests_per_minute=600)  # 10 per second after the burst
+        for _ in range(600):
+            limiter.acquire(self.CONFIG)
+        llm = AsyncLLMClient("fake", "", rate_limiter=limiter)
+        
+        async def main():
+            ticks = 0
+            
+            async def ticker():
+                nonlocal ticks
+                while True:
+                    await asyncio.sleep(0.01)
+                    ticks += 1
+            
+            task = asyncio.ensure_future(ticker())
+            answers = await asyncio.gather(*(llm.generate(f"question {i}") for i in range(2)))
+            task.cancel()
+            return answers, ticks
+        
+        answers, ticks = asyncio.run(main())
+        assert len(answers) == 2 and ticks >= 5
+        assert limiter.metrics()["fake:fake"]["granted"] == 602
+    
+    def test_cancelled_async_wait_leaves_queue(self):
+        """A cancelled async acquire gives up its place, so later requests still go through"""
+        import asyncio
+        
+        limiter = self.limiter(requests_per_minute=60)  # 1 per second after the burst
+        for _ in range(60):
+            limiter.acquire(self.CONFIG)
+        
+        with pytest.raises(asyncio.TimeoutError):
+            asyncio.run(asyncio.wait_for(limiter.acquire_async(self.CONFIG), 0.05))
+        assert limiter.metrics()["fake:fake"]["queued"] == 0
+        
+        assert limiter.acquire(self.CONFIG).waited < 1.5
+        assert limiter.metrics()["fake:fake"]["granted"] == 61
+    
+    def test_llm_client_uses_limiter(self):
+        """LLMClient requests go through the limiter"""
+        from pragyan.llm_client import LLMClient
+        
+        limiter = self.limiter(requests_per_minute=100)
+        llm = LLMClient("fake", "", rate_limiter=limiter)
+        llm.generate("hello")
+        "".join(llm.generate_stream("hello again"))
+        
+        assert limiter.metrics()["fake:fake"]["granted"] == 2
+
+
+class SlowClient:
+    """Provider stand-in that takes a while to answer and counts requests"""
+    
+    def __init__(self, delay=0.2, error=None):
+        self.delay = delay
+        self.error = error
+        self.calls = 0
+    
+    def generate(self, prompt, system_prompt=None):
+        import time
+        self.calls += 1
+        time.sleep(self.delay)
+        if self.error is not None:
+            raise self.error
+        return f"response to {prompt}"
+    
+    def generate_json(self, prompt, system_prompt=None):
+        return {"answer": self.generate(prompt, system_prompt), "steps": []}
+    
+    def generate_stream(self, prompt, system_prompt=None):
+        import time
+        self.calls += 1
+        for word in ["one ", "two ", "three"]:
+            time.sleep(self.delay / 3)
+            yield word
+
+
+class TestSingleFlight:
+    """Test coalescing of identical concurrent LLM requests"""
+    
+    @staticmethod
+    def llm(client, **kwargs):
+        from pragyan.llm_client import LLMClient
+        from pragyan.singleflight import SingleFlight
+        
+        llm = LLMClient("fake", "", **kwargs)
+        llm.client = client
+        if llm.flights is not None:
+            llm.flights = SingleFlight()
+        return llm
+    
+    @staticmethod
+    def concurrently(fn, *args_list):
+        from concurrent.futures import ThreadPoolExecutor
+        
+        with ThreadPoolExecutor(max_workers=len(args_list)) as pool:
+            futures = [pool.submit(fn, *args) for args in args_list]
+            return [future.result() for future in futures]
+    
+    def test_identical_requests_share_one_call(self):
+        """Concurrent identical requests reach the provider once and get separate copies"""
+        client = SlowClient()
+        llm = self.llm(client)
+        
+        results = self.concurrently(llm.generate_json, *[("Two Sum",)] * 4)
+        
+        assert client.calls == 1
+        assert llm.flights.followers == 3
+        assert all(result == results[0] for result in results)
+        results[0]["steps"].append("mutated")
+        assert results[1]["steps"] == []
+    
+    def test_different_requests_are_not_shared(self):
+        """Only identical prompts are coalesced, and nothing is remembered afterwards"""
+        client = SlowClient(delay=0.05)
+        llm = self.llm(client)
+        
+        self.concurrently(llm.generate, ("Two Sum",), ("Three Sum",))
+        llm.generate("Two Sum")
+        
+        assert client.calls == 3
+        assert llm.flights.in_flight() == 0
+    
+    def test_errors_reach_every_waiter(self):
+        """Followers see the leader's exception instead of retrying it"""
+        client = SlowClient(error=RuntimeError("provider down"))
+        llm = self.llm(client)
+        
+        def call():
+            try:
+                llm.generate("Two Sum")
+            except RuntimeError as e:
+                return str(e)
+        
+        assert self.concurrently(call, (), (), ()) == ["provider down"] * 3
+        assert client.calls == 1
+    
+    def test_streams_are_replayed_to_followers(self):
+        """A follower gets every chunk of the shared stream, including ones it missed"""
+        client = SlowClient()
+        llm = self.llm(client)
+        
+        texts = self.concurrently(lambda: "".join(llm.generate_stream("Two Sum")), (), ())
+        
+        assert texts == ["one two three"] * 2
+        assert client.calls == 1
+    
+    def test_same_thread_streams_do_not_wait_on_each_other(self):
+        """Interleaving two identical streams in one thread makes two calls instead of deadlocking"""
+        client = SlowClient(delay=0.0)
+        llm = self.llm(client)
+        
+        pairs = list(zip(llm.generate_stream("Two Sum"), llm.generate_stream("Two Sum")))
+        
+        assert len(pairs) == 3
+        assert client.calls == 2
+    
+    def test_coalescing_can_be_disabled(self):
+        """coalesce=False sends every request"""
+        client = SlowClient(delay=0.05)
+        llm = self.llm(client, coalesce=False)
+        
+        self.concurrently(llm.generate, ("Two Sum",), ("Two Sum",))
+        
+        assert llm.flights is None
+        assert client.calls == 2
+
+
+def make_solution(code, language=ProgrammingLanguage.PYTHON):
+    """Solution with only the fields the sandbox looks at"""
+    return Solution(
+        code=code, language=language, explanation="", time_complexity="",
+        space_complexity="", concept="", approach=""
+    )
+
+
+TWO_SUM = """class Solution:
+    def twoSum(self, nums: List[int], target: int) -> List[int]:
+        seen = {}
+        for i, n in enumerate(nums):
+            if target - n in seen:
+                return [seen[target - n], i]
+            seen[n] = i
+"""
+
+
+@pytest.fixture(scope="module")
+def sandbox():
+    """A small sandbox pool shared by the execution tests"""
+    from pragyan.models import ExecutionConfig
+    from pragyan.sandbox import SandboxPool
+    
+    with SandboxPool(ExecutionConfig(workers=2, cpu_time_limit=0.5, wall_time_limit=2.0)) as pool:
+        yield pool
+
+
+class TestSandbox:
+    """Test running generated solutions against test cases"""
+    
+    def test_python_solution_passes_and_fails(self, sandbox):
+        """Inputs in LeetCode notation are passed to the Solution method and outputs compared"""
+        report = sandbox.run(make_solution(TWO_SUM), [
+            {"input": "nums = [2,7,11,15], target = 9", "expected_output": "[0,1]"},
+            {"input": "nums = [3,2,4]\ntarget = 6", "output": "[1, 2]"},
+            {"input": {"nums": [3, 3], "target": 6}, "expected_output": [1, 0]},
+        ])
+        
+        assert report.status == "ok"
+        assert [case.status for case in report.cases] == ["passed", "passed", "failed"]
+        assert report.cases[2].output == "[0, 1]"
+        assert not report.passed and report.pass_count == 2
+        assert all(case.runtime_s >= 0 for case in report.cases)
+    
+    def test_top_level_function_and_in_place_result(self, sandbox):
+        """Helpers are skipped when picking the function, and None results are judged on the argument"""
+        code = """def swap(nums, i, j):
+    nums[i], nums[j] = nums[j], nums[i]
+
+def reverse(nums):
+    for i in range(len(nums) // 2):
+        swap(nums, i, len(nums) - 1 - i)
+"""
+        report = sandbox.run(make_solution(code), [{"input": "[1, 2, 3]", "expected_output": "[3, 2, 1]"}])
+        
+        assert report.passed
+    
+    def test_limits(self, sandbox):
+        """Runaway cases time out or hit the memory limit without stopping the other cases"""
+        code = """def solve(n):
+    if n == 0:
+        while True:
+            pass
+    if n == 1:
+        return [0] * (10 ** 9)
+    return n * 2
+"""
+        report = sandbox.run(make_solution(code), [
+            {"input": "0", "expected_output": "0"},
+            {"input": "1", "expected_output": "0"},
+            {"input": "2", "expected_output": "4"},
+        ])
+        
+        assert [case.status for case in report.cases] == ["timeout", "memory", "passed"]
+        assert report.cases[0].cpu_s < 2
+    
+    def test_crashes_and_broken_code(self, sandbox):
+        """A solution that kills its process or does not compile is reported, and the pool keeps working"""
+        crash = sandbox.run(make_solution("import os\ndef f(x):\n    os._exit(3)\n"), [{"input": "1", "output": "1"}])
+        broken = sandbox.run(make_solution("def f(x):\n    return (\n"), [{"input": "1", "output": "1"}])
+        
+        assert crash.cases[0].status == "error" and "code 3" in crash.cases[0].error
+        assert broken.cases[0].status == "error" and "SyntaxError" in broken.cases[0].error
+        assert sandbox.run(make_solution(TWO_SUM), [{"input": "[1, 2], 3", "output": "[0, 1]"}]).passed
+    
+    def test_run_many_in_parallel(self, sandbox):
+        """Many solutions are verified concurrently across the warm workers"""
+        jobs = [(make_solution(TWO_SUM), [{"input": f"[1, {i}], {i + 1}", "output": "[0, 1]"}]) for i in range(10)]
+        
+        assert all(report.passed for report in sandbox.run_many(jobs))
+    
+    def test_compiled_program(self, sandbox):
+        """Other languages are compiled once and run with the input on stdin"""
+        import shutil
+        
+        if not shutil.which("gcc"):
+            pytest.skip("gcc not installed")
+        code = '#include <stdio.h>\nint main() { long a, b; scanf("%ld %ld", &a, &b); printf("%ld\\n", a + b); }'
+        report = sandbox.run(make_solution(code, ProgrammingLanguage.C), [
+            {"input": "1 2", "expected_output": "3"},
+            {"input": "5 5", "expected_output": "11"},
+        ])
+        
+        assert [case.status for case in report.cases] == ["passed", "failed"]
+        broken = sandbox.run(make_solution("int main() { return x; }", ProgrammingLanguage.C), [{"input": "", "output": ""}])
+        assert broken.status == "compile_error" and "x" in broken.error
+    
+    def test_verify_solution_uses_examples(self, sandbox, stub_llm):
+        """verify_solution runs the question's examples through the sandbox"""
+        from pragyan.solver import DSASolver
+        
+        question = Question(title="Two Sum", description="...", examples=[
+            {"input": "nums = [2,7,11,15], target = 9", "output": "[0,1]"},
+            {"input": "nums = [3,3], target = 6", "output": "[0,1]"},
+        ])
+        solver = DSASolver(stub_llm("gemini", "key"))
+        
+        report = solver.verify_solution(question, make_solution(TWO_SUM), num_cases=0, sandbox=sandbox)
+        
+        assert report.passed and len(report.cases) == 2
+
+
+class TestConstraints:
+    """Test reading problem constraints and building inputs from them"""
+    
+    def test_parse_numbers_and_bounds(self):
+        """Powers written with ^, superscripts or flattened digits all parse"""
+        from pragyan.constraints import Constraints, parse_number
+        
+        assert parse_number("10^4") == 10 ** 4
+        assert parse_number("10⁵") == 10 ** 5
+        assert parse_number("104") == 10 ** 4
+        assert parse_number("2 * 10^5") == 2 * 10 ** 5
+        assert parse_number("10,000") == 10000
+        
+        constraints = Constraints.parse([
+            "2 <= nums.length <= 10^4",
+            "-109 <= nums[i] <= 109",
+            "1 <= k <= nums.length",
+        ])
+        assert constraints.length("nums").high == 10 ** 4
+        assert constraints.element("nums").low == -10 ** 9
+        assert constraints.value("k").high_ref == "nums.length"
+        assert constraints.max_size("nums") == 10 ** 4
+    
+    def test_shapes_and_synthesis(self):
+        """Grids, strings and scalars get arguments of the requested size within the bounds"""
+        import random
+        from pragyan.constraints import Constraints, synthesize_arguments
+        
+        constraints = Constraints.parse([
+            "m == grid.length",
+            "n == grid[i].length",
+            "1 <= m, n <= 200",
+            "0 <= grid[i][j] <= 9",
+            "1 <= s.length <= 5 * 10^4",
+            "s consists of lowercase English letters.",
+        ])
+        assert constraints.shape("grid") == "grid" and constraints.max_size("grid") == 40000
+        assert constraints.shape("s") == "str"
+        
+        grid, s = synthesize_arguments(["grid", "s"], constraints, 100, random.Random(1))
+        assert len(grid) == 10 and all(len(row) == 10 and all(0 <= x <= 9 for x in row) for row in grid)
+        assert len(s) == 100 and s.islower()
+        
+        scalar = Constraints.parse(["1 <= n <= 45"])
+        assert synthesize_arguments(["n"], scalar, 30) == [30]
+
+
+class TestProfiler:
+    """Test measuring a solution's growth against its claimed complexity"""
+    
+    @pytest.mark.parametrize("model,cost", [
+        ("O(1)", lambda n: 5e-6),
+        ("O(n)", lambda n: 3e-7 * n + 1e-5),
+        ("O(n log n)", lambda n: 2e-7 * n * math.log2(n) + 1e-5),
+        ("O(n^2)", lambda n: 1e-8 * n * n + 1e-5),
+    ])
+    def test_fit_growth(self, model, cost):
+        """Synthetic measurements are matched to the model that produced them, noise included"""
+        import random
+        from pragyan.profiler import fit_growth
+        
+        rng = random.Random(0)
+        points = [(n, cost(n) * rng.uniform(0.95, 1.05)) for n in (2 ** k for k in range(4, 14))]
+        
+        fit = fit_growth(points)
+        
+        assert fit.model == model
+        assert fit.predict(8192) == pytest.approx(cost(8192), rel=0.2)
+        assert fit_growth(points[:3]) is None
+    
+    def test_parse_complexity(self):
+        """Claimed complexities are normalized to a growth model"""
+        from pragyan.profiler import parse_complexity
+        
+        assert parse_complexity("O(n log n) - sorting dominates") == "O(n log n)"
+        assert parse_complexity("O(N * log(N))") == "O(n log n)"
+        assert parse_complexity("O(n²)") == "O(n^2)"
+        assert parse_complexity("O(m*n) for the grid") == "O(n)"
+        assert parse_complexity("O(1) extra space") == "O(1)"
+        assert parse_complexity("O(k)") is None
+        assert parse_complexity("") is None
+    
+    def test_profile_flags_wrong_claim(self, sandbox):
+        """A quadratic solution claimed as O(n) is flagged and projected to time out at the limit"""
+        from pragyan.models import ProfileConfig
+        from pragyan.profiler import ComplexityProfiler
+        
+        question = Question(title="Two Sum", description="...", constraints=[
+            "2 <= nums.length <= 10^5",
+            "-10^9 <= nums[i] <= 10^9",
+            "-10^9 <= target <= 10^9",
+        ])
+        quadratic = make_solution("""class Solution:
+    def twoSum(self, nums: List[int], target: int) -> List[int]:
+        for i in range(len(nums)):
+            for j in range(i + 1, len(nums)):
+                if nums[i] + nums[j] == target:
+                    return [i, j]
+        return []
+""")
+        quadratic.time_complexity = "O(n)"
+        linear = make_solution(TWO_SUM)
+        linear.time_complexity = linear.space_complexity = "O(n)"
+        profiler = ComplexityProfiler(ProfileConfig(max_size=1024, size_time_budget=0.1), sandbox)
+        
+        slow = profiler.profile(question, quadratic)
+        fast = profiler.profile(question, linear)
+        
+        assert slow.status == "ok" and slow.size_parameter == "nums" and slow.max_size == 10 ** 5
+        assert slow.time_fit.model == "O(n^2)" and slow.time_mismatch and slow.would_tle
+        assert fast.time_fit.model in ("O(n)", "O(n log n)") and fast.time_mismatch is False
+        assert not fast.would_tle
+        assert fast.to_dict()["points"][0]["n"] == 16
+    
+    def test_compare_approaches_benchmark(self, sandbox):
+        """compare_approaches(benchmark=True) measures every approach on the same inputs"""
+        from pragyan.main import Pragyan
+        from pragyan.models import ExecutionConfig, ProfileConfig
+        
+        question = Question(title="Two Sum", description="...", constraints=[
+            "2 <= nums.length <= 10^4", "-10^9 <= nums[i] <= 10^9", "-10^9 <= target <= 10^9",
+        ])
+        pragyan = Pragyan(provider="fake", api_key="")
+        pragyan._sandbox = sandbox
+        
+        result = pragyan.compare_approaches(question, benchmark=True, config=ProfileConfig(max_size=1024, size_time_budget=0.1))
+        
+        table = result["benchmark"]
+        assert table["sizes"][0] == 16 and table["sizes"][-1] == 1024
+        rows = {row["name"]: row for row in table["approaches"]}
+        assert rows["Brute force"]["measured_time"] == "O(n^2)" and rows["Brute force"]["would_tle"]
+        assert rows["Hash map"]["measured_time"] in ("O(n)", "O(n log n)") and not rows["Hash map"]["would_tle"]
+        assert rows["Brute force"]["measured_space"] == "O(1)"
+        assert table["fastest"] == "Hash map"
+    
+    def test_compare_rejects_mismatched_signatures(self, sandbox):
+        """Approaches taking different arguments are reported instead of run on the wrong inputs"""
+        from pragyan.models import ProfileConfig
+        from pragyan.profiler import ComplexityProfiler
+        
+        question = Question(title="Sum", description="...", constraints=["1 <= nums.length <= 100"])
+        table = ComplexityProfiler(ProfileConfig(max_size=64), sandbox).compare(question, {
+            "sum": make_solution("def total(nums):\n    return sum(nums)\n"),
+            "pair": make_solution("def total(nums, k):\n    return sum(nums) + k\n"),
+        })
+        
+        assert table.reports["sum"].status == "ok" and table.reports["sum"].points
+        assert table.reports["pair"].status == "error" and "(nums, k)" in table.reports["pair"].error
+        assert table.fastest == "sum"
+    
+    def test_profile_unsupported_language(self, sandbox):
+        """Only Python solutions are profiled"""
+        from pragyan.profiler import ComplexityProfiler
+        
+        report = ComplexityProfiler(sandbox=sandbox).profile(Question(title="t", description="d"), make_solution("int main() {}", ProgrammingLanguage.C))
+        
+        assert report.status == "unsupported" and report.time_fit is None
+
+
+class TestStress:
+    """Test worst-case input generation and stress runs"""
+    
+    def test_orders(self):
+        """Each order builds its worst case within the constraint bounds"""
+        from pragyan.constraints import Constraints, synthesize_arguments
+        
+        constraints = Constraints.parse(["1 <= nums.length <= 100", "-50 <= nums[i] <= 50", "1 <= k <= 20"])
+        
+        def nums(order):
+            return synthesize_arguments(["nums", "k"], constraints, 40, order=order)
+        
+        assert nums("sorted")[0] == sorted(nums("sorted")[0])
+        assert nums("reversed")[0] == sorted(nums("reversed")[0], reverse=True)
+        assert nums("equal") == [[50] * 40, 20]
+        assert len(set(nums("distinct")[0])) == 40
+        organ = nums("pipe_organ")[0]
+        peak = organ.index(max(organ))
+        assert organ[:peak + 1] == sorted(organ[:peak + 1]) and organ[peak:] == sorted(organ[peak:], reverse=True)
+        deep = nums("deep")[0]
+        assert all(a < b for a, b in zip(deep, deep[1:]))
+        with pytest.raises(ValueError):
+            nums("shuffled")
+    
+    def test_deep_shapes(self):
+        """Deep recursion shapes: one region covering the grid, edge lists forming a single path"""
+        from pragyan.constraints import Constraints, synthesize_arguments
+        
+        grid = Constraints.parse(["m == grid.length", "n == grid[i].length", "1 <= m, n <= 300", "grid[i][j] is 0 or 1", "0 <= grid[i][j] <= 1"])
+        edges = Constraints.parse(["1 <= edges.length <= 10^5", "edges[i].length == 2"])
+        
+        assert synthesize_arguments(["grid"], grid, 16, order="deep") == [[[1] * 4] * 4]
+        assert synthesize_arguments(["edges"], edges, 8, order="deep") == [[[0, 1], [1, 2], [2, 3], [3, 4]]]
+    
+    def test_argument_files_round_trip(self, tmp_path):
+        """Numeric arrays are stored raw and everything else as JSON, and both load back unchanged"""
+        from pragyan.stress import write_arguments
+        from pragyan._sandbox_worker import load_arguments
+        
+        arguments = [list(range(-5, 5)), [0.5, 1.5], "abc", [[1, 2], [3]], [2 ** 70], [], 7]
+        segments = write_arguments(arguments, tmp_path / "args.bin")
+        
+        assert [segment["kind"] for segment in segments] == ["int64", "float64", "json", "json", "json", "json", "json"]
+        assert load_arguments(str(tmp_path / "args.bin"), segments) == arguments
+    
+    def test_stress_finds_worst_case(self, sandbox):
+        """A first-element-pivot quicksort passes random input but fails sorted input at the limit"""
+        from pragyan.stress import StressGenerator
+        
+        question = Question(title="Sort an Array", description="...", constraints=[
+            "1 <= nums.length <= 5 * 10^4", "-5 * 10^4 <= nums[i] <= 5 * 10^4",
+        ])
+        code = """class Solution:
+    def sortArray(self, nums: List[int]) -> List[int]:
+        if len(nums) <= 1:
+            return nums
+        pivot, rest = nums[0], nums[1:]
+        return self.sortArray([x for x in rest if x < pivot]) + [pivot] + self.sortArray([x for x in rest if x >= pivot])
+"""
+        with StressGenerator.for_question(question, ["nums"]) as generator:
+            inputs = generator.generate(["random", "sorted"], size=10 ** 4)
+            sorted_nums = inputs[1].load()[0]
+            assert generator.max_size == 5 * 10 ** 4 and len(sorted_nums) == 10 ** 4 and sorted_nums == sorted(sorted_nums)
+            report = sandbox.stress(make_solution(code), inputs)
+            directory = generator.directory
+        
+        assert [case.input for case in report.cases] == ["random (n=10000)", "sorted (n=10000)"]
+        assert report.cases[0].passed and not report.cases[1].passed
+        assert not directory.exists()